@@ -37,6 +37,7 @@ from skills_runtime.observability.run_metrics import compute_run_metrics_summary
 from skills_runtime.tools.builtin import register_builtin_tools
 from skills_runtime.tools.protocol import ToolCall, ToolResult
 from skills_runtime.tools.registry import ToolExecutionContext, ToolRegistry
+from skills_runtime.tools.search_index import TrigramIndex
 from skills_runtime.core.utf8 import ensure_utf8_stdio
 
 
@@ -293,6 +294,7 @@ def _build_parser() -> argparse.ArgumentParser:
     list_dir.add_argument("--depth", type=int, default=2, help="Recursion depth (>=1).")
     list_dir.add_argument("--offset", type=int, default=1, help="1-indexed offset (>=1).")
     list_dir.add_argument("--limit", type=int, default=25, help="Max entries to return (>=1).")
+    list_dir.add_argument("--cursor", default=None, help="Continue after a previous page (result.data.next_cursor).")
 
     grep_files = tools_sub.add_parser("grep-files", help="Call builtin tool: grep_files")
     _add_common_flags(grep_files)
@@ -301,6 +303,17 @@ def _build_parser() -> argparse.ArgumentParser:
     grep_files.add_argument("--include", default=None, help="Glob include filter (e.g. '*.md').")
     grep_files.add_argument("--limit", type=int, default=100, help="Max matched files to return (>=1).")
 
+    search_p = tools_sub.add_parser("search", help="Indexed search: refresh the workspace trigram index, then grep_files")
+    _add_common_flags(search_p)
+    search_p.add_argument("--pattern", required=True, help="Regex/search pattern (non-empty).")
+    search_p.add_argument("--path", default=None, help="Search root (default: workspace root).")
+    search_p.add_argument("--include", default=None, help="Glob include filter (e.g. '*.md').")
+    search_p.add_argument("--limit", type=int, default=100, help="Max matched files (or lines with --lines) to return (>=1).")
+    search_p.add_argument("--lines", action="store_true", help="Return path:line:text matches instead of file paths.")
+    search_p.add_argument("--context", type=int, default=0, help="Context lines around each match (with --lines).")
+    search_p.add_argument("--no-refresh", action="store_true", help="Use the existing index as-is (do not update it).")
+    search_p.add_argument("--reindex", action="store_true", help="Rebuild the index from scratch before searching.")
+
     apply_patch = tools_sub.add_parser("apply-patch", help="Call builtin tool: apply_patch")
     _add_common_flags(apply_patch)
     group = apply_patch.add_mutually_exclusive_group(required=True)
@@ -390,6 +403,7 @@ def _build_parser() -> argparse.ArgumentParser:
     _add_common_flags(wait_p)
     wait_p.add_argument("--ids", required=True, help="Comma-separated child agent ids.")
     wait_p.add_argument("--timeout-ms", type=int, default=None, help="Timeout in ms (>=1).")
+    wait_p.add_argument("--mode", choices=["all", "any"], default=None, help="Return when all (default) or any child finishes.")
 
     send_p = tools_sub.add_parser("send-input", help="Call builtin tool: send_input")
     _add_common_flags(send_p)
@@ -549,8 +563,9 @@ def _dump_tools_cli_payload(
     env_file: Optional[Path],
     dotenv_error: Optional[str],
     pretty: bool,
+    extra_stats: Optional[Dict[str, Any]] = None,
 ) -> None:
-    """输出 tools CLI 统一 JSON envelope（tool/result/stats）。"""
+    """输出 tools CLI 统一 JSON envelope（tool/result/stats；extra_stats 合并进 stats）。"""
 
     stats: Dict[str, Any] = {
         "workspace_root": str(workspace_root),
@@ -559,6 +574,8 @@ def _dump_tools_cli_payload(
     }
     if dotenv_error:
         stats["dotenv_error"] = dotenv_error
+    if extra_stats:
+        stats.update(extra_stats)
 
     payload = {"tool": tool_name, "result": _tool_result_to_jsonable(result), "stats": stats}
     _dump_json_to_stdout(payload, pretty=pretty)
@@ -599,6 +616,8 @@ def _handle_tools_list_dir(args: argparse.Namespace) -> int:
         "offset": int(args.offset),
         "limit": int(args.limit),
     }
+    if args.cursor is not None:
+        tool_args["cursor"] = str(args.cursor)
     result = _dispatch_builtin_tool(workspace_root=ws, tool_name="list_dir", tool_args=tool_args)
     _dump_tools_cli_payload(
         tool_name="list_dir",
@@ -651,6 +670,65 @@ def _handle_tools_grep_files(args: argparse.Namespace) -> int:
     return _exit_code_for_tool_result(result)
 
 
+def _handle_tools_search(args: argparse.Namespace) -> int:
+    """执行 `tools search`（先增量更新 trigram 索引，再通过 grep_files 查询）。"""
+
+    r = _bootstrap_workspace(args)
+    ws, overlays, env_file = r.ws, r.overlay_paths, r.env_file
+    dotenv_error = r.dotenv_error or (r.issues[0].message if r.issues else None)
+    if ws is None:
+        result = ToolResult.error_payload(error_kind="validation", stderr="workspace_root is invalid")
+        _dump_tools_cli_payload(
+            tool_name="grep_files",
+            result=result,
+            workspace_root=Path(str(args.workspace_root)).expanduser().resolve(),
+            overlay_paths=overlays,
+            env_file=env_file,
+            dotenv_error=dotenv_error,
+            pretty=bool(args.pretty),
+        )
+        return _exit_code_for_tool_result(result)
+
+    index_stats: Dict[str, Any] = {"refreshed": False}
+    if not args.no_refresh or args.reindex:
+        started = time.monotonic()
+        try:
+            refreshed = TrigramIndex.open_or_create(ws).refresh(force_rebuild=bool(args.reindex))
+        except OSError as exc:
+            index_stats["error"] = str(exc)
+        else:
+            index_stats = {
+                "refreshed": True,
+                "files": refreshed.files,
+                "reindexed": refreshed.reindexed,
+                "removed": refreshed.removed,
+                "rebuilt": refreshed.rebuilt,
+                "duration_ms": int((time.monotonic() - started) * 1000),
+            }
+
+    tool_args: Dict[str, Any] = {"pattern": str(args.pattern), "limit": int(args.limit)}
+    if args.path is not None:
+        tool_args["path"] = str(args.path)
+    if args.include is not None:
+        tool_args["include"] = str(args.include)
+    if args.lines:
+        tool_args["mode"] = "lines"
+        tool_args["context_lines"] = int(args.context)
+
+    result = _dispatch_builtin_tool(workspace_root=ws, tool_name="grep_files", tool_args=tool_args)
+    _dump_tools_cli_payload(
+        tool_name="grep_files",
+        result=result,
+        workspace_root=ws,
+        overlay_paths=overlays,
+        env_file=env_file,
+        dotenv_error=dotenv_error,
+        pretty=bool(args.pretty),
+        extra_stats={"index": index_stats},
+    )
+    return _exit_code_for_tool_result(result)
+
+
 def _resolve_input_file_path(*, workspace_root: Path, raw: str) -> Tuple[Optional[Path], Optional[ToolResult]]:
     """
     解析 `--input-file` 为绝对路径并做 workspace_root 边界校验。
@@ -1351,6 +1429,8 @@ def _handle_tools_wait(args: argparse.Namespace) -> int:
     tool_args: Dict[str, Any] = {"ids": ids}
     if args.timeout_ms is not None:
         tool_args["timeout_ms"] = int(args.timeout_ms)
+    if args.mode is not None:
+        tool_args["mode"] = str(args.mode)
     result2 = _dispatch_builtin_tool(workspace_root=ws, tool_name="wait", tool_args=tool_args)
     _dump_tools_cli_payload(
         tool_name="wait",
@@ -1627,6 +1707,8 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
             return _handle_tools_list_dir(args)
         if args.tools_cmd == "grep-files":
             return _handle_tools_grep_files(args)
+        if args.tools_cmd == "search":
+            return _handle_tools_search(args)
         if args.tools_cmd == "apply-patch":
             return _handle_tools_apply_patch(args)
         if args.tools_cmd == "read-file":
@@ -115,10 +115,26 @@ class AgentSdkLlmConfig(BaseModel):
         cap_delay_sec: float = Field(default=8.0, ge=0.0)
         jitter_ratio: float = Field(default=0.1, ge=0.0, le=1.0)
 
+    class Http(BaseModel):
+        """
+        LLM HTTP 连接池参数（backend 持有的长生命周期 client）。
+
+        说明：
+        - `http2=true` 需要额外安装 `h2`（`pip install 'skills-runtime-sdk[http2]'`）。
+        """
+
+        model_config = ConfigDict(extra="forbid")
+
+        max_connections: int = Field(default=100, ge=1)
+        max_keepalive_connections: int = Field(default=20, ge=0)
+        keepalive_expiry_sec: float = Field(default=30.0, ge=0.0)
+        http2: StrictBool = False
+
     base_url: str
     api_key_env: str
     timeout_sec: int = Field(default=60, ge=1)
     retry: Retry = Field(default_factory=Retry)
+    http: Http = Field(default_factory=Http)
 
 
 class AgentSdkModelsConfig(BaseModel):
@@ -205,11 +221,70 @@ class AgentSdkRunConfig(BaseModel):
         increase_budget_extra_steps: int = Field(default=20, ge=0)
         increase_budget_extra_wall_time_sec: int = Field(default=600, ge=0)
 
+        # proactive compaction：发请求前按模型窗口预估 prompt token，超过阈值先压缩（None 表示关闭）
+        context_window_tokens: Optional[int] = Field(default=None, ge=1)
+        proactive_compaction_ratio: float = Field(default=0.8, gt=0, le=1)
+        # 预计下一轮越过阈值时，在 tool 执行期间后台生成摘要（与 tool 执行重叠）
+        background_compaction: StrictBool = True
+
+    class Wal(BaseModel):
+        """
+        本地 JSONL WAL 写入策略（仅影响默认的 `JsonlWal`；注入的 wal_backend 不受影响）。
+
+        说明：
+        - `group_commit` 默认关闭，保持“每条事件 flush 一次”的既有行为；
+        - 开启后事件按条数/字节/时间阈值合并写入，终态事件仍立即 flush + fsync；
+        - `offset_index` 控制是否维护 `events.jsonl.idx`（行号 → 字节偏移），用于 O(1) 打开/定位。
+        """
+
+        model_config = ConfigDict(extra="forbid")
+
+        group_commit: StrictBool = False
+        group_commit_max_events: int = Field(default=64, ge=1)
+        group_commit_max_bytes: int = Field(default=256 * 1024, ge=1)
+        group_commit_max_delay_ms: int = Field(default=20, ge=0)
+        offset_index: StrictBool = True
+
+    class DeltaCoalescing(BaseModel):
+        """
+        LLM text delta 合并策略（`llm_response_delta` with `delta_type=text`）。
+
+        说明：
+        - 开启时按时间/字符阈值把逐 token 的 delta 合并为更少、更大的事件（WAL/hooks/stream 同步受益）；
+        - 审计要求“一 token 一事件”的部署可设 `enabled=false` 恢复逐 token 行为；
+        - 拼接后的文本与事件相对顺序（text → tool_calls → usage）在两种模式下一致。
+        """
+
+        model_config = ConfigDict(extra="forbid")
+
+        enabled: StrictBool = True
+        max_delay_ms: int = Field(default=40, ge=1)
+        max_chars: int = Field(default=256, ge=1)
+
+    class ToolDispatch(BaseModel):
+        """
+        同一轮已批准 tool calls 的并发派发策略。
+
+        说明：
+        - `max_parallel` 为单批次同时执行的 tool call 上限；`1` 恢复逐个串行派发的既有行为；
+        - 并发分组按 `ToolSpec.idempotency`：相邻的 `safe` 调用并发（受 `max_parallel` 约束）；
+          相邻的同名 `unknown` 调用在 `unknown_per_tool>1` 时并发；其余调用（`unsafe`/未声明/不同工具之间）按原始顺序逐个执行；
+        - 无论并发与否，tool_call_* 与工具旁路事件都按原始 call 顺序写入 WAL。
+        """
+
+        model_config = ConfigDict(extra="forbid")
+
+        max_parallel: int = Field(default=8, ge=1)
+        unknown_per_tool: int = Field(default=1, ge=1)
+
     max_steps: int = Field(default=40, ge=1)
     max_wall_time_sec: Optional[int] = Field(default=None, ge=1)
     human_timeout_ms: Optional[int] = Field(default=None, ge=1)
     resume_strategy: Literal["summary", "replay"] = Field(default="summary")
     context_recovery: ContextRecovery = Field(default_factory=ContextRecovery)
+    wal: Wal = Field(default_factory=Wal)
+    delta_coalescing: DeltaCoalescing = Field(default_factory=DeltaCoalescing)
+    tool_dispatch: ToolDispatch = Field(default_factory=ToolDispatch)
 
 
 class AgentSdkSafetyConfig(BaseModel):
@@ -329,6 +404,8 @@ class AgentSdkSkillsConfig(BaseModel):
         model_config = ConfigDict(extra="forbid")
 
         max_bytes: Optional[int] = Field(default=None, ge=1)
+        # 注入正文的进程内 LRU 缓存上限（字节；0 表示禁用，每次注入都回源读取）。
+        body_cache_max_bytes: StrictInt = Field(default=8 * 1024 * 1024, ge=0)
 
     class Actions(BaseModel):
         """Skills actions（skill_exec）能力开关。"""
@@ -356,7 +433,8 @@ class AgentSdkSkillsConfig(BaseModel):
         max_dirs_per_root: StrictInt = Field(default=100000, ge=0)
         max_frontmatter_bytes: StrictInt = Field(default=65536, ge=1)
 
-        refresh_policy: Literal["always", "ttl", "manual"] = Field(default="always")
+        # incremental：每次 scan 都检查变更，但只重读有变化的 source/条目（filesystem stat 指纹；redis/pgsql etag/updated_at）。
+        refresh_policy: Literal["always", "ttl", "manual", "incremental"] = Field(default="always")
         ttl_sec: StrictInt = Field(default=300, ge=1)
 
     # skill 依赖的 env var 缺失时的处理策略（云端无人值守建议 fail_fast 或 skip_skill）。
@@ -380,6 +458,8 @@ class AgentSdkPromptHistoryConfig(BaseModel):
     mode: Optional[Literal["none", "compacted", "full"]] = None
     max_messages: int = Field(default=40, ge=1)
     max_chars: int = Field(default=120_000, ge=1)
+    max_tokens: Optional[int] = Field(default=None, ge=1)
+    tokenizer: Literal["auto", "heuristic", "tiktoken"] = "auto"
 
 
 class AgentSdkPromptSkillInjectionConfig(BaseModel):
@@ -411,6 +491,7 @@ class AgentSdkPromptConfig(BaseModel):
     system_path: Optional[str] = None
     developer_path: Optional[str] = None
     include_skills_list: Optional[bool] = None
+    skills_list_top_k: Optional[int] = Field(default=None, ge=1)
     include_cwd_tree: bool = False
     skill_injection: AgentSdkPromptSkillInjectionConfig = Field(default_factory=AgentSdkPromptSkillInjectionConfig)
     history: AgentSdkPromptHistoryConfig = Field(default_factory=AgentSdkPromptHistoryConfig)
@@ -21,6 +21,7 @@ from skills_runtime.core.exec_sessions import ExecSessionsProvider
 from skills_runtime.core.executor import Executor
 from skills_runtime.llm.protocol import ChatBackend
 from skills_runtime.prompts.manager import PromptManager, PromptTemplates
+from skills_runtime.prompts.tokens import get_token_estimator
 from skills_runtime.safety.approvals import ApprovalProvider
 from skills_runtime.skills.manager import SkillsManager
 from skills_runtime.state.wal_protocol import WalBackend
@@ -177,16 +178,25 @@ class Agent:
                     developer_path=developer_path,
                 )
 
+        history_cfg = self._config.prompt.history
+        # 配置了 history token 预算或模型窗口（proactive compaction）时，按 tokenizer 配置精确估算。
+        needs_tokenizer = (
+            history_cfg.max_tokens is not None or self._config.run.context_recovery.context_window_tokens is not None
+        )
         self._prompt_manager = PromptManager(
             templates=prompt_templates,
             profile=self._config.prompt.profile,
             include_skills_list=self._config.prompt.include_skills_list,
+            skills_list_top_k=self._config.prompt.skills_list_top_k,
             skill_injection_mode=self._config.prompt.skill_injection.mode,
             skill_render=self._config.prompt.skill_injection.render,
             history_mode=self._config.prompt.history.mode,
             tools_exposure=self._config.prompt.tools.exposure,
             history_max_messages=int(self._config.prompt.history.max_messages),
             history_max_chars=int(self._config.prompt.history.max_chars),
+            history_max_tokens=history_cfg.max_tokens,
+            history_tokenizer=history_cfg.tokenizer,
+            token_estimator=get_token_estimator(history_cfg.tokenizer) if needs_tokenizer else None,
         )
         self._extra_tools: List[Tuple[ToolSpec, Any, bool]] = []
 
@@ -276,6 +276,10 @@ class AgentLoop:
                 assistant_text = result.assistant_text
                 pending_tool_calls = list(result.pending_tool_calls)
                 if pending_tool_calls:
+                    # 预计下一轮越过模型窗口阈值时，让摘要生成与 tool 执行重叠。
+                    session.turn_orchestrator.start_background_compaction(
+                        ctx=session.ctx, backend=backend, turn_id=turn_id
+                    )
                     ok = await process_pending_tool_calls(
                         ctx=session.ctx,
                         turn_id=turn_id,
@@ -301,4 +305,5 @@ class AgentLoop:
             session.finalizer.emit_failed(e)
             return
         finally:
+            session.turn_orchestrator.cancel_background_compaction()
             session.finalizer.merge_new_env_vars()
@@ -17,11 +17,47 @@ import time
 import uuid
 from dataclasses import dataclass
 from queue import Queue
-from typing import Callable, Optional
+from typing import Callable, Iterable, Optional
 
 
 ChildAgentRunner = Callable[[str, "ChildAgentContext"], str]
 
+# wait 的返回条件：all=全部 child 结束；any=任一 child 结束。
+COLLAB_WAIT_MODES = ("all", "any")
+
+
+def wait_children_settled(
+    cond: threading.Condition,
+    *,
+    ids: Iterable[str],
+    is_settled: Callable[[str], bool],
+    mode: str = "all",
+    deadline: Optional[float] = None,
+) -> None:
+    """
+    在条件变量上阻塞，直到目标 child 满足 `mode` 或到达 `deadline`（`time.monotonic()` 绝对时间）。
+
+    约定：
+    - 调用方 MUST 已持有 `cond`；`is_settled(id)` 在锁内求值；
+    - child 状态发生变化的一方负责 `cond.notify_all()`，因此唤醒延迟与轮询间隔/child 数量无关。
+    """
+
+    if mode not in COLLAB_WAIT_MODES:
+        raise ValueError(f"mode must be one of {list(COLLAB_WAIT_MODES)}")
+    targets = list(ids)
+    need_all = mode == "all"
+    while True:
+        settled = [i for i in targets if is_settled(i)]
+        if (need_all and len(settled) == len(targets)) or (not need_all and settled):
+            return
+        if deadline is None:
+            cond.wait()
+            continue
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        cond.wait(remaining)
+
 
 @dataclass
 class ChildAgentContext:
@@ -81,6 +117,8 @@ class CollabManager:
 
         self._runner = runner
         self._lock = threading.Lock()
+        # child 进入终态时 notify_all，供 wait 事件驱动地唤醒。
+        self._changed = threading.Condition(self._lock)
         self._agents: dict[str, ChildAgentHandle] = {}
         self._terminal: dict[str, ChildAgentSnapshot] = {}
 
@@ -164,6 +202,7 @@ class CollabManager:
                 final_output=final_output,
                 error=error,
             )
+            self._changed.notify_all()
 
     def get(self, agent_id: str) -> Optional[ChildAgentHandle]:
         """获取子 agent 句柄（不存在返回 None）。"""
@@ -171,36 +210,31 @@ class CollabManager:
         with self._lock:
             return self._agents.get(str(agent_id))
 
-    def wait(self, *, ids: list[str], timeout_ms: Optional[int] = None) -> list[ChildAgentSnapshot]:
+    def wait(self, *, ids: list[str], timeout_ms: Optional[int] = None, mode: str = "all") -> list[ChildAgentSnapshot]:
         """
         等待一组子 agent（或超时返回当前状态）。
 
         参数：
         - ids：子 agent id 列表（必须都存在）
         - timeout_ms：总超时（毫秒）
+        - mode：`all` 等待全部结束；`any` 任一结束即返回（返回值仍包含全部 ids 的当前快照）
         """
 
         if not ids:
             raise ValueError("ids must not be empty")
 
-        handles: list[ChildAgentHandle] = []
-        with self._lock:
+        deadline = None if timeout_ms is None else (time.monotonic() + timeout_ms / 1000.0)
+        with self._changed:
             missing = [i for i in ids if str(i) not in self._agents and str(i) not in self._terminal]
             if missing:
                 raise KeyError(f"unknown ids: {missing}")
-            handles = [self._agents[str(i)] for i in ids if str(i) in self._agents]
-
-        deadline = None if timeout_ms is None else (time.monotonic() + timeout_ms / 1000.0)
-        for h in handles:
-            if not h.thread.is_alive():
-                continue
-            if deadline is None:
-                h.thread.join()
-            else:
-                remaining = deadline - time.monotonic()
-                if remaining <= 0:
-                    break
-                h.thread.join(timeout=remaining)
+            wait_children_settled(
+                self._changed,
+                ids=[str(i) for i in ids],
+                is_settled=lambda agent_id: agent_id not in self._agents,
+                mode=mode,
+                deadline=deadline,
+            )
 
         # 返回快照（避免暴露内部可变对象给调用方写入）
         out: list[ChildAgentSnapshot] = []
@@ -65,13 +65,14 @@ class PersistentCollabManager:
         )
         return RemoteChildHandle(id=str(data.get("id") or ""), status=str(data.get("status") or "running"))
 
-    def wait(self, *, ids: List[str], timeout_ms: Optional[int] = None) -> List[RemoteChildHandle]:
+    def wait(self, *, ids: List[str], timeout_ms: Optional[int] = None, mode: str = "all") -> List[RemoteChildHandle]:
         """
         等待一组子 agent 完成（或超时返回当前状态）。
 
         参数：
         - ids：child id 列表（必须全部存在）
         - timeout_ms：总超时（毫秒；可空）
+        - mode：`all` 等待全部结束；`any` 任一结束即返回
 
         返回：
         - RemoteChildHandle 列表（按 server 返回顺序）
@@ -80,7 +81,11 @@ class PersistentCollabManager:
         try:
             data = self._client.call(
                 method="collab.wait",
-                params={"ids": [str(i) for i in ids], "timeout_ms": (None if timeout_ms is None else int(timeout_ms))},
+                params={
+                    "ids": [str(i) for i in ids],
+                    "timeout_ms": (None if timeout_ms is None else int(timeout_ms)),
+                    "mode": str(mode),
+                },
             )
         except RuntimeError as e:
             # server 侧会把 unknown ids 抛为 KeyError -> error string；工具层期望 KeyError 走 validation
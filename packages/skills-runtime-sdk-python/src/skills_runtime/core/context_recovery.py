@@ -5,13 +5,14 @@
 - ask-first 人类决策
 - compact-first 自动压缩
 - handoff 生成可复制摘要并终止本次 run
+- proactive：按模型窗口预估 prompt token，越过阈值前主动压缩（可与 tool 执行重叠）
 """
 
 from __future__ import annotations
 
 import asyncio
 import hashlib
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 from skills_runtime.core.contracts import AgentEvent
 from skills_runtime.core.run_context import RunContext
@@ -24,6 +25,8 @@ from skills_runtime.prompts.compaction import (
 )
 from skills_runtime.tools.protocol import HumanIOProvider
 
+_SUMMARY_MARKER = SUMMARY_PREFIX_TEMPLATE_ZH.strip().splitlines()[0]
+
 
 async def ask_human_context_recovery_choice(
     *,
@@ -83,7 +86,7 @@ async def ask_human_context_recovery_choice(
     return ans
 
 
-async def perform_compaction_turn_and_rebuild_history(
+async def generate_compaction_summary(
     *,
     backend: ChatBackend,
     executor_model: str,
@@ -91,17 +94,29 @@ async def perform_compaction_turn_and_rebuild_history(
     task: str,
     reason: str,
     turn_id: str,
+    history: Optional[List[Dict[str, Any]]] = None,
+    payload_extra: Optional[Dict[str, Any]] = None,
 ) -> str:
-    """执行一次 compaction turn，并用摘要重建 history（返回 artifact_path）。"""
+    """
+    执行 compaction turn 并返回完整摘要文本（不修改 history）。
+
+    参数：
+    - history：参与压缩的 history 快照；None 表示使用当前 `ctx.history`
+    - payload_extra：附加到 `compaction_started` 事件 payload 的字段（例如 proactive 的 token 估算）
+    """
     if ctx.max_compactions_per_run > 0 and ctx.compactions_performed >= ctx.max_compactions_per_run:
         raise ValueError("max compactions per run exceeded")
 
+    # 滚动摘要：已有摘要时只格式化检查点之后的新增消息，并与上一份摘要合并。
+    pending, previous_summary = ctx.rolling_summary.pending_messages(ctx.history if history is None else history)
     transcript = format_history_for_compaction(
-        ctx.history,
+        pending,
         max_chars=ctx.compaction_history_max_chars,
         keep_last_messages=ctx.compaction_keep_last_messages,
     )
-    compaction_messages = build_compaction_messages(task=task, transcript=transcript)
+    compaction_messages = build_compaction_messages(
+        task=task, transcript=transcript, previous_summary=previous_summary
+    )
 
     ctx.emit_event(
         AgentEvent(
@@ -109,7 +124,13 @@ async def perform_compaction_turn_and_rebuild_history(
             timestamp=now_rfc3339(),
             run_id=ctx.run_id,
             turn_id=turn_id,
-            payload={"reason": str(reason or "unknown"), "mode": ctx.context_recovery_mode},
+            payload={
+                "reason": str(reason or "unknown"),
+                "mode": ctx.context_recovery_mode,
+                "incremental": previous_summary is not None,
+                "messages": len(pending),
+                **(payload_extra or {}),
+            },
         )
     )
 
@@ -132,6 +153,8 @@ async def perform_compaction_turn_and_rebuild_history(
                 summary_text += str(getattr(ev, "text", "") or "")
             elif t == "completed":
                 break
+    except asyncio.CancelledError:
+        raise
     except BaseException as e:
         ctx.emit_event(
             AgentEvent(
@@ -143,9 +166,28 @@ async def perform_compaction_turn_and_rebuild_history(
             )
         )
         summary_text = f"(compaction failed; fallback transcript excerpt)\n\n{transcript}"
+        if previous_summary:
+            summary_text = f"(compaction failed; previous summary + new transcript excerpt)\n\n{previous_summary}\n\n{transcript}"
 
     summary_text = str(summary_text or "").strip()
-    summary_full = (SUMMARY_PREFIX_TEMPLATE_ZH + "\n" + summary_text).strip() + "\n"
+    return (SUMMARY_PREFIX_TEMPLATE_ZH + "\n" + summary_text).strip() + "\n"
+
+
+def apply_compaction_summary(
+    *,
+    ctx: RunContext,
+    summary_full: str,
+    reason: str,
+    turn_id: str,
+    upto: Optional[int] = None,
+) -> str:
+    """
+    用摘要重建 history（返回 artifact_path）。
+
+    参数：
+    - upto：摘要覆盖的 history 前缀长度；None 表示整个 history。
+      `history[upto:]`（摘要生成期间追加的消息，例如后台压缩时并发执行的 tool call/result）原样保留在末尾。
+    """
     artifact_path = ctx.write_text_artifact(kind="handoff_summary", content=summary_full)
     ctx.compaction_artifacts.append(artifact_path)
 
@@ -169,8 +211,10 @@ async def perform_compaction_turn_and_rebuild_history(
         )
     )
 
+    covered = len(ctx.history) if upto is None else max(0, min(int(upto), len(ctx.history)))
+    appended = ctx.history[covered:]
     kept_tail = []
-    for m in ctx.history:
+    for m in ctx.history[:covered]:
         if not isinstance(m, dict):
             continue
         if m.get("role") not in ("user", "assistant"):
@@ -178,6 +222,9 @@ async def perform_compaction_turn_and_rebuild_history(
         content = m.get("content")
         if not isinstance(content, str) or not content.strip():
             continue
+        if content.startswith(_SUMMARY_MARKER):
+            # 上一份摘要已被新摘要合并，不再作为尾部原文保留。
+            continue
         kept_tail.append({"role": m.get("role"), "content": content})
     kept_tail = (
         kept_tail[-max(0, int(ctx.compaction_keep_last_messages)) :]
@@ -188,6 +235,12 @@ async def perform_compaction_turn_and_rebuild_history(
     ctx.history.clear()
     ctx.history.append({"role": "assistant", "content": summary_full})
     ctx.history.extend(kept_tail)
+    # 检查点：摘要覆盖到的最后一条（summary 或保留的尾部原文）；其后追加的消息留给下一次增量摘要。
+    ctx.rolling_summary.update(
+        summary=summary_full.strip().removeprefix(SUMMARY_PREFIX_TEMPLATE_ZH.strip()).strip(),
+        checkpoint=ctx.history[-1],
+    )
+    ctx.history.extend(appended)
 
     ctx.emit_event(
         AgentEvent(
@@ -202,6 +255,164 @@ async def perform_compaction_turn_and_rebuild_history(
     return artifact_path
 
 
+async def perform_compaction_turn_and_rebuild_history(
+    *,
+    backend: ChatBackend,
+    executor_model: str,
+    ctx: RunContext,
+    task: str,
+    reason: str,
+    turn_id: str,
+) -> str:
+    """执行一次 compaction turn，并用摘要重建 history（返回 artifact_path）。"""
+    summary_full = await generate_compaction_summary(
+        backend=backend,
+        executor_model=executor_model,
+        ctx=ctx,
+        task=task,
+        reason=reason,
+        turn_id=turn_id,
+    )
+    return apply_compaction_summary(ctx=ctx, summary_full=summary_full, reason=reason, turn_id=turn_id)
+
+
+class ProactiveCompactor:
+    """
+    主动（proactive）上下文预算：在请求发出前按模型窗口预估 prompt token，越过阈值时先压缩。
+
+    规则：
+    - 仅当 `ctx.context_window_tokens` 配置时启用；阈值 = 窗口 × `ctx.proactive_compaction_ratio`；
+    - `before_request`：若有后台摘要则等待并应用；否则 prompt 估算越过阈值时内联执行 compaction；
+    - `start_background`：按上一轮 prompt 增量线性外推，预计下一轮越过阈值时，在 tool 执行期间
+      用 history 快照后台生成摘要；应用时快照之后追加的消息（tool call/result）原样保留；
+    - 受 `max_compactions_per_run` 约束；未启用或无 token 估算时完全不介入（仍由 context_length_exceeded 兜底）。
+    """
+
+    def __init__(self, *, executor_model: str, task: str) -> None:
+        """创建 compactor（每个 run 一个实例）。"""
+
+        self._executor_model = executor_model
+        self._task = task
+        self._last_prompt_tokens: Optional[int] = None
+        self._growth = 0
+        self._pending: Optional["asyncio.Task[str]"] = None
+        self._pending_len = 0
+        self._pending_last: Optional[Dict[str, Any]] = None
+
+    @staticmethod
+    def threshold(ctx: RunContext) -> Optional[int]:
+        """返回触发压缩的 prompt token 阈值（未启用时为 None）。"""
+
+        if ctx.context_window_tokens is None:
+            return None
+        return max(1, int(ctx.context_window_tokens * ctx.proactive_compaction_ratio))
+
+    @staticmethod
+    def _budget_left(ctx: RunContext) -> bool:
+        """是否仍允许本 run 再做一次 compaction。"""
+
+        return ctx.max_compactions_per_run <= 0 or ctx.compactions_performed < ctx.max_compactions_per_run
+
+    def _payload(self, ctx: RunContext, prompt_tokens: int) -> Dict[str, Any]:
+        """compaction_started 的附加字段。"""
+
+        return {"prompt_tokens": int(prompt_tokens), "context_window_tokens": ctx.context_window_tokens}
+
+    async def before_request(self, *, ctx: RunContext, backend: ChatBackend, turn_id: str, prompt_tokens: int) -> bool:
+        """
+        请求发出前的预算检查；返回 True 表示 history 已重建（调用方需重新组装 messages）。
+        """
+
+        if self._pending is not None:
+            if await self._apply_pending(ctx=ctx, turn_id=turn_id):
+                return True
+        threshold = self.threshold(ctx)
+        if threshold is None or prompt_tokens < threshold or not ctx.history or not self._budget_left(ctx):
+            return False
+        summary_full = await generate_compaction_summary(
+            backend=backend,
+            executor_model=self._executor_model,
+            ctx=ctx,
+            task=self._task,
+            reason="proactive",
+            turn_id=turn_id,
+            payload_extra=self._payload(ctx, prompt_tokens),
+        )
+        apply_compaction_summary(ctx=ctx, summary_full=summary_full, reason="proactive", turn_id=turn_id)
+        self._last_prompt_tokens = None
+        return True
+
+    def record_request(self, prompt_tokens: int) -> None:
+        """记录实际发出的 prompt token 估算，用于外推下一轮的增长。"""
+
+        if self._last_prompt_tokens is not None:
+            self._growth = max(0, int(prompt_tokens) - self._last_prompt_tokens)
+        self._last_prompt_tokens = int(prompt_tokens)
+
+    def start_background(self, *, ctx: RunContext, backend: ChatBackend, turn_id: str) -> bool:
+        """预计下一轮越过阈值时启动后台摘要（与 tool 执行重叠）；返回是否已启动。"""
+
+        threshold = self.threshold(ctx)
+        if (
+            threshold is None
+            or not ctx.background_compaction
+            or self._pending is not None
+            or self._last_prompt_tokens is None
+            or not ctx.history
+            or not self._budget_left(ctx)
+        ):
+            return False
+        if self._last_prompt_tokens + self._growth < threshold:
+            return False
+        snapshot = list(ctx.history)
+        self._pending_len = len(snapshot)
+        self._pending_last = snapshot[-1]
+        self._pending = asyncio.ensure_future(
+            generate_compaction_summary(
+                backend=backend,
+                executor_model=self._executor_model,
+                ctx=ctx,
+                task=self._task,
+                reason="proactive_background",
+                turn_id=turn_id,
+                history=snapshot,
+                payload_extra=self._payload(ctx, self._last_prompt_tokens + self._growth),
+            )
+        )
+        return True
+
+    async def _apply_pending(self, *, ctx: RunContext, turn_id: str) -> bool:
+        """等待后台摘要并应用；快照前缀已被替换（或生成失败）时丢弃摘要，返回 False。"""
+
+        task, self._pending = self._pending, None
+        if task is None:
+            return False
+        try:
+            summary_full = await task
+        except ValueError:
+            # max compactions 已用尽（启动后被其它压缩占用）：放弃本次后台摘要。
+            return False
+        upto = self._pending_len
+        if len(ctx.history) < upto or ctx.history[upto - 1] is not self._pending_last:
+            return False
+        apply_compaction_summary(
+            ctx=ctx, summary_full=summary_full, reason="proactive_background", turn_id=turn_id, upto=upto
+        )
+        self._last_prompt_tokens = None
+        return True
+
+    def cancel(self) -> None:
+        """取消未完成的后台摘要（run 结束时调用）。"""
+
+        task, self._pending = self._pending, None
+        if task is None:
+            return
+        if not task.done():
+            task.cancel()
+        elif not task.cancelled():
+            task.exception()  # 标记异常已读取，避免 "exception was never retrieved" 告警
+
+
 async def handle_context_length_exceeded(
     *,
     exc: BaseException,
@@ -385,4 +596,11 @@ async def handle_context_length_exceeded(
     raise exc
 
 
-__all__ = ["ask_human_context_recovery_choice", "perform_compaction_turn_and_rebuild_history", "handle_context_length_exceeded"]
+__all__ = [
+    "apply_compaction_summary",
+    "ask_human_context_recovery_choice",
+    "generate_compaction_summary",
+    "handle_context_length_exceeded",
+    "perform_compaction_turn_and_rebuild_history",
+    "ProactiveCompactor",
+]
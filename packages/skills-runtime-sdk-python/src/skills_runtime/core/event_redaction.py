@@ -9,6 +9,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Any, Dict, Sequence
 
 from skills_runtime.core.approval_sanitizers import _sanitize_approval_request
+from skills_runtime.core.secret_redactor import SecretRedactor, get_secret_redactor
 
 if TYPE_CHECKING:  # pragma: no cover
     from skills_runtime.skills.manager import SkillsManager
@@ -19,29 +20,21 @@ def _redact_event_data(data: Any, *, redaction_values: Sequence[str] = ()) -> An
     递归脱敏事件数据（best-effort）。
 
     规则：
-    - 字符串中出现已知 secret 值时替换为 `<redacted>`；
+    - 字符串中出现已知 secret 值时替换为 `<redacted>`（共享的编译脱敏器，单遍扫描）；
     - `env` 字段仅保留 `env_keys`；
     - 保留原有结构，避免影响可观测性。
     """
 
-    def _redact_str(text: str) -> str:
-        """将字符串中的已知 secret 值替换为 `<redacted>`（best-effort）。"""
-        if not text:
-            return text
-        out = text
-        for v in redaction_values:
-            if not isinstance(v, str):
-                continue
-            vv = v.strip()
-            if len(vv) < 4:
-                continue
-            out = out.replace(vv, "<redacted>")
-        return out
+    return _redact_with(data, get_secret_redactor(redaction_values))
+
+
+def _redact_with(data: Any, redactor: SecretRedactor) -> Any:
+    """`_redact_event_data` 的递归主体（脱敏器只构建/查找一次）。"""
 
     if isinstance(data, str):
-        return _redact_str(data)
+        return redactor.redact(data)
     if isinstance(data, list):
-        return [_redact_event_data(x, redaction_values=redaction_values) for x in data]
+        return [_redact_with(x, redactor) for x in data]
     if isinstance(data, dict):
         out: Dict[str, Any] = {}
         for k, v in data.items():
@@ -49,7 +42,7 @@ def _redact_event_data(data: Any, *, redaction_values: Sequence[str] = ()) -> An
             if key == "env" and isinstance(v, dict):
                 out["env_keys"] = sorted(str(kk) for kk in v.keys())
                 continue
-            out[key] = _redact_event_data(v, redaction_values=redaction_values)
+            out[key] = _redact_with(v, redactor)
         return out
     return data
 
@@ -20,9 +20,10 @@ import os
 import pty
 import select
 import subprocess
+import threading
 import time
 import signal
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Mapping, Optional, Protocol, runtime_checkable
 
@@ -38,6 +39,8 @@ class ExecSession:
     proc: subprocess.Popen[bytes]
     master_fd: int
     created_at_ms: int
+    # 会话级 I/O 锁：串行化同一 session 的 write/poll 与 fd 回收；不同 session 之间互不阻塞。
+    io_lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
 
 
 @dataclass
@@ -58,6 +61,8 @@ class ExecSessionManager:
     说明：
     - 本实现面向 macOS/Linux（不考虑 Windows）。
     - PTY 输出为 stdout/stderr 合流（stderr 为空），与大多数交互式 CLI 预期一致。
+    - 线程安全：会话表只在 spawn/close/查找时短暂加锁；`write` 的等待输出阶段只持有该 session 的 `io_lock`，
+      因此不同 session 的读写可并行（例如 runtime server 同时服务多个 agent 的轮询）。
     """
 
     def __init__(self) -> None:
@@ -66,9 +71,11 @@ class ExecSessionManager:
 
         说明：
         - session_id 在单进程内自增生成；
-        - session 仅保存在内存中（不落盘）。
+        - session 仅保存在内存中（不落盘）；
+        - `_lock` 只保护会话表（`_next_id/_sessions`），不在持有期间做阻塞 I/O。
         """
 
+        self._lock = threading.Lock()
         self._next_id = 1
         self._sessions: dict[int, ExecSession] = {}
 
@@ -123,16 +130,30 @@ class ExecSessionManager:
             raise
         os.close(slave_fd)
 
-        sid = self._next_id
-        self._next_id += 1
-        session = ExecSession(session_id=sid, proc=proc, master_fd=master_fd, created_at_ms=int(time.time() * 1000))
-        self._sessions[sid] = session
+        with self._lock:
+            sid = self._next_id
+            self._next_id += 1
+            session = ExecSession(session_id=sid, proc=proc, master_fd=master_fd, created_at_ms=int(time.time() * 1000))
+            self._sessions[sid] = session
         return session
 
     def has(self, session_id: int) -> bool:
         """判断 session 是否存在（仍由本 manager 持有）。"""
 
-        return int(session_id) in self._sessions
+        with self._lock:
+            return int(session_id) in self._sessions
+
+    def session_ids(self) -> list[int]:
+        """返回当前持有的 session id 快照（升序）。"""
+
+        with self._lock:
+            return sorted(self._sessions.keys())
+
+    def _get(self, sid: int) -> Optional[ExecSession]:
+        """在会话表锁内查找 session；不存在返回 None。"""
+
+        with self._lock:
+            return self._sessions.get(sid)
 
     def write(
         self,
@@ -150,10 +171,14 @@ class ExecSessionManager:
         - chars：要写入的字符串（utf-8）；为空表示仅轮询输出
         - yield_time_ms：等待输出的时间（毫秒）
         - max_output_bytes：本次读取的最大字节数（尾部截断）
+
+        说明：
+        - 仅持有该 session 的 `io_lock`（同一 session 的并发调用按到达顺序串行，不影响其它 session）。
         """
 
         sid = int(session_id)
-        if sid not in self._sessions:
+        session = self._get(sid)
+        if session is None:
             raise KeyError("session not found")
 
         if yield_time_ms < 0:
@@ -161,7 +186,22 @@ class ExecSessionManager:
         if max_output_bytes < 0:
             raise ValueError("max_output_bytes must be >= 0")
 
-        session = self._sessions[sid]
+        with session.io_lock:
+            # 等锁期间可能已被 close/退出回收（fd 已关闭），此时视为不存在。
+            if self._get(sid) is not session:
+                raise KeyError("session not found")
+            return self._write_locked(session, chars=chars, yield_time_ms=yield_time_ms, max_output_bytes=max_output_bytes)
+
+    def _write_locked(
+        self,
+        session: ExecSession,
+        *,
+        chars: str,
+        yield_time_ms: int,
+        max_output_bytes: int,
+    ) -> ExecSessionWriteResult:
+        """`write` 的主体（调用方已持有 `session.io_lock`）。"""
+
         proc = session.proc
         master_fd = session.master_fd
 
@@ -212,7 +252,7 @@ class ExecSessionManager:
         running = proc.poll() is None
         if not running:
             exit_code = proc.returncode
-            self._cleanup_session(sid)
+            self._cleanup_session_locked(session)
 
         return ExecSessionWriteResult(
             stdout=out_text,
@@ -223,12 +263,18 @@ class ExecSessionManager:
         )
 
     def close(self, session_id: int) -> None:
-        """关闭 session（best-effort：terminate 进程并清理资源）。"""
+        """
+        关闭 session（best-effort：terminate 进程并清理资源）。
+
+        说明：
+        - 先终止进程（不持锁）：正在等待输出的 `write` 会因 EOF/EIO 提前返回并释放 `io_lock`；
+        - 再持有 `io_lock` 回收 fd，避免关闭仍被其它线程 select/read 的 fd。
+        """
 
         sid = int(session_id)
-        if sid not in self._sessions:
+        session = self._get(sid)
+        if session is None:
             return
-        session = self._sessions[sid]
         # 进程是新的 session leader（start_new_session=True），优先按进程组终止，避免子孙进程残留。
         pid = int(getattr(session.proc, "pid", 0) or 0)
         try:
@@ -254,25 +300,27 @@ class ExecSessionManager:
                 pass
         except OSError:
             pass
-        self._cleanup_session(sid)
+        with session.io_lock:
+            self._cleanup_session_locked(session)
 
     def close_all(self) -> None:
         """关闭所有 session（用于 run 结束清理）。"""
 
-        for sid in list(self._sessions.keys()):
+        for sid in self.session_ids():
             self.close(sid)
 
-    def _cleanup_session(self, sid: int) -> None:
+    def _cleanup_session_locked(self, session: ExecSession) -> None:
         """
-        清理 session 资源（关闭 master fd 并从内存移除）。
+        清理 session 资源（从会话表移除并关闭 master fd；调用方已持有 `session.io_lock`）。
 
-        参数：
-        - sid：session id
+        说明：
+        - 只有仍登记在表中的同一对象才会关闭 fd，保证幂等（close 与进程自然退出并发时不会重复 close）。
         """
 
-        session = self._sessions.pop(sid, None)
-        if session is None:
-            return
+        with self._lock:
+            if self._sessions.get(session.session_id) is not session:
+                return
+            del self._sessions[session.session_id]
         try:
             os.close(session.master_fd)
         except OSError:
@@ -393,14 +441,22 @@ class PersistentExecSessionManager:
 
     def has(self, session_id: int) -> bool:
         """
-        判断 session 是否存在（最小实现：尝试一次 0ms 的 write 轮询）。
+        判断 session 是否存在（`exec.has` 只读探测）。
 
         注意：
         - 该方法为 best-effort，主要用于清理/健康检查；
-        - 对于正常工作流，推荐直接调用 `write()` 并处理 KeyError。
+        - 对于正常工作流，推荐直接调用 `write()` 并处理 KeyError；
+        - 旧版 server 不支持 `exec.has` 时退回 0ms `exec.write` 探测。
         """
 
-        # Phase 1：不暴露 list/has；写入时由 server 抛 KeyError 即可。
+        try:
+            data = self._client.call(method="exec.has", params={"session_id": int(session_id)})
+            return bool(data.get("exists"))
+        except RuntimeError as e:
+            if "unknown method" not in str(e):
+                return False
+        except (OSError, ConnectionError):
+            return False
         try:
             _ = self._client.call(method="exec.write", params={"session_id": int(session_id), "chars": "", "yield_time_ms": 0})
             return True
@@ -12,23 +12,39 @@ Executor（命令/脚本/文件系统执行引擎）。
 - 为避免子进程 stdout/stderr 输出过大导致内存膨胀，本实现采用“尾部截断”策略：
   - 单独限制 stdout/stderr 的最大字节数（保留尾部）
   - 再对 combined bytes 施加上限（优先保留 stderr，其次 stdout）
+- 等待与读取（POSIX）：单个 selector 同时监听 stdout/stderr 管道与 pidfd（Linux），
+  进程退出与输出到达都是事件驱动的，不再为每条命令创建读线程，也不再固定间隔轮询；
+  没有 pidfd 的平台在管道仍打开时以 `_EXIT_POLL_S` 间隔检查退出；
+  `cancel_checker` 是回调形式，仅在设置时按 `_CANCEL_POLL_S` 间隔检查（不影响命令完成的延迟）。
+- Windows 管道不支持 select：沿用后台读线程 + `proc.wait` 轮询。
+- 实时输出：可选 `on_output(stream, chunk)` 回调在读到输出时被调用（stream 为 "stdout"/"stderr"）；
+  进程运行期间无输出时以 `_OUTPUT_TICK_S` 间隔发送空 chunk 心跳（stream 为空字符串），
+  供调用方按时间刷新其缓冲。回调异常 fail-open，不影响命令执行与结果截断。
 """
 
 from __future__ import annotations
 
 import logging
 import os
+import selectors
 import signal
 import subprocess
 import threading
 import time
 from pathlib import Path
-from typing import Callable, Mapping, Optional
+from typing import Callable, Mapping, Optional, Tuple
 
 from pydantic import BaseModel, ConfigDict, Field
 
 logger = logging.getLogger(__name__)
 
+_READ_CHUNK_BYTES = 64 * 1024
+_CANCEL_POLL_S = 0.05
+_EXIT_POLL_S = 0.05
+_OUTPUT_TICK_S = 0.25
+
+OutputCallback = Callable[[str, bytes], None]
+
 
 class CommandResult(BaseModel):
     """
@@ -99,6 +115,30 @@ class _TailRingBuffer:
         return bytes(self._buf)
 
 
+def _open_pidfd(pid: int) -> Optional[int]:
+    """打开进程的 pidfd（Linux 5.3+，Python 3.9+）；不支持时返回 None。"""
+
+    pidfd_open = getattr(os, "pidfd_open", None)
+    if pidfd_open is None:
+        return None
+    try:
+        return int(pidfd_open(pid))
+    except OSError:
+        return None
+
+
+def _notify_output(on_output: Optional[OutputCallback], stream: str, chunk: bytes) -> None:
+    """调用 on_output（异常时 fail-open）。"""
+
+    if on_output is None:
+        return
+    try:
+        on_output(stream, chunk)
+    except Exception:
+        # 防御性兜底：on_output 由外部注入，可能抛出任意异常；不影响命令执行。
+        logger.debug("on_output raised an exception; ignoring and continuing", exc_info=True)
+
+
 def _decode_bytes(data: bytes) -> str:
     """将字节解码为 UTF-8 文本；非法字节替换为 U+FFFD。"""
 
@@ -152,6 +192,7 @@ class Executor:
         env: Optional[Mapping[str, str]] = None,
         timeout_ms: int = 60_000,
         cancel_checker: Optional[Callable[[], bool]] = None,
+        on_output: Optional[OutputCallback] = None,
     ) -> CommandResult:
         """
         执行 argv 命令并捕获结果。
@@ -161,6 +202,7 @@ class Executor:
         - cwd：工作目录（必须存在且为目录）
         - env：追加/覆盖的环境变量（会覆盖 os.environ 同名项）
         - timeout_ms：超时毫秒数；超时后会尝试 SIGTERM→SIGKILL
+        - on_output：可选；运行期间收到输出时回调 `(stream, chunk)`（见模块说明；不影响返回结果的截断）
 
         返回：
         - `CommandResult`：包含 stdout/stderr/exit_code/timeout/truncated 等结构化字段
@@ -211,21 +253,6 @@ class Executor:
         stdout_buf = _TailRingBuffer(self._max_stdout_bytes)
         stderr_buf = _TailRingBuffer(self._max_stderr_bytes)
 
-        def _drain_stream(stream: Optional[object], buf: _TailRingBuffer) -> None:
-            """持续读取子进程 stdout/stderr 并写入尾部缓冲（用于后台线程）。"""
-
-            if stream is None:
-                return
-            # `Popen.stdout/stderr` 是 `io.BufferedReader`；使用 read() 分块读取即可。
-            while True:
-                try:
-                    chunk = stream.read(4096)  # type: ignore[attr-defined]
-                except (OSError, ValueError):
-                    return
-                if not chunk:
-                    return
-                buf.append(chunk)
-
         popen_kwargs: dict = {
             "cwd": str(cwd_path),
             "env": merged_env,
@@ -268,62 +295,36 @@ class Executor:
                 error_kind="unknown",
             )
 
-        t_out = threading.Thread(target=_drain_stream, args=(proc.stdout, stdout_buf), daemon=True)
-        t_err = threading.Thread(target=_drain_stream, args=(proc.stderr, stderr_buf), daemon=True)
-        t_out.start()
-        t_err.start()
-
-        reader_deadline = start + (timeout_ms / 1000.0) + (self._terminate_grace_ms / 1000.0)
-
-        timeout = False
-        cancelled = False
+        deadline = start + (timeout_ms / 1000.0)
+        reader_deadline = deadline + (self._terminate_grace_ms / 1000.0)
         try:
-            # 为支持“硬取消”，采用短超时轮询：
-            # - 超时：按原逻辑 terminate
-            # - cancel_checker：若返回 true，terminate 并标记 cancelled
-            deadline = time.monotonic() + (timeout_ms / 1000.0)
-            while True:
-                if cancel_checker is not None:
-                    try:
-                        if cancel_checker():
-                            cancelled = True
-                            self._terminate_process(proc)
-                            break
-                    except Exception:
-                        # 防御性兜底：cancel_checker 由外部注入，可能抛出任意异常；fail-open 不中断执行器。
-                        logger.debug("cancel_checker raised an exception; ignoring and continuing", exc_info=True)
-
-                remaining = deadline - time.monotonic()
-                if remaining <= 0:
-                    timeout = True
-                    self._terminate_process(proc)
-                    break
-                try:
-                    proc.wait(timeout=min(0.05, remaining))
-                    break
-                except subprocess.TimeoutExpired:
-                    continue
-        except subprocess.TimeoutExpired:
-            timeout = True
-            self._terminate_process(proc)
+            if os.name == "nt":
+                timeout, cancelled = self._wait_with_threads(
+                    proc,
+                    stdout_buf=stdout_buf,
+                    stderr_buf=stderr_buf,
+                    deadline=deadline,
+                    reader_deadline=reader_deadline,
+                    cancel_checker=cancel_checker,
+                    on_output=on_output,
+                )
+            else:
+                timeout, cancelled = self._wait_with_selector(
+                    proc,
+                    stdout_buf=stdout_buf,
+                    stderr_buf=stderr_buf,
+                    deadline=deadline,
+                    reader_deadline=reader_deadline,
+                    cancel_checker=cancel_checker,
+                    on_output=on_output,
+                )
         finally:
-            try:
-                if proc.stdout:
-                    proc.stdout.close()
-            except OSError:
-                pass
-            try:
-                if proc.stderr:
-                    proc.stderr.close()
-            except OSError:
-                pass
-            # reader thread 可能因平台/管道边界条件阻塞：确保 join 不会超过 timeout + grace。
-            remaining = max(0.0, reader_deadline - time.monotonic())
-            if remaining > 0:
-                t_out.join(timeout=remaining)
-                remaining = max(0.0, reader_deadline - time.monotonic())
-                if remaining > 0:
-                    t_err.join(timeout=remaining)
+            for stream in (proc.stdout, proc.stderr):
+                try:
+                    if stream:
+                        stream.close()
+                except OSError:
+                    pass
 
         duration_ms = int((time.monotonic() - start) * 1000)
         exit_code: Optional[int] = None if (timeout or cancelled) else proc.returncode
@@ -380,6 +381,193 @@ class Executor:
             error_kind=error_kind,
         )
 
+    @staticmethod
+    def _should_cancel(cancel_checker: Optional[Callable[[], bool]]) -> bool:
+        """调用 cancel_checker（异常时 fail-open 返回 False）。"""
+
+        if cancel_checker is None:
+            return False
+        try:
+            return bool(cancel_checker())
+        except Exception:
+            # 防御性兜底：cancel_checker 由外部注入，可能抛出任意异常；fail-open 不中断执行器。
+            logger.debug("cancel_checker raised an exception; ignoring and continuing", exc_info=True)
+            return False
+
+    def _wait_with_selector(
+        self,
+        proc: subprocess.Popen[bytes],
+        *,
+        stdout_buf: _TailRingBuffer,
+        stderr_buf: _TailRingBuffer,
+        deadline: float,
+        reader_deadline: float,
+        cancel_checker: Optional[Callable[[], bool]],
+        on_output: Optional[OutputCallback] = None,
+    ) -> tuple[bool, bool]:
+        """
+        POSIX：单个 selector 读取 stdout/stderr 并等待进程退出（pidfd 可用时退出也是事件）。
+
+        说明：
+        - 进程退出（或被终止）后继续读到管道 EOF，但不超过 reader_deadline（timeout + grace），
+          避免后台孙进程持有管道导致无限等待；
+        - 返回 (timeout, cancelled)。
+        """
+
+        sel = selectors.DefaultSelector()
+        pidfd: Optional[int] = None
+        open_streams = 0
+        timeout = False
+        cancelled = False
+        exited = False
+        try:
+            streams: Tuple[Tuple[object, _TailRingBuffer, str], ...] = (
+                (proc.stdout, stdout_buf, "stdout"),
+                (proc.stderr, stderr_buf, "stderr"),
+            )
+            for stream, buf, name in streams:
+                if stream is None:
+                    continue
+                fd = stream.fileno()  # type: ignore[attr-defined]
+                os.set_blocking(fd, False)
+                sel.register(fd, selectors.EVENT_READ, (buf, name))
+                open_streams += 1
+            pidfd = _open_pidfd(proc.pid)
+            if pidfd is not None:
+                sel.register(pidfd, selectors.EVENT_READ, None)
+
+            while True:
+                if not exited:
+                    if self._should_cancel(cancel_checker):
+                        cancelled = True
+                    elif time.monotonic() >= deadline:
+                        timeout = True
+                    if cancelled or timeout:
+                        self._terminate_process(proc)
+                        exited = True
+                        if pidfd is not None:
+                            sel.unregister(pidfd)
+                if exited and open_streams == 0:
+                    break
+
+                now = time.monotonic()
+                wait = (reader_deadline if exited else deadline) - now
+                if exited and wait <= 0:
+                    break
+                if not exited:
+                    if cancel_checker is not None:
+                        wait = min(wait, _CANCEL_POLL_S)
+                    if on_output is not None:
+                        wait = min(wait, _OUTPUT_TICK_S)
+                    if pidfd is None:
+                        wait = min(wait, _EXIT_POLL_S)
+                    if open_streams == 0 and pidfd is None:
+                        # 无 pidfd 且管道已全部关闭：只能阻塞等待退出。
+                        try:
+                            proc.wait(timeout=max(0.0, wait))
+                            exited = True
+                        except subprocess.TimeoutExpired:
+                            pass
+                        continue
+
+                events = sel.select(max(0.0, wait))
+                if not events and not exited:
+                    _notify_output(on_output, "", b"")
+                for key, _mask in events:
+                    if key.data is None:
+                        sel.unregister(key.fd)
+                        proc.wait()
+                        exited = True
+                        continue
+                    try:
+                        chunk = os.read(key.fd, _READ_CHUNK_BYTES)
+                    except BlockingIOError:
+                        continue
+                    except OSError:
+                        chunk = b""
+                    if not chunk:
+                        sel.unregister(key.fd)
+                        open_streams -= 1
+                        continue
+                    buf, name = key.data
+                    buf.append(chunk)
+                    _notify_output(on_output, name, chunk)
+
+                if not exited and pidfd is None and proc.poll() is not None:
+                    exited = True
+        finally:
+            sel.close()
+            if pidfd is not None:
+                os.close(pidfd)
+        return timeout, cancelled
+
+    def _wait_with_threads(
+        self,
+        proc: subprocess.Popen[bytes],
+        *,
+        stdout_buf: _TailRingBuffer,
+        stderr_buf: _TailRingBuffer,
+        deadline: float,
+        reader_deadline: float,
+        cancel_checker: Optional[Callable[[], bool]],
+        on_output: Optional[OutputCallback] = None,
+    ) -> tuple[bool, bool]:
+        """
+        Windows：后台线程读取 stdout/stderr，主线程以短超时轮询退出/取消/超时。
+
+        返回：(timeout, cancelled)。
+        """
+
+        def _drain_stream(stream: Optional[object], buf: _TailRingBuffer, name: str) -> None:
+            """持续读取子进程 stdout/stderr 并写入尾部缓冲（用于后台线程）。"""
+
+            if stream is None:
+                return
+            # `Popen.stdout/stderr` 是 `io.BufferedReader`；使用 read() 分块读取即可。
+            while True:
+                try:
+                    chunk = stream.read(4096)  # type: ignore[attr-defined]
+                except (OSError, ValueError):
+                    return
+                if not chunk:
+                    return
+                buf.append(chunk)
+                _notify_output(on_output, name, chunk)
+
+        t_out = threading.Thread(target=_drain_stream, args=(proc.stdout, stdout_buf, "stdout"), daemon=True)
+        t_err = threading.Thread(target=_drain_stream, args=(proc.stderr, stderr_buf, "stderr"), daemon=True)
+        t_out.start()
+        t_err.start()
+
+        timeout = False
+        cancelled = False
+        try:
+            while True:
+                if self._should_cancel(cancel_checker):
+                    cancelled = True
+                    self._terminate_process(proc)
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    timeout = True
+                    self._terminate_process(proc)
+                    break
+                try:
+                    proc.wait(timeout=min(0.05, remaining))
+                    break
+                except subprocess.TimeoutExpired:
+                    _notify_output(on_output, "", b"")
+                    continue
+        finally:
+            # reader thread 可能因平台/管道边界条件阻塞：确保 join 不会超过 timeout + grace。
+            remaining = max(0.0, reader_deadline - time.monotonic())
+            if remaining > 0:
+                t_out.join(timeout=remaining)
+                remaining = max(0.0, reader_deadline - time.monotonic())
+                if remaining > 0:
+                    t_err.join(timeout=remaining)
+        return timeout, cancelled
+
     def run_shell(
         self,
         command: str,
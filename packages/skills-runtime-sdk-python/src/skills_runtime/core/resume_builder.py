@@ -14,6 +14,7 @@ import logging
 from typing import Any, Dict, List, Optional, Set
 
 from skills_runtime.core.contracts import AgentEvent
+from skills_runtime.state.jsonl_wal import JsonlWal
 from skills_runtime.state.wal_protocol import WalBackend
 
 logger = logging.getLogger(__name__)
@@ -21,7 +22,12 @@ logger = logging.getLogger(__name__)
 
 @dataclass(frozen=True)
 class ResumeInfo:
-    """Resume 计算结果：包含 WAL 事件统计与可选的 replay/summary 产物。"""
+    """
+    Resume 计算结果：包含 WAL 事件统计与可选的 replay/summary 产物。
+
+    说明：
+    - summary 策略下若走了索引尾部快速路径，`existing_events_all` 仅包含尾部窗口。
+    """
     existing_events_all: List[AgentEvent]
     existing_events_count: int
     existing_events_tail: List[AgentEvent]
@@ -33,11 +39,46 @@ class ResumeInfo:
     resume_summary: Optional[str]
 
 
-def _load_existing_run_events(*, wal: WalBackend, run_id: str) -> tuple[List[AgentEvent], int, List[AgentEvent]]:
-    """从 WAL 读取指定 run_id 的历史事件，并返回全量/计数/尾部窗口。"""
+_RESUME_TAIL_EVENTS = 200
+
+
+def _load_tail_via_offset_index(*, wal: JsonlWal, run_id: str) -> Optional[tuple[int, List[AgentEvent]]]:
+    """
+    借助 JsonlWal 的 sidecar 行偏移索引只读取尾部窗口（summary resume 快速路径）。
+
+    返回：
+    - `(count, tail)`；索引无法证明整个 WAL 都是本 run 的合法事件（`uniform_run_id`），
+      或尾部存在非本 run 事件/不可解析行时（计数可能不准），返回 None 由调用方全量扫描。
+    """
+
+    if wal.uniform_run_id() != run_id:
+        return None
+    count = wal.event_count()
+    start = max(0, count - _RESUME_TAIL_EVENTS)
+    tail = list(wal.iter_events(start_index=start))
+    if len(tail) != count - start or any(ev.run_id != run_id for ev in tail):
+        return None
+    return count, tail
+
+
+def _load_existing_run_events(
+    *, wal: WalBackend, run_id: str, tail_only: bool = False
+) -> tuple[List[AgentEvent], int, List[AgentEvent]]:
+    """
+    从 WAL 读取指定 run_id 的历史事件，并返回全量/计数/尾部窗口。
+
+    说明：
+    - `tail_only=True` 且 WAL 为带索引的 `JsonlWal` 时，只 seek 读取尾部窗口；
+      此时返回的“全量”即尾部窗口（仅 replay 需要真正的全量事件）。
+    """
+    if tail_only and isinstance(wal, JsonlWal) and wal.offset_index:
+        fast = _load_tail_via_offset_index(wal=wal, run_id=run_id)
+        if fast is not None:
+            count, tail = fast
+            return tail, count, tail
     existing_events_all = list(wal.iter_events(run_id=run_id))
     existing_events_count = len(existing_events_all)
-    existing_events_tail: List[AgentEvent] = list(deque(existing_events_all, maxlen=200))
+    existing_events_tail: List[AgentEvent] = list(deque(existing_events_all, maxlen=_RESUME_TAIL_EVENTS))
     return existing_events_all, existing_events_count, existing_events_tail
 
 
@@ -122,7 +163,10 @@ def prepare_resume(
     resume_strategy: str,
 ) -> ResumeInfo:
     """根据 WAL 与 resume_strategy 生成 ResumeInfo（replay 或 summary）。"""
-    existing_events_all, existing_events_count, existing_events_tail = _load_existing_run_events(wal=wal, run_id=run_id)
+    needs_full_replay = initial_history is None and resume_strategy == "replay"
+    existing_events_all, existing_events_count, existing_events_tail = _load_existing_run_events(
+        wal=wal, run_id=run_id, tail_only=not needs_full_replay
+    )
 
     resume_replay_history: Optional[List[Dict[str, Any]]] = None
     resume_replay_denied: Dict[str, int] = {}
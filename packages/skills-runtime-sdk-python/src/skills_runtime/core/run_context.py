@@ -14,6 +14,7 @@ from typing import Any, Dict, List, Optional
 
 from skills_runtime.core.contracts import AgentEvent
 from skills_runtime.core.utils import now_rfc3339
+from skills_runtime.prompts.compaction import RollingSummary
 from skills_runtime.state.wal_emitter import WalEmitter
 from skills_runtime.state.wal_protocol import WalBackend
 
@@ -39,6 +40,8 @@ class RunContext:
 
     compactions_performed: int = 0
     compaction_artifacts: List[str] = field(default_factory=list)
+    # 滚动摘要：后续 compaction 只摘要检查点之后的新增消息并与上一份摘要合并
+    rolling_summary: RollingSummary = field(default_factory=RollingSummary)
     terminal_notices: List[Dict[str, Any]] = field(default_factory=list)
 
     max_steps: int = 100
@@ -50,6 +53,13 @@ class RunContext:
     compaction_keep_last_messages: int = 10
     increase_budget_extra_steps: int = 50
     increase_budget_extra_wall_time_sec: int = 300
+    # proactive compaction（context_window_tokens=None 表示关闭）
+    context_window_tokens: Optional[int] = None
+    proactive_compaction_ratio: float = 0.8
+    background_compaction: bool = True
+    # text delta 合并窗口（0 表示逐 token 发出 `llm_response_delta`）
+    text_delta_coalesce_ms: int = 0
+    text_delta_coalesce_max_chars: int = 256
 
     def emit_event(self, ev: AgentEvent) -> None:
         """统一事件出口：WAL append（如启用）→ hooks → stream（保持顺序一致）。"""
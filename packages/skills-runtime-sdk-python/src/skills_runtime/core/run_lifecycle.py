@@ -134,13 +134,22 @@ class RunBootstrap:
             wal = injected_wal
             wal_locator = f"{wal.locator()}#run_id={resolved_run_id}"
         else:
-            wal = JsonlWal(wal_jsonl_path)
+            wal_cfg = self._config.run.wal
+            wal = JsonlWal(
+                wal_jsonl_path,
+                group_commit=bool(wal_cfg.group_commit),
+                group_commit_max_events=int(wal_cfg.group_commit_max_events),
+                group_commit_max_bytes=int(wal_cfg.group_commit_max_bytes),
+                group_commit_max_delay_ms=int(wal_cfg.group_commit_max_delay_ms),
+                offset_index=bool(wal_cfg.offset_index),
+            )
             wal_locator = str(wal_jsonl_path)
 
         wal_emitter = WalEmitter(wal=wal, stream=emit, hooks=list(self._event_hooks))
         max_steps = int(self._config.run.max_steps)
         max_wall_time_sec = self._config.run.max_wall_time_sec
         cr = self._config.run.context_recovery
+        dc = self._config.run.delta_coalescing
         ctx = RunContext(
             run_id=resolved_run_id,
             run_dir=run_dir,
@@ -159,6 +168,11 @@ class RunBootstrap:
             compaction_keep_last_messages=int(cr.compaction_keep_last_messages),
             increase_budget_extra_steps=int(cr.increase_budget_extra_steps),
             increase_budget_extra_wall_time_sec=int(cr.increase_budget_extra_wall_time_sec),
+            context_window_tokens=int(cr.context_window_tokens) if cr.context_window_tokens is not None else None,
+            proactive_compaction_ratio=float(cr.proactive_compaction_ratio),
+            background_compaction=bool(cr.background_compaction),
+            text_delta_coalesce_ms=int(dc.max_delay_ms) if dc.enabled else 0,
+            text_delta_coalesce_max_chars=int(dc.max_chars),
         )
 
         resume_strategy = str(self._config.run.resume_strategy)
@@ -259,7 +273,13 @@ class RunBootstrap:
         custom_tool_names = set(spec.name for spec, _handler, _override in self._extra_tools)
         registered_tool_names = set(spec.name for spec in registry.list_specs())
 
-        dispatcher = ToolDispatcher(registry=registry, now_rfc3339=now_rfc3339)
+        tool_dispatch_cfg = self._config.run.tool_dispatch
+        dispatcher = ToolDispatcher(
+            registry=registry,
+            now_rfc3339=now_rfc3339,
+            max_parallel=tool_dispatch_cfg.max_parallel,
+            unknown_per_tool=tool_dispatch_cfg.unknown_per_tool,
+        )
         safety_gate = SafetyGate(
             safety_config=self._safety,
             get_descriptor=registry.get_descriptor,
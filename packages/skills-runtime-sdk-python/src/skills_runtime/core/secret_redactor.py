@@ -0,0 +1,145 @@
+"""
+已知 secret 值的脱敏器（编译一次，单遍扫描）。
+
+背景：
+- tool 输出、tool 结果、事件/WAL 参数都需要把 env_store 中的 secret 值替换为 `<redacted>`；
+- 逐个 secret 调用 `str.replace` 的代价是“输出大小 × secret 数量”，大输出 + 大量 secret 时明显变慢。
+
+本模块把全部 secret 编译为一个交替正则（长的优先），每个字符串只扫描一遍；
+脱敏器按“规范化后的 secret 集合”缓存，env_store 不变时 registry / streaming bridge / WAL 路径共享同一实例。
+
+规范化规则（与历史行为一致）：
+- 只处理 str；先 strip；长度 < 4 的值忽略（避免误伤常见短串）。
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+import json
+import re
+from typing import Any, Iterable, Optional, Pattern, Tuple
+
+REDACTED = "<redacted>"
+_MIN_SECRET_LEN = 4
+
+
+class SecretRedactor:
+    """
+    编译好的多模式 secret 脱敏器（不可变，可跨线程共享）。
+
+    说明：
+    - `redact` 对文本做单遍替换；
+    - `redact_obj` 递归处理 dict/list 中的字符串；
+    - `redact_json_text` 面向 JSON 文本：无命中时原样返回（不做 loads/dumps），命中时按结构脱敏。
+    """
+
+    __slots__ = ("_secrets", "_pattern", "_probe")
+
+    def __init__(self, secrets: Tuple[str, ...]) -> None:
+        """用规范化后的 secret 元组构建（一般通过 `get_secret_redactor` 获取缓存实例）。"""
+
+        self._secrets = secrets
+        self._pattern: Optional[Pattern[str]] = _compile(secrets)
+        # JSON 文本中 secret 可能以转义形式出现（例如含引号/反斜杠/非 ASCII），探测时一并匹配。
+        variants = set(secrets)
+        for s in secrets:
+            variants.add(json.dumps(s, ensure_ascii=False)[1:-1])
+            variants.add(json.dumps(s)[1:-1])
+        self._probe: Optional[Pattern[str]] = self._pattern if variants == set(secrets) else _compile(tuple(variants))
+
+    @property
+    def enabled(self) -> bool:
+        """是否存在需要脱敏的 secret。"""
+
+        return self._pattern is not None
+
+    @property
+    def max_secret_len(self) -> int:
+        """最长 secret 的字符数（流式脱敏时用于保留跨块边界的尾部）；无 secret 时为 0。"""
+
+        return max((len(x) for x in self._secrets), default=0)
+
+    def redact(self, text: str) -> str:
+        """把文本中出现的已知 secret 替换为 `<redacted>`（单遍扫描）。"""
+
+        if not text or self._pattern is None:
+            return text
+        return self._pattern.sub(REDACTED, text)
+
+    def redact_obj(self, obj: Any) -> Any:
+        """递归脱敏对象结构中的字符串（dict/list 返回新对象，其它类型原样返回）。"""
+
+        if self._pattern is None:
+            return obj
+        if isinstance(obj, str):
+            return self.redact(obj)
+        if isinstance(obj, list):
+            return [self.redact_obj(x) for x in obj]
+        if isinstance(obj, dict):
+            return {k: self.redact_obj(v) for k, v in obj.items()}
+        return obj
+
+    def redact_json_text(self, content: str) -> str:
+        """
+        脱敏可能是 JSON 的文本。
+
+        规则：
+        - 未命中任何 secret（含其 JSON 转义形式）：原样返回；
+        - 命中且为 JSON object/array：解析后按结构脱敏再序列化（避免替换破坏转义）；
+        - 其它情况：按普通文本脱敏。
+        """
+
+        if not content or self._probe is None or self._probe.search(content) is None:
+            return content
+        try:
+            obj = json.loads(content)
+        except json.JSONDecodeError:
+            return self.redact(content)
+        if isinstance(obj, (dict, list)):
+            return json.dumps(self.redact_obj(obj), ensure_ascii=False)
+        return self.redact(content)
+
+
+def _compile(secrets: Tuple[str, ...]) -> Optional[Pattern[str]]:
+    """把 secret 集合编译为交替正则（长的优先，保证重叠时替换最长匹配）。"""
+
+    if not secrets:
+        return None
+    ordered = sorted(secrets, key=lambda s: (-len(s), s))
+    return re.compile("|".join(re.escape(s) for s in ordered))
+
+
+def normalize_secrets(values: Optional[Iterable[Any]]) -> Tuple[str, ...]:
+    """按历史规则规范化 secret 值：只取 str、strip、丢弃长度 < 4 的值，去重后排序。"""
+
+    out = set()
+    for v in values or ():
+        if not isinstance(v, str):
+            continue
+        vv = v.strip()
+        if len(vv) >= _MIN_SECRET_LEN:
+            out.add(vv)
+    return tuple(sorted(out))
+
+
+@lru_cache(maxsize=16)
+def _cached_redactor(secrets: Tuple[str, ...]) -> SecretRedactor:
+    """按规范化 secret 集合缓存编译结果。"""
+
+    return SecretRedactor(secrets)
+
+
+def get_secret_redactor(values: Optional[Iterable[Any]]) -> SecretRedactor:
+    """
+    获取（缓存的）脱敏器。
+
+    参数：
+    - values：secret 候选值（通常是 `env_store.values()`）
+
+    说明：env_store 未变化时返回同一实例；变化后自动编译新实例（旧实例由 LRU 淘汰）。
+    """
+
+    return _cached_redactor(normalize_secrets(values))
+
+
+__all__ = ["REDACTED", "SecretRedactor", "get_secret_redactor", "normalize_secrets"]
@@ -6,12 +6,15 @@ StreamingBridge：承接 AgentLoop 中单轮 LLM streaming 的并发/清理逻
   从 `agent_loop.AgentLoop._run_stream_async` 中拆出；
 - 对主 loop 输出显式 `StreamOutcome`，避免再靠多层 `try/finally` 与隐式 return
   传播终态语义。
+- 可选 text delta 合并（coalescing）：按时间/字符阈值把逐 token 的 `text_delta` 合并为一条
+  `llm_response_delta`，减少 WAL/hooks/stream 的逐事件开销；阈值来自 `RunContext`。
 """
 
 from __future__ import annotations
 
 import asyncio
 import contextlib
+import time
 from dataclasses import dataclass
 from typing import Any, Dict, List, Literal, Optional
 
@@ -51,7 +54,10 @@ class StreamingBridge:
     说明：
     - 负责消费 backend async iterator，并把底层 provider 事件归一化成 SDK 事件；
     - 负责处理 cancel/budget watcher 与 backend task 生命周期；
-    - 不直接发出 terminal event，由上层主 loop 依据 `StreamOutcome` 统一决定。
+    - 不直接发出 terminal event，由上层主 loop 依据 `StreamOutcome` 统一决定；
+    - `ctx.text_delta_coalesce_ms > 0` 时合并 text delta：缓冲达到 `text_delta_coalesce_max_chars`
+      或首段缓冲已等待 `text_delta_coalesce_ms` 即发出；tool_calls/usage/终态之前必先发出缓冲，
+      因此事件顺序与拼接后的文本均与逐 token 模式一致。
     """
 
     def __init__(
@@ -96,6 +102,37 @@ class StreamingBridge:
         pending_tool_calls: List[ToolCall] = []
         usage_payload: Optional[Dict[str, Any]] = None
 
+        coalesce_sec = max(0, int(getattr(self._ctx, "text_delta_coalesce_ms", 0) or 0)) / 1000.0
+        coalesce_max_chars = max(1, int(getattr(self._ctx, "text_delta_coalesce_max_chars", 1) or 1))
+        pending_text: List[str] = []
+        pending_chars = 0
+        pending_deadline: Optional[float] = None
+
+        def _emit_text_delta(text: str) -> None:
+            """发出一条 text 类型的 `llm_response_delta`。"""
+
+            self._ctx.emit_event(
+                AgentEvent(
+                    type="llm_response_delta",
+                    timestamp=now_rfc3339(),
+                    run_id=self._ctx.run_id,
+                    turn_id=self._turn_id,
+                    payload={"delta_type": "text", "text": text},
+                )
+            )
+
+        def _flush_text() -> None:
+            """发出已合并的 text 缓冲（无缓冲时 no-op）。"""
+
+            nonlocal pending_text, pending_chars, pending_deadline
+            if not pending_text:
+                return
+            text = "".join(pending_text)
+            pending_text = []
+            pending_chars = 0
+            pending_deadline = None
+            _emit_text_delta(text)
+
         agen = backend.stream_chat(request)
         q_backend: "asyncio.Queue[Any]" = asyncio.Queue()
         stop_event: asyncio.Event = asyncio.Event()
@@ -133,8 +170,12 @@ class StreamingBridge:
             while True:
                 get_future = asyncio.create_task(q_backend.get())
                 stop_future = asyncio.create_task(stop_event.wait())
+                wait_timeout: Optional[float] = None
+                if pending_deadline is not None:
+                    wait_timeout = max(0.0, pending_deadline - time.monotonic())
                 done, pending = await asyncio.wait(
                     {get_future, stop_future},
+                    timeout=wait_timeout,
                     return_when=asyncio.FIRST_COMPLETED,
                 )
                 for future in pending:
@@ -142,7 +183,13 @@ class StreamingBridge:
                     with contextlib.suppress(BaseException):
                         await future
 
+                if not done:
+                    # 合并窗口到期且期间没有新 delta：发出缓冲，保持流式低延迟。
+                    _flush_text()
+                    continue
+
                 if stop_future in done:
+                    _flush_text()
                     if not get_future.done():
                         get_future.cancel()
                         with contextlib.suppress(BaseException):
@@ -165,6 +212,7 @@ class StreamingBridge:
                 if item is None:
                     break
                 if isinstance(item, BaseException):
+                    _flush_text()
                     return StreamOutcome(
                         assistant_text=assistant_text,
                         pending_tool_calls=list(pending_tool_calls),
@@ -178,17 +226,18 @@ class StreamingBridge:
                 if event_type == "text_delta":
                     text = getattr(ev, "text", "") or ""
                     assistant_text += text
-                    self._ctx.emit_event(
-                        AgentEvent(
-                            type="llm_response_delta",
-                            timestamp=now_rfc3339(),
-                            run_id=self._ctx.run_id,
-                            turn_id=self._turn_id,
-                            payload={"delta_type": "text", "text": text},
-                        )
-                    )
+                    if coalesce_sec <= 0:
+                        _emit_text_delta(text)
+                        continue
+                    pending_text.append(text)
+                    pending_chars += len(text)
+                    if pending_deadline is None:
+                        pending_deadline = time.monotonic() + coalesce_sec
+                    if pending_chars >= coalesce_max_chars or time.monotonic() >= pending_deadline:
+                        _flush_text()
                     continue
 
+                _flush_text()
                 if event_type == "tool_calls":
                     calls = getattr(ev, "tool_calls", None) or []
                     pending_tool_calls.extend(calls)
@@ -232,6 +281,7 @@ class StreamingBridge:
                         )
                     break
 
+            _flush_text()
             return StreamOutcome(
                 assistant_text=assistant_text,
                 pending_tool_calls=list(pending_tool_calls),
@@ -5,7 +5,7 @@
 - arguments JSON 解析校验（fail-closed）
 - safety gate policy（allow/deny/ask）
 - approvals flow（含 session cache 与 loop guard）
-- tool dispatch 与 history 回注（Fix 5：两阶段 approval 串行 + dispatch asyncio.gather）
+- tool dispatch 与 history 回注（Fix 5：两阶段 approval 串行 + 批量并发 dispatch）
 """
 
 from __future__ import annotations
@@ -45,9 +45,9 @@ async def process_pending_tool_calls(
     Fix 5：两阶段实现：
     - Phase 1（串行）：validation + safety gate + approvals → 收集 approved_batch
       denied/invalid 结果直接写入 history（顺序保持）。
-    - Phase 2（asyncio.gather）：批量派发 approved_batch。
-      同步 handler 在单线程 event loop 中仍为顺序执行；
-      当 handler 变为 async 时，gather 自动获得并发语义。
+    - Phase 2（并发）：`ToolDispatcher.dispatch_batch` 批量派发 approved_batch。
+      同步 handler 在有界线程池中执行、async handler 直接 await，并发度按 ToolSpec.idempotency 分级；
+      WAL 事件顺序仍按原始 call 顺序确定（见 `tools/dispatcher.py`）。
     - Phase 3：把 approved 结果按原始 call 顺序写入 history。
     """
     if not pending_tool_calls:
@@ -294,31 +294,20 @@ async def process_pending_tool_calls(
         # 通过所有检查：加入 approved_batch 等待 Phase 2 派发
         approved_batch.append((call, step_id))
 
-    # ── Phase 2：asyncio.gather 并发派发 approved_batch ──────────────────────
-    # 同步 handler 在单线程 event loop 中顺序执行（无 await 点不切换）；
-    # 当 handler 升级为 async 时，gather 自动提供并发语义。
+    # ── Phase 2：批量并发派发 approved_batch ────────────────────────────────
+    # 同步 handler 卸载到线程池（不阻塞 event loop），async handler 直接 await；
+    # 一轮耗时约等于最慢的调用，tool_call_* 事件仍按原始 call 顺序落盘。
     if not approved_batch:
         return True
 
-    async def _dispatch_one_async(call: ToolCall, step_id: str) -> ToolResult:
-        """
-        单个 tool call 的异步派发包装（为未来 async handler 铺路）。
-
-        关键约束：
-        - 每个 dispatch 必须拥有独立的 pending_tool_events 容器；
-        - 且该容器必须同时作为本次 registry.dispatch 的 event_sink；
-        - 否则一个 dispatch 的 clear/flush 会污染同批次其它 dispatch，或导致工具旁路事件丢失。
-        """
-        local_pending_tool_events: List[AgentEvent] = []
-        return dispatcher.dispatch_one(
-            inputs=ToolDispatchInputs(call=call, run_id=ctx.run_id, turn_id=turn_id, step_id=step_id),
-            pending_tool_events=local_pending_tool_events,
-            emit_event=ctx.emit_event,
-            emit_stream=ctx.wal_emitter.stream_only,
-        )
-
-    dispatch_results: List[ToolResult] = list(
-        await asyncio.gather(*[_dispatch_one_async(call, step_id) for call, step_id in approved_batch])
+    dispatch_results: List[ToolResult] = await dispatcher.dispatch_batch(
+        batch=[
+            ToolDispatchInputs(call=call, run_id=ctx.run_id, turn_id=turn_id, step_id=step_id)
+            for call, step_id in approved_batch
+        ],
+        emit_event=ctx.emit_event,
+        emit_stream=ctx.wal_emitter.stream_only,
+        emit_wal=ctx.wal_emitter.append,
     )
 
     # ── Phase 3：按原始 call 顺序写入 history ────────────────────────────────
@@ -14,7 +14,7 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Literal, Optional
 
-from skills_runtime.core.context_recovery import handle_context_length_exceeded
+from skills_runtime.core.context_recovery import ProactiveCompactor, handle_context_length_exceeded
 from skills_runtime.core.contracts import AgentEvent
 from skills_runtime.core.errors import FrameworkError, UserError
 from skills_runtime.core.loop_controller import LoopController
@@ -93,6 +93,7 @@ class TurnOrchestrator:
         self._ensure_skill_env_vars = ensure_skill_env_vars
         self._bridge_factory = bridge_factory
         self._handle_context_length_exceeded = handle_context_length_exceeded_fn
+        self._compactor = ProactiveCompactor(executor_model=self._executor_model, task=self._task)
 
     async def run_turn(
         self,
@@ -110,6 +111,8 @@ class TurnOrchestrator:
         职责：
         - resolve/inject skills
         - build prompt messages
+        - proactive context budgeting（按模型窗口预估 token，必要时先压缩再重组 messages）
+        - emit `prompt_compiled`（prompt debug 摘要，含稳定前缀缓存命中）
         - emit `llm_request_started`
         - 调用 `StreamingBridge`
         - 处理 context recovery 与 turn 级分流
@@ -174,15 +177,27 @@ class TurnOrchestrator:
             )
         else:
             provider_tools = list(tools)
-        messages, _prompt_debug = self._prompt_manager.build_messages(
-            task=self._task,
-            cwd=str(self._workspace_root),
-            tools=provider_tools,
-            skills_manager=self._skills_manager,
-            injected_skills=injected,
-            history=ctx.history,
-            user_input=None,
-        )
+        messages, prompt_debug = self._build_messages(ctx=ctx, provider_tools=provider_tools, injected=injected)
+        prompt_tokens = prompt_debug.get("prompt_tokens") if isinstance(prompt_debug, dict) else None
+        if isinstance(prompt_tokens, int):
+            if await self._compactor.before_request(
+                ctx=ctx, backend=backend, turn_id=turn_id, prompt_tokens=prompt_tokens
+            ):
+                messages, prompt_debug = self._build_messages(ctx=ctx, provider_tools=provider_tools, injected=injected)
+                prompt_tokens = prompt_debug.get("prompt_tokens")
+            if isinstance(prompt_tokens, int):
+                self._compactor.record_request(prompt_tokens)
+        if isinstance(prompt_debug, dict):
+            # debug 摘要不含密钥（profile/模板版本/计数/前缀缓存命中情况）。
+            ctx.emit_event(
+                AgentEvent(
+                    type="prompt_compiled",
+                    timestamp=now_rfc3339(),
+                    run_id=self._run_id,
+                    turn_id=turn_id,
+                    payload=dict(prompt_debug),
+                )
+            )
         ctx.emit_event(
             AgentEvent(
                 type="llm_request_started",
@@ -268,6 +283,29 @@ class TurnOrchestrator:
             pending_tool_calls=[],
         )
 
+    def start_background_compaction(self, *, ctx: RunContext, backend: ChatBackend, turn_id: str) -> bool:
+        """在执行本轮 tool calls 前调用：预计下一轮越过窗口阈值时后台生成摘要（与 tool 执行重叠）。"""
+
+        return self._compactor.start_background(ctx=ctx, backend=backend, turn_id=turn_id)
+
+    def cancel_background_compaction(self) -> None:
+        """run 结束时取消未完成的后台摘要。"""
+
+        self._compactor.cancel()
+
+    def _build_messages(self, *, ctx: RunContext, provider_tools: List[Any], injected: List[Any]) -> tuple[List[Dict[str, Any]], Any]:
+        """按当前 history 组装本轮 messages（proactive compaction 后需重组）。"""
+
+        return self._prompt_manager.build_messages(
+            task=self._task,
+            cwd=str(self._workspace_root),
+            tools=provider_tools,
+            skills_manager=self._skills_manager,
+            injected_skills=injected,
+            history=ctx.history,
+            user_input=None,
+        )
+
     async def _maybe_await(self, value: Any) -> Any:
         """兼容 sync/async 回调，必要时等待结果。"""
 
@@ -3,6 +3,14 @@ OpenAI-compatible `/v1/chat/completions` backend（Phase 2）。
 
 对齐规格：
 - `docs/specs/skills-runtime-sdk/docs/llm-backend.md`
+
+连接管理：
+- backend 持有长生命周期、带连接池的 `httpx.AsyncClient`（每个 event loop 一个），
+  多次请求/重试/并发 agent 共享 keep-alive 连接，避免每轮重复 TCP/TLS 握手；
+- 池参数来自 `llm.http`（连接上限、keep-alive 过期、可选 HTTP/2）；
+- client 的生命周期不超过其 loop：`asyncio.run` 收尾取消剩余任务时随之关闭并解除登记
+  （因此 `run_stream_sync` 等每次新建 loop 的用法不会累积连接池）；
+- 调用方在不再使用 backend 时应 `await backend.aclose()`（或 `async with backend:`）。
 """
 
 from __future__ import annotations
@@ -10,7 +18,9 @@ from __future__ import annotations
 import asyncio
 import os
 import random
-from typing import Any, AsyncIterator, Dict, List, Optional
+import threading
+import weakref
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 import httpx
 
@@ -19,6 +29,9 @@ from skills_runtime.llm.chat_sse import ChatCompletionsSseParser, ChatStreamEven
 from skills_runtime.llm.protocol import ChatRequest
 from skills_runtime.tools.protocol import ToolSpec, tool_spec_to_openai_tool
 
+# 每个 event loop 的 (client, keeper task)。
+_ClientEntry = Tuple[httpx.AsyncClient, "asyncio.Task[None]"]
+
 
 class OpenAIChatCompletionsBackend:
     """
@@ -26,6 +39,9 @@ class OpenAIChatCompletionsBackend:
 
     说明：
     - Phase 2 优先保证 SSE 解析与 tool_calls 拼接口径一致；网络重试/backoff 在 Phase 3 完善。
+    - `httpx.AsyncClient` 绑定其创建时的 event loop，因此按 loop 缓存：同一 loop 内所有请求与重试
+      复用同一个连接池；不同线程/不同 `asyncio.run` 各自持有独立 client；
+    - 每个 client 配一个常驻 keeper 任务，loop 收尾取消它时关闭 client（见 `_close_with_loop`）。
     """
 
     def __init__(self, cfg: AgentSdkLlmConfig, *, api_key: Optional[str] = None) -> None:
@@ -39,6 +55,101 @@ class OpenAIChatCompletionsBackend:
 
         self._cfg = cfg
         self._api_key_override = api_key
+        self._clients_lock = threading.Lock()
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _ClientEntry]" = weakref.WeakKeyDictionary()
+
+    def _new_client(self) -> httpx.AsyncClient:
+        """
+        按 `llm.http` 创建带连接池的 `httpx.AsyncClient`。
+
+        异常：
+        - `http2=true` 但未安装 `h2` 时抛 `ValueError`（配置错误，fail-fast）。
+        """
+
+        http_cfg = getattr(self._cfg, "http", None)
+        limits = httpx.Limits(
+            max_connections=int(getattr(http_cfg, "max_connections", 100)),
+            max_keepalive_connections=int(getattr(http_cfg, "max_keepalive_connections", 20)),
+            keepalive_expiry=float(getattr(http_cfg, "keepalive_expiry_sec", 30.0)),
+        )
+        http2 = bool(getattr(http_cfg, "http2", False))
+        try:
+            return httpx.AsyncClient(timeout=httpx.Timeout(self._cfg.timeout_sec), limits=limits, http2=http2)
+        except ImportError as exc:
+            raise ValueError(
+                "llm.http.http2=true requires the optional 'h2' package (pip install 'skills-runtime-sdk[http2]')."
+            ) from exc
+
+    def _client(self) -> httpx.AsyncClient:
+        """返回当前 event loop 的共享 client（不存在或已关闭时创建）。"""
+
+        loop = asyncio.get_running_loop()
+        with self._clients_lock:
+            entry = self._clients.get(loop)
+            if entry is not None and not bool(getattr(entry[0], "is_closed", False)):
+                return entry[0]
+            client = self._new_client()
+            keeper = loop.create_task(self._close_with_loop(loop, client), name="openai-chat-client-keeper")
+            self._clients[loop] = (client, keeper)
+        if entry is not None:
+            entry[1].cancel()
+        return client
+
+    async def _close_with_loop(self, loop: asyncio.AbstractEventLoop, client: httpx.AsyncClient) -> None:
+        """
+        常驻到被取消为止，然后关闭 client 并解除登记。
+
+        说明：
+        - `asyncio.run` 收尾时会取消并等待剩余任务，因此 client 在其 loop 关闭前被 `aclose()`；
+          否则 client 的 transport 持有 loop 引用，WeakKeyDictionary 条目永远不会被回收。
+        """
+
+        try:
+            await loop.create_future()
+        finally:
+            with self._clients_lock:
+                entry = self._clients.get(loop)
+                if entry is not None and entry[0] is client:
+                    del self._clients[loop]
+            await client.aclose()
+
+    async def aclose(self) -> None:
+        """
+        关闭 backend 持有的连接池。
+
+        说明：
+        - 当前 event loop 的 client 会被 `aclose()`；绑定其它仍在运行的 loop 的 client 由其 keeper 任务
+          在所属 loop 中关闭；
+        - 关闭后 backend 仍可继续使用：下次请求会按需重建 client。
+        """
+
+        try:
+            loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        with self._clients_lock:
+            current = self._clients.pop(loop, None) if loop is not None else None
+            others = [(owner, keeper) for owner, (_client, keeper) in self._clients.items()]
+            self._clients.clear()
+        for owner, keeper in others:
+            try:
+                owner.call_soon_threadsafe(keeper.cancel)
+            except RuntimeError:
+                pass  # loop 已关闭：其 keeper 已在收尾时关闭过 client
+        if current is not None:
+            client, keeper = current
+            keeper.cancel()
+            await client.aclose()
+
+    async def __aenter__(self) -> "OpenAIChatCompletionsBackend":
+        """异步上下文管理器入口：返回 self。"""
+
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:  # type: ignore[no-untyped-def]
+        """异步上下文管理器退出：关闭连接池。"""
+
+        await self.aclose()
 
     def _endpoint(self) -> str:
         """返回 `/v1/chat/completions` 的完整 URL（基于 cfg.base_url 拼接）。"""
@@ -182,7 +293,6 @@ class OpenAIChatCompletionsBackend:
             await asyncio.sleep(delay)
             return float(delay)
 
-        timeout = httpx.Timeout(self._cfg.timeout_sec)
         headers = {"Content-Type": "application/json"}
         headers.update(self._auth_header())
         payload_without_stream_options = dict(payload)
@@ -194,28 +304,28 @@ class OpenAIChatCompletionsBackend:
         usage_fallback_available = injected_stream_options
         while True:
             try:
-                async with httpx.AsyncClient(timeout=timeout) as client:
-                    parser = ChatCompletionsSseParser()
-                    async with client.stream("POST", self._endpoint(), json=current_payload, headers=headers) as resp:
-                        # 重要：streaming 模式下若直接 raise_for_status，HTTPStatusError 里的 response
-                        # 往往没有缓存 body，导致上层无法解析 OpenAI 风格 {"error":{"message":...}}。
-                        # 这里在非 2xx 时先读取响应 body（错误 JSON），再抛异常，保证可观测性。
-                        if resp.status_code >= 400:
-                            try:
-                                await resp.aread()
-                            except httpx.HTTPError:
-                                pass
-                        resp.raise_for_status()
-                        async for line in resp.aiter_lines():
-                            if not line or not line.startswith("data:"):
-                                continue
-                            data = line[len("data:") :].strip()
-                            for ev in parser.feed_data(data):
-                                emitted_any = True
-                                yield ev
-                        for ev in parser.finish():
+                client = self._client()
+                parser = ChatCompletionsSseParser()
+                async with client.stream("POST", self._endpoint(), json=current_payload, headers=headers) as resp:
+                    # 重要：streaming 模式下若直接 raise_for_status，HTTPStatusError 里的 response
+                    # 往往没有缓存 body，导致上层无法解析 OpenAI 风格 {"error":{"message":...}}。
+                    # 这里在非 2xx 时先读取响应 body（错误 JSON），再抛异常，保证可观测性。
+                    if resp.status_code >= 400:
+                        try:
+                            await resp.aread()
+                        except httpx.HTTPError:
+                            pass
+                    resp.raise_for_status()
+                    async for line in resp.aiter_lines():
+                        if not line or not line.startswith("data:"):
+                            continue
+                        data = line[len("data:") :].strip()
+                        for ev in parser.feed_data(data):
                             emitted_any = True
                             yield ev
+                    for ev in parser.finish():
+                        emitted_any = True
+                        yield ev
                 return
             except httpx.HTTPStatusError as exc:
                 status = exc.response.status_code
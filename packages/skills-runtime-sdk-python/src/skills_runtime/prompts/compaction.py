@@ -3,13 +3,16 @@ Compaction prompts（/compact）与对话历史压缩辅助函数。
 
 目标：
 - 为内部生产提供可复用、可回归的“上下文压缩/交接摘要（handoff summary）”能力；
-- 默认使用中文提示词，强调不泄露 secrets 与给出可继续执行的结构化信息。
+- 默认使用中文提示词，强调不泄露 secrets 与给出可继续执行的结构化信息；
+- 滚动摘要（`RollingSummary`）：后续压缩只摘要上次检查点之后新增的消息，并与上一份摘要合并，
+  每次压缩的输入规模与 run 长度无关。
 """
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 import json
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 
 COMPACTION_SYSTEM_PROMPT_ZH = """你是一个“对话压缩器（Conversation Compactor）”。
@@ -42,6 +45,30 @@ COMPACTION_USER_PROMPT_TEMPLATE_ZH = """请根据下面的“任务描述”和
 再次提醒：不要泄露 secrets；遇到疑似敏感值用 <redacted>。"""
 
 
+COMPACTION_MERGE_PROMPT_TEMPLATE_ZH = """请把“上一份摘要”与其后“新增对话节选”合并，生成一份更新后的 handoff 摘要。
+
+任务描述：
+{task}
+
+上一份摘要（已覆盖此前的全部对话）：
+{previous_summary}
+
+新增对话节选（上一份摘要之后发生；可能不完整，请以可见内容为准）：
+{transcript}
+
+要求：
+- 保留上一份摘要中仍然有效的信息，用新增内容更新进展、状态与下一步；已过时的内容删除或标注；
+- 输出格式与上一份摘要一致（Markdown）：
+1) 目标/范围（Goal/Scope）
+2) 已完成进展（Progress）
+3) 关键决策与理由（Key Decisions）
+4) 当前状态/阻塞点（Current State / Blockers）
+5) 下一步建议（Next Steps）
+6) 风险与注意事项（Risks / Notes）
+
+再次提醒：不要泄露 secrets；遇到疑似敏感值用 <redacted>。"""
+
+
 SUMMARY_PREFIX_TEMPLATE_ZH = """[对话压缩摘要｜handoff]
 说明：这是一次上下文压缩生成的摘要，用于继续推进任务；可能遗漏细节。
 """
@@ -137,18 +164,70 @@ def format_history_for_compaction(
     return _clip_text_middle(transcript, max_chars=int(max_chars))
 
 
-def build_compaction_messages(*, task: str, transcript: str) -> List[Dict[str, Any]]:
+def build_compaction_messages(
+    *,
+    task: str,
+    transcript: str,
+    previous_summary: Optional[str] = None,
+) -> List[Dict[str, Any]]:
     """
     构造 compaction turn 的 chat.completions messages（tools 禁用）。
 
     参数：
     - task：当前 run 的任务描述
     - transcript：格式化后的对话节选文本
+    - previous_summary：上一份滚动摘要；提供时 transcript 只含其后的新增消息，提示词改为“合并更新”
     """
 
-    user = COMPACTION_USER_PROMPT_TEMPLATE_ZH.format(task=str(task or "").strip(), transcript=str(transcript or "").strip())
+    if previous_summary:
+        user = COMPACTION_MERGE_PROMPT_TEMPLATE_ZH.format(
+            task=str(task or "").strip(),
+            previous_summary=str(previous_summary).strip(),
+            transcript=str(transcript or "").strip(),
+        )
+    else:
+        user = COMPACTION_USER_PROMPT_TEMPLATE_ZH.format(
+            task=str(task or "").strip(), transcript=str(transcript or "").strip()
+        )
     return [
         {"role": "system", "content": COMPACTION_SYSTEM_PROMPT_ZH.strip()},
         {"role": "user", "content": user.strip()},
     ]
 
+
+
+@dataclass
+class RollingSummary:
+    """
+    滚动摘要存储（每个 run 一份，挂在 `RunContext` 上）。
+
+    字段：
+    - summary：最近一次压缩得到的摘要正文（已去掉 `SUMMARY_PREFIX_TEMPLATE_ZH` 前缀，调用方注入 history 时自行加前缀）；
+      空串表示尚未压缩
+    - checkpoint：history 中已被该摘要覆盖的最后一条 message（按对象身份定位）
+    """
+
+    summary: str = ""
+    checkpoint: Optional[Dict[str, Any]] = None
+
+    def pending_messages(self, history: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        返回 `(待摘要消息, 上一份摘要)`。
+
+        规则：
+        - 检查点仍在 history 中：只返回其后的新增消息，并返回上一份摘要用于合并；
+        - 尚无摘要或检查点已不在 history 中（例如 history 被外部替换）：回退为整段 history 全量摘要。
+        """
+
+        checkpoint = self.checkpoint
+        if self.summary and checkpoint is not None:
+            for i in range(len(history) - 1, -1, -1):
+                if history[i] is checkpoint:
+                    return history[i + 1 :], self.summary
+        return history, None
+
+    def update(self, *, summary: str, checkpoint: Optional[Dict[str, Any]]) -> None:
+        """记录新的摘要（不含前缀的正文）与检查点。"""
+
+        self.summary = summary
+        self.checkpoint = checkpoint
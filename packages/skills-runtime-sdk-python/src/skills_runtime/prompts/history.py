@@ -3,11 +3,25 @@
 
 对齐规格：
 - `docs/specs/skills-runtime-sdk/docs/prompt-manager.md` §3.1
+
+预算维度：
+- `max_messages`：条数上限；
+- `max_chars`：字符上限（content + tool_calls 的 name/arguments）；
+- `max_tokens`：token 上限（可选；按 `prompts.tokens` 的估算器计数，含 per-message 开销）。
+
+增量计数：
+- `HistoryLedger` 按 message 对象身份缓存每条的字符数/token 数，并维护前缀和；
+  history 只追加时每 turn 只计数新增 message，裁剪起点用二分查找得到（无 O(n²) 的头部 pop）。
 """
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Tuple
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
+
+from skills_runtime.prompts.tokens import TokenEstimator, heuristic_token_count, message_text, message_tokens
+
+_Signature = Tuple[int, int]
 
 
 def _message_char_len(msg: Dict[str, Any]) -> int:
@@ -15,17 +29,86 @@ def _message_char_len(msg: Dict[str, Any]) -> int:
     估算单条 message 的“字符长度”。
 
     说明：
-    - Phase 2 不做 token 精确计数（避免引入额外 tokenizer 依赖）；
-    - 对非字符串 content 回退到 `str(content)` 的长度估算。
+    - 计入 content 与 `tool_calls` 的 function name/arguments（assistant tool call 消息通常 content 为空）；
+    - 对非字符串 content 回退到 JSON 序列化后的长度估算。
     """
 
-    # Phase 2：粗粒度按字符串长度估算（不做 token 精确计数）
+    return len(message_text(msg))
+
+
+def _signature(msg: Dict[str, Any]) -> _Signature:
+    """message 的廉价变更签名（content 长度/对象 + tool_calls 条数），用于发现原地修改。"""
+
     content = msg.get("content")
-    if content is None:
-        return 0
-    if isinstance(content, str):
-        return len(content)
-    return len(str(content))
+    content_sig = len(content) if isinstance(content, str) else id(content)
+    tool_calls = msg.get("tool_calls")
+    return content_sig, len(tool_calls) if isinstance(tool_calls, list) else -1
+
+
+class HistoryLedger:
+    """
+    history 的增量计数账本（PromptManager 持有，跨 turn 复用）。
+
+    说明：
+    - 按对象身份（`is`）比对已记账的前缀；首个不一致处之后的条目重新计数；
+    - 保留 message 的强引用，避免对象被回收后 `id` 复用导致误命中；
+    - 只服务于单个 history 列表的演进（追加/压缩后重建），不做跨列表共享。
+    """
+
+    def __init__(self, estimator: TokenEstimator = heuristic_token_count) -> None:
+        """创建空账本并绑定 token 估算器。"""
+
+        self._estimator = estimator
+        self._refs: List[Dict[str, Any]] = []
+        self._sigs: List[_Signature] = []
+        self._prefix_chars: List[int] = [0]
+        self._prefix_tokens: List[int] = [0]
+
+    def sync(self, history: List[Dict[str, Any]]) -> None:
+        """把账本与当前 history 对齐：保留一致的前缀，重新计数其后的条目。"""
+
+        refs = self._refs
+        common = min(len(refs), len(history))
+        keep = 0
+        while keep < common and history[keep] is refs[keep] and _signature(history[keep]) == self._sigs[keep]:
+            keep += 1
+        if keep < len(refs):
+            del refs[keep:]
+            del self._sigs[keep:]
+            del self._prefix_chars[keep + 1 :]
+            del self._prefix_tokens[keep + 1 :]
+        for msg in history[keep:]:
+            refs.append(msg)
+            self._sigs.append(_signature(msg))
+            self._prefix_chars.append(self._prefix_chars[-1] + _message_char_len(msg))
+            self._prefix_tokens.append(self._prefix_tokens[-1] + message_tokens(msg, self._estimator))
+
+    def window_start(self, *, max_messages: int, max_chars: int, max_tokens: Optional[int] = None) -> int:
+        """
+        返回满足全部预算的最早保留下标（已 sync 的 history；保留 `[start:]`）。
+
+        说明：字符/token 前缀和单调递增，按预算二分查找起点。
+        """
+
+        n = len(self._refs)
+        if max_messages <= 0 or max_chars <= 0 or (max_tokens is not None and max_tokens <= 0):
+            return n
+        start = max(0, n - max_messages)
+        start = bisect_left(self._prefix_chars, self._prefix_chars[n] - max_chars, lo=start, hi=n)
+        if max_tokens is not None:
+            start = bisect_left(self._prefix_tokens, self._prefix_tokens[n] - max_tokens, lo=start, hi=n)
+        return start
+
+    def tokens_between(self, start: int, end: int) -> int:
+        """返回 `[start:end)` 区间 message 的估算 token 总数。"""
+
+        return self._prefix_tokens[end] - self._prefix_tokens[start]
+
+    @property
+    def total_tokens(self) -> int:
+        """已记账 history 的估算 token 总数（running total）。"""
+
+        return self._prefix_tokens[-1]
 
 
 def trim_history(
@@ -33,6 +116,8 @@ def trim_history(
     *,
     max_messages: int,
     max_chars: int,
+    max_tokens: Optional[int] = None,
+    estimator: TokenEstimator = heuristic_token_count,
 ) -> Tuple[List[Dict[str, Any]], int]:
     """
     裁剪对话历史（优先保留最近消息）。
@@ -41,30 +126,24 @@ def trim_history(
     - history：chat messages（list[dict]）
     - max_messages：最多保留条数
     - max_chars：最多保留字符数（粗估）
+    - max_tokens：最多保留 token 数（可选；None 表示不限制）
+    - estimator：token 估算器（默认启发式）
 
     返回：
     - kept：保留的历史（按原顺序）
     - dropped：丢弃条数
     """
 
-    if max_messages < 0 or max_chars < 0:
-        raise ValueError("max_messages/max_chars 必须 >= 0")
+    if max_messages < 0 or max_chars < 0 or (max_tokens is not None and max_tokens < 0):
+        raise ValueError("max_messages/max_chars/max_tokens 必须 >= 0")
 
     if not history:
         return [], 0
 
-    # 先按条数裁剪（保留尾部）
-    kept = history[-max_messages:] if max_messages > 0 else []
-    dropped = len(history) - len(kept)
-
-    # 再按字符数裁剪（从头部丢弃，保留尾部）
-    if max_chars == 0:
-        return [], len(history)
+    ledger = HistoryLedger(estimator)
+    ledger.sync(history)
+    start = ledger.window_start(max_messages=max_messages, max_chars=max_chars, max_tokens=max_tokens)
+    return history[start:], start
 
-    total = sum(_message_char_len(m) for m in kept)
-    while kept and total > max_chars:
-        first = kept.pop(0)
-        total -= _message_char_len(first)
-        dropped += 1
 
-    return kept, dropped
+__all__ = ["HistoryLedger", "trim_history"]
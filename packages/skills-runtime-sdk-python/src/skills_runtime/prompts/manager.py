@@ -7,12 +7,16 @@ PromptManager（模板加载 + 固定注入顺序 + skills list section + histor
 
 from __future__ import annotations
 
+from collections import OrderedDict
 from dataclasses import dataclass
+import json
 from pathlib import Path
 import re
-from typing import Any, Dict, List, Literal, Optional, Sequence, Tuple
+from typing import Any, Dict, FrozenSet, List, Literal, Optional, Sequence, Tuple
 
-from skills_runtime.prompts.history import trim_history
+from skills_runtime.prompts.history import HistoryLedger
+from skills_runtime.prompts.tokens import TokenEstimator, get_token_estimator, heuristic_token_count, message_tokens
+from skills_runtime.skills.body_cache import body_cache_key
 from skills_runtime.skills.mentions import extract_skill_mentions
 from skills_runtime.skills.manager import SkillsManager
 from skills_runtime.skills.models import Skill
@@ -24,6 +28,12 @@ SkillRenderMode = Literal["body", "method_only", "summary", "none"]
 HistoryMode = Literal["none", "compacted", "full"]
 ToolsExposure = Literal["none", "explicit_only", "all"]
 
+_PREFIX_CACHE_MAX = 8
+
+# 工具名按“完整 token”匹配：前后都不能紧邻 `[\w.-]`。仅由这些字符组成的工具名等价于
+# “文本中某个最长 `[\w.-]+` 片段与之完全相同”，可用一次切分 + 集合查找完成。
+_TOOL_TOKEN_RE = re.compile(r"[\w.-]+")
+
 _PROFILE_DEFAULTS: Dict[str, Dict[str, object]] = {
     "default_agent": {
         "include_skills_list": True,
@@ -128,6 +138,60 @@ class PromptTemplates:
         return result
 
 
+@dataclass(frozen=True)
+class _StablePrefix:
+    """
+    一次渲染得到的稳定前缀（跨 turn 复用）。
+
+    字段：
+    - messages：system / skills list / injected skills messages（按固定顺序）
+    - skills_count/listed_count/injected_count：debug 统计（已启用 / skills 列表列出 / 注入）
+    - tokens：前缀的 token 估算
+    """
+
+    messages: Tuple[Dict[str, Any], ...]
+    skills_count: int
+    listed_count: int
+    injected_count: int
+    tokens: int
+
+
+@dataclass(frozen=True)
+class _ToolMatcher:
+    """
+    `tools_exposure=explicit_only` 的工具名匹配器（按工具名集合构建一次，跨 turn 复用）。
+
+    字段：
+    - names：构建时的工具名序列（用于判断工具集合是否变化）
+    - token_names：仅由 `[\\w.-]` 组成的工具名（常见情况），用文本 token 集合做 O(1) 查找
+    - patterns：其余工具名（含 `:`、`/`、空格等）预编译的边界正则
+    """
+
+    names: Tuple[str, ...]
+    token_names: FrozenSet[str]
+    patterns: Tuple[Tuple[str, "re.Pattern[str]"], ...]
+
+    @classmethod
+    def build(cls, names: Sequence[str]) -> "_ToolMatcher":
+        """按工具名集合构建匹配器。"""
+
+        token_names = frozenset(n for n in names if _TOOL_TOKEN_RE.fullmatch(n))
+        patterns = tuple(
+            (n, re.compile(rf"(?<![\w.-]){re.escape(n)}(?![\w.-])"))
+            for n in dict.fromkeys(names)
+            if n and n not in token_names
+        )
+        return cls(names=tuple(names), token_names=token_names, patterns=patterns)
+
+    def match(self, text: str, tokens: FrozenSet[str]) -> FrozenSet[str]:
+        """返回文本中以完整 token 形式出现的工具名集合。"""
+
+        matched = self.token_names & tokens
+        if self.patterns:
+            matched = matched | {n for n, pattern in self.patterns if pattern.search(text)}
+        return matched
+
+
 class PromptManager:
     """
     Prompt 组装器（Phase 2：chat.completions）。
@@ -139,12 +203,16 @@ class PromptManager:
         templates: PromptTemplates,
         profile: PromptProfile = "default_agent",
         include_skills_list: Optional[bool] = None,
+        skills_list_top_k: Optional[int] = None,
         skill_injection_mode: Optional[SkillInjectionMode] = None,
         skill_render: Optional[SkillRenderMode] = None,
         history_mode: Optional[HistoryMode] = None,
         tools_exposure: Optional[ToolsExposure] = None,
         history_max_messages: int = 40,
         history_max_chars: int = 120_000,
+        history_max_tokens: Optional[int] = None,
+        history_tokenizer: str = "auto",
+        token_estimator: Optional[TokenEstimator] = None,
     ) -> None:
         """
         创建 PromptManager 并固定注入策略。
@@ -153,10 +221,15 @@ class PromptManager:
         - `templates`：system/developer 模板来源。
         - `profile`：prompt profile，决定默认注入策略。
         - `include_skills_list`：是否注入可用 skills 列表；`None` 时使用 profile 默认。
+        - `skills_list_top_k`：skills 列表最多列出的条数（按与 task 的相关性取 top-k，另加显式 mention 的 skill）；
+          `None` 表示列出全部已启用 skills。
         - `skill_injection_mode/skill_render`：控制 skill 注入范围和渲染形态。
         - `history_mode`：控制是否注入历史。
         - `tools_exposure`：控制传给 provider 的 tools 范围。
         - `history_max_messages/history_max_chars`：历史滑窗限制（用于控制上下文长度）。
+        - `history_max_tokens`：历史 token 预算（可选；None 表示只按条数/字符裁剪）。
+        - `history_tokenizer`：`auto|heuristic|tiktoken`，仅在设置 `history_max_tokens` 时解析。
+        - `token_estimator`：自定义 token 估算器（优先于 `history_tokenizer`）。
         """
 
         profile_value = _coerce_choice(
@@ -170,6 +243,9 @@ class PromptManager:
         self._include_skills_list = (
             bool(defaults["include_skills_list"]) if include_skills_list is None else bool(include_skills_list)
         )
+        if skills_list_top_k is not None and skills_list_top_k < 1:
+            raise ValueError("skills_list_top_k must be >= 1")
+        self._skills_list_top_k = skills_list_top_k
         self._skill_injection_mode = _coerce_choice(
             str(skill_injection_mode or defaults["skill_injection_mode"]),
             allowed=("all", "explicit_only", "none"),
@@ -192,6 +268,26 @@ class PromptManager:
         )
         self._history_max_messages = history_max_messages
         self._history_max_chars = history_max_chars
+        if history_max_tokens is not None and history_max_tokens < 1:
+            raise ValueError("history_max_tokens must be >= 1")
+        self._history_max_tokens = history_max_tokens
+        if token_estimator is None:
+            token_estimator = (
+                get_token_estimator(history_tokenizer) if history_max_tokens is not None else heuristic_token_count
+            )
+        self._token_estimator = token_estimator
+        # 跨 turn 复用的增量计数账本：history 追加时只计数新增 message。
+        self._history_ledger = HistoryLedger(token_estimator)
+        # tool schema 的 token 估算缓存（按 ToolSpec 对象身份；保留强引用避免 id 复用）
+        self._tool_tokens_cache: Dict[int, Tuple[ToolSpec, int]] = {}
+        # 稳定前缀缓存（system/skills list/injected skills）：run 内各 turn 逐字节复用
+        self._prefix_cache: "OrderedDict[Tuple[Any, ...], _StablePrefix]" = OrderedDict()
+        self._prefix_hits = 0
+        self._prefix_misses = 0
+        # explicit_only 工具匹配器（按工具名集合构建一次）与请求文本解析结果（task 在 run 内不变）的单条缓存
+        self._tool_matcher: Optional[_ToolMatcher] = None
+        self._text_tokens: Tuple[str, FrozenSet[str]] = ("", frozenset())
+        self._text_mentions: Tuple[str, FrozenSet[Tuple[str, str]]] = ("", frozenset())
 
     @property
     def tools_exposure(self) -> str:
@@ -214,7 +310,30 @@ class PromptManager:
             return []
 
         text = "\n".join(part for part in (task, user_input or "") if part)
-        return [tool for tool in tools if re.search(rf"(?<![\w.-]){re.escape(tool.name)}(?![\w.-])", text)]
+        names = tuple(tool.name for tool in tools)
+        matcher = self._tool_matcher
+        if matcher is None or matcher.names != names:
+            matcher = self._tool_matcher = _ToolMatcher.build(names)
+        if self._text_tokens[0] != text:
+            self._text_tokens = (text, frozenset(_TOOL_TOKEN_RE.findall(text)))
+        matched = matcher.match(text, self._text_tokens[1])
+        return [tool for tool in tools if tool.name in matched]
+
+    def _tools_tokens(self, tools: Sequence[ToolSpec]) -> int:
+        """估算 provider tools（name/description/parameters schema）占用的 token 数。"""
+
+        total = 0
+        cache = self._tool_tokens_cache
+        for spec in tools:
+            hit = cache.get(id(spec))
+            if hit is None or hit[0] is not spec:
+                wire = {"name": spec.name, "description": spec.description, "parameters": spec.parameters}
+                hit = (spec, self._token_estimator(json.dumps(wire, ensure_ascii=False, sort_keys=True)))
+                if len(cache) >= 1024:
+                    cache.clear()
+                cache[id(spec)] = hit
+            total += hit[1]
+        return total
 
     def _load_template_texts(self) -> Tuple[str, str]:
         """
@@ -241,14 +360,21 @@ class PromptManager:
         if self._skill_injection_mode == "all":
             return True
 
-        mentioned = {
-            (mention.namespace, mention.skill_name)
-            for mention in extract_skill_mentions("\n".join(part for part in (task, user_input or "") if part))
-        }
         if mention_text:
-            return (skill.namespace, skill.skill_name) in mentioned
+            return (skill.namespace, skill.skill_name) in self._mentioned_skills(task=task, user_input=user_input)
         return False
 
+    def _mentioned_skills(self, *, task: str, user_input: Optional[str]) -> FrozenSet[Tuple[str, str]]:
+        """返回请求文本中 mention 的 `(namespace, skill_name)` 集合（同一文本只解析一次）。"""
+
+        text = "\n".join(part for part in (task, user_input or "") if part)
+        if self._text_mentions[0] != text:
+            self._text_mentions = (
+                text,
+                frozenset((mention.namespace, mention.skill_name) for mention in extract_skill_mentions(text)),
+            )
+        return self._text_mentions[1]
+
     def _render_skill_summary(self, skill: Skill) -> str:
         """渲染不读取正文的 skill metadata 摘要。"""
 
@@ -335,16 +461,195 @@ class PromptManager:
         """
 
         provider_tools = self.filter_tools_for_task(tools, task=task, user_input=user_input)
+        key = self._prefix_key(
+            task=task,
+            user_input=user_input,
+            cwd=cwd,
+            provider_tools=provider_tools,
+            skills_manager=skills_manager,
+            injected_skills=injected_skills,
+        )
+        prefix = self._prefix_cache.get(key) if key is not None else None
+        prefix_hit = prefix is not None
+        if prefix is None:
+            self._prefix_misses += 1
+            prefix = self._render_stable_prefix(
+                task=task,
+                cwd=cwd,
+                provider_tools=provider_tools,
+                skills_manager=skills_manager,
+                injected_skills=injected_skills,
+                user_input=user_input,
+            )
+            if key is not None:
+                self._prefix_cache[key] = prefix
+                while len(self._prefix_cache) > _PREFIX_CACHE_MAX:
+                    self._prefix_cache.popitem(last=False)
+        else:
+            self._prefix_hits += 1
+            self._prefix_cache.move_to_end(key)
+
+        # 稳定前缀逐字节复用（浅拷贝 dict，content 字符串不变），利于 provider 侧 prompt caching 命中。
+        messages: List[Dict[str, Any]] = [dict(m) for m in prefix.messages]
+
+        history_tokens = 0
+        if self._history_mode == "none":
+            kept_history: List[Dict[str, Any]] = []
+            dropped = len(history)
+        else:
+            ledger = self._history_ledger
+            ledger.sync(history)
+            dropped = ledger.window_start(
+                max_messages=self._history_max_messages,
+                max_chars=self._history_max_chars,
+                max_tokens=self._history_max_tokens,
+            )
+            kept_history = history[dropped:]
+            history_tokens = ledger.tokens_between(dropped, len(history))
+        messages.extend(kept_history)
+
+        if user_input:
+            messages.append({"role": "user", "content": user_input})
+        else:
+            messages.append({"role": "user", "content": task})
+
+        # 整个请求的 token 估算（供 proactive compaction 对照模型窗口）：history 部分来自增量账本。
+        prompt_tokens = (
+            prefix.tokens
+            + history_tokens
+            + message_tokens(messages[-1], self._token_estimator)
+            + self._tools_tokens(provider_tools)
+        )
+
+        debug = {
+            "profile": self._profile,
+            "templates": [{"name": self._templates.name, "version": self._templates.version}],
+            "skills_count": prefix.skills_count,
+            "skills_listed": prefix.listed_count,
+            "injected_skills_count": prefix.injected_count,
+            "skill_injection_mode": self._skill_injection_mode,
+            "skill_render": self._skill_render,
+            "tools_count": len(provider_tools),
+            "tools_exposure": self._tools_exposure,
+            "history_mode": self._history_mode,
+            "history_kept": len(kept_history),
+            "history_dropped": dropped,
+            "history_tokens": history_tokens,
+            "prompt_tokens": prompt_tokens,
+            "prompt_cache": {"hit": prefix_hit, "hits": self._prefix_hits, "misses": self._prefix_misses},
+        }
+        return messages, debug
+
+    def _prefix_key(
+        self,
+        *,
+        task: str,
+        user_input: Optional[str],
+        cwd: str,
+        provider_tools: Sequence[ToolSpec],
+        skills_manager: SkillsManager,
+        injected_skills: Sequence[Tuple[Skill, str, Optional[str]]],
+    ) -> Optional[Tuple[Any, ...]]:
+        """
+        计算稳定前缀的缓存 key；无法确定版本时返回 None（本次不缓存）。
+
+        组成：模板 name/version、task/user_input/cwd、provider tool 名称、skills `scan_generation`，
+        以及注入 skill 的正文版本（`body_cache_key`；只在需要读取正文的渲染模式下参与）。
+        """
+
+        generation = getattr(skills_manager, "scan_generation", None)
+        if not isinstance(generation, int):
+            return None
+        reads_body = self._skill_render in ("body", "method_only")
+        injected_key: List[Tuple[Any, ...]] = []
+        for skill, source, mention_text in injected_skills:
+            version = body_cache_key(skill) if reads_body else ()
+            if version is None:
+                return None
+            injected_key.append((skill.source_id, skill.locator, source, mention_text, version))
+        return (
+            self._templates.name,
+            self._templates.version,
+            task,
+            user_input,
+            cwd,
+            tuple(t.name for t in provider_tools),
+            id(skills_manager),
+            generation,
+            tuple(injected_key),
+        )
+
+    def _select_listed_skills(
+        self,
+        enabled_skills: List[Skill],
+        *,
+        skills_manager: SkillsManager,
+        injected_skills: Sequence[Tuple[Skill, str, Optional[str]]],
+        query: str,
+    ) -> List[Skill]:
+        """
+        选出 skills 列表中要列出的 skills。
+
+        规则：
+        - 未设置 `skills_list_top_k` 或已启用 skills 不超过 top-k：全部列出（保持 scan 顺序）；
+        - 否则：先列显式 mention 的 skills，再按相关性取 top-k（`SkillsManager.rank_skills`）；
+          相关性命中不足 top-k 时（例如 task 与 skill metadata 语言不同、没有共同词）按 scan 顺序补足。
+        """
+
+        top_k = self._skills_list_top_k
+        if top_k is None or len(enabled_skills) <= top_k:
+            return enabled_skills
+        rank = getattr(skills_manager, "rank_skills", None)
+        if not callable(rank):
+            return enabled_skills
+        picked: List[Skill] = []
+        seen: set[Tuple[str, str]] = set()
+
+        def _take(skills: Sequence[Skill], limit: Optional[int] = None) -> None:
+            """按顺序去重追加，直到 picked 达到 limit。"""
+
+            for skill in skills:
+                if limit is not None and len(picked) >= limit:
+                    return
+                key = (skill.source_id, skill.locator)
+                if key not in seen:
+                    seen.add(key)
+                    picked.append(skill)
+
+        _take([s for s, source, _ in injected_skills if source == "mention"])
+        limit = len(picked) + top_k
+        _take(rank(query, limit=top_k), limit)
+        _take(enabled_skills, limit)
+        return picked
+
+    def _render_stable_prefix(
+        self,
+        *,
+        task: str,
+        cwd: str,
+        provider_tools: Sequence[ToolSpec],
+        skills_manager: SkillsManager,
+        injected_skills: Sequence[Tuple[Skill, str, Optional[str]]],
+        user_input: Optional[str],
+    ) -> "_StablePrefix":
+        """渲染稳定前缀：system（含 developer policy）、skills list、injected skills。"""
+
         system_t, developer_t = self._load_template_texts()
         # 提前获取 skills 列表，避免后续两处引用各自调用 list_skills() 造成冗余扫描。
         enabled_skills = skills_manager.list_skills(enabled_only=True)
+        listed_skills = self._select_listed_skills(
+            enabled_skills,
+            skills_manager=skills_manager,
+            injected_skills=injected_skills,
+            query="\n".join(x for x in (task, user_input) if x),
+        )
         variables = {
             "task": task,
             "cwd": cwd,
             "tools": "\n".join(f"- {t.name}" for t in provider_tools),
             "skills": "\n".join(
                 f"- $[{s.namespace}].{s.skill_name}: {s.description}"
-                for s in enabled_skills
+                for s in listed_skills
             ),
             "constraints": "",
         }
@@ -357,13 +662,16 @@ class PromptManager:
         merged_system = system_text
         if developer_text:
             merged_system = f"{system_text}\n\n[Developer Policy]\n{developer_text}\n"
-        system_msg = {"role": "system", "content": merged_system}
-
-        messages: List[Dict[str, Any]] = [system_msg]
+        messages: List[Dict[str, Any]] = [{"role": "system", "content": merged_system}]
 
         if self._include_skills_list:
             skills_lines = ["Available skills (mention via $[namespace].skill_name):"]
-            for s in enabled_skills:
+            if len(listed_skills) < len(enabled_skills):
+                skills_lines[0] = (
+                    f"Available skills (showing {len(listed_skills)} of {len(enabled_skills)} most relevant to this task; "
+                    "mention via $[namespace].skill_name):"
+                )
+            for s in listed_skills:
                 skills_lines.append(f"- $[{s.namespace}].{s.skill_name}: {s.description}")
             messages.append({"role": "user", "content": "\n".join(skills_lines)})
 
@@ -382,33 +690,10 @@ class PromptManager:
             messages.append({"role": "user", "content": content})
             injected_count += 1
 
-        if self._history_mode == "none":
-            kept_history: List[Dict[str, Any]] = []
-            dropped = len(history)
-        else:
-            kept_history, dropped = trim_history(
-                history,
-                max_messages=self._history_max_messages,
-                max_chars=self._history_max_chars,
-            )
-        messages.extend(kept_history)
-
-        if user_input:
-            messages.append({"role": "user", "content": user_input})
-        else:
-            messages.append({"role": "user", "content": task})
-
-        debug = {
-            "profile": self._profile,
-            "templates": [{"name": self._templates.name, "version": self._templates.version}],
-            "skills_count": len(enabled_skills),
-            "injected_skills_count": injected_count,
-            "skill_injection_mode": self._skill_injection_mode,
-            "skill_render": self._skill_render,
-            "tools_count": len(provider_tools),
-            "tools_exposure": self._tools_exposure,
-            "history_mode": self._history_mode,
-            "history_kept": len(kept_history),
-            "history_dropped": dropped,
-        }
-        return messages, debug
+        return _StablePrefix(
+            messages=tuple(messages),
+            skills_count=len(enabled_skills),
+            listed_count=len(listed_skills),
+            injected_count=injected_count,
+            tokens=sum(message_tokens(m, self._token_estimator) for m in messages),
+        )
@@ -0,0 +1,121 @@
+"""
+Token 估算（history 预算使用）。
+
+说明：
+- 内置启发式估算器不依赖任何 tokenizer：ASCII 约 4 字符 / token，非 ASCII（CJK 等）按 1 字符 / token；
+- 可选 tokenizer：安装 `tiktoken`（`pip install 'skills-runtime-sdk[tokens]'`）后可用 BPE 精确计数；
+- message 级估算同时计入 `tool_calls`（function name + arguments）与固定的 per-message 开销，
+  与 chat.completions 的计费口径更接近。
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any, Callable, Dict, Literal, Optional
+
+logger = logging.getLogger(__name__)
+
+TokenEstimator = Callable[[str], int]
+TokenizerName = Literal["auto", "heuristic", "tiktoken"]
+
+# chat.completions 每条 message 的固定开销（role/分隔符），按 OpenAI cookbook 的经验值取 4。
+MESSAGE_OVERHEAD_TOKENS = 4
+_TIKTOKEN_ENCODING = "o200k_base"
+
+
+def heuristic_token_count(text: str) -> int:
+    """启发式 token 估算：ASCII 按 4 字符 / token（向上取整），非 ASCII 字符各算 1 个 token。"""
+
+    if not text:
+        return 0
+    if text.isascii():
+        return (len(text) + 3) // 4
+    ascii_chars = sum(1 for ch in text if ch < "\x80")
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def _load_tiktoken() -> Optional[TokenEstimator]:
+    """尝试加载 tiktoken 编码；未安装或编码数据不可用时返回 None。"""
+
+    try:
+        import tiktoken  # type: ignore[import-not-found]
+    except ImportError:
+        return None
+    try:
+        encoding = tiktoken.get_encoding(_TIKTOKEN_ENCODING)
+    except Exception:
+        # 防御性兜底：编码文件需首次下载，离线环境可能失败；由调用方决定是否降级。
+        logger.debug("tiktoken encoding %s unavailable", _TIKTOKEN_ENCODING, exc_info=True)
+        return None
+
+    def _count(text: str) -> int:
+        """tiktoken 计数（忽略特殊 token 校验，按普通文本处理）。"""
+
+        return len(encoding.encode(text, disallowed_special=())) if text else 0
+
+    return _count
+
+
+def get_token_estimator(name: str = "auto") -> TokenEstimator:
+    """
+    按名称返回 token 估算器。
+
+    参数：
+    - name：`auto`（有 tiktoken 则用，否则启发式）| `heuristic` | `tiktoken`
+
+    异常：
+    - `ValueError`：未知名称，或显式要求 `tiktoken` 但不可用（配置错误，fail-fast）
+    """
+
+    if name == "heuristic":
+        return heuristic_token_count
+    if name not in ("auto", "tiktoken"):
+        raise ValueError("tokenizer must be one of auto, heuristic, tiktoken")
+    counter = _load_tiktoken()
+    if counter is not None:
+        return counter
+    if name == "tiktoken":
+        raise ValueError(
+            "prompt.history.tokenizer=tiktoken requires the optional 'tiktoken' package "
+            "(pip install 'skills-runtime-sdk[tokens]')."
+        )
+    return heuristic_token_count
+
+
+def message_text(msg: Dict[str, Any]) -> str:
+    """把一条 chat message 中参与计数的文本（content + tool_calls 的 name/arguments）拼成字符串。"""
+
+    parts = []
+    content = msg.get("content")
+    if isinstance(content, str):
+        parts.append(content)
+    elif content is not None:
+        parts.append(json.dumps(content, ensure_ascii=False, default=str))
+    tool_calls = msg.get("tool_calls")
+    if isinstance(tool_calls, list):
+        for tc in tool_calls:
+            fn = tc.get("function") if isinstance(tc, dict) else None
+            if isinstance(fn, dict):
+                parts.append(str(fn.get("name") or ""))
+                parts.append(str(fn.get("arguments") or ""))
+            elif tc is not None:
+                parts.append(json.dumps(tc, ensure_ascii=False, default=str))
+    return "\n".join(parts)
+
+
+def message_tokens(msg: Dict[str, Any], estimator: TokenEstimator) -> int:
+    """估算单条 message 的 token 数（含 per-message 固定开销）。"""
+
+    return estimator(message_text(msg)) + MESSAGE_OVERHEAD_TOKENS
+
+
+__all__ = [
+    "MESSAGE_OVERHEAD_TOKENS",
+    "TokenEstimator",
+    "TokenizerName",
+    "get_token_estimator",
+    "heuristic_token_count",
+    "message_text",
+    "message_tokens",
+]
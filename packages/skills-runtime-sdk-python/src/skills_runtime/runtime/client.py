@@ -7,12 +7,15 @@ import secrets
 import socket
 import subprocess
 import sys
+import threading
 import time
-from dataclasses import dataclass
+import weakref
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, Optional
 
 from skills_runtime.runtime.paths import get_runtime_paths
+from skills_runtime.runtime.protocol import FRAME_HEADER, FRAME_MAGIC, encode_frame
 
 
 @dataclass(frozen=True)
@@ -48,13 +51,215 @@ def _pid_alive(pid: int) -> bool:
         return False
 
 
+def _unwrap_response(obj: Any) -> Dict[str, Any]:
+    """
+    把 server 响应对象转换为 data dict；`ok=false` 时抛 RuntimeError（`<error_kind>: <error>`）。
+    """
+
+    if not isinstance(obj, dict):
+        raise RuntimeError("invalid runtime response")
+    if obj.get("ok") is not True:
+        kind = str(obj.get("error_kind") or "").strip() or None
+        msg = str(obj.get("error") or "runtime call failed")
+        if kind:
+            raise RuntimeError(f"{kind}: {msg}")
+        raise RuntimeError(msg)
+    data_obj = obj.get("data")
+    return data_obj if isinstance(data_obj, dict) else {"data": data_obj}
+
+
+class _ConnectionUnavailable(ConnectionError):
+    """长连接在请求发出前已不可用（请求未送达 server，可安全重连重试）。"""
+
+
+class _FramingUnsupported(ConnectionError):
+    """server 已接受连接但未完成 framed 握手（例如旧版 server）。"""
+
+
+@dataclass
+class _PendingCall:
+    """长连接上一个等待响应的请求槽位。"""
+
+    event: threading.Event = field(default_factory=threading.Event)
+    response: Optional[Dict[str, Any]] = None
+    error: Optional[BaseException] = None
+
+
+class _RuntimeConnection:
+    """
+    framed 长连接（见 `runtime/protocol.py`）：多个线程可并发在同一 socket 上发起请求。
+
+    说明：
+    - 后台 reader 线程按响应 `id` 唤醒对应的等待方；
+    - 连接断开时所有未完成请求收到 `ConnectionResetError`，之后的请求收到 `_ConnectionUnavailable`。
+    """
+
+    def __init__(self, sock: socket.socket, *, secret: str) -> None:
+        """接管一个已完成握手的 socket，并启动 reader 线程。"""
+
+        self._sock = sock
+        self._secret = secret
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._pending: Dict[int, _PendingCall] = {}
+        self._next_id = 1
+        self._closed = False
+        self._reader = threading.Thread(target=self._read_loop, name="skills-runtime-rpc-reader", daemon=True)
+        self._reader.start()
+
+    @classmethod
+    def open(cls, info: RuntimeServerInfo, *, timeout_sec: float) -> "_RuntimeConnection":
+        """
+        连接 server 并完成 framed 握手。
+
+        异常：
+        - OSError：连接失败
+        - _FramingUnsupported：已连接，但 server 未在 `timeout_sec` 内回送握手
+        """
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(float(timeout_sec))
+            sock.connect(str(info.socket_path))
+            ack = b""
+            try:
+                sock.sendall(FRAME_MAGIC)
+                while len(ack) < len(FRAME_MAGIC):
+                    b = sock.recv(len(FRAME_MAGIC) - len(ack))
+                    if not b:
+                        break
+                    ack += b
+            except TimeoutError as e:
+                raise _FramingUnsupported("runtime server did not answer framed handshake") from e
+            if ack != FRAME_MAGIC:
+                raise _FramingUnsupported("runtime server does not support framed connections")
+            sock.settimeout(None)
+        except BaseException:
+            sock.close()
+            raise
+        return cls(sock, secret=info.secret)
+
+    @property
+    def alive(self) -> bool:
+        """连接是否仍可用于新请求。"""
+
+        return not self._closed
+
+    def request(self, *, method: str, params: Dict[str, Any], timeout_sec: float) -> Dict[str, Any]:
+        """
+        发送一个请求并等待其响应对象（未解包）。
+
+        异常：
+        - _ConnectionUnavailable：请求未发出（连接已断开 / 发送失败）
+        - ConnectionResetError：请求已发出但连接在响应前断开
+        - TimeoutError：`timeout_sec` 内未收到响应（连接保持可用，迟到的响应被丢弃）
+        """
+
+        slot = _PendingCall()
+        with self._lock:
+            if self._closed:
+                raise _ConnectionUnavailable("runtime connection closed")
+            rid = self._next_id
+            self._next_id += 1
+            self._pending[rid] = slot
+        frame = encode_frame({"id": rid, "method": str(method), "params": params, "secret": self._secret})
+        try:
+            with self._send_lock:
+                self._sock.sendall(frame)
+        except OSError as e:
+            with self._lock:
+                self._pending.pop(rid, None)
+            self.close()
+            raise _ConnectionUnavailable("runtime connection send failed") from e
+
+        if not slot.event.wait(float(timeout_sec)):
+            with self._lock:
+                abandoned = self._pending.pop(rid, None) is not None
+            if abandoned:
+                raise TimeoutError(f"runtime call timed out: {method}")
+            # reader 已在超时边界取走槽位：响应/错误即将写入。
+            slot.event.wait()
+        if slot.error is not None:
+            raise slot.error
+        return slot.response or {}
+
+    def _recv_exact(self, n: int) -> Optional[bytes]:
+        """读取恰好 n 字节；对端关闭或出错时返回 None。"""
+
+        buf = bytearray()
+        while len(buf) < n:
+            try:
+                b = self._sock.recv(n - len(buf))
+            except OSError:
+                return None
+            if not b:
+                return None
+            buf.extend(b)
+        return bytes(buf)
+
+    def _read_loop(self) -> None:
+        """reader 线程：读取响应帧并分发给等待方；连接断开后让所有等待方失败。"""
+
+        reason: BaseException = ConnectionResetError("runtime connection lost before response")
+        while True:
+            header = self._recv_exact(FRAME_HEADER.size)
+            if header is None:
+                break
+            body = self._recv_exact(FRAME_HEADER.unpack(header)[0])
+            if body is None:
+                break
+            try:
+                obj = json.loads(body.decode("utf-8", errors="replace"))
+            except ValueError:
+                reason = RuntimeError("invalid runtime response")
+                break
+            if not isinstance(obj, dict):
+                reason = RuntimeError("invalid runtime response")
+                break
+            rid = obj.get("id")
+            if rid is None:
+                # 连接级错误：server 回包后会关闭连接。
+                reason = RuntimeError(f"{obj.get('error_kind') or 'internal'}: {obj.get('error') or 'runtime connection error'}")
+                break
+            with self._lock:
+                slot = self._pending.pop(rid, None) if isinstance(rid, int) else None
+            if slot is not None:
+                slot.response = obj
+                slot.event.set()
+        self._fail_all(reason)
+
+    def _fail_all(self, reason: BaseException) -> None:
+        """标记连接关闭并唤醒所有未完成请求。"""
+
+        with self._lock:
+            self._closed = True
+            pending = list(self._pending.values())
+            self._pending.clear()
+        for slot in pending:
+            slot.error = reason
+            slot.event.set()
+        with contextlib.suppress(OSError):
+            self._sock.close()
+
+    def close(self) -> None:
+        """关闭连接（幂等）；reader 线程随之退出并让未完成请求失败。"""
+
+        with self._lock:
+            self._closed = True
+        with contextlib.suppress(OSError):
+            self._sock.shutdown(socket.SHUT_RDWR)
+        with contextlib.suppress(OSError):
+            self._sock.close()
+
+
 class RuntimeClient:
     """
     本地 runtime client（Unix socket JSON RPC）。
 
     说明：
     - client 会在首次请求时确保 server 已启动；
-    - server 为“workspace 级单例”，位于 `.skills_runtime_sdk/runtime/`。
+    - server 为“workspace 级单例”，位于 `.skills_runtime_sdk/runtime/`；
+    - `call()` 复用一条 framed 长连接（多线程可并发复用），仅在连接不可用时才重新 `ensure_server()` 并重连。
     """
 
     def __init__(self, *, workspace_root: Path, start_timeout_ms: int = 2000) -> None:
@@ -69,6 +274,11 @@ class RuntimeClient:
         self._workspace_root = Path(workspace_root).resolve()
         self._start_timeout_ms = int(start_timeout_ms)
         self._paths = get_runtime_paths(workspace_root=self._workspace_root)
+        self._conn_lock = threading.Lock()
+        self._conn: Optional[_RuntimeConnection] = None
+        # 握手失败的 server pid（例如不支持 framed 的旧版 server）：对其直接走 legacy 一次性连接。
+        self._legacy_only_pid: Optional[int] = None
+        self._conn_finalizer: Optional[weakref.finalize] = None
 
     def _read_server_info_state(self) -> _ServerInfoReadResult:
         """
@@ -325,16 +535,58 @@ class RuntimeClient:
                 chunks.append(b)
         raw = b"".join(chunks).decode("utf-8", errors="replace")
         obj = json.loads(raw) if raw.strip() else {}
-        if not isinstance(obj, dict):
-            raise RuntimeError("invalid runtime response")
-        if obj.get("ok") is not True:
-            kind = str(obj.get("error_kind") or "").strip() or None
-            msg = str(obj.get("error") or "runtime call failed")
-            if kind:
-                raise RuntimeError(f"{kind}: {msg}")
-            raise RuntimeError(msg)
-        data_obj = obj.get("data")
-        return data_obj if isinstance(data_obj, dict) else {"data": data_obj}
+        return _unwrap_response(obj)
+
+    def _persistent_connection(self, *, stale: Optional[_RuntimeConnection] = None) -> tuple[Optional[_RuntimeConnection], Optional[RuntimeServerInfo]]:
+        """
+        返回可用的长连接；必要时 `ensure_server()` 并重新建连。
+
+        参数：
+        - stale：调用方刚发现不可用的连接（若仍是当前连接则丢弃）
+
+        返回：
+        - (conn, None)：长连接可用
+        - (None, info)：server 不支持 framed 或建连失败，调用方应使用 legacy 一次性连接
+        """
+
+        with self._conn_lock:
+            if stale is not None and self._conn is stale:
+                self._drop_connection_locked()
+            conn = self._conn
+            if conn is not None and conn.alive:
+                return conn, None
+            self._drop_connection_locked()
+
+            info = self.ensure_server()
+            if self._legacy_only_pid == info.pid:
+                return None, info
+            try:
+                conn = _RuntimeConnection.open(info, timeout_sec=self._derive_timeout_sec(method="ping", params={}))
+            except _FramingUnsupported:
+                self._legacy_only_pid = info.pid
+                return None, info
+            except OSError:
+                # 含 TimeoutError：交由 legacy 路径给出与旧行为一致的错误。
+                return None, info
+            self._conn = conn
+            self._conn_finalizer = weakref.finalize(self, conn.close)
+            return conn, None
+
+    def _drop_connection_locked(self) -> None:
+        """关闭并丢弃当前长连接（调用方须持有 `_conn_lock`）。"""
+
+        if self._conn_finalizer is not None:
+            self._conn_finalizer.detach()
+            self._conn_finalizer = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def close(self) -> None:
+        """关闭长连接（幂等；不会停止 server）。后续 `call()` 会按需重连。"""
+
+        with self._conn_lock:
+            self._drop_connection_locked()
 
     def call(self, *, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
@@ -346,8 +598,23 @@ class RuntimeClient:
 
         返回：
         - data 对象（dict）；当 server 返回 ok=false 时抛 RuntimeError
+
+        说明：
+        - 复用 framed 长连接，不做逐次 ping；仅当请求发出前发现连接已断开时，才重新 `ensure_server()` 并重试一次；
+        - 请求已发出后连接断开则抛 `ConnectionResetError`（不自动重放，避免非幂等方法重复执行）。
         """
 
-        info = self.ensure_server()
         timeout_sec = self._derive_timeout_sec(method=method, params=params)
-        return self._call_with_info(info, method=method, params=params, timeout_sec=timeout_sec)
+        stale: Optional[_RuntimeConnection] = None
+        for _attempt in range(2):
+            conn, info = self._persistent_connection(stale=stale)
+            if conn is None:
+                assert info is not None
+                return self._call_with_info(info, method=method, params=params, timeout_sec=timeout_sec)
+            try:
+                obj = conn.request(method=method, params=params or {}, timeout_sec=timeout_sec)
+            except _ConnectionUnavailable:
+                stale = conn
+                continue
+            return _unwrap_response(obj)
+        raise ConnectionResetError("runtime connection unavailable")
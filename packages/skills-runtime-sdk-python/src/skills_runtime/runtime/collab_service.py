@@ -23,6 +23,8 @@ from pathlib import Path
 from queue import Queue
 from typing import Any, Dict, List, Optional
 
+from skills_runtime.core.collab_manager import wait_children_settled
+
 logger = logging.getLogger(__name__)
 
 
@@ -60,10 +62,12 @@ class CollabAgentService:
         创建协作 agent 服务。
 
         参数：
-        - wait_join_poll_sec：collab.wait 的 join 轮询间隔（秒）
+        - wait_join_poll_sec：保留兼容；collab.wait 已改为条件变量唤醒，不再轮询
         """
         self._wait_join_poll_sec = max(0.01, float(wait_join_poll_sec))
         self._children_lock = threading.Lock()
+        # child 进入终态 / 被清理时 notify_all，collab.wait 据此唤醒。
+        self._children_changed = threading.Condition(self._children_lock)
         self._children: Dict[str, _ChildState] = {}
         self._terminal_children: Dict[str, _TerminalChildState] = {}
 
@@ -104,6 +108,7 @@ class CollabAgentService:
             error=error,
         )
         self._terminal_children[child_id] = record
+        self._children_changed.notify_all()
         return record
 
     def _cli_default_runner(self, message: str, child: _ChildState) -> str:
@@ -233,44 +238,28 @@ class CollabAgentService:
         return {"id": terminal.id, "status": terminal.status}
 
     def handle_collab_wait(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """RPC：collab.wait。"""
+        """RPC：collab.wait（`mode=all|any`；child 终态变化时由条件变量唤醒）。"""
         ids = params.get("ids")
         timeout_ms = params.get("timeout_ms")
         if not isinstance(ids, list) or not ids:
             raise ValueError("ids must be non-empty list")
         ids_s = [str(x) for x in ids]
+        mode = str(params.get("mode") or "all")
         deadline = None
         if timeout_ms is not None:
             deadline = time.monotonic() + int(timeout_ms) / 1000.0
 
-        # 先取快照，避免长 join 持锁
-        with self._children_lock:
+        with self._children_changed:
             missing = [i for i in ids_s if i not in self._children and i not in self._terminal_children]
             if missing:
                 raise KeyError(f"unknown ids: {missing}")
-            handles = [self._children[i] for i in ids_s if i in self._children]
-
-        pending = list(handles)
-        while pending:
-            next_pending = []
-            for h in pending:
-                if not h.thread.is_alive():
-                    continue
-                wait_sec = self._wait_join_poll_sec
-                if deadline is not None:
-                    remaining = deadline - time.monotonic()
-                    if remaining <= 0:
-                        next_pending.append(h)
-                        continue
-                    wait_sec = min(wait_sec, remaining)
-                h.thread.join(timeout=wait_sec)
-                if h.thread.is_alive():
-                    next_pending.append(h)
-            if not next_pending:
-                break
-            if deadline is not None and time.monotonic() >= deadline:
-                break
-            pending = next_pending
+            wait_children_settled(
+                self._children_changed,
+                ids=ids_s,
+                is_settled=lambda cid: cid not in self._children,
+                mode=mode,
+                deadline=deadline,
+            )
 
         results = []
         with self._children_lock:
@@ -314,4 +303,5 @@ class CollabAgentService:
                 child.status = "cancelled"
             self._children.clear()
             self._terminal_children.clear()
+            self._children_changed.notify_all()
         return cancelled
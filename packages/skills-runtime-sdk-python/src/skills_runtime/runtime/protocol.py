@@ -0,0 +1,29 @@
+"""
+runtime RPC 的长连接分帧协议（client/server 共用）。
+
+两种连接形态：
+- legacy（一次性）：client 发送一个 JSON 对象后 `shutdown(SHUT_WR)`，server 读到 EOF 后回一个 JSON 对象并关闭；
+- framed（长连接）：client 连接后先发送 `FRAME_MAGIC`，server 原样回送作为握手确认；
+  之后双方按“4 字节 big-endian 长度 + UTF-8 JSON”收发帧，可在同一连接上并发多路复用多个请求。
+
+framed 帧结构：
+- 请求：`{"id": <int>, "method": str, "params": dict, "secret": str}`（每帧都携带 secret）
+- 响应：`{"id": <int|None>, "ok": bool, "data"|"error_kind"+"error": ...}`
+  - `id=None` 表示连接级错误（例如帧过大/无法解析），server 回包后关闭连接。
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+from typing import Any, Dict
+
+FRAME_MAGIC = b"SRRPC1\n"
+FRAME_HEADER = struct.Struct(">I")
+
+
+def encode_frame(obj: Dict[str, Any]) -> bytes:
+    """把一个 JSON 对象编码为“长度前缀 + 正文”的帧字节串。"""
+
+    payload = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+    return FRAME_HEADER.pack(len(payload)) + payload
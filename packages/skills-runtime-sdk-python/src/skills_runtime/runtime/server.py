@@ -14,8 +14,10 @@ from pathlib import Path
 from queue import Queue
 from typing import Any, Dict, Optional
 
+from skills_runtime.core.collab_manager import wait_children_settled
 from skills_runtime.core.exec_sessions import ExecSessionManager, ExecSessionWriteResult
 from skills_runtime.runtime.paths import get_runtime_paths
+from skills_runtime.runtime.protocol import FRAME_HEADER, FRAME_MAGIC, encode_frame
 
 
 @dataclass
@@ -60,6 +62,7 @@ class RuntimeServer:
         - secret：本地鉴权 secret（客户端需携带；仅本机使用）
         - idle_timeout_ms：无运行资源时的空闲退出阈值（毫秒）
         - max_request_bytes：单次 RPC 请求体最大字节数（用于防止内存 DoS；超限返回 validation 错误）
+        - wait_join_poll_ms：保留兼容；`collab.wait` 已改为条件变量唤醒，不再按该间隔轮询
         """
 
         self._workspace_root = Path(workspace_root).resolve()
@@ -76,9 +79,12 @@ class RuntimeServer:
         # 该 marker 会注入到 exec session 子进程 env，并落盘到 registry；restart 后可用于验证是否“本框架产物”。
         self._exec_marker = secrets.token_hex(8)
 
+        # ExecSessionManager 自带会话表锁 + 会话级 I/O 锁；这里的锁只串行化 exec registry 文件的读改写。
         self._exec = ExecSessionManager()
-        self._exec_lock = threading.Lock()
+        self._exec_registry_lock = threading.Lock()
         self._children_lock = threading.Lock()
+        # child 状态变化（完成/失败/取消/清理）时 notify_all，`collab.wait` 据此唤醒。
+        self._children_changed = threading.Condition(self._children_lock)
         self._children: Dict[str, _ChildState] = {}
 
         self._shutdown = threading.Event()
@@ -364,9 +370,8 @@ class RuntimeServer:
         - 任一 child 状态为 running 视为 running。
         """
 
-        with self._exec_lock:
-            if any(self._exec.has(sid) for sid in list(getattr(self._exec, "_sessions", {}).keys())):
-                return True
+        if self._exec.session_ids():
+            return True
         with self._children_lock:
             for c in self._children.values():
                 if c.status == "running":
@@ -401,8 +406,8 @@ class RuntimeServer:
         env2["SKILLS_RUNTIME_SDK_RUNTIME_EXEC_SESSION_MARKER"] = str(self._exec_marker)
         env2["SKILLS_RUNTIME_SDK_RUNTIME_WORKSPACE_ROOT"] = str(self._workspace_root)
 
-        with self._exec_lock:
-            s = self._exec.spawn(argv=[str(x) for x in argv], cwd=cwd_path, env=env2, tty=tty)
+        s = self._exec.spawn(argv=[str(x) for x in argv], cwd=cwd_path, env=env2, tty=tty)
+        with self._exec_registry_lock:
             self._register_exec_session(
                 session_id=int(s.session_id),
                 pid=int(getattr(s.proc, "pid", 0) or 0),
@@ -410,11 +415,11 @@ class RuntimeServer:
                 argv=[str(x) for x in argv],
                 cwd=str(cwd_path),
             )
-            return {
-                "session_id": int(s.session_id),
-                "created_at_ms": int(s.created_at_ms),
-                "pid": int(getattr(s.proc, "pid", 0) or 0),
-            }
+        return {
+            "session_id": int(s.session_id),
+            "created_at_ms": int(s.created_at_ms),
+            "pid": int(getattr(s.proc, "pid", 0) or 0),
+        }
 
     def _handle_exec_write(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -422,23 +427,25 @@ class RuntimeServer:
 
         参数（params）：
         - session_id/chars/yield_time_ms/max_output_bytes：语义对齐 ExecSessionManager.write
+
+        说明：
+        - 等待输出期间只持有该 session 的锁（见 ExecSessionManager），不同 session 的轮询互不阻塞。
         """
 
         session_id = int(params.get("session_id"))
         chars = str(params.get("chars") or "")
         yield_time_ms = int(params.get("yield_time_ms", 50))
         max_output_bytes = int(params.get("max_output_bytes", 64 * 1024))
-        with self._exec_lock:
-            wr: ExecSessionWriteResult = self._exec.write(
-                session_id=session_id,
-                chars=chars,
-                yield_time_ms=yield_time_ms,
-                max_output_bytes=max_output_bytes,
-            )
-            if not wr.running:
-                # session 已退出：从 registry 移除，避免 restart 后误认为 orphan
-                with contextlib.suppress(Exception):
-                    self._unregister_exec_session(session_id)
+        wr: ExecSessionWriteResult = self._exec.write(
+            session_id=session_id,
+            chars=chars,
+            yield_time_ms=yield_time_ms,
+            max_output_bytes=max_output_bytes,
+        )
+        if not wr.running:
+            # session 已退出：从 registry 移除，避免 restart 后误认为 orphan
+            with self._exec_registry_lock, contextlib.suppress(Exception):
+                self._unregister_exec_session(session_id)
         return {
             "stdout": wr.stdout,
             "stderr": wr.stderr,
@@ -447,6 +454,21 @@ class RuntimeServer:
             "truncated": wr.truncated,
         }
 
+    def _handle_exec_has(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        RPC：exec.has。
+
+        参数（params）：
+        - session_id：要探测的 session id
+
+        语义：
+        - 只读探测，不写入 stdin、不消费输出缓冲（替代旧的 0ms `exec.write` 探测）。
+        """
+
+        session_id = int(params.get("session_id"))
+        exists = bool(self._exec.has(session_id))
+        return {"session_id": int(session_id), "exists": exists}
+
     def _handle_exec_close(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """
         RPC：exec.close。
@@ -460,9 +482,9 @@ class RuntimeServer:
         """
 
         session_id = int(params.get("session_id"))
-        with self._exec_lock:
-            existed = bool(self._exec.has(session_id))
-            self._exec.close(session_id)
+        existed = bool(self._exec.has(session_id))
+        self._exec.close(session_id)
+        with self._exec_registry_lock:
             self._unregister_exec_session(session_id)
         return {"ok": True, "session_id": int(session_id), "found": bool(existed)}
 
@@ -475,8 +497,8 @@ class RuntimeServer:
         """
 
         _ = params
-        with self._exec_lock:
-            self._exec.close_all()
+        self._exec.close_all()
+        with self._exec_registry_lock:
             with contextlib.suppress(Exception):
                 reg = self._read_exec_registry()
                 reg["exec_sessions"] = {}
@@ -499,10 +521,7 @@ class RuntimeServer:
             children = list(self._children.values())
         active_children = sum(1 for c in children if c.status == "running")
 
-        # ExecSessionManager 当前未公开 list API，先走 best-effort 私有字段快照（单线程 server 内使用可接受）。
-        with self._exec_lock:
-            sessions = list(getattr(self._exec, "_sessions", {}).keys())
-            active_exec = sum(1 for sid in sessions if self._exec.has(sid))
+        active_exec = len(self._exec.session_ids())
 
         reg = self._read_exec_registry()
         reg_sessions = reg.get("exec_sessions") or {}
@@ -535,8 +554,8 @@ class RuntimeServer:
         close_children = bool(params.get("children", True))
 
         if close_exec:
-            with self._exec_lock:
-                self._exec.close_all()
+            self._exec.close_all()
+            with self._exec_registry_lock:
                 with contextlib.suppress(Exception):
                     reg = self._read_exec_registry()
                     reg["exec_sessions"] = {}
@@ -553,6 +572,7 @@ class RuntimeServer:
                     child.status = "cancelled"
                 # cleanup 的目标是“快速回收”，不保证保留历史；直接清空，避免无限增长。
                 self._children.clear()
+                self._children_changed.notify_all()
 
         return {"ok": True, "exec": bool(close_exec), "children": bool(close_children), "cancelled_children": int(cancelled_children)}
 
@@ -615,9 +635,10 @@ class RuntimeServer:
                     if cur.cancel_event.is_set():
                         cur.status = "cancelled"
                         cur.final_output = None
-                        return
-                    cur.status = "completed"
-                    cur.final_output = str(out)
+                    else:
+                        cur.status = "completed"
+                        cur.final_output = str(out)
+                    self._children_changed.notify_all()
             except Exception as e:
                 # 防御性兜底：child runner 可能抛出任意异常；记录错误状态，不影响 server 主循环。
                 with self._children_lock:
@@ -626,6 +647,7 @@ class RuntimeServer:
                         return
                     cur.status = "failed"
                     cur.error = str(e)
+                    self._children_changed.notify_all()
 
         t = threading.Thread(target=_run, daemon=True)
         dummy.thread = t
@@ -670,6 +692,7 @@ class RuntimeServer:
         with self._children_lock:
             if cid in self._children:
                 self._children[cid].status = "cancelled"
+                self._children_changed.notify_all()
         return {"id": cid}
 
     def _handle_collab_resume(self, params: Dict[str, Any]) -> Dict[str, Any]:
@@ -685,45 +708,40 @@ class RuntimeServer:
         return {"id": child.id, "status": child.status}
 
     def _handle_collab_wait(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """RPC：collab.wait。"""
+        """
+        RPC：collab.wait。
+
+        参数（params）：
+        - ids：child id 列表（必须全部存在）
+        - timeout_ms：总超时（毫秒；可空 = 一直等待）
+        - mode：`all`（默认）全部结束才返回；`any` 任一结束即返回
+
+        说明：
+        - child 状态变化时通过条件变量唤醒，按精确 deadline 返回，不依赖轮询间隔。
+        """
 
         ids = params.get("ids")
         timeout_ms = params.get("timeout_ms")
         if not isinstance(ids, list) or not ids:
             raise ValueError("ids must be non-empty list")
         ids_s = [str(x) for x in ids]
+        mode = str(params.get("mode") or "all")
         deadline = None
         if timeout_ms is not None:
             deadline = time.monotonic() + int(timeout_ms) / 1000.0
 
-        # 先取快照，避免长 join 持锁
-        with self._children_lock:
+        with self._children_changed:
             missing = [i for i in ids_s if i not in self._children]
             if missing:
                 raise KeyError(f"unknown ids: {missing}")
-            handles = [self._children[i] for i in ids_s]
 
-        pending = list(handles)
-        while pending:
-            next_pending = []
-            for h in pending:
-                if not h.thread.is_alive():
-                    continue
-                wait_sec = self._wait_join_poll_sec
-                if deadline is not None:
-                    remaining = deadline - time.monotonic()
-                    if remaining <= 0:
-                        next_pending.append(h)
-                        continue
-                    wait_sec = min(wait_sec, remaining)
-                h.thread.join(timeout=wait_sec)
-                if h.thread.is_alive():
-                    next_pending.append(h)
-            if not next_pending:
-                break
-            if deadline is not None and time.monotonic() >= deadline:
-                break
-            pending = next_pending
+            def _settled(cid: str) -> bool:
+                """child 已离开 running（或已被 cleanup 清除）即视为结束。"""
+
+                cur = self._children.get(cid)
+                return cur is None or cur.status != "running"
+
+            wait_children_settled(self._children_changed, ids=ids_s, is_settled=_settled, mode=mode, deadline=deadline)
 
         results = []
         with self._children_lock:
@@ -761,6 +779,8 @@ class RuntimeServer:
             return self._handle_exec_spawn(params)
         if method == "exec.write":
             return self._handle_exec_write(params)
+        if method == "exec.has":
+            return self._handle_exec_has(params)
         if method == "exec.close":
             return self._handle_exec_close(params)
         if method == "exec.close_all":
@@ -806,17 +826,43 @@ class RuntimeServer:
             msg = kind
         return {"error_kind": kind, "error": msg}
 
-    def _read_request(self, conn: socket.socket) -> Optional[Dict[str, Any]]:
+    def _read_preamble(self, conn: socket.socket) -> Optional[bytes]:
+        """
+        读取连接开头的字节，用于区分 framed 长连接与 legacy 一次性请求。
+
+        返回：
+        - `FRAME_MAGIC`：client 请求 framed 长连接
+        - 其它 bytes：legacy 请求体的开头部分（可能为空：client 直接关闭了写端）
+        - None：活性窗口内未收到任何可判定的数据
+        """
+
+        head = bytearray()
+        while len(head) < len(FRAME_MAGIC) and FRAME_MAGIC.startswith(bytes(head)):
+            try:
+                b = conn.recv(len(FRAME_MAGIC) - len(head))
+            except socket.timeout:
+                return None
+            if not b:
+                break
+            head.extend(b)
+        return bytes(head)
+
+    def _read_request(self, conn: socket.socket, initial: bytes = b"") -> Optional[Dict[str, Any]]:
         """
         读取并解析一个连接上的 RPC 请求。
 
+        参数：
+        - initial：已由 `_read_preamble` 读出的请求体开头
+
         返回：
         - dict：已完整收到并成功解析的请求对象
         - None：连接在活性窗口内未形成完整请求，server 直接放弃该连接
         """
 
         conn.settimeout(self._request_read_timeout_sec)
-        raw = bytearray()
+        raw = bytearray(initial)
+        if len(raw) > self._max_request_bytes:
+            raise ValueError("request too large")
         while True:
             try:
                 b = conn.recv(65536)
@@ -836,29 +882,144 @@ class RuntimeServer:
             raise ValueError("invalid request")
         return req
 
+    def _execute_request(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        校验 secret 并执行一个已解析的请求，返回响应对象（不含 framed 的 `id`）。
+
+        说明：
+        - 任何异常都映射为 `ok=false` 的稳定错误结构，不向上抛出。
+        """
+
+        try:
+            if str(req.get("secret") or "") != self._secret:
+                raise PermissionError("invalid secret")
+            method = str(req.get("method") or "")
+            params = req.get("params") or {}
+            if not isinstance(params, dict):
+                raise ValueError("params must be object")
+            self._last_activity = time.monotonic()
+            data = self._dispatch(method, params)
+            return {"ok": True, "data": data}
+        except Exception as e:
+            # 防御性兜底：单请求异常不得拖垮连接 worker / 整个 server。
+            return {"ok": False, **self._format_rpc_error(e)}
+
+    def _recv_exact(self, conn: socket.socket, n: int, *, idle_ok: bool) -> Optional[bytes]:
+        """
+        从 framed 连接精确读取 `n` 字节。
+
+        参数：
+        - idle_ok：位于帧边界时为 True（空闲等待不算超时，仅在 shutdown 时返回）
+
+        返回：
+        - bytes：读满 n 字节
+        - None：对端关闭 / 帧读取中途停滞超过活性窗口 / server 正在 shutdown
+        """
+
+        buf = bytearray()
+        while len(buf) < n:
+            try:
+                b = conn.recv(n - len(buf))
+            except socket.timeout:
+                if idle_ok and not buf and not self._shutdown.is_set():
+                    continue
+                return None
+            except OSError:
+                return None
+            if not b:
+                return None
+            buf.extend(b)
+        return bytes(buf)
+
+    def _send_frame(self, conn: socket.socket, send_lock: threading.Lock, obj: Dict[str, Any]) -> None:
+        """在连接级发送锁内写出一个响应帧（best-effort：连接已断开时静默丢弃）。"""
+
+        frame = encode_frame(obj)
+        with send_lock:
+            with contextlib.suppress(OSError):
+                conn.sendall(frame)
+
+    def _serve_framed_request(self, conn: socket.socket, send_lock: threading.Lock, req: Dict[str, Any]) -> None:
+        """framed worker：执行单个请求并按 `id` 回包。"""
+
+        resp = self._execute_request(req)
+        resp["id"] = req.get("id")
+        self._send_frame(conn, send_lock, resp)
+
+    def _serve_framed(self, conn: socket.socket) -> None:
+        """
+        处理 framed 长连接：循环读帧，每个请求交给独立 worker 执行并按 `id` 回包。
+
+        说明：
+        - 同一连接上的请求互不阻塞（例如 `collab.wait` 长轮询期间仍可 `exec.write`）；
+        - 帧过大 / 无法解析时回送 `id=None` 的错误帧并关闭连接（无法再对齐帧边界）。
+        """
+
+        send_lock = threading.Lock()
+        workers: list[threading.Thread] = []
+        with contextlib.suppress(OSError):
+            conn.sendall(FRAME_MAGIC)
+        try:
+            self._framed_read_loop(conn, send_lock, workers)
+        finally:
+            if self._shutdown.is_set():
+                # shutdown：给在途请求（包括 `shutdown` 本身）一个有界窗口写回响应，再关闭连接。
+                deadline = time.monotonic() + self._request_read_timeout_sec
+                for t in workers:
+                    t.join(timeout=max(0.0, deadline - time.monotonic()))
+
+    def _framed_read_loop(self, conn: socket.socket, send_lock: threading.Lock, workers: list[threading.Thread]) -> None:
+        """framed 读循环：逐帧解析并派发 worker；返回即表示连接应关闭。"""
+
+        while not self._shutdown.is_set():
+            header = self._recv_exact(conn, FRAME_HEADER.size, idle_ok=True)
+            if header is None:
+                return
+            (size,) = FRAME_HEADER.unpack(header)
+            if size > self._max_request_bytes:
+                self._send_frame(conn, send_lock, {"id": None, "ok": False, **self._format_rpc_error(ValueError("request too large"))})
+                return
+            body = self._recv_exact(conn, size, idle_ok=False)
+            if body is None:
+                return
+            try:
+                req = json.loads(body.decode("utf-8", errors="replace"))
+                if not isinstance(req, dict):
+                    raise ValueError("invalid request")
+            except ValueError as e:
+                self._send_frame(conn, send_lock, {"id": None, "ok": False, **self._format_rpc_error(e)})
+                return
+            try:
+                t = threading.Thread(target=self._serve_framed_request, args=(conn, send_lock, req), daemon=True)
+                t.start()
+                workers[:] = [w for w in workers if w.is_alive()]
+                workers.append(t)
+            except RuntimeError as e:
+                self._send_frame(conn, send_lock, {"id": req.get("id"), "ok": False, **self._format_rpc_error(e)})
+
     def _serve_connection(self, conn: socket.socket) -> None:
         """
         处理单个已接受连接。
 
         说明：
         - 读请求、dispatch、回包都在独立 worker 中完成；
+        - 连接以 `FRAME_MAGIC` 开头时进入 framed 长连接模式（见 `runtime/protocol.py`），否则按 legacy 一次性请求处理；
         - 若请求在活性窗口内未完整形成，则直接关闭连接，不强制返回 JSON。
         """
 
         with conn:
             try:
-                req = self._read_request(conn)
+                conn.settimeout(self._request_read_timeout_sec)
+                head = self._read_preamble(conn)
+                if head is None:
+                    return
+                if head == FRAME_MAGIC:
+                    self._serve_framed(conn)
+                    return
+                req = self._read_request(conn, head)
                 if req is None:
                     return
-                if str(req.get("secret") or "") != self._secret:
-                    raise PermissionError("invalid secret")
-                method = str(req.get("method") or "")
-                params = req.get("params") or {}
-                if not isinstance(params, dict):
-                    raise ValueError("params must be object")
-                self._last_activity = time.monotonic()
-                data = self._dispatch(method, params)
-                resp = {"ok": True, "data": data}
+                resp = self._execute_request(req)
             except Exception as e:
                 # 防御性兜底：单连接 worker 不得因请求异常拖垮整个 server。
                 resp = {"ok": False, **self._format_rpc_error(e)}
@@ -881,6 +1042,7 @@ class RuntimeServer:
                 self._paths.socket_path.unlink()
 
         s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conn_threads: list[threading.Thread] = []
         try:
             s.bind(str(self._paths.socket_path))
             os.chmod(self._paths.socket_path, stat.S_IRUSR | stat.S_IWUSR)  # 0600
@@ -907,19 +1069,25 @@ class RuntimeServer:
                 try:
                     t = threading.Thread(target=self._serve_connection, args=(conn,), daemon=True)
                     t.start()
+                    conn_threads[:] = [w for w in conn_threads if w.is_alive()]
+                    conn_threads.append(t)
                 except Exception:
                     with contextlib.suppress(Exception):
                         conn.close()
         finally:
+            # 先给在途连接一个有界窗口写回响应（包括 `shutdown` 本身的回包），避免进程先于 daemon worker 退出。
+            deadline = time.monotonic() + self._request_read_timeout_sec
+            for t in conn_threads:
+                t.join(timeout=max(0.0, deadline - time.monotonic()))
             # 进程正常退出时尽量回收资源，避免遗留 orphan。
             with contextlib.suppress(Exception):
-                with self._exec_lock:
-                    self._exec.close_all()
+                self._exec.close_all()
             with contextlib.suppress(Exception):
                 with self._children_lock:
                     for c in self._children.values():
                         c.cancel_event.set()
                     self._children.clear()
+                    self._children_changed.notify_all()
             with contextlib.suppress(Exception):
                 s.close()
             self._cleanup_files()
@@ -0,0 +1,132 @@
+"""
+Skill 正文的进程内缓存（按版本寻址 + 字节上限 LRU）。
+
+用途：
+- `render_injected_skill` 每个 turn 都会对被 mention 的 skill 调用 `body_loader`；
+  redis/pgsql source 的 loader 每次都要打开 client 并回源读取正文。
+- 本缓存以 `(source_id, locator, version)` 为 key：version 变化即视为新内容，旧条目自然被 LRU 淘汰，
+  因此无需显式失效。
+
+version 的来源：
+- filesystem（`skill.path` 非空）：注入时现取 `stat` 的 `(mtime_ns, size)`（刚修改过的文件不缓存）；
+- redis/pgsql：scan 阶段写入 metadata 的 `etag`（redis `etag` / pgsql `body_etag`），缺失时退回 `updated_at`；
+- 以上都没有时不缓存（无法判断正文是否变化）。
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from skills_runtime.skills.models import Skill
+
+# filesystem 正文 mtime 距今不足该窗口时不缓存（粗粒度 mtime 下同一时间片内的二次修改无法区分）。
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+def body_cache_key(skill: Skill) -> Optional[Tuple[Hashable, ...]]:
+    """为 skill 正文生成缓存 key；无法确定版本时返回 None（调用方直接回源）。"""
+
+    if skill.path is not None:
+        try:
+            st = os.stat(skill.path)
+        except OSError:
+            return None
+        if time.time_ns() - int(st.st_mtime_ns) < _RACY_WINDOW_NS:
+            return None
+        return (skill.source_id, skill.locator, "stat", int(st.st_mtime_ns), int(st.st_size))
+
+    meta = skill.metadata if isinstance(skill.metadata, dict) else {}
+    etag = meta.get("etag")
+    if isinstance(etag, str) and etag:
+        return (skill.source_id, skill.locator, "etag", etag)
+    updated_at = meta.get("updated_at")
+    if isinstance(updated_at, str) and updated_at:
+        return (skill.source_id, skill.locator, "updated_at", updated_at)
+    return None
+
+
+class SkillBodyCache:
+    """
+    字节上限的 LRU 正文缓存（线程安全）。
+
+    参数：
+    - max_bytes：缓存正文（UTF-8 编码）总字节上限；0 表示禁用（每次回源）
+    """
+
+    def __init__(self, *, max_bytes: int) -> None:
+        """创建缓存；`max_bytes<=0` 时所有调用直接回源（仍统计 miss）。"""
+
+        self._max_bytes = max(0, int(max_bytes))
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[Hashable, ...], Tuple[str, int]]" = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get_or_load(self, skill: Skill, loader: Callable[[], str]) -> str:
+        """
+        返回 skill 正文：命中缓存则直接返回，否则调用 `loader()` 回源并写入缓存。
+
+        说明：
+        - loader 在锁外执行（回源可能是网络 I/O）；并发 miss 时可能重复回源，但结果一致；
+        - loader 抛出的异常原样透传（不缓存失败）；
+        - 超过 `max_bytes` 的单个正文不入缓存。
+        """
+
+        key = body_cache_key(skill) if self._max_bytes > 0 else None
+        if key is not None:
+            with self._lock:
+                hit = self._entries.get(key)
+                if hit is not None:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return hit[0]
+        with self._lock:
+            self._misses += 1
+
+        body = loader()
+        if key is None or not isinstance(body, str):
+            return body
+
+        size = len(body.encode("utf-8"))
+        if size > self._max_bytes:
+            return body
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (body, size)
+            self._bytes += size
+            while self._bytes > self._max_bytes and self._entries:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._evictions += 1
+        return body
+
+    def clear(self) -> None:
+        """清空缓存条目（计数器保留）。"""
+
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """返回命中/未命中/淘汰计数与当前占用（只读快照）。"""
+
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self._max_bytes > 0,
+                "max_bytes": self._max_bytes,
+                "bytes": self._bytes,
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": (self._hits / lookups) if lookups else 0.0,
+            }
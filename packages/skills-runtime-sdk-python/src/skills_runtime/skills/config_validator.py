@@ -265,6 +265,27 @@ def preflight(skills_config: AgentSdkSkillsConfig) -> List[FrameworkIssue]:
                     )
                 )
 
+        def _optional_positive_int(option_key: str) -> None:
+            """校验 source.options 中可选的正整数选项（缺省允许），不合法时追加 issue。"""
+            value = source.options.get(option_key)
+            if value is None:
+                return
+            if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+                issues.append(
+                    _issue(
+                        code="SKILL_CONFIG_INVALID_OPTION",
+                        message="Invalid skills source option.",
+                        path=f"skills.sources[{idx}].options.{option_key}",
+                        details={
+                            "source_id": source.id,
+                            "source_type": stype,
+                            "option": option_key,
+                            "expected": "positive integer",
+                            "actual": value if isinstance(value, int) else type(value).__name__,
+                        },
+                    )
+                )
+
         if stype == "filesystem":
             _required_non_empty_str("root")
         elif stype == "in-memory":
@@ -272,6 +293,8 @@ def preflight(skills_config: AgentSdkSkillsConfig) -> List[FrameworkIssue]:
         elif stype == "redis":
             _required_non_empty_str("dsn_env")
             _required_non_empty_str("key_prefix")
+            _optional_positive_int("scan_batch_size")
+            _optional_positive_int("scan_count")
         elif stype == "pgsql":
             _required_non_empty_str("dsn_env")
             _required_non_empty_str("schema")
@@ -0,0 +1,170 @@
+"""
+Skills 相关性索引（内存 BM25，用于大 skill 目录下的 skills list 裁剪）。
+
+说明：
+- 文档字段：skill_name、namespace、description，以及 metadata 中的字符串/字符串列表字段（不含正文）；
+- 分词：ASCII 字母数字按词（`snake_case`/`kebab-case` 拆开），CJK 按单字；
+- 增量维护：`sync()` 按 skill 身份/字段比对，只为新增或变化的 skill 重建倒排项，删除的 skill 移除倒排项；
+- 查询只遍历查询词的倒排表，耗时与目录规模无关（只与命中文档数相关）。
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from skills_runtime.skills.models import Skill
+
+# BM25 常用参数（Robertson/Zaragoza 推荐区间的中值）。
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+|[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]")
+
+_DocKey = Tuple[str, str, str]
+
+
+def tokenize(text: str) -> List[str]:
+    """把文本切分为索引词（小写 ASCII 词 + CJK 单字）。"""
+
+    return _TOKEN_RE.findall(str(text or "").lower())
+
+
+def _doc_key(skill: Skill) -> _DocKey:
+    """skill 在索引中的稳定 key（同一 source 内 locator 唯一）。"""
+
+    return skill.source_id, skill.namespace, skill.locator
+
+
+def _metadata_text(metadata: Any) -> Iterable[str]:
+    """提取 metadata 顶层的字符串与字符串列表值（跳过正文等大字段）。"""
+
+    if not isinstance(metadata, dict):
+        return
+    for key, value in metadata.items():
+        if key == "body_markdown":
+            continue
+        if isinstance(value, str):
+            yield value
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                if isinstance(item, str):
+                    yield item
+
+
+def _doc_terms(skill: Skill) -> List[str]:
+    """skill 的索引词序列（skill_name 计两次，提高名称命中的权重）。"""
+
+    parts = [skill.skill_name, skill.skill_name, skill.namespace, skill.description, *_metadata_text(skill.metadata)]
+    return tokenize("\n".join(parts))
+
+
+class SkillsIndex:
+    """
+    skills 的内存 BM25 索引（SkillsManager 持有，scan 后增量同步）。
+
+    线程安全：由调用方（SkillsManager 的 scan 锁）保证 `sync` 不并发；`search` 只读。
+    """
+
+    def __init__(self) -> None:
+        """创建空索引。"""
+
+        self._skills: Dict[_DocKey, Skill] = {}
+        self._order: Dict[_DocKey, int] = {}
+        self._doc_len: Dict[_DocKey, int] = {}
+        self._doc_tf: Dict[_DocKey, Dict[str, int]] = {}
+        self._postings: Dict[str, Dict[_DocKey, int]] = {}
+        self._total_len = 0
+
+    def __len__(self) -> int:
+        """索引中的 skill 数。"""
+
+        return len(self._skills)
+
+    def sync(self, skills: Sequence[Skill]) -> None:
+        """
+        把索引与最新 scan 结果对齐。
+
+        规则：同一 key 的 Skill 对象相同（增量 scan 复用）或可检索字段未变时跳过；其余新增/更新/删除。
+        """
+
+        seen: Dict[_DocKey, int] = {}
+        for pos, skill in enumerate(skills):
+            key = _doc_key(skill)
+            seen[key] = pos
+            old = self._skills.get(key)
+            if old is not None and (
+                old is skill
+                or (
+                    old.skill_name == skill.skill_name
+                    and old.description == skill.description
+                    and old.metadata == skill.metadata
+                )
+            ):
+                self._skills[key] = skill
+                continue
+            if old is not None:
+                self._remove(key)
+            self._add(key, skill)
+        for key in [k for k in self._skills if k not in seen]:
+            self._remove(key)
+        self._order = seen
+
+    def search(self, query: str, *, limit: Optional[int] = None) -> List[Tuple[Skill, float]]:
+        """
+        按 BM25 返回与 query 相关的 skills（分数降序；同分按 scan 顺序）。
+
+        参数：
+        - query：查询文本（通常是 task + user input）
+        - limit：最多返回条数；None 表示返回全部命中
+        """
+
+        n_docs = len(self._skills)
+        if n_docs == 0:
+            return []
+        avg_len = self._total_len / n_docs or 1.0
+        scores: Dict[_DocKey, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            df = len(postings)
+            idf = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+            for key, tf in postings.items():
+                norm = tf + _BM25_K1 * (1.0 - _BM25_B + _BM25_B * self._doc_len[key] / avg_len)
+                scores[key] = scores.get(key, 0.0) + idf * tf * (_BM25_K1 + 1.0) / norm
+        ranked = sorted(scores.items(), key=lambda kv: (-kv[1], self._order.get(kv[0], 0)))
+        if limit is not None:
+            ranked = ranked[: max(0, limit)]
+        return [(self._skills[key], score) for key, score in ranked]
+
+    def _add(self, key: _DocKey, skill: Skill) -> None:
+        """为单个 skill 建立倒排项。"""
+
+        terms = _doc_terms(skill)
+        tf: Dict[str, int] = {}
+        for term in terms:
+            tf[term] = tf.get(term, 0) + 1
+        for term, count in tf.items():
+            self._postings.setdefault(term, {})[key] = count
+        self._skills[key] = skill
+        self._doc_tf[key] = tf
+        self._doc_len[key] = len(terms)
+        self._total_len += len(terms)
+
+    def _remove(self, key: _DocKey) -> None:
+        """移除单个 skill 的倒排项。"""
+
+        for term in self._doc_tf.pop(key, {}):
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(key, None)
+            if not postings:
+                del self._postings[term]
+        self._total_len -= self._doc_len.pop(key, 0)
+        self._skills.pop(key, None)
+
+
+__all__ = ["SkillsIndex", "tokenize"]
@@ -18,7 +18,9 @@ import uuid
 
 from skills_runtime.config.loader import AgentSdkSkillsConfig
 from skills_runtime.core.errors import FrameworkError, FrameworkIssue, UserError
+from skills_runtime.skills.body_cache import SkillBodyCache
 from skills_runtime.skills.bundles import ExtractedBundle
+from skills_runtime.skills.index import SkillsIndex
 from skills_runtime.skills.mentions import SkillMention
 from skills_runtime.skills.models import ScanReport, Skill
 from skills_runtime.skills.manager_ops import (
@@ -37,13 +39,18 @@ from skills_runtime.skills.config_validator import (
     validate_and_normalize_config as _validate_and_normalize_config,
 )
 from skills_runtime.skills.source_client_registry import SourceClientRegistry
-from skills_runtime.skills.sources.filesystem import scan_filesystem_source as _scan_filesystem_source_impl
+from skills_runtime.skills.sources.filesystem import (
+    FilesystemScanCache,
+    scan_filesystem_source as _scan_filesystem_source_impl,
+)
 from skills_runtime.skills.sources.in_memory import scan_in_memory_source as _scan_in_memory_source_impl
 from skills_runtime.skills.sources.pgsql import (
+    PgsqlScanCache,
     pgsql_client_context as _pgsql_client_context_impl,
     scan_pgsql_source as _scan_pgsql_source_impl,
 )
 from skills_runtime.skills.sources.redis import (
+    RedisScanCache,
     ensure_redis_bundle_extracted as _ensure_redis_bundle_extracted_impl,
     scan_redis_source as _scan_redis_source_impl,
 )
@@ -82,11 +89,19 @@ class SkillsManager:
         self._skills_by_path: Dict[Path, Skill] = {}
         self._skills_by_name: Dict[str, List[Skill]] = {}
         self._scan_report: Optional[ScanReport] = None
+        # skills 列表内容的代际号：列表（或启用状态）实际变化时才递增，供 prompt 前缀缓存做 key。
+        self._scan_generation = 0
+        self._scan_signature: Optional[Tuple[Tuple[str, ...], ...]] = None
+        # 相关性索引：每次 scan 后增量同步，供 skills list 按 task 取 top-k。
+        self._skills_index = SkillsIndex()
         self._scan_lock = threading.RLock()
         self._scan_cache_key: Optional[str] = None
         self._scan_last_ok_at_monotonic: Optional[float] = None
         self._scan_last_ok_report: Optional[ScanReport] = None
         self._disabled_paths: set[Path] = set()
+        # refresh_policy=incremental：按 (space_id, source_id) 保存的增量扫描状态（绑定 scan cache key）。
+        self._incremental_scan_caches: Dict[Tuple[str, str], Any] = {}
+        self._incremental_cache_key: Optional[str] = None
         self._scan_options = _scan_options_from_config(self._skills_config)
         bundles_cfg = getattr(self._skills_config, "bundles", None)
         self._bundle_max_bytes = int(getattr(bundles_cfg, "max_bytes", 1 * 1024 * 1024) or 1 * 1024 * 1024)
@@ -94,6 +109,7 @@ class SkillsManager:
         self._bundle_max_extracted_bytes = getattr(bundles_cfg, "max_extracted_bytes", None)
         self._bundle_max_files = getattr(bundles_cfg, "max_files", None)
         self._bundle_max_single_file_bytes = getattr(bundles_cfg, "max_single_file_bytes", None)
+        self._body_cache = SkillBodyCache(max_bytes=int(self._skills_config.injection.body_cache_max_bytes))
 
     def _bundle_cache_root(self) -> Path:
         """bundle 解压缓存根目录（runtime-owned，可删可重建）。"""
@@ -152,12 +168,29 @@ class SkillsManager:
         """
         return self._scan_report
 
+    @property
+    def scan_generation(self) -> int:
+        """skills 列表代际号：scan 结果内容或启用状态变化时递增（内容相同的重复 scan 不变）。"""
+        return self._scan_generation
+
+    def _set_scan_report(self, report: ScanReport) -> None:
+        """写入当前 ScanReport；skills 列表内容变化时推进 `scan_generation`。"""
+
+        signature = tuple(
+            (s.space_id, s.source_id, s.namespace, s.skill_name, s.description, s.locator) for s in report.skills
+        )
+        if signature != self._scan_signature:
+            self._scan_signature = signature
+            self._scan_generation += 1
+        self._skills_index.sync(report.skills)
+        self._scan_report = report
+
     def _scan_refresh_policy_from_config(self) -> tuple[str, int]:
         """
         从 skills.scan 读取 refresh_policy/ttl_sec。
 
         返回：
-        - refresh_policy：always|ttl|manual
+        - refresh_policy：always|ttl|manual|incremental
         - ttl_sec：int（仅 ttl 生效）
         """
         scan = self._skills_config.scan
@@ -171,6 +204,23 @@ class SkillsManager:
         }
         return json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
 
+    def _prepare_incremental_scan_caches(self, *, cache_key: str, force_refresh: bool) -> None:
+        """incremental：配置变化或显式 refresh 时丢弃增量状态（下一次 scan 退化为全量重建）。"""
+        if force_refresh or self._incremental_cache_key != cache_key:
+            self._incremental_scan_caches = {}
+            self._incremental_cache_key = cache_key
+
+    def _source_scan_cache(self, space: AgentSdkSkillsConfig.Space, source: AgentSdkSkillsConfig.Source, factory: type) -> Any:
+        """incremental 模式下返回该 (space, source) 的增量扫描状态；其它策略返回 None（全量扫描）。"""
+        if str(self._skills_config.scan.refresh_policy) != "incremental":
+            return None
+        key = (space.id, source.id)
+        cache = self._incremental_scan_caches.get(key)
+        if not isinstance(cache, factory):
+            cache = factory()
+            self._incremental_scan_caches[key] = cache
+        return cache
+
     def _scan_refresh_failed_warning(self, *, refresh_policy: str, reason: str) -> FrameworkIssue:
         """构造 refresh 失败但回退缓存时的 warning。"""
         return FrameworkIssue(
@@ -208,16 +258,21 @@ class SkillsManager:
     ) -> ScanReport:
         """构建 scan 报告对象。"""
         enabled_spaces = [s for s in self._skills_config.spaces if s.enabled]
+        stats = {
+            "spaces_total": len(enabled_spaces),
+            "sources_total": len(self._skills_config.sources),
+            "skills_total": len(skills),
+        }
+        if str(self._skills_config.scan.refresh_policy) == "incremental":
+            caches = list(self._incremental_scan_caches.values())
+            stats["skills_reused"] = sum(int(getattr(c, "reused", 0)) for c in caches)
+            stats["skills_reloaded"] = sum(int(getattr(c, "reloaded", 0)) for c in caches)
         return ScanReport(
             scan_id=f"scan_{uuid.uuid4().hex[:12]}",
             skills=skills,
             errors=errors,
             warnings=warnings,
-            stats={
-                "spaces_total": len(enabled_spaces),
-                "sources_total": len(self._skills_config.sources),
-                "skills_total": len(skills),
-            },
+            stats=stats,
         )
 
     def _scan_filesystem_source(
@@ -236,6 +291,7 @@ class SkillsManager:
             source=source,
             sink=sink,
             errors=errors,
+            scan_cache=self._source_scan_cache(space, source, FilesystemScanCache),
         )
 
     def _scan_in_memory_source(
@@ -282,6 +338,7 @@ class SkillsManager:
             sink=sink,
             errors=errors,
             get_redis_client_for_source=self._get_redis_client,
+            scan_cache=self._source_scan_cache(space, source, RedisScanCache),
         )
 
     def _scan_pgsql_source(
@@ -308,6 +365,7 @@ class SkillsManager:
             sink=sink,
             errors=errors,
             pgsql_client_context_for_source=_client_ctx,
+            scan_cache=self._source_scan_cache(space, source, PgsqlScanCache),
         )
 
     def _check_duplicates_or_raise(self, skills: Sequence[Skill]) -> None:
@@ -349,16 +407,40 @@ class SkillsManager:
             return items
         return [s for s in items if not (s.path is not None and s.path in self._disabled_paths)]
 
+    def rank_skills(self, query: str, *, limit: int, enabled_only: bool = True) -> List[Skill]:
+        """
+        按与 query 的相关性返回最多 `limit` 个 skills（BM25；无任何词命中的 skill 不返回）。
+
+        参数：
+        - query：查询文本（通常是 task + user input）
+        - limit：最多返回条数
+        - enabled_only：是否跳过已禁用的 skill
+        """
+
+        if limit <= 0:
+            return []
+        out: List[Skill] = []
+        for skill, _score in self._skills_index.search(query):
+            if enabled_only and skill.path is not None and skill.path in self._disabled_paths:
+                continue
+            out.append(skill)
+            if len(out) >= limit:
+                break
+        return out
+
     def set_enabled(self, skill_path: Path, enabled: bool) -> None:
         """按 skill 路径启用/禁用（主要用于 Studio/UI 层的运行态过滤）。"""
 
         p = Path(skill_path).resolve()
         if p not in self._skills_by_path:
             raise UserError(f"未扫描到的 skill：{p}")
+        was_enabled = p not in self._disabled_paths
         if enabled:
             self._disabled_paths.discard(p)
         else:
             self._disabled_paths.add(p)
+        if was_enabled != bool(enabled):
+            self._scan_generation += 1
 
     def _raise_space_not_configured(self, mention) -> None:
         """抛出 space 未配置错误。"""
@@ -380,6 +462,14 @@ class SkillsManager:
         """渲染注入到 prompt 的 skill 文本（用于 mention 注入）。"""
         return _render_injected_skill(self, skill, source=source, mention_text=mention_text)
 
+    def _load_skill_body(self, skill: Skill) -> str:
+        """读取 skill 正文（经进程内正文缓存；未命中时调用 `skill.body_loader`）。"""
+        return self._body_cache.get_or_load(skill, skill.body_loader)
+
+    def body_cache_stats(self) -> Dict[str, Any]:
+        """返回注入正文缓存的命中/未命中/淘汰统计（只读快照）。"""
+        return self._body_cache.stats()
+
     def close(self) -> None:
         """释放运行时创建的 source client。"""
         self._client_registry.close()
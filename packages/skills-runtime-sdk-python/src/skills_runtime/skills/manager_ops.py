@@ -88,13 +88,16 @@ def scan(manager, *, force_refresh: bool = False) -> ScanReport:
             cached_ok = manager._scan_last_ok_report
             cached_ok_at = manager._scan_last_ok_at_monotonic
 
+        if refresh_policy == "incremental":
+            manager._prepare_incremental_scan_caches(cache_key=cache_key, force_refresh=force_refresh)
+
         if not force_refresh and refresh_policy == "ttl" and cached_ok is not None and cached_ok_at is not None:
             if (manager._now_monotonic() - float(cached_ok_at)) < float(ttl_sec):
-                manager._scan_report = cached_ok
+                manager._set_scan_report(cached_ok)
                 return cached_ok
 
         if not force_refresh and refresh_policy == "manual" and cached_ok is not None:
-            manager._scan_report = cached_ok
+            manager._set_scan_report(cached_ok)
             return cached_ok
 
         report, skills_by_key, skills_by_path, skills_by_name, fatal_exc = perform_full_scan(manager)
@@ -103,10 +106,10 @@ def scan(manager, *, force_refresh: bool = False) -> ScanReport:
             if refresh_policy in {"ttl", "manual"} and cached_ok is not None:
                 warn = manager._scan_refresh_failed_warning(refresh_policy=refresh_policy, reason=str(fatal_exc))
                 fallback = manager._make_scan_report(skills=list(cached_ok.skills), errors=[], warnings=[warn])
-                manager._scan_report = fallback
+                manager._set_scan_report(fallback)
                 return fallback
 
-            manager._scan_report = report
+            manager._set_scan_report(report)
             manager._skills_by_key = {}
             manager._skills_by_path = {}
             manager._skills_by_name = {}
@@ -118,10 +121,10 @@ def scan(manager, *, force_refresh: bool = False) -> ScanReport:
                 reason=f"scan_errors: {[e.code for e in report.errors]}",
             )
             fallback = manager._make_scan_report(skills=list(cached_ok.skills), errors=[], warnings=[warn])
-            manager._scan_report = fallback
+            manager._set_scan_report(fallback)
             return fallback
 
-        manager._scan_report = report
+        manager._set_scan_report(report)
         manager._skills_by_key = skills_by_key
         manager._skills_by_path = skills_by_path
         manager._skills_by_name = skills_by_name
@@ -180,12 +183,12 @@ def resolve_mentions(manager, text: str) -> List[Tuple[Skill, SkillMention]]:
 
 
 def render_injected_skill(manager, skill: Skill, *, source: str, mention_text: str | None = None) -> str:
-    """Render injected skill (lazy-load body + max_bytes validation)."""
+    """Render injected skill (lazy-load body via the manager body cache + max_bytes validation)."""
 
     _ = source
     _ = mention_text
     try:
-        raw = skill.body_loader()
+        raw = manager._load_skill_body(skill)
     except Exception as exc:
         raise FrameworkError(
             code="SKILL_BODY_READ_FAILED",
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+from dataclasses import dataclass, field
+import os
 from pathlib import Path
-from typing import Any, Dict, List
+import time
+from typing import Dict, List, Optional, Tuple
 
 from skills_runtime.config.loader import AgentSdkSkillsConfig
 from skills_runtime.core.errors import FrameworkIssue
@@ -10,6 +13,26 @@ from skills_runtime.skills.mentions import is_valid_skill_name_slug
 from skills_runtime.skills.models import Skill
 from skills_runtime.skills.sources._utils import utc_from_timestamp_rfc3339
 
+# mtime 距今不足该窗口的条目不缓存（规避粗粒度 mtime 下的“同一时间片内二次修改”）。
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+@dataclass
+class FilesystemScanCache:
+    """
+    filesystem source 的增量扫描状态（`refresh_policy=incremental`）。
+
+    字段：
+    - dirs：目录 -> (stat 指纹, 排序后的 `(name, kind)` 列表)
+    - files：SKILL.md 路径 -> (stat 指纹, 上次解析结果：Skill 或 FrameworkIssue)
+    - reused/reloaded：最近一次 scan 中复用/重新读取 frontmatter 的 SKILL.md 数量
+    """
+
+    dirs: Dict[Path, Tuple[Tuple[int, int, int, int], List[Tuple[str, str]]]] = field(default_factory=dict)
+    files: Dict[Path, Tuple[Tuple[int, int, int, int], Skill | FrameworkIssue]] = field(default_factory=dict)
+    reused: int = 0
+    reloaded: int = 0
+
 
 def scan_filesystem_source(
     *,
@@ -19,8 +42,14 @@ def scan_filesystem_source(
     source: AgentSdkSkillsConfig.Source,
     sink: List[Skill],
     errors: List[FrameworkIssue],
+    scan_cache: Optional[FilesystemScanCache] = None,
 ) -> None:
-    """Scan filesystem source (metadata-only; does not read body during scan)."""
+    """
+    Scan filesystem source (metadata-only; does not read body during scan).
+
+    With `scan_cache` (incremental mode), unchanged directories are not re-listed and
+    unchanged SKILL.md files are not re-parsed; results are identical to a full scan.
+    """
 
     root = source.options.get("root")
     if not isinstance(root, str) or not root.strip():
@@ -47,6 +76,12 @@ def scan_filesystem_source(
     max_depth = int(scan_options["max_depth"])
     max_dirs_per_root = int(scan_options["max_dirs_per_root"])
 
+    if scan_cache is not None:
+        scan_cache.reused = 0
+        scan_cache.reloaded = 0
+    seen_dirs: set[Path] = set()
+    seen_files: set[Path] = set()
+
     visited_dirs = 0
     queue: List[tuple[Path, int]] = [(fs_root, 0)]
     while queue:
@@ -63,104 +98,199 @@ def scan_filesystem_source(
             break
         if depth > max_depth:
             continue
+        seen_dirs.add(cur)
 
-        entries = sorted(cur.iterdir(), key=lambda p: p.name)
-        for entry in entries:
-            if ignore_dot_entries and entry.name.startswith("."):
+        for name, kind in _list_dir(cur, scan_cache=scan_cache):
+            if ignore_dot_entries and name.startswith("."):
                 continue
-            # 默认策略（fail-closed）：scan 阶段不跟随目录 symlink，避免 traversal 扩展扫描范围。
-            # 但对 `SKILL.md` symlink 需要显式产出结构化 issue（避免静默吞掉）。
-            if entry.is_symlink() and entry.name != "SKILL.md":
-                continue
-            if entry.is_dir():
+            entry = cur / name
+            if kind == "dir":
                 queue.append((entry, depth + 1))
                 continue
-            if not entry.is_file() or entry.name != "SKILL.md":
+            if kind != "skill_md":
                 continue
 
-            skill_md = entry
-            try:
-                skill_md_real = skill_md.resolve()
-            except OSError as exc:
-                errors.append(
-                    FrameworkIssue(
-                        code="SKILL_SCAN_METADATA_INVALID",
-                        message="Skill metadata is invalid.",
-                        details={
-                            "source_id": source.id,
-                            "path": str(skill_md),
-                            "reason": f"resolve_failed:{exc}",
-                        },
-                    )
-                )
-                continue
-            if not skill_md_real.is_relative_to(root_real):
-                errors.append(
-                    FrameworkIssue(
-                        code="SKILL_SCAN_METADATA_INVALID",
-                        message="Skill metadata is invalid.",
-                        details={
-                            "source_id": source.id,
-                            "root": str(fs_root),
-                            "root_real": str(root_real),
-                            "path": str(skill_md),
-                            "path_real": str(skill_md_real),
-                            "reason": "path_escape",
-                        },
-                    )
-                )
-                continue
-            try:
-                loaded = load_skill_metadata_from_path(
-                    skill_md,
-                    max_frontmatter_bytes=int(scan_options["max_frontmatter_bytes"]),
+            if scan_cache is None:
+                result = _load_skill_entry(
+                    skill_md=entry,
+                    root_real=root_real,
+                    fs_root=fs_root,
+                    scan_options=scan_options,
+                    space=space,
+                    source=source,
                 )
-            except SkillLoadError as exc:
-                errors.append(
-                    FrameworkIssue(
-                        code="SKILL_SCAN_METADATA_INVALID",
-                        message="Skill metadata is invalid.",
-                        details={
-                            "source_id": source.id,
-                            "path": str(skill_md),
-                            "reason": exc.message,
-                        },
+            else:
+                try:
+                    sig = _stable_sig(os.stat(entry))
+                except OSError:
+                    # symlink 目标消失等：与全量扫描一致（`is_file()` 为 False 时静默跳过）。
+                    scan_cache.files.pop(entry, None)
+                    continue
+                cached = scan_cache.files.get(entry)
+                if sig is not None and cached is not None and cached[0] == sig:
+                    result = cached[1]
+                    scan_cache.reused += 1
+                else:
+                    result = _load_skill_entry(
+                        skill_md=entry,
+                        root_real=root_real,
+                        fs_root=fs_root,
+                        scan_options=scan_options,
+                        space=space,
+                        source=source,
                     )
-                )
-                continue
+                    scan_cache.reloaded += 1
+                    if sig is None:
+                        scan_cache.files.pop(entry, None)
+                    else:
+                        scan_cache.files[entry] = (sig, result)
+                seen_files.add(entry)
 
-            stat = skill_md.stat()
-            if not is_valid_skill_name_slug(loaded.skill_name):
-                errors.append(
-                    FrameworkIssue(
-                        code="SKILL_SCAN_METADATA_INVALID",
-                        message="Skill metadata is invalid.",
-                        details={
-                            "source_id": source.id,
-                            "path": str(skill_md),
-                            "field": "skill_name",
-                            "actual": loaded.skill_name,
-                            "reason": "invalid_skill_name_slug",
-                        },
-                    )
-                )
-                continue
-            sink.append(
-                Skill(
-                    space_id=space.id,
-                    source_id=source.id,
-                    namespace=space.namespace,
-                    skill_name=loaded.skill_name,
-                    description=loaded.description,
-                    locator=str(skill_md),
-                    path=skill_md_real,
-                    body_size=int(stat.st_size),
-                    body_loader=lambda p=skill_md, r=root_real: _read_body_under_root(p, r),
-                    required_env_vars=list(loaded.required_env_vars),
-                    metadata={**dict(loaded.metadata), "updated_at": utc_from_timestamp_rfc3339(stat.st_mtime)},
-                    scope=loaded.scope,
-                )
-            )
+            if isinstance(result, Skill):
+                sink.append(result)
+            else:
+                errors.append(result)
+
+    if scan_cache is not None:
+        for stale in [p for p in scan_cache.files if p not in seen_files]:
+            del scan_cache.files[stale]
+        for stale in [p for p in scan_cache.dirs if p not in seen_dirs]:
+            del scan_cache.dirs[stale]
+
+
+def _stable_sig(st: os.stat_result) -> Optional[Tuple[int, int, int, int]]:
+    """
+    由 stat 结果生成变更指纹；mtime 过新（处于 racy 窗口内）时返回 None（不可缓存）。
+
+    说明：
+    - 部分文件系统 mtime 精度较粗，同一精度窗口内的二次修改无法由 mtime 区分；
+      对“刚修改过”的条目不缓存，下一次 scan 会重新读取。
+    """
+
+    if time.time_ns() - int(st.st_mtime_ns) < _RACY_WINDOW_NS:
+        return None
+    return (int(st.st_dev), int(st.st_ino), int(st.st_mtime_ns), int(st.st_size))
+
+
+def _list_dir(cur: Path, *, scan_cache: Optional["FilesystemScanCache"]) -> List[Tuple[str, str]]:
+    """
+    列出目录条目并分类为 `dir|skill_md|other`（按名称排序）。
+
+    增量模式下：目录 `(dev, ino, mtime)` 未变化时直接复用上次的分类结果，不再 `iterdir()`。
+    目录内增删/重命名条目都会更新该目录的 mtime，因此复用是安全的。
+    """
+
+    sig: Optional[Tuple[int, int, int, int]] = None
+    if scan_cache is not None:
+        try:
+            sig = _stable_sig(os.stat(cur))
+        except OSError:
+            sig = None
+        cached = scan_cache.dirs.get(cur)
+        if sig is not None and cached is not None and cached[0] == sig:
+            return cached[1]
+
+    listing: List[Tuple[str, str]] = []
+    for entry in sorted(cur.iterdir(), key=lambda p: p.name):
+        # 默认策略（fail-closed）：scan 阶段不跟随目录 symlink，避免 traversal 扩展扫描范围。
+        # 但对 `SKILL.md` symlink 需要显式产出结构化 issue（避免静默吞掉）。
+        if entry.is_symlink() and entry.name != "SKILL.md":
+            kind = "other"
+        elif entry.is_dir():
+            kind = "dir"
+        elif entry.is_file() and entry.name == "SKILL.md":
+            kind = "skill_md"
+        else:
+            kind = "other"
+        listing.append((entry.name, kind))
+
+    if scan_cache is not None:
+        if sig is None:
+            scan_cache.dirs.pop(cur, None)
+        else:
+            scan_cache.dirs[cur] = (sig, listing)
+    return listing
+
+
+def _load_skill_entry(
+    *,
+    skill_md: Path,
+    root_real: Path,
+    fs_root: Path,
+    scan_options: Dict[str, int | bool],
+    space: AgentSdkSkillsConfig.Space,
+    source: AgentSdkSkillsConfig.Source,
+) -> Skill | FrameworkIssue:
+    """读取单个 SKILL.md 的 frontmatter 并构造 Skill；不合法时返回结构化 issue。"""
+
+    try:
+        skill_md_real = skill_md.resolve()
+    except OSError as exc:
+        return FrameworkIssue(
+            code="SKILL_SCAN_METADATA_INVALID",
+            message="Skill metadata is invalid.",
+            details={
+                "source_id": source.id,
+                "path": str(skill_md),
+                "reason": f"resolve_failed:{exc}",
+            },
+        )
+    if not skill_md_real.is_relative_to(root_real):
+        return FrameworkIssue(
+            code="SKILL_SCAN_METADATA_INVALID",
+            message="Skill metadata is invalid.",
+            details={
+                "source_id": source.id,
+                "root": str(fs_root),
+                "root_real": str(root_real),
+                "path": str(skill_md),
+                "path_real": str(skill_md_real),
+                "reason": "path_escape",
+            },
+        )
+    try:
+        loaded = load_skill_metadata_from_path(
+            skill_md,
+            max_frontmatter_bytes=int(scan_options["max_frontmatter_bytes"]),
+        )
+    except SkillLoadError as exc:
+        return FrameworkIssue(
+            code="SKILL_SCAN_METADATA_INVALID",
+            message="Skill metadata is invalid.",
+            details={
+                "source_id": source.id,
+                "path": str(skill_md),
+                "reason": exc.message,
+            },
+        )
+
+    stat = skill_md.stat()
+    if not is_valid_skill_name_slug(loaded.skill_name):
+        return FrameworkIssue(
+            code="SKILL_SCAN_METADATA_INVALID",
+            message="Skill metadata is invalid.",
+            details={
+                "source_id": source.id,
+                "path": str(skill_md),
+                "field": "skill_name",
+                "actual": loaded.skill_name,
+                "reason": "invalid_skill_name_slug",
+            },
+        )
+    return Skill(
+        space_id=space.id,
+        source_id=source.id,
+        namespace=space.namespace,
+        skill_name=loaded.skill_name,
+        description=loaded.description,
+        locator=str(skill_md),
+        path=skill_md_real,
+        body_size=int(stat.st_size),
+        body_loader=lambda p=skill_md, r=root_real: _read_body_under_root(p, r),
+        required_env_vars=list(loaded.required_env_vars),
+        metadata={**dict(loaded.metadata), "updated_at": utc_from_timestamp_rfc3339(stat.st_mtime)},
+        scope=loaded.scope,
+    )
 
 
 def _read_body_under_root(path: Path, root_real: Path) -> str:
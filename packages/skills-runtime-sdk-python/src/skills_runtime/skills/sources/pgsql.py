@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import contextlib
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Dict, Iterator, List, Mapping, MutableMapping
+from typing import Any, Dict, Iterator, List, Mapping, MutableMapping, Optional, Tuple
 
 from skills_runtime.config.loader import AgentSdkSkillsConfig
 from skills_runtime.core.errors import FrameworkError, FrameworkIssue
@@ -11,6 +12,50 @@ from skills_runtime.skills.models import Skill
 from skills_runtime.skills.sources._utils import ensure_metadata_string, normalize_optional_int, safe_identifier
 
 
+@dataclass
+class PgsqlScanCache:
+    """
+    pgsql source 的增量扫描状态（`refresh_policy=incremental`）。
+
+    字段：
+    - fingerprint：上次全量查询时的 `(count(*), max(updated_at))`；None 表示不可复用
+    - skills/issues：上次全量查询产出的 Skill 与结构化 issue
+    - reused/reloaded：最近一次 scan 中复用/重新校验的行数（source 级：要么全部复用，要么全部重读）
+
+    约束：
+    - 依赖 writer 在每次更新行时刷新 `updated_at`（删除/禁用由 count 变化覆盖）。
+    """
+
+    fingerprint: Optional[Tuple[Any, ...]] = None
+    skills: List[Skill] = field(default_factory=list)
+    issues: List[FrameworkIssue] = field(default_factory=list)
+    reused: int = 0
+    reloaded: int = 0
+
+
+def _pgsql_fingerprint(client: Any, *, table_ref: str, namespace: str) -> Optional[Tuple[Any, ...]]:
+    """查询 `(count(*), max(updated_at))` 作为 source 级变更指纹；失败或无 updated_at 时返回 None。"""
+
+    sql = (
+        "SELECT count(*) AS row_count, max(updated_at) AS max_updated_at "
+        f"FROM {table_ref} "
+        "WHERE enabled = TRUE AND namespace = %s"
+    )
+    try:
+        with client.cursor() as cursor:
+            cursor.execute(sql, (namespace,))
+            rows = fetchall_as_rows(cursor)
+    except Exception:
+        return None
+    if len(rows) != 1:
+        return None
+    row_count = rows[0].get("row_count")
+    max_updated_at = rows[0].get("max_updated_at")
+    if max_updated_at is None and row_count not in (0, "0"):
+        return None
+    return (str(row_count), str(max_updated_at))
+
+
 def get_pgsql_client(
     *,
     source: AgentSdkSkillsConfig.Source,
@@ -146,8 +191,14 @@ def scan_pgsql_source(
     sink: List[Skill],
     errors: List[FrameworkIssue],
     pgsql_client_context_for_source,
+    scan_cache: Optional[PgsqlScanCache] = None,
 ) -> None:
-    """Scan pgsql source (metadata-only)."""
+    """
+    Scan pgsql source (metadata-only).
+
+    With `scan_cache` (incremental mode), a cheap `count/max(updated_at)` probe runs first;
+    when it matches the previous scan, the cached skills are reused without the metadata query.
+    """
 
     try:
         schema = safe_identifier(source.options.get("schema"), field="schema", source_id=source.id)
@@ -167,11 +218,21 @@ def scan_pgsql_source(
         "WHERE enabled = TRUE AND namespace = %s"
     )
 
+    fingerprint: Optional[Tuple[Any, ...]] = None
+    rows: Optional[List[Dict[str, Any]]]
+    if scan_cache is not None:
+        scan_cache.reused = 0
+        scan_cache.reloaded = 0
     try:
         with pgsql_client_context_for_source(source) as client:
-            with client.cursor() as cursor:
-                cursor.execute(sql, (space.namespace,))
-                rows = fetchall_as_rows(cursor)
+            if scan_cache is not None:
+                fingerprint = _pgsql_fingerprint(client, table_ref=table_ref, namespace=space.namespace)
+            if fingerprint is not None and scan_cache is not None and fingerprint == scan_cache.fingerprint:
+                rows = None
+            else:
+                with client.cursor() as cursor:
+                    cursor.execute(sql, (space.namespace,))
+                    rows = fetchall_as_rows(cursor)
     except FrameworkError as exc:
         errors.append(exc.to_issue())
         return
@@ -187,9 +248,19 @@ def scan_pgsql_source(
                 },
             )
         )
+        if scan_cache is not None:
+            scan_cache.fingerprint = None
         return
 
-    for row in rows:
+    if rows is None and scan_cache is not None:
+        sink.extend(scan_cache.skills)
+        errors.extend(scan_cache.issues)
+        scan_cache.reused = len(scan_cache.skills)
+        return
+
+    sink_start = len(sink)
+    errors_start = len(errors)
+    for row in rows or []:
         locator = f"{schema}.{table}#{row.get('id')}"
         try:
             skill_name = ensure_metadata_string(row.get("skill_name"), field="skill_name", source_id=source.id, locator=locator)
@@ -318,3 +389,9 @@ def scan_pgsql_source(
             )
         except FrameworkError as exc:
             errors.append(exc.to_issue())
+
+    if scan_cache is not None:
+        scan_cache.fingerprint = fingerprint
+        scan_cache.reloaded = len(rows or [])
+        scan_cache.skills = list(sink[sink_start:])
+        scan_cache.issues = list(errors[errors_start:])
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import contextlib
+from dataclasses import dataclass, field
 import os
 from pathlib import Path
-from typing import Any, Callable, Dict, Iterator, List, Mapping, MutableMapping
+from typing import Any, Callable, Dict, Iterator, List, Mapping, MutableMapping, Optional, Sequence, Tuple
 
 from skills_runtime.config.loader import AgentSdkSkillsConfig
 from skills_runtime.core.errors import FrameworkError, FrameworkIssue
@@ -13,6 +14,107 @@ from skills_runtime.skills.mentions import is_valid_skill_name_slug
 from skills_runtime.skills.models import Skill
 from skills_runtime.skills.sources._utils import ensure_metadata_string, normalize_optional_int, parse_json_string_field
 
+# 每个 pipeline 批次包含的 meta key 数（`options.scan_batch_size` 未配置时）。
+_DEFAULT_SCAN_BATCH_SIZE = 100
+
+
+@dataclass
+class RedisScanCache:
+    """
+    redis source 的增量扫描状态（`refresh_policy=incremental`）。
+
+    字段：
+    - skills：meta key -> (`(etag, updated_at)` 指纹, 上次构造的 Skill)
+    - reused/reloaded：最近一次 scan 中复用/重新 HGETALL 的 key 数量
+
+    约束：
+    - 只有 `etag/updated_at` 至少一个非空的 key 才会被缓存；writer 更新 meta 时必须同步更新它们。
+    """
+
+    skills: Dict[str, Tuple[Tuple[Optional[str], Optional[str]], Skill]] = field(default_factory=dict)
+    reused: int = 0
+    reloaded: int = 0
+
+
+def _redis_batch(client: Any, raw_keys: Sequence[Any], op: Callable[[Any, Any], Any]) -> List[Any]:
+    """
+    对一批 key 执行同一条命令，尽量合并为一次 pipeline round-trip。
+
+    参数：
+    - op：`op(target, raw_key)` 在 client 或 pipeline 上发出单条命令
+
+    返回：
+    - 与 raw_keys 等长的结果列表；单个 key 失败时对应位置为异常对象（不中断整批）
+
+    说明：
+    - client 不支持 `pipeline()`（例如测试 fake）或只有 1 个 key 时逐条执行；
+    - pipeline 使用 `transaction=False`（只读批量，不需要 MULTI/EXEC）。
+    """
+
+    if not raw_keys:
+        return []
+    pipeline_factory = getattr(client, "pipeline", None)
+    if len(raw_keys) > 1 and callable(pipeline_factory):
+        try:
+            pipe = pipeline_factory(transaction=False)
+            for rk in raw_keys:
+                op(pipe, rk)
+            out = list(pipe.execute(raise_on_error=False))
+        except Exception as exc:
+            return [exc] * len(raw_keys)
+        if len(out) != len(raw_keys):
+            return [RuntimeError(f"pipeline returned {len(out)} results for {len(raw_keys)} commands")] * len(raw_keys)
+        return out
+
+    results: List[Any] = []
+    for rk in raw_keys:
+        try:
+            results.append(op(client, rk))
+        except Exception as exc:
+            results.append(exc)
+    return results
+
+
+def _redis_meta_fingerprints(
+    client: Any, raw_keys: Sequence[Any]
+) -> List[Optional[Tuple[Optional[str], Optional[str]]]]:
+    """
+    批量 HMGET 读取 meta 的 `etag/updated_at` 作为变更指纹（比 HGETALL 轻量）。
+
+    返回：
+    - 与 raw_keys 等长；client 不支持 hmget、读取失败或两个字段都为空时对应位置为 None（调用方回退为完整读取）
+    """
+
+    if not callable(getattr(client, "hmget", None)):
+        return [None] * len(raw_keys)
+    out: List[Optional[Tuple[Optional[str], Optional[str]]]] = []
+    for values in _redis_batch(client, raw_keys, lambda target, rk: target.hmget(rk, ["etag", "updated_at"])):
+        if not isinstance(values, (list, tuple)) or len(values) != 2:
+            out.append(None)
+            continue
+        fields: List[Optional[str]] = []
+        for v in values:
+            if isinstance(v, bytes):
+                v = v.decode("utf-8", errors="replace")
+            fields.append(v if isinstance(v, str) and v else None)
+        out.append(None if fields[0] is None and fields[1] is None else (fields[0], fields[1]))
+    return out
+
+
+def _optional_positive_int_option(source: AgentSdkSkillsConfig.Source, name: str) -> Optional[int]:
+    """读取 source.options 中可选的正整数选项；类型不合法时抛 `SKILL_SCAN_METADATA_INVALID`。"""
+
+    value = source.options.get(name)
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise FrameworkError(
+            code="SKILL_SCAN_METADATA_INVALID",
+            message="Skill metadata is invalid.",
+            details={"source_id": source.id, "field": name, "expected": "positive integer"},
+        )
+    return int(value)
+
 
 def get_redis_client(
     *,
@@ -182,6 +284,197 @@ def ensure_redis_bundle_extracted(
     )
 
 
+def _redis_meta_to_skill(
+    *,
+    space: AgentSdkSkillsConfig.Space,
+    source: AgentSdkSkillsConfig.Source,
+    key_prefix: str,
+    locator: str,
+    meta: Mapping[Any, Any],
+    get_redis_client_for_source: Callable[[AgentSdkSkillsConfig.Source], Any],
+) -> Skill:
+    """将一条 HGETALL 结果解码并校验为 Skill（不合法时抛 `SKILL_SCAN_METADATA_INVALID`）。"""
+
+    normalized: Dict[str, Any] = {}
+    for mk, mv in meta.items():
+        key_name = mk.decode("utf-8") if isinstance(mk, bytes) else str(mk)
+        if isinstance(mv, bytes):
+            normalized[key_name] = mv.decode("utf-8")
+        else:
+            normalized[key_name] = mv
+
+    skill_name = ensure_metadata_string(
+        normalized.get("skill_name"),
+        field="skill_name",
+        source_id=source.id,
+        locator=locator,
+    )
+    if not is_valid_skill_name_slug(skill_name):
+        raise FrameworkError(
+            code="SKILL_SCAN_METADATA_INVALID",
+            message="Skill metadata is invalid.",
+            details={"source_id": source.id, "locator": locator, "field": "skill_name", "actual": skill_name},
+        )
+    description = ensure_metadata_string(
+        normalized.get("description"),
+        field="description",
+        source_id=source.id,
+        locator=locator,
+    )
+    created_at = ensure_metadata_string(
+        normalized.get("created_at"),
+        field="created_at",
+        source_id=source.id,
+        locator=locator,
+    )
+    body_size = normalize_optional_int(
+        normalized.get("body_size"),
+        field="body_size",
+        source_id=source.id,
+        locator=locator,
+    )
+
+    required_env_vars_parsed = parse_json_string_field(
+        normalized.get("required_env_vars"),
+        field="required_env_vars",
+        source_id=source.id,
+        locator=locator,
+    )
+    required_env_vars: List[str]
+    if required_env_vars_parsed is None:
+        required_env_vars = []
+    elif isinstance(required_env_vars_parsed, list) and all(isinstance(v, str) for v in required_env_vars_parsed):
+        required_env_vars = list(required_env_vars_parsed)
+    else:
+        raise FrameworkError(
+            code="SKILL_SCAN_METADATA_INVALID",
+            message="Skill metadata is invalid.",
+            details={"source_id": source.id, "locator": locator, "field": "required_env_vars"},
+        )
+
+    metadata_parsed = parse_json_string_field(
+        normalized.get("metadata"),
+        field="metadata",
+        source_id=source.id,
+        locator=locator,
+    )
+    metadata_obj: Dict[str, Any]
+    if metadata_parsed is None:
+        metadata_obj = {}
+    elif isinstance(metadata_parsed, dict):
+        metadata_obj = dict(metadata_parsed)
+    else:
+        raise FrameworkError(
+            code="SKILL_SCAN_METADATA_INVALID",
+            message="Skill metadata is invalid.",
+            details={"source_id": source.id, "locator": locator, "field": "metadata"},
+        )
+
+    body_key = normalized.get("body_key")
+    if body_key is None:
+        body_key = f"{key_prefix}body:{space.namespace}:{skill_name}"
+    if not isinstance(body_key, str) or not body_key:
+        raise FrameworkError(
+            code="SKILL_SCAN_METADATA_INVALID",
+            message="Skill metadata is invalid.",
+            details={"source_id": source.id, "locator": locator, "field": "body_key"},
+        )
+
+    etag = normalized.get("etag")
+    if etag is not None and not isinstance(etag, str):
+        raise FrameworkError(
+            code="SKILL_SCAN_METADATA_INVALID",
+            message="Skill metadata is invalid.",
+            details={"source_id": source.id, "locator": locator, "field": "etag"},
+        )
+    updated_at = normalized.get("updated_at")
+    if updated_at is not None and not isinstance(updated_at, str):
+        raise FrameworkError(
+            code="SKILL_SCAN_METADATA_INVALID",
+            message="Skill metadata is invalid.",
+            details={"source_id": source.id, "locator": locator, "field": "updated_at"},
+        )
+    scope = normalized.get("scope")
+    if scope is not None and not isinstance(scope, str):
+        raise FrameworkError(
+            code="SKILL_SCAN_METADATA_INVALID",
+            message="Skill metadata is invalid.",
+            details={"source_id": source.id, "locator": locator, "field": "scope"},
+        )
+
+    bundle_sha256 = normalized.get("bundle_sha256")
+    if bundle_sha256 is not None:
+        if not isinstance(bundle_sha256, str) or not is_sha256_hex(bundle_sha256):
+            raise FrameworkError(
+                code="SKILL_SCAN_METADATA_INVALID",
+                message="Skill metadata is invalid.",
+                details={"source_id": source.id, "locator": locator, "field": "bundle_sha256"},
+            )
+
+    bundle_key = normalized.get("bundle_key")
+    if bundle_key is not None and (not isinstance(bundle_key, str) or not bundle_key):
+        raise FrameworkError(
+            code="SKILL_SCAN_METADATA_INVALID",
+            message="Skill metadata is invalid.",
+            details={"source_id": source.id, "locator": locator, "field": "bundle_key"},
+        )
+
+    bundle_size = normalized.get("bundle_size")
+    if bundle_size is not None:
+        bundle_size = normalize_optional_int(bundle_size, field="bundle_size", source_id=source.id, locator=locator)
+
+    bundle_format = normalized.get("bundle_format")
+    if bundle_format is not None:
+        if not isinstance(bundle_format, str) or str(bundle_format).strip().lower() != "zip":
+            raise FrameworkError(
+                code="SKILL_SCAN_METADATA_INVALID",
+                message="Skill metadata is invalid.",
+                details={"source_id": source.id, "locator": locator, "field": "bundle_format"},
+            )
+
+    def _load_body(
+        redis_client_context_ref=_redis_client_context,
+        get_redis_client_for_source_ref=get_redis_client_for_source,
+        source_ref: AgentSdkSkillsConfig.Source = source,
+        body_key_ref: str = body_key,
+    ) -> str:
+        """延迟加载 skill body（按 redis key 读取）。"""
+        with redis_client_context_ref(source=source_ref, get_redis_client_for_source=get_redis_client_for_source_ref) as client_ref:
+            body_raw = client_ref.get(body_key_ref)
+        if body_raw is None:
+            raise FileNotFoundError(f"missing body key: {body_key_ref}")
+        if isinstance(body_raw, bytes):
+            return body_raw.decode("utf-8")
+        if isinstance(body_raw, str):
+            return body_raw
+        raise TypeError(f"invalid body type: {type(body_raw)!r}")
+
+    return Skill(
+        space_id=space.id,
+        source_id=source.id,
+        namespace=space.namespace,
+        skill_name=skill_name,
+        description=description,
+        locator=locator,
+        path=None,
+        body_size=body_size,
+        body_loader=_load_body,
+        required_env_vars=required_env_vars,
+        metadata={
+            **metadata_obj,
+            "etag": etag,
+            "created_at": created_at,
+            "updated_at": updated_at,
+            "body_key": body_key,
+            "bundle_sha256": bundle_sha256,
+            "bundle_key": bundle_key,
+            "bundle_size": bundle_size,
+            "bundle_format": bundle_format,
+        },
+        scope=scope,
+    )
+
+
 def scan_redis_source(
     *,
     space: AgentSdkSkillsConfig.Space,
@@ -189,8 +482,18 @@ def scan_redis_source(
     sink: List[Skill],
     errors: List[FrameworkIssue],
     get_redis_client_for_source: Callable[[AgentSdkSkillsConfig.Source], Any],
+    scan_cache: Optional[RedisScanCache] = None,
 ) -> None:
-    """Scan redis source (metadata-only)."""
+    """
+    Scan redis source (metadata-only).
+
+    Meta keys are read in batches of `options.scan_batch_size` (default 100) through a
+    non-transactional pipeline, so N skills cost ~N/batch round-trips instead of N.
+    `options.scan_count` is forwarded to SCAN as the COUNT hint when set.
+
+    With `scan_cache` (incremental mode), keys whose `etag/updated_at` fingerprint is
+    unchanged reuse the previously built Skill instead of a full HGETALL + re-validation.
+    """
 
     key_prefix = source.options.get("key_prefix")
     if not isinstance(key_prefix, str) or not key_prefix:
@@ -204,6 +507,8 @@ def scan_redis_source(
         return
 
     try:
+        batch_size = _optional_positive_int_option(source, "scan_batch_size") or _DEFAULT_SCAN_BATCH_SIZE
+        scan_count = _optional_positive_int_option(source, "scan_count")
         client = get_redis_client_for_source(source)
     except FrameworkError as exc:
         errors.append(exc.to_issue())
@@ -211,7 +516,10 @@ def scan_redis_source(
 
     pattern = f"{key_prefix}meta:{space.namespace}:*"
     try:
-        keys_iter = client.scan_iter(match=pattern)
+        if scan_count is not None:
+            keys_iter = client.scan_iter(match=pattern, count=scan_count)
+        else:
+            keys_iter = client.scan_iter(match=pattern)
     except Exception as exc:
         dsn_env = source.options.get("dsn_env")
         errors.append(
@@ -229,6 +537,82 @@ def scan_redis_source(
         )
         return
 
+    if scan_cache is not None:
+        scan_cache.reused = 0
+        scan_cache.reloaded = 0
+    seen_keys: set[str] = set()
+
+    def _process_batch(raw_keys: List[Any]) -> None:
+        """按批处理 meta keys：批量取指纹 → 批量 HGETALL 变化的 key → 按 key 顺序产出 Skill/issue。"""
+
+        keys = [rk.decode("utf-8") if isinstance(rk, bytes) else str(rk) for rk in raw_keys]
+        results: List[Any] = [None] * len(raw_keys)
+        fingerprints: List[Optional[Tuple[Optional[str], Optional[str]]]] = [None] * len(raw_keys)
+        todo = list(range(len(raw_keys)))
+        if scan_cache is not None:
+            seen_keys.update(keys)
+            # 指纹先于 HGETALL 读取：两者之间若发生写入，缓存的是新内容 + 旧指纹，下一次 scan 会再次刷新。
+            fingerprints = _redis_meta_fingerprints(client, raw_keys)
+            todo = []
+            for i, key in enumerate(keys):
+                cached = scan_cache.skills.get(key)
+                if fingerprints[i] is not None and cached is not None and cached[0] == fingerprints[i]:
+                    results[i] = cached[1]
+                    scan_cache.reused += 1
+                    continue
+                scan_cache.skills.pop(key, None)
+                scan_cache.reloaded += 1
+                todo.append(i)
+        metas = _redis_batch(client, [raw_keys[i] for i in todo], lambda target, rk: target.hgetall(rk))
+        for i, meta in zip(todo, metas):
+            results[i] = meta
+
+        for i, key in enumerate(keys):
+            meta = results[i]
+            if isinstance(meta, Skill):
+                sink.append(meta)
+                continue
+            locator = f"redis://{key}"
+            if isinstance(meta, Exception):
+                errors.append(
+                    FrameworkIssue(
+                        code="SKILL_SCAN_SOURCE_UNAVAILABLE",
+                        message="Skill source is unavailable in current runtime.",
+                        details={
+                            "source_id": source.id,
+                            "source_type": source.type,
+                            "locator": locator,
+                            "reason": f"redis hgetall failed: {meta}",
+                        },
+                    )
+                )
+                continue
+            if not isinstance(meta, Mapping):
+                errors.append(
+                    FrameworkIssue(
+                        code="SKILL_SCAN_METADATA_INVALID",
+                        message="Skill metadata is invalid.",
+                        details={"source_id": source.id, "locator": locator, "reason": "metadata row is not a mapping"},
+                    )
+                )
+                continue
+            try:
+                skill = _redis_meta_to_skill(
+                    space=space,
+                    source=source,
+                    key_prefix=key_prefix,
+                    locator=locator,
+                    meta=meta,
+                    get_redis_client_for_source=get_redis_client_for_source,
+                )
+            except FrameworkError as exc:
+                errors.append(exc.to_issue())
+                continue
+            sink.append(skill)
+            if scan_cache is not None and fingerprints[i] is not None:
+                scan_cache.skills[key] = (fingerprints[i], skill)
+
+    batch: List[Any] = []
     keys_iter = iter(keys_iter)
     while True:
         try:
@@ -251,216 +635,13 @@ def scan_redis_source(
                 )
             )
             break
-
-        key = raw_key.decode("utf-8") if isinstance(raw_key, bytes) else str(raw_key)
-        locator = f"redis://{key}"
-        try:
-            meta = client.hgetall(raw_key)
-        except Exception as exc:
-            errors.append(
-                FrameworkIssue(
-                    code="SKILL_SCAN_SOURCE_UNAVAILABLE",
-                    message="Skill source is unavailable in current runtime.",
-                    details={
-                        "source_id": source.id,
-                        "source_type": source.type,
-                        "locator": locator,
-                        "reason": f"redis hgetall failed: {exc}",
-                    },
-                )
-            )
-            continue
-
-        if not isinstance(meta, Mapping):
-            errors.append(
-                FrameworkIssue(
-                    code="SKILL_SCAN_METADATA_INVALID",
-                    message="Skill metadata is invalid.",
-                    details={"source_id": source.id, "locator": locator, "reason": "metadata row is not a mapping"},
-                )
-            )
-            continue
-
-        normalized: Dict[str, Any] = {}
-        for mk, mv in meta.items():
-            key_name = mk.decode("utf-8") if isinstance(mk, bytes) else str(mk)
-            if isinstance(mv, bytes):
-                normalized[key_name] = mv.decode("utf-8")
-            else:
-                normalized[key_name] = mv
-
-        try:
-            skill_name = ensure_metadata_string(
-                normalized.get("skill_name"),
-                field="skill_name",
-                source_id=source.id,
-                locator=locator,
-            )
-            if not is_valid_skill_name_slug(skill_name):
-                raise FrameworkError(
-                    code="SKILL_SCAN_METADATA_INVALID",
-                    message="Skill metadata is invalid.",
-                    details={"source_id": source.id, "locator": locator, "field": "skill_name", "actual": skill_name},
-                )
-            description = ensure_metadata_string(
-                normalized.get("description"),
-                field="description",
-                source_id=source.id,
-                locator=locator,
-            )
-            created_at = ensure_metadata_string(
-                normalized.get("created_at"),
-                field="created_at",
-                source_id=source.id,
-                locator=locator,
-            )
-            body_size = normalize_optional_int(
-                normalized.get("body_size"),
-                field="body_size",
-                source_id=source.id,
-                locator=locator,
-            )
-
-            required_env_vars_parsed = parse_json_string_field(
-                normalized.get("required_env_vars"),
-                field="required_env_vars",
-                source_id=source.id,
-                locator=locator,
-            )
-            required_env_vars: List[str]
-            if required_env_vars_parsed is None:
-                required_env_vars = []
-            elif isinstance(required_env_vars_parsed, list) and all(isinstance(v, str) for v in required_env_vars_parsed):
-                required_env_vars = list(required_env_vars_parsed)
-            else:
-                raise FrameworkError(
-                    code="SKILL_SCAN_METADATA_INVALID",
-                    message="Skill metadata is invalid.",
-                    details={"source_id": source.id, "locator": locator, "field": "required_env_vars"},
-                )
-
-            metadata_parsed = parse_json_string_field(
-                normalized.get("metadata"),
-                field="metadata",
-                source_id=source.id,
-                locator=locator,
-            )
-            metadata_obj: Dict[str, Any]
-            if metadata_parsed is None:
-                metadata_obj = {}
-            elif isinstance(metadata_parsed, dict):
-                metadata_obj = dict(metadata_parsed)
-            else:
-                raise FrameworkError(
-                    code="SKILL_SCAN_METADATA_INVALID",
-                    message="Skill metadata is invalid.",
-                    details={"source_id": source.id, "locator": locator, "field": "metadata"},
-                )
-
-            body_key = normalized.get("body_key")
-            if body_key is None:
-                body_key = f"{key_prefix}body:{space.namespace}:{skill_name}"
-            if not isinstance(body_key, str) or not body_key:
-                raise FrameworkError(
-                    code="SKILL_SCAN_METADATA_INVALID",
-                    message="Skill metadata is invalid.",
-                    details={"source_id": source.id, "locator": locator, "field": "body_key"},
-                )
-
-            etag = normalized.get("etag")
-            if etag is not None and not isinstance(etag, str):
-                raise FrameworkError(
-                    code="SKILL_SCAN_METADATA_INVALID",
-                    message="Skill metadata is invalid.",
-                    details={"source_id": source.id, "locator": locator, "field": "etag"},
-                )
-            updated_at = normalized.get("updated_at")
-            if updated_at is not None and not isinstance(updated_at, str):
-                raise FrameworkError(
-                    code="SKILL_SCAN_METADATA_INVALID",
-                    message="Skill metadata is invalid.",
-                    details={"source_id": source.id, "locator": locator, "field": "updated_at"},
-                )
-            scope = normalized.get("scope")
-            if scope is not None and not isinstance(scope, str):
-                raise FrameworkError(
-                    code="SKILL_SCAN_METADATA_INVALID",
-                    message="Skill metadata is invalid.",
-                    details={"source_id": source.id, "locator": locator, "field": "scope"},
-                )
-
-            bundle_sha256 = normalized.get("bundle_sha256")
-            if bundle_sha256 is not None:
-                if not isinstance(bundle_sha256, str) or not is_sha256_hex(bundle_sha256):
-                    raise FrameworkError(
-                        code="SKILL_SCAN_METADATA_INVALID",
-                        message="Skill metadata is invalid.",
-                        details={"source_id": source.id, "locator": locator, "field": "bundle_sha256"},
-                    )
-
-            bundle_key = normalized.get("bundle_key")
-            if bundle_key is not None and (not isinstance(bundle_key, str) or not bundle_key):
-                raise FrameworkError(
-                    code="SKILL_SCAN_METADATA_INVALID",
-                    message="Skill metadata is invalid.",
-                    details={"source_id": source.id, "locator": locator, "field": "bundle_key"},
-                )
-
-            bundle_size = normalized.get("bundle_size")
-            if bundle_size is not None:
-                bundle_size = normalize_optional_int(bundle_size, field="bundle_size", source_id=source.id, locator=locator)
-
-            bundle_format = normalized.get("bundle_format")
-            if bundle_format is not None:
-                if not isinstance(bundle_format, str) or str(bundle_format).strip().lower() != "zip":
-                    raise FrameworkError(
-                        code="SKILL_SCAN_METADATA_INVALID",
-                        message="Skill metadata is invalid.",
-                        details={"source_id": source.id, "locator": locator, "field": "bundle_format"},
-                    )
-
-            def _load_body(
-                redis_client_context_ref=_redis_client_context,
-                get_redis_client_for_source_ref=get_redis_client_for_source,
-                source_ref: AgentSdkSkillsConfig.Source = source,
-                body_key_ref: str = body_key,
-            ) -> str:
-                """延迟加载 skill body（按 redis key 读取）。"""
-                with redis_client_context_ref(source=source_ref, get_redis_client_for_source=get_redis_client_for_source_ref) as client_ref:
-                    body_raw = client_ref.get(body_key_ref)
-                if body_raw is None:
-                    raise FileNotFoundError(f"missing body key: {body_key_ref}")
-                if isinstance(body_raw, bytes):
-                    return body_raw.decode("utf-8")
-                if isinstance(body_raw, str):
-                    return body_raw
-                raise TypeError(f"invalid body type: {type(body_raw)!r}")
-
-            sink.append(
-                Skill(
-                    space_id=space.id,
-                    source_id=source.id,
-                    namespace=space.namespace,
-                    skill_name=skill_name,
-                    description=description,
-                    locator=locator,
-                    path=None,
-                    body_size=body_size,
-                    body_loader=_load_body,
-                    required_env_vars=required_env_vars,
-                    metadata={
-                        **metadata_obj,
-                        "etag": etag,
-                        "created_at": created_at,
-                        "updated_at": updated_at,
-                        "body_key": body_key,
-                        "bundle_sha256": bundle_sha256,
-                        "bundle_key": bundle_key,
-                        "bundle_size": bundle_size,
-                        "bundle_format": bundle_format,
-                    },
-                    scope=scope,
-                )
-            )
-        except FrameworkError as exc:
-            errors.append(exc.to_issue())
+        batch.append(raw_key)
+        if len(batch) >= batch_size:
+            _process_batch(batch)
+            batch = []
+    if batch:
+        _process_batch(batch)
+
+    if scan_cache is not None:
+        for stale in [k for k in scan_cache.skills if k not in seen_keys]:
+            del scan_cache.skills[stale]
@@ -8,14 +8,20 @@ WAL Fork 辅助（Phase 4）。
 - 从某个 `events.jsonl` 的行号（0-based）截取前缀事件；
 - 写入到新 run 目录下，并把 copied events 的 `run_id` 重写为新 run_id；
 - 该 fork 结果可用于后续 resume（summary 或 replay）。
+- 源 WAL 只读：不加锁、不创建/更新其 sidecar 索引；已有且与 WAL 衔接的 `events.jsonl.idx` 只用来定位前缀末尾，
+  否则逐行读到 `up_to_index_inclusive` 为止；两种方式都不读取前缀之后的内容；
+- 目标 WAL 先写入同目录临时文件，完成后原子替换（中途失败不留下半截 WAL）；其索引在首次打开时按需构建。
 """
 
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from skills_runtime.state.wal_index import WalOffsetIndex
+
 
 def fork_run_events_jsonl(
     *,
@@ -44,31 +50,49 @@ def fork_run_events_jsonl(
     if not src.exists():
         raise FileNotFoundError(str(src))
 
+    if src.resolve() == dst.resolve():
+        raise ValueError("dst_wal_path must differ from src_wal_path")
+
     dst.parent.mkdir(parents=True, exist_ok=True)
 
+    # 源索引新鲜时直接定位前缀末尾（只读）；否则按行计数，读到 max_line 为止。
     max_line = int(up_to_index_inclusive)
-    out_lines: list[str] = []
-    with src.open("r", encoding="utf-8") as f:
-        for idx, raw in enumerate(f):
-            if idx > max_line:
-                break
-            line = raw.strip()
-            if not line:
-                continue
-            obj = json.loads(line)
-            if isinstance(obj, dict):
-                obj["run_id"] = str(new_run_id)
-                payload = obj.get("payload")
-                if isinstance(payload, dict) and isinstance(payload.get("wal_locator"), str):
-                    # best-effort：把 wal_locator 指向新路径，避免 fork 后 UI/审计展示误导。
-                    payload["wal_locator"] = str(dst)
-                out_lines.append(json.dumps(obj, ensure_ascii=False))
-
-    with dst.open("w", encoding="utf-8") as f2:
-        for line2 in out_lines:
-            f2.write(line2)
-            f2.write("\n")
-
+    prefix_end = WalOffsetIndex(src).peek_start_offset(max_line + 1)
+
+    tmp = dst.with_name(f"{dst.name}.tmp")
+    try:
+        with src.open("rb") as f, tmp.open("w", encoding="utf-8") as f2:
+            remaining = prefix_end
+            idx = 0
+            for raw in f:
+                if remaining is not None:
+                    if remaining <= 0:
+                        break
+                    remaining -= len(raw)
+                elif idx > max_line:
+                    break
+                line = raw.decode("utf-8").strip()
+                if not line:
+                    continue
+                idx += 1
+                obj = json.loads(line)
+                if isinstance(obj, dict):
+                    obj["run_id"] = str(new_run_id)
+                    payload = obj.get("payload")
+                    if isinstance(payload, dict) and isinstance(payload.get("wal_locator"), str):
+                        # best-effort：把 wal_locator 指向新路径，避免 fork 后 UI/审计展示误导。
+                        payload["wal_locator"] = str(dst)
+                    f2.write(json.dumps(obj, ensure_ascii=False))
+                    f2.write("\n")
+        # 目标 WAL 被整体替换：旧的 sidecar 索引必须作废，否则可能被误判为仍然有效。
+        WalOffsetIndex(dst).discard()
+        os.replace(tmp, dst)
+    except BaseException:
+        try:
+            tmp.unlink()
+        except FileNotFoundError:
+            pass
+        raise
 
 def fork_run(
     *,
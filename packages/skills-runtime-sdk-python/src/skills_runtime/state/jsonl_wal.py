@@ -7,20 +7,27 @@ JSONL WAL（Write-Ahead Log）。
 实现约定（M1 最小闭环）：
 - `append()` 返回值为 **0-based 行号**（line index），用于恢复/fork 指定位置。
 - 文件为 append-only；不做 compaction。
+- 默认维护 sidecar 行偏移索引（`events.jsonl.idx`，见 `state/wal_index.py`），
+  打开/定位/tail 不再全量扫描 WAL。
+- 可选 group-commit 模式（`group_commit=True`）：事件先进入内存缓冲，按条数/字节/时间阈值
+  合并为一次 `write()`；终态事件立即 flush + fsync。line index 语义不变。
 """
 
 from __future__ import annotations
 
 import contextlib
+import io
 import logging
 import json
 import os
 import threading
+import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterator, Optional, TextIO
+from typing import Any, Dict, Iterator, List, Optional, TextIO
 
 from skills_runtime.core.contracts import AgentEvent
+from skills_runtime.state.wal_index import WalOffsetIndex
 
 try:
     import fcntl
@@ -38,6 +45,22 @@ _TERMINAL_EVENT_TYPES: frozenset[str] = frozenset({
 })
 
 
+_EVENT_FIELDS = ("type", "timestamp", "run_id", "turn_id", "step_id", "payload")
+
+
+def _line_run_id(raw: bytes) -> Optional[str]:
+    """解析单行 WAL 的 run_id（与 `iter_events` 相同的解析规则；不可解析行返回 None）。"""
+
+    try:
+        obj = json.loads(raw)
+        if not isinstance(obj, dict):
+            return None
+        return AgentEvent.model_validate({k: obj[k] for k in _EVENT_FIELDS if k in obj}).run_id
+    except Exception:
+        # 防御性兜底：任何解析/校验失败都按“不可解析行”处理（与 iter_events 跳过语义一致）。
+        return None
+
+
 @dataclass
 class JsonlWal:
     """
@@ -45,9 +68,25 @@ class JsonlWal:
 
     参数：
     - path：WAL 文件路径（例如 `.skills_runtime_sdk/runs/<run_id>/events.jsonl`）
+    - group_commit：是否启用 group-commit（默认关闭，保持逐条 flush 语义）
+    - group_commit_max_events：缓冲条数阈值（达到即 flush）
+    - group_commit_max_bytes：缓冲字节阈值（UTF-8 编码后；达到即 flush）
+    - group_commit_max_delay_ms：首条缓冲事件最长等待时间（到期由后台 timer flush）
+    - offset_index：是否维护 sidecar 行偏移索引（默认开启；关闭时退化为全量扫描）
+
+    group-commit 约束：
+    - 缓冲非空期间本实例持有进程级 append 锁（"写租约"），因此跨进程共享同一 WAL 时
+      line index 仍然唯一且连续；代价是其它进程的 append 最多被阻塞 `group_commit_max_delay_ms`。
+    - 终态事件（或 `force_fsync=True`）会连同缓冲一起立即写入并 fsync。
+    - `iter_events()` / `flush()` / `close()` 会先落盘缓冲，保证同进程读到自己写入的事件。
     """
 
     path: Path
+    group_commit: bool = False
+    group_commit_max_events: int = 64
+    group_commit_max_bytes: int = 256 * 1024
+    group_commit_max_delay_ms: int = 20
+    offset_index: bool = True
 
     def __post_init__(self) -> None:
         """
@@ -55,7 +94,8 @@ class JsonlWal:
 
         说明：
         - `dataclass` 初始化后会调用该方法；
-        - `_next_index` 通过扫描现有文件行数得到（0-based）。
+        - `_next_index` 优先由 sidecar 索引得到（索引缺失/过期时增量补齐或重建），
+          未启用索引时扫描现有文件行数（0-based）。
         """
 
         self.path = Path(self.path)
@@ -63,10 +103,28 @@ class JsonlWal:
         self._lock = threading.RLock()
         self._lock_path = self.path.with_name(f"{self.path.name}.lock")
         self._lock_fh: Optional[TextIO] = self._lock_path.open("a+", encoding="utf-8")
-        self._next_index = self._scan_next_index()
-        self._observed_signature = self._stat_signature()
+        self._index: Optional[WalOffsetIndex] = (
+            WalOffsetIndex(self.path, run_id_of=_line_run_id) if self.offset_index else None
+        )
+        with self._process_append_lock():
+            self._next_index = self._sync_next_index()
+            self._observed_signature = self._stat_signature()
         # 复用同一文件句柄，避免每次 append 打开/关闭文件造成额外 syscalls。
         self._fh: Optional[TextIO] = self.path.open("a", encoding="utf-8")
+        # group-commit 状态：缓冲行、缓冲字节数、写租约与延迟 flush timer。
+        self._pending: List[str] = []
+        self._pending_sizes: List[int] = []
+        self._pending_run_ids: List[str] = []
+        self._pending_bytes = 0
+        self._lease_held = False
+        self._flush_timer: Optional[threading.Timer] = None
+        self._flush_count = 0
+        self._flushed_events = 0
+        self._last_batch_size = 0
+        self._max_batch_size = 0
+        self._last_flush_latency_ms = 0.0
+        self._max_flush_latency_ms = 0.0
+        self._total_flush_latency_ms = 0.0
 
     def locator(self) -> str:
         """
@@ -93,6 +151,42 @@ class JsonlWal:
                     count += 1
         return count
 
+    def _sync_next_index(self) -> int:
+        """
+        得到下一个可用 line index：有索引时同步索引（O(新增尾部)），否则全量扫描。
+
+        约束：
+        - 调用方须持有进程级 append 锁（索引同步会写 sidecar 文件）。
+        """
+
+        if self._index is None:
+            return self._scan_next_index()
+        return self._index.sync()
+
+    def _record_line_ends(self, sizes: List[int], *, end_offset: int, run_ids: List[str]) -> None:
+        """
+        把刚写入的若干行登记到索引（调用方须持有进程级 append 锁）。
+
+        参数：
+        - sizes：按写入顺序排列的每行 UTF-8 字节数（含换行）
+        - end_offset：写入完成后的文件大小
+        - run_ids：与 sizes 一一对应的事件 run_id（维护索引的 run 归属标记）
+        """
+
+        if self._index is None or not sizes:
+            return
+        start = end_offset - sum(sizes)
+        if start != self._index.covered_end():
+            # 与索引覆盖区间不衔接（例如存在未完成的尾片段）：交给 sync 按尾部重扫。
+            self._index.sync()
+            return
+        ends: List[int] = []
+        pos = start
+        for size in sizes:
+            pos += size
+            ends.append(pos)
+        self._index.append_ends(ends, run_ids=run_ids)
+
     def _stat_signature(self) -> tuple[int, int]:
         """返回 `(size, mtime_ns)` 签名，用于检测外部进程是否已写入 WAL。"""
 
@@ -134,16 +228,19 @@ class JsonlWal:
           - `force_fsync=False`（默认）：自动判断——终态事件（run_completed/
             run_failed/run_cancelled/budget_exceeded）仍 fsync；delta 事件只 flush。
           两种路径均保证：非终态 delta 事件不会因额外 fsync 引入延迟。
+        - group-commit 模式下：事件进入缓冲并立即分配 index；实际写盘由阈值/timer/终态事件触发。
         """
 
         payload = event.model_dump(by_alias=True, exclude_none=True)
         line = json.dumps(payload, ensure_ascii=False)
         is_terminal = force_fsync or (event.type in _TERMINAL_EVENT_TYPES)
+        if self.group_commit:
+            return self._append_buffered(line, run_id=event.run_id, is_terminal=is_terminal)
         with self._lock:
             with self._process_append_lock():
                 current_signature = self._stat_signature()
                 if current_signature != self._observed_signature:
-                    self._next_index = self._scan_next_index()
+                    self._next_index = self._sync_next_index()
                     self._observed_signature = current_signature
                 index = self._next_index
                 if self._fh is None or self._fh.closed:
@@ -155,13 +252,222 @@ class JsonlWal:
                     os.fsync(self._fh.fileno())
                 self._next_index = index + 1
                 self._observed_signature = self._stat_signature()
+                if self._index is not None:
+                    self._record_line_ends(
+                        [len(line.encode("utf-8")) + 1],
+                        end_offset=self._observed_signature[0],
+                        run_ids=[event.run_id],
+                    )
         return index
 
-    def iter_events(self, *, run_id: Optional[str] = None) -> Iterator[AgentEvent]:
-        """按文件顺序迭代 WAL 中的事件（可选按 run_id 过滤）。"""
+    def _append_buffered(self, line: str, *, run_id: str, is_terminal: bool) -> int:
+        """group-commit 路径：缓冲一行并分配 index，必要时立即 flush。"""
 
+        data = line + "\n"
+        with self._lock:
+            if not self._lease_held:
+                self._acquire_lease_locked()
+            index = self._next_index
+            size = len(data.encode("utf-8"))
+            self._pending.append(data)
+            self._pending_sizes.append(size)
+            self._pending_run_ids.append(run_id)
+            self._pending_bytes += size
+            self._next_index = index + 1
+            if (
+                is_terminal
+                or len(self._pending) >= max(1, int(self.group_commit_max_events))
+                or self._pending_bytes >= max(1, int(self.group_commit_max_bytes))
+            ):
+                self._flush_pending_locked(fsync=is_terminal)
+            elif self._flush_timer is None:
+                delay_sec = max(0, int(self.group_commit_max_delay_ms)) / 1000.0
+                timer = threading.Timer(delay_sec, self._flush_from_timer)
+                timer.daemon = True
+                self._flush_timer = timer
+                timer.start()
+        return index
+
+    def _acquire_lease_locked(self) -> None:
+        """
+        获取写租约：进入进程级 append 锁并按需重扫 index（调用方须持有 `self._lock`）。
+
+        说明：
+        - 租约一直持有到缓冲 flush 完成，期间其它进程无法插入行，已分配的 index 保持稳定。
+        """
+
+        if fcntl is not None and self._lock_fh is not None and not self._lock_fh.closed:
+            fcntl.flock(self._lock_fh.fileno(), fcntl.LOCK_EX)
+        self._lease_held = True
+        current_signature = self._stat_signature()
+        if current_signature != self._observed_signature:
+            self._next_index = self._sync_next_index()
+            self._observed_signature = current_signature
+
+    def _release_lease_locked(self) -> None:
+        """释放写租约（调用方须持有 `self._lock`）。"""
+
+        if not self._lease_held:
+            return
+        self._lease_held = False
+        if fcntl is not None and self._lock_fh is not None and not self._lock_fh.closed:
+            fcntl.flock(self._lock_fh.fileno(), fcntl.LOCK_UN)
+
+    def _flush_pending_locked(self, *, fsync: bool = False) -> None:
+        """把缓冲合并为一次 write 落盘并释放写租约（调用方须持有 `self._lock`）。"""
+
+        timer = self._flush_timer
+        self._flush_timer = None
+        if timer is not None:
+            timer.cancel()
+        if not self._pending:
+            self._release_lease_locked()
+            return
+        batch = self._pending
+        sizes = self._pending_sizes
+        run_ids = self._pending_run_ids
+        self._pending = []
+        self._pending_sizes = []
+        self._pending_run_ids = []
+        self._pending_bytes = 0
+        started = time.perf_counter()
+        try:
+            if self._fh is None or self._fh.closed:
+                self._fh = self.path.open("a", encoding="utf-8")
+            self._fh.write("".join(batch))
+            self._fh.flush()
+            if fsync:
+                os.fsync(self._fh.fileno())
+            self._observed_signature = self._stat_signature()
+            self._record_line_ends(sizes, end_offset=self._observed_signature[0], run_ids=run_ids)
+        finally:
+            self._release_lease_locked()
+        latency_ms = (time.perf_counter() - started) * 1000.0
+        self._flush_count += 1
+        self._flushed_events += len(batch)
+        self._last_batch_size = len(batch)
+        self._max_batch_size = max(self._max_batch_size, len(batch))
+        self._last_flush_latency_ms = latency_ms
+        self._max_flush_latency_ms = max(self._max_flush_latency_ms, latency_ms)
+        self._total_flush_latency_ms += latency_ms
+
+    def _flush_from_timer(self) -> None:
+        """延迟 flush 回调（后台 timer 线程）。"""
+
+        try:
+            with self._lock:
+                self._flush_timer = None
+                self._flush_pending_locked()
+        except Exception:
+            # 防御性兜底：timer 线程异常不得静默丢失缓冲；下一次 append/flush/close 仍会重试写入。
+            logging.warning("WAL group-commit timer flush failed (path=%s)", self.path, exc_info=True)
+
+    def flush(self) -> None:
+        """
+        立即落盘 group-commit 缓冲（非 group-commit 模式下为 no-op）。
+
+        说明：
+        - 每次 `append()` 在非 group-commit 模式下已 flush，因此这里只处理缓冲。
+        """
+
+        with self._lock:
+            if self._pending or self._lease_held:
+                self._flush_pending_locked()
+
+    def group_commit_stats(self) -> Dict[str, Any]:
+        """
+        返回 group-commit 计数器快照（用于 metrics/排障）。
+
+        字段：
+        - flushes / events_flushed：flush 次数与累计落盘事件数
+        - last_batch_size / max_batch_size / avg_batch_size：批大小
+        - last_flush_latency_ms / max_flush_latency_ms / avg_flush_latency_ms：单次 write(+fsync) 耗时
+        - pending_events：当前仍在缓冲中的事件数
+        """
+
+        with self._lock:
+            flushes = self._flush_count
+            return {
+                "enabled": bool(self.group_commit),
+                "flushes": flushes,
+                "events_flushed": self._flushed_events,
+                "pending_events": len(self._pending),
+                "last_batch_size": self._last_batch_size,
+                "max_batch_size": self._max_batch_size,
+                "avg_batch_size": (self._flushed_events / flushes) if flushes else 0.0,
+                "last_flush_latency_ms": self._last_flush_latency_ms,
+                "max_flush_latency_ms": self._max_flush_latency_ms,
+                "avg_flush_latency_ms": (self._total_flush_latency_ms / flushes) if flushes else 0.0,
+            }
+
+    def event_count(self) -> int:
+        """
+        返回 WAL 行数（即下一个 line index；含本实例尚在缓冲中的事件）。
+
+        说明：
+        - 启用索引时为 O(1)（外部进程写入后仅增量补齐索引尾部）。
+        """
+
+        with self._lock:
+            if self._pending or self._lease_held:
+                return self._next_index
+            with self._process_append_lock():
+                current_signature = self._stat_signature()
+                if current_signature != self._observed_signature:
+                    self._next_index = self._sync_next_index()
+                    self._observed_signature = current_signature
+                return self._next_index
+
+    def byte_offset(self, index: int) -> Optional[int]:
+        """
+        返回第 `index` 行（0-based）的起始字节偏移；未启用索引时返回 None。
+
+        说明：
+        - `index >= event_count()` 时返回已索引区间末尾（即整个文件的完整行前缀长度）。
+        """
+
+        if self._index is None:
+            return None
+        self.flush()
+        with self._lock:
+            with self._process_append_lock():
+                count = self._index.sync()
+                self._next_index = max(self._next_index, count)
+                self._observed_signature = self._stat_signature()
+                if index >= self._index.entry_count():
+                    return self._index.covered_end()
+                return self._index.start_offset(max(0, int(index)))
+
+    def uniform_run_id(self) -> Optional[str]:
+        """
+        若索引能证明 WAL 的全部完整行都是同一 run 的合法事件，返回该 run_id；否则返回 None。
+
+        说明：
+        - 未启用索引时返回 None；未完成的尾片段不在证明范围内（调用方需自行校验尾部）。
+        """
+
+        if self._index is None:
+            return None
+        self.flush()
+        with self._lock:
+            with self._process_append_lock():
+                self._next_index = max(self._next_index, self._index.sync())
+                self._observed_signature = self._stat_signature()
+                return self._index.uniform_run_id()
+
+    def iter_events(self, *, run_id: Optional[str] = None, start_index: int = 0) -> Iterator[AgentEvent]:
+        """
+        按文件顺序迭代 WAL 中的事件（可选按 run_id 过滤）。
+
+        参数：
+        - start_index：从第几行（0-based）开始；启用索引时直接 seek 到对应字节偏移（tail 为 O(1) 定位）。
+        """
+
+        self.flush()
         if not self.path.exists():
             return iter(())
+        start_index = max(0, int(start_index))
+        start_offset = self.byte_offset(start_index) if start_index > 0 else 0
 
         def _iter() -> Iterator[AgentEvent]:
             """内部生成器：逐行读取 JSONL 并反序列化为 `AgentEvent`。"""
@@ -170,11 +476,19 @@ class JsonlWal:
             non_object_lines = 0
             invalid_event_lines = 0
 
-            with self.path.open("r", encoding="utf-8") as f:
-                for line_no, raw_line in enumerate(f, start=1):
+            to_skip = start_index if start_offset is None else 0
+            with self.path.open("rb") as fb:
+                if start_offset:
+                    fb.seek(start_offset)
+                f = io.TextIOWrapper(fb, encoding="utf-8")
+                first_line_no = start_index + 1 if start_offset else 1
+                for line_no, raw_line in enumerate(f, start=first_line_no):
                     line = raw_line.strip()
                     if not line:
                         continue
+                    if to_skip > 0:
+                        to_skip -= 1
+                        continue
                     try:
                         obj = json.loads(line)
                     except Exception as exc:
@@ -187,18 +501,7 @@ class JsonlWal:
                         logging.warning("WAL line is not a JSON object (path=%s line=%s)", self.path, line_no)
                         non_object_lines += 1
                         continue
-                    filtered = {
-                        k: obj[k]
-                        for k in (
-                            "type",
-                            "timestamp",
-                            "run_id",
-                            "turn_id",
-                            "step_id",
-                            "payload",
-                        )
-                        if k in obj
-                    }
+                    filtered = {k: obj[k] for k in _EVENT_FIELDS if k in obj}
                     try:
                         ev = AgentEvent.model_validate(filtered)
                     except Exception as exc:
@@ -225,9 +528,11 @@ class JsonlWal:
         return _iter()
 
     def close(self) -> None:
-        """关闭 WAL 句柄（释放 fd）。"""
+        """关闭 WAL 句柄（释放 fd；group-commit 模式下先落盘缓冲）。"""
 
         with self._lock:
+            if self._pending or self._lease_held:
+                self._flush_pending_locked()
             if self._fh is not None:
                 try:
                     self._fh.close()
@@ -235,6 +540,8 @@ class JsonlWal:
                     pass
                 finally:
                     self._fh = None
+            if self._index is not None:
+                self._index.close()
             if self._lock_fh is not None:
                 try:
                     self._lock_fh.close()
@@ -0,0 +1,342 @@
+"""
+JSONL WAL 的 sidecar 行偏移索引（`events.jsonl.idx`）。
+
+格式（little-endian）：
+- header：8 字节 magic（`SRWIDX01`）
+- entries：每个非空行一个 uint64，记录该行（含换行符）**结束**处的字节偏移
+
+语义：
+- 第 i 行的字节区间为 `[entries[i-1], entries[i])`（i=0 时起点为 0）；
+- 行数 = `(idx 文件大小 - header) / 8`，打开/定位均无需扫描 WAL；
+- 只索引以换行结尾的完整行；WAL 尾部未完成的片段不入索引（但计入行数，与 `JsonlWal` 一致）；
+- 索引落后于 WAL 时只增量扫描尾部；索引与 WAL 不一致（被截断/替换）时整体重建。
+
+run 归属标记（`events.jsonl.idx.run`，JSON：`{"run_id": ..., "mixed": bool}`）：
+- 记录“已索引的每一行都是同一 run_id 的合法事件”是否成立；出现其它 run_id 或不可解析行即置 `mixed`，
+  之后不再回退（直到索引重建）；
+- 先写标记、后追加 entries：中途崩溃只会让标记偏保守，不会误报“同一 run”；
+- 旧版本遗留的索引（无标记文件）视为无法证明（`mixed`）。
+
+并发约束：
+- 会写入索引的方法（`sync/append_ends`）调用方 MUST 持有 WAL 的进程级 append 锁；
+  `JsonlWal` 已在 append/初始化路径上满足该约束。
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import BinaryIO, Callable, List, Optional, Sequence, Tuple
+
+_MAGIC = b"SRWIDX01"
+_ENTRY = struct.Struct("<Q")
+# 增量扫描时每累计多少条 entry 写一次索引（避免超大 WAL 重建时内存膨胀）。
+_SCAN_FLUSH_ENTRIES = 4096
+
+# 单行 WAL（原始字节）→ run_id；不可解析为事件时返回 None。由 JsonlWal 注入，本模块不依赖事件模型。
+RunIdOf = Callable[[bytes], Optional[str]]
+_RunState = Tuple[Optional[str], bool]
+
+
+class WalOffsetIndex:
+    """
+    `events.jsonl` 行号 → 字节偏移的 sidecar 索引。
+
+    参数：
+    - wal_path：WAL 文件路径；索引文件固定为同目录下的 `<name>.idx`
+    - run_id_of：扫描 WAL 尾部时解析每行 run_id 的函数；为 None 时不做 run 归属判断（标记恒为 mixed）
+    """
+
+    def __init__(self, wal_path: Path, *, run_id_of: Optional[RunIdOf] = None) -> None:
+        """记录路径；索引文件句柄延迟到首次访问时打开。"""
+
+        self.wal_path = Path(wal_path)
+        self.path = self.wal_path.with_name(f"{self.wal_path.name}.idx")
+        self.run_path = self.wal_path.with_name(f"{self.wal_path.name}.idx.run")
+        self._run_id_of = run_id_of
+        self._lock = threading.RLock()
+        self._fh: Optional[BinaryIO] = None
+        # 已索引区间末尾的缓存：由 sync/append_ends 维护，供写路径 O(1) 衔接校验。
+        self._covered_end: Optional[int] = None
+        # run 归属标记缓存 `(run_id, mixed)`；写入前总会从磁盘重读（其它进程可能已更新）。
+        self._run_state: Optional[_RunState] = None
+
+    def _handle(self) -> BinaryIO:
+        """返回索引文件句柄（`a+b` + 无缓冲：写入总在末尾，且对其它进程立即可见）。"""
+
+        if self._fh is None or self._fh.closed:
+            self._fh = self.path.open("a+b", buffering=0)
+        return self._fh
+
+    def _size(self) -> int:
+        """返回索引文件当前字节数。"""
+
+        return int(os.fstat(self._handle().fileno()).st_size)
+
+    def _header_ok(self) -> bool:
+        """校验 header magic；截掉尾部不完整的 entry（写入被中断时）。"""
+
+        fh = self._handle()
+        size = self._size()
+        if size < len(_MAGIC):
+            return False
+        fh.seek(0)
+        if fh.read(len(_MAGIC)) != _MAGIC:
+            return False
+        torn = (size - len(_MAGIC)) % _ENTRY.size
+        if torn:
+            fh.truncate(size - torn)
+        return True
+
+    def _reset(self) -> None:
+        """清空索引并写入 header。"""
+
+        fh = self._handle()
+        fh.truncate(0)
+        fh.write(_MAGIC)
+        self._covered_end = 0
+        self._write_run_state((None, False))
+
+    def _read_run_state(self) -> _RunState:
+        """从磁盘读取 run 归属标记；缺失（旧版索引）或损坏时，非空索引视为 mixed。"""
+
+        try:
+            obj = json.loads(self.run_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None, self.entry_count() > 0
+        except (OSError, ValueError):
+            return None, True
+        if not isinstance(obj, dict):
+            return None, True
+        run_id = obj.get("run_id")
+        return (run_id if isinstance(run_id, str) else None), bool(obj.get("mixed", True))
+
+    def _write_run_state(self, state: _RunState) -> None:
+        """原子替换 run 归属标记文件。"""
+
+        tmp = self.run_path.with_name(f"{self.run_path.name}.tmp")
+        tmp.write_text(json.dumps({"run_id": state[0], "mixed": state[1]}), encoding="utf-8")
+        os.replace(tmp, self.run_path)
+        self._run_state = state
+
+    def _note_runs(self, run_ids: Optional[Sequence[Optional[str]]]) -> None:
+        """在追加 entries 之前更新 run 归属标记（run_ids 为 None 表示归属未知）。"""
+
+        state = self._run_state if self._run_state is not None else self._read_run_state()
+        for _attempt in range(2):
+            run_id, mixed = state
+            if not mixed:
+                for rid in run_ids if run_ids is not None else (None,):
+                    if rid is None or (run_id is not None and rid != run_id):
+                        mixed = True
+                        break
+                    run_id = rid
+            if (run_id, mixed) == state:
+                self._run_state = state
+                return
+            # 标记需要变化：以磁盘上的最新标记为准重算一次（缓存可能落后于其它进程的写入）。
+            fresh = self._read_run_state()
+            if fresh == state:
+                self._write_run_state((run_id, mixed))
+                return
+            state = fresh
+        self._write_run_state((None, True))
+
+    def uniform_run_id(self) -> Optional[str]:
+        """若已索引的全部行都是同一 run_id 的合法事件，返回该 run_id；否则（或索引为空）返回 None。"""
+
+        with self._lock:
+            if self.entry_count() == 0:
+                return None
+            run_id, mixed = self._run_state = self._read_run_state()
+            return None if mixed else run_id
+
+    def entry_count(self) -> int:
+        """返回已索引的完整行数（不触发同步）。"""
+
+        with self._lock:
+            size = self._size()
+            if size < len(_MAGIC):
+                return 0
+            return (size - len(_MAGIC)) // _ENTRY.size
+
+    def end_offset(self, index: int) -> int:
+        """返回第 `index` 行（0-based）结束处的字节偏移；越界抛 `IndexError`。"""
+
+        with self._lock:
+            if index < 0 or index >= self.entry_count():
+                raise IndexError(index)
+            fh = self._handle()
+            fh.seek(len(_MAGIC) + index * _ENTRY.size)
+            data = fh.read(_ENTRY.size)
+            if len(data) != _ENTRY.size:
+                raise IndexError(index)
+            return int(_ENTRY.unpack(data)[0])
+
+    def start_offset(self, index: int) -> int:
+        """
+        返回第 `index` 行的起始字节偏移。
+
+        说明：
+        - `index == entry_count()` 时返回已索引区间的末尾（即下一行的写入位置）。
+        """
+
+        if index <= 0:
+            return 0
+        return self.end_offset(index - 1)
+
+    def peek_start_offset(self, index: int) -> Optional[int]:
+        """
+        只读查询第 `index` 行的起始字节偏移（不创建/修改索引文件、不加锁、不扫描 WAL）。
+
+        返回：
+        - 索引存在、header 正确、末尾与 WAL 衔接且覆盖到该行时返回偏移（`index == 行数` 时为已索引区间末尾）；
+        - 其余情况（缺失、损坏、疑似失效、落后于 `index`）返回 None，由调用方自行逐行扫描。
+        """
+
+        try:
+            with self.path.open("rb") as fh:
+                if fh.read(len(_MAGIC)) != _MAGIC:
+                    return None
+                count = (int(os.fstat(fh.fileno()).st_size) - len(_MAGIC)) // _ENTRY.size
+                if index > count:
+                    return None
+                if count == 0:
+                    return 0
+                fh.seek(len(_MAGIC) + (count - 1) * _ENTRY.size)
+                covered = int(_ENTRY.unpack(fh.read(_ENTRY.size))[0])
+                offset = covered
+                if 0 < index < count:
+                    fh.seek(len(_MAGIC) + (index - 1) * _ENTRY.size)
+                    offset = int(_ENTRY.unpack(fh.read(_ENTRY.size))[0])
+                elif index <= 0:
+                    offset = 0
+            with self.wal_path.open("rb") as f:
+                if covered > int(os.fstat(f.fileno()).st_size):
+                    return None
+                for end in {covered, offset} - {0}:
+                    f.seek(end - 1)
+                    if f.read(1) != b"\n":
+                        return None
+        except (OSError, struct.error):
+            return None
+        return offset
+
+    def covered_end(self) -> int:
+        """返回已索引区间末尾的字节偏移（优先使用 sync/append 维护的缓存）。"""
+
+        with self._lock:
+            if self._covered_end is None:
+                self._covered_end = self.start_offset(self.entry_count())
+            return self._covered_end
+
+    def append_ends(self, ends: Sequence[int], *, run_ids: Optional[Sequence[Optional[str]]] = None) -> None:
+        """
+        追加若干行的结束偏移（调用方须持有 WAL 进程级锁，且保证 ends 紧接已索引区间）。
+
+        参数：
+        - run_ids：与 ends 一一对应的各行 run_id（不可解析行为 None）；None 表示归属未知
+        """
+
+        if not ends:
+            return
+        with self._lock:
+            self._note_runs(run_ids)
+            self._handle().write(b"".join(_ENTRY.pack(int(e)) for e in ends))
+            self._covered_end = int(ends[-1])
+
+    def _covered_end_is_plausible(self, count: int, covered: int) -> bool:
+        """抽查已索引区间末尾：WAL 在该偏移前一个字节必须是换行符。"""
+
+        if count <= 0:
+            return True
+        try:
+            with self.wal_path.open("rb") as f:
+                f.seek(covered - 1)
+                return f.read(1) == b"\n"
+        except OSError:
+            return False
+
+    def sync(self) -> int:
+        """
+        使索引覆盖 WAL 中所有完整行，并返回 WAL 行数（0-based 下一个 index）。
+
+        复杂度：
+        - 索引新鲜：O(1)；
+        - 索引落后：O(未索引尾部字节数)；
+        - 索引失效（WAL 被截断/替换、header 损坏）：一次全量重建。
+        """
+
+        with self._lock:
+            try:
+                wal_size = int(self.wal_path.stat().st_size)
+            except FileNotFoundError:
+                wal_size = 0
+            if not self._header_ok():
+                self._reset()
+            count = self.entry_count()
+            covered = self.start_offset(count)
+            if covered > wal_size or not self._covered_end_is_plausible(count, covered):
+                self._reset()
+                count = 0
+                covered = 0
+            self._covered_end = covered
+            if covered == wal_size:
+                return count
+            return self._index_tail(count=count, offset=covered)
+
+    def _index_tail(self, *, count: int, offset: int) -> int:
+        """从 `offset` 起扫描 WAL 尾部并追加 entries，返回行数（含未完成尾片段）。"""
+
+        pending: List[int] = []
+        run_ids: Optional[List[Optional[str]]] = [] if self._run_id_of is not None else None
+        trailing = 0
+        pos = offset
+        with self.wal_path.open("rb") as f:
+            f.seek(offset)
+            for raw in f:
+                pos += len(raw)
+                if not raw.endswith(b"\n"):
+                    trailing = 1 if raw.strip() else 0
+                    break
+                if not raw.strip():
+                    continue
+                pending.append(pos)
+                if run_ids is not None and self._run_id_of is not None:
+                    run_ids.append(self._run_id_of(raw))
+                if len(pending) >= _SCAN_FLUSH_ENTRIES:
+                    self.append_ends(pending, run_ids=run_ids)
+                    count += len(pending)
+                    pending = []
+                    run_ids = [] if run_ids is not None else None
+        self.append_ends(pending, run_ids=run_ids)
+        return count + len(pending) + trailing
+
+    def discard(self) -> None:
+        """删除索引文件（WAL 将被整体重写时调用；下次访问会重建）。"""
+
+        with self._lock:
+            self.close()
+            for path in (self.path, self.run_path):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+
+    def close(self) -> None:
+        """关闭索引文件句柄。"""
+
+        with self._lock:
+            self._covered_end = None
+            self._run_state = None
+            if self._fh is not None:
+                try:
+                    self._fh.close()
+                except OSError:
+                    pass
+                finally:
+                    self._fh = None
+
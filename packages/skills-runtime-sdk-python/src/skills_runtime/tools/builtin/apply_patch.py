@@ -16,17 +16,26 @@ Patch 格式：
 安全边界：
 - 所有路径必须位于 workspace_root 下（通过 `ctx.resolve_path` 强制）。
 - Add File / Move to 目标禁止覆盖已有文件。
+
+性能：
+- hunk 定位使用“行内容 → 出现位置”索引（每个文件构建一次），以最稀有的行做锚点校验候选位置；
+- 规划阶段只记录每个 hunk 在原文件中的落点（`_Edit`），不保存改写后的全文；
+- 落盘时按行流式读取原文件、单遍套用所有 hunk 并写入临时文件，最后原子替换。
 """
 
 from __future__ import annotations
 
+import os
+import tempfile
 import time
+from bisect import bisect_left
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from skills_runtime.tools.line_index import LineReader
 from skills_runtime.tools.protocol import ToolCall, ToolResult, ToolResultPayload, ToolSpec
 from skills_runtime.tools.registry import ToolExecutionContext
 
@@ -76,42 +85,79 @@ def _split_lines(text: str) -> List[str]:
     return (text or "").splitlines()
 
 
-def _find_subsequence(haystack: List[str], needle: List[str], *, start: int = 0) -> Optional[int]:
+class _LineIndex:
     """
-    在 haystack 中寻找 needle 子序列首次出现的位置。
-
-    参数：
-    - haystack：目标行列表
-    - needle：要匹配的行列表（必须非空）
-    - start：起始搜索位置
+    文件行索引：行内容 → 出现位置（升序），每个文件构建一次，供该文件的所有 hunk 定位。
 
-    返回：
-    - index（int）或 None（未找到）
+    说明：
+    - `find` 以 needle 中出现次数最少的行作为锚点，只在锚点的出现位置上做完整比对；
+    - 候选按位置升序检查，因此返回值与朴素的“首次出现”一致。
     """
 
-    if not needle:
+    def __init__(self, lines: List[str]) -> None:
+        """构建索引。"""
+
+        self._lines = lines
+        self._positions: Dict[str, List[int]] = {}
+        for i, line in enumerate(lines):
+            bucket = self._positions.get(line)
+            if bucket is None:
+                self._positions[line] = [i]
+            else:
+                bucket.append(i)
+
+    def find(self, needle: List[str], *, start: int = 0) -> Optional[int]:
+        """
+        在 start 及之后寻找 needle 子序列首次出现的位置。
+
+        返回：
+        - index（int）或 None（未找到或 needle 为空）
+        """
+
+        if not needle:
+            return None
+        anchor_k = 0
+        anchor_positions: Optional[List[int]] = None
+        for k, text in enumerate(needle):
+            positions = self._positions.get(text)
+            if positions is None:
+                return None
+            if anchor_positions is None or len(positions) < len(anchor_positions):
+                anchor_k, anchor_positions = k, positions
+                if len(positions) == 1:
+                    break
+        assert anchor_positions is not None
+
+        lines = self._lines
+        n = len(needle)
+        last = len(lines) - n
+        for j in range(bisect_left(anchor_positions, start + anchor_k), len(anchor_positions)):
+            i = anchor_positions[j] - anchor_k
+            if i > last:
+                return None
+            if lines[i : i + n] == needle:
+                return i
         return None
-    n = len(needle)
-    for i in range(start, len(haystack) - n + 1):
-        if haystack[i : i + n] == needle:
-            return i
-    return None
 
 
-def _apply_hunk(*, file_lines: List[str], hunk_lines: List[str], search_from: int) -> Tuple[List[str], int]:
+@dataclass(frozen=True)
+class _Edit:
+    """一个 hunk 在原文件中的落点：用 lines 替换原文件的 `[start, start + length)` 行。"""
+
+    start: int
+    length: int
+    lines: Tuple[str, ...]
+
+
+def _split_hunk(hunk_lines: List[str]) -> Tuple[List[str], List[str]]:
     """
-    将一个 hunk 应用到 file_lines 上。
+    把 hunk 拆成 (before, after)。
 
     参数：
-    - file_lines：原始文件行（无行尾换行符）
     - hunk_lines：前缀为 ' ' / '-' / '+' 的行
-    - search_from：从该位置开始寻找匹配片段（用于多 hunk 顺序应用）
-
-    返回：
-    - (new_lines, next_search_from)
 
     异常：
-    - ValueError：hunk 无法匹配
+    - ValueError：hunk 行为空或没有可匹配的 context/delete 行
     """
 
     before: List[str] = []
@@ -128,14 +174,102 @@ def _apply_hunk(*, file_lines: List[str], hunk_lines: List[str], search_from: in
 
     if not before:
         raise ValueError("unsupported hunk: empty match block")
+    return before, after
+
+
+def _locate_hunks(file_lines: List[str], hunks: List[List[str]]) -> List[_Edit]:
+    """
+    依次定位所有 hunk（全部相对原文件坐标，互不重叠、按位置升序）。
+
+    说明：
+    - 后一个 hunk 从前一个 hunk 匹配区段之后开始搜索（等价于在已改写文本上顺序应用）。
+
+    异常：
+    - ValueError：hunk 无法匹配
+    """
+
+    index = _LineIndex(file_lines)
+    edits: List[_Edit] = []
+    search_from = 0
+    for h in hunks:
+        before, after = _split_hunk(h)
+        idx = index.find(before, start=search_from)
+        if idx is None:
+            raise ValueError("hunk does not apply (context not found)")
+        edits.append(_Edit(start=idx, length=len(before), lines=tuple(after)))
+        search_from = idx + len(before)
+    return edits
+
+
+def _iter_patched_lines(source: Iterable[str], edits: List[_Edit]) -> Iterator[str]:
+    """单遍套用 edits：流式产出改写后的行。"""
+
+    pending = iter(edits)
+    nxt = next(pending, None)
+    skip = 0
+    for i, line in enumerate(source):
+        if nxt is not None and i == nxt.start:
+            yield from nxt.lines
+            skip = nxt.length
+            nxt = next(pending, None)
+        if skip:
+            skip -= 1
+            continue
+        yield line
+    # 防御性兜底：落点超出文件末尾（源文件在规划后被截断）。
+    if nxt is not None or skip:
+        raise ValueError("file changed since patch was planned")
+
 
-    idx = _find_subsequence(file_lines, before, start=search_from)
-    if idx is None:
-        raise ValueError("hunk does not apply (context not found)")
+def _render_lines(lines: Iterable[str], *, ends_with_newline: bool) -> str:
+    """把行渲染为文件文本（非空时每行以换行结尾；为空时保留原文件是否以换行结尾）。"""
 
-    new_lines = list(file_lines[:idx]) + after + list(file_lines[idx + len(before) :])
-    next_from = idx + len(after)
-    return new_lines, next_from
+    out = [line + "\n" for line in lines]
+    if not out:
+        return "\n" if ends_with_newline else ""
+    return "".join(out)
+
+
+def _file_ends_with_newline(path: Path) -> bool:
+    """判断文件最后一个字节是否为换行（`\n` 或 `\r`，与 universal newlines 语义一致）。"""
+
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() == 0:
+            return False
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) in (b"\n", b"\r")
+
+
+def _atomic_rewrite(path: Path, *, edits: List[_Edit]) -> None:
+    """
+    流式读取 path、单遍套用 edits，写入同目录临时文件后原子替换（保留原文件权限位）。
+    """
+
+    ends_with_newline = _file_ends_with_newline(path)
+    mode = path.stat().st_mode
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", dir=str(path.parent))
+    tmp_path = Path(tmp_name)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as tmp_f, LineReader(path) as reader:
+            wrote = False
+            for line in _iter_patched_lines(reader.iter_lines(0), edits):
+                tmp_f.write(line)
+                tmp_f.write("\n")
+                wrote = True
+            if not wrote and ends_with_newline:
+                tmp_f.write("\n")
+            tmp_f.flush()
+            os.fsync(tmp_f.fileno())
+        os.chmod(tmp_path, mode & 0o7777)
+        os.replace(str(tmp_path), str(path))
+    except BaseException:
+        try:
+            if tmp_path.exists():
+                tmp_path.unlink()
+        except OSError:
+            pass
+        raise
 
 
 def _parse_patch_sections(lines: List[str]) -> List[Tuple[str, str, List[str]]]:
@@ -234,7 +368,7 @@ def _delete_file(path: Path) -> None:
 
 def _apply_update(path: Path, *, update_lines: List[str], ctx: ToolExecutionContext) -> Tuple[Optional[Path], List[str]]:
     """
-    应用 Update File 语义（包含 hunks + 可选 Move to）。
+    应用 Update File 语义（包含 hunks；Move to 只解析，由调用方处理）。
 
     返回：
     - (move_to_path_or_none, applied_hunk_summaries)
@@ -245,26 +379,23 @@ def _apply_update(path: Path, *, update_lines: List[str], ctx: ToolExecutionCont
     if path.is_dir():
         raise IsADirectoryError(f"path is a directory: {path}")
 
-    original_text = path.read_text(encoding="utf-8")
-    new_text, move_to, summaries = _apply_update_to_text(original_text, update_lines=update_lines, ctx=ctx)
-    path.write_text(new_text, encoding="utf-8")
-    return move_to, summaries
+    move_to, hunks = _parse_update_lines(update_lines, ctx=ctx)
+    edits = _locate_hunks(path.read_text(encoding="utf-8").splitlines(), hunks)
+    _atomic_rewrite(path, edits=edits)
+    return move_to, [f"hunk_applied:{len(h)}" for h in hunks]
 
 
-def _apply_update_to_text(
-    original_text: str, *, update_lines: List[str], ctx: ToolExecutionContext
-) -> Tuple[str, Optional[Path], List[str]]:
+def _parse_update_lines(update_lines: List[str], *, ctx: ToolExecutionContext) -> Tuple[Optional[Path], List[List[str]]]:
     """
-    将 Update File patch 作用到 original_text（纯函数，不写文件）。
+    解析 Update File section body。
 
     返回：
-    - (new_text, move_to_path_or_none, applied_hunk_summaries)
+    - (move_to_path_or_none, hunks)
     """
 
     move_to: Optional[Path] = None
     hunks: List[List[str]] = []
     current_hunk: List[str] = []
-    summaries: List[str] = []
 
     for raw in update_lines:
         if raw.startswith("*** Move to: "):
@@ -285,15 +416,7 @@ def _apply_update_to_text(
 
     if current_hunk:
         hunks.append(current_hunk)
-
-    file_lines = (original_text or "").splitlines()
-    search_from = 0
-    for h in hunks:
-        file_lines, search_from = _apply_hunk(file_lines=file_lines, hunk_lines=h, search_from=search_from)
-        summaries.append(f"hunk_applied:{len(h)}")
-
-    new_text = "\n".join(file_lines) + ("\n" if (original_text or "").endswith("\n") or file_lines else "")
-    return new_text, move_to, summaries
+    return move_to, hunks
 
 
 def _render_add_file_text(*, content_lines: List[str]) -> str:
@@ -307,11 +430,24 @@ def _render_add_file_text(*, content_lines: List[str]) -> str:
 
 @dataclass(frozen=True)
 class _PlannedOp:
-    """规划阶段的文件操作（用于 dry-run 模拟 apply 的副作用）。"""
+    """
+    规划阶段的文件操作（用于 dry-run 模拟 apply 的副作用）。
+
+    说明：
+    - write_update 只携带 edits（相对执行到该步时磁盘上的内容），不携带改写后的全文；
+    - base_stat：edits 基于磁盘原文件规划时记录 (size, mtime_ns)，落盘前校验文件未被外部修改。
+    """
+
     kind: str  # write_new | write_update | delete | move
     path: Path
     text: Optional[str] = None
     moved_to: Optional[Path] = None
+    edits: Optional[List[_Edit]] = None
+    base_stat: Optional[Tuple[int, int]] = None
+
+
+# virtual FS 中的文件内容：已物化的文本，或“磁盘源文件 + 待套用的 edits”（按需物化）。
+_VirtualContent = Union[str, Tuple[Path, List[_Edit]]]
 
 
 def _plan_multi_section_patch(
@@ -322,36 +458,45 @@ def _plan_multi_section_patch(
 
     约束：
     - 以 section 顺序模拟 apply，确保后续 section 能看到前序的虚拟变更；
-    - 若任何一个 section 无法通过校验，则整体失败（不产生写盘副作用）。
+    - 若任何一个 section 无法通过校验，则整体失败（不产生写盘副作用）；
+    - 只在某个文件被多个 section 依次修改时才物化其中间文本；其余文件规划完即释放行列表。
     """
 
     planned_ops: List[_PlannedOp] = []
     changes: List[_Change] = []
 
-    virtual_text: Dict[Path, str] = {}
+    virtual: Dict[Path, _VirtualContent] = {}
     virtual_deleted: set[Path] = set()
 
     def _v_exists(p: Path) -> bool:
         """判断 virtual FS 中目标是否存在（考虑 planned add/delete）。"""
         if p in virtual_deleted:
             return False
-        if p in virtual_text:
+        if p in virtual:
             return True
         return p.exists()
 
     def _v_is_dir(p: Path) -> bool:
         """判断 virtual FS 中目标是否为目录（优先处理虚拟覆盖）。"""
-        if p in virtual_text:
+        if p in virtual:
             return False
         if p in virtual_deleted:
             return False
         return p.exists() and p.is_dir()
 
     def _v_read_text(p: Path) -> str:
-        """读取 virtual FS 中的文本内容（优先读取虚拟覆盖）。"""
-        if p in virtual_text:
-            return virtual_text[p]
-        return p.read_text(encoding="utf-8")
+        """读取 virtual FS 中的文本内容（优先读取虚拟覆盖；pending edits 此时才物化）。"""
+        content = virtual.get(p)
+        if content is None:
+            return p.read_text(encoding="utf-8")
+        if isinstance(content, str):
+            return content
+        source, edits = content
+        source_text = source.read_text(encoding="utf-8")
+        return _render_lines(
+            _iter_patched_lines(source_text.splitlines(), edits),
+            ends_with_newline=source_text.endswith(("\n", "\r")),
+        )
 
     for op, raw_path, body_lines in sections:
         target = ctx.resolve_path(raw_path)
@@ -360,7 +505,7 @@ def _plan_multi_section_patch(
             if _v_exists(target):
                 raise FileExistsError(f"file already exists: {target}")
             text = _render_add_file_text(content_lines=body_lines)
-            virtual_text[target] = text
+            virtual[target] = text
             virtual_deleted.discard(target)
             planned_ops.append(_PlannedOp(kind="write_new", path=target, text=text))
             changes.append(_Change(kind="add", path=raw_path))
@@ -373,7 +518,7 @@ def _plan_multi_section_patch(
                 raise FileNotFoundError(f"file not found: {target}")
             if _v_is_dir(target):
                 raise IsADirectoryError(f"path is a directory: {target}")
-            virtual_text.pop(target, None)
+            virtual.pop(target, None)
             virtual_deleted.add(target)
             planned_ops.append(_PlannedOp(kind="delete", path=target))
             changes.append(_Change(kind="delete", path=raw_path))
@@ -384,18 +529,29 @@ def _plan_multi_section_patch(
                 raise FileNotFoundError(f"file not found: {target}")
             if _v_is_dir(target):
                 raise IsADirectoryError(f"path is a directory: {target}")
-            original_text = _v_read_text(target)
-            new_text, move_to, _summaries = _apply_update_to_text(original_text, update_lines=body_lines, ctx=ctx)
-            virtual_text[target] = new_text
+            move_to, hunks = _parse_update_lines(body_lines, ctx=ctx)
+            base_stat: Optional[Tuple[int, int]] = None
+            if target in virtual:
+                # 同一文件被多个 section 依次修改：物化中间文本，后续 edits 相对它计算。
+                base_text = _v_read_text(target)
+                base_lines = base_text.splitlines()
+                edits = _locate_hunks(base_lines, hunks)
+                virtual[target] = _render_lines(
+                    _iter_patched_lines(base_lines, edits), ends_with_newline=base_text.endswith(("\n", "\r"))
+                )
+            else:
+                st = target.stat()
+                base_stat = (int(st.st_size), int(st.st_mtime_ns))
+                edits = _locate_hunks(target.read_text(encoding="utf-8").splitlines(), hunks)
+                virtual[target] = (target, edits)
             virtual_deleted.discard(target)
-            planned_ops.append(_PlannedOp(kind="write_update", path=target, text=new_text))
+            planned_ops.append(_PlannedOp(kind="write_update", path=target, edits=edits, base_stat=base_stat))
             changes.append(_Change(kind="update", path=raw_path, moved_to=str(move_to) if move_to else None))
 
             if move_to is not None:
                 if _v_exists(move_to):
                     raise FileExistsError(f"move target already exists: {move_to}")
-                virtual_text[move_to] = virtual_text[target]
-                virtual_text.pop(target, None)
+                virtual[move_to] = virtual.pop(target)
                 virtual_deleted.add(target)
                 planned_ops.append(_PlannedOp(kind="move", path=target, moved_to=move_to))
                 changes.append(_Change(kind="move", path=raw_path, moved_to=str(move_to)))
@@ -419,13 +575,17 @@ def _apply_planned_ops(*, ops: List[_PlannedOp]) -> None:
             op.path.write_text(op.text, encoding="utf-8")
             continue
         if op.kind == "write_update":
-            if op.text is None:
-                raise ValueError("invalid planned op: missing text")
+            if op.edits is None:
+                raise ValueError("invalid planned op: missing edits")
             if not op.path.exists():
                 raise FileNotFoundError(f"file not found: {op.path}")
             if op.path.is_dir():
                 raise IsADirectoryError(f"path is a directory: {op.path}")
-            op.path.write_text(op.text, encoding="utf-8")
+            if op.base_stat is not None:
+                st = op.path.stat()
+                if (int(st.st_size), int(st.st_mtime_ns)) != op.base_stat:
+                    raise ValueError(f"file changed since patch was planned: {op.path}")
+            _atomic_rewrite(op.path, edits=op.edits)
             continue
         if op.kind == "delete":
             _delete_file(op.path)
@@ -38,6 +38,7 @@ FILE_READ_SPEC = ToolSpec(
         "required": ["path"],
         "additionalProperties": False,
     },
+    idempotency="safe",
 )
 
 
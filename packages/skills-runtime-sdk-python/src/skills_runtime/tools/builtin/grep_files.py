@@ -6,46 +6,75 @@
 - 参考 Codex：`../codex/docs/workdocjcl/spec/05_Integrations/TOOLS_DETAILED/grep_files.md`
 
 语义：
-- 返回“包含匹配的文件路径列表”，不返回逐行匹配内容。
+- 默认（mode=files）返回“包含匹配的文件路径列表”，不返回逐行匹配内容。
   - 逐行内容由 `file_read` 再读取（更可控，避免输出过大）。
+- mode=lines 返回 `path:line:text`（可带上下文行，上下文行用 `path-line-text` 表示）。
+- 搜索由 `skills_runtime.tools.grep_engine` 完成：并行扫描、流式产出，达到 limit 即停止。
+- workspace 下存在 trigram 索引（`.skills_runtime_sdk/index/`，由 `tools search` 建立）时先用索引缩小候选文件；
+  pattern 无法缩小或索引过旧时回退到全量扫描。
 """
 
 from __future__ import annotations
 
-import fnmatch
-import os
 import re
 import time
-from pathlib import Path
-from typing import Optional
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from skills_runtime.tools.grep_engine import DEFAULT_MAX_FILE_BYTES, FileHit, GrepOptions, GrepStats, compile_matcher, grep
 from skills_runtime.tools.protocol import ToolCall, ToolResult, ToolResultPayload, ToolSpec
 from skills_runtime.tools.registry import ToolExecutionContext
+from skills_runtime.tools.search_index import TrigramIndex
 
 
 class _GrepFilesArgs(BaseModel):
-    """grep_files 输入参数（Phase 4 最小字段）。"""
+    """grep_files 输入参数。"""
 
     model_config = ConfigDict(extra="forbid")
 
     pattern: str
     path: Optional[str] = None
     include: Optional[str] = None
-    limit: int = Field(default=100, ge=1, description="最多返回的匹配文件数")
+    limit: int = Field(default=100, ge=1, description="最多返回的匹配文件数（lines 模式为匹配行数）")
+    mode: Literal["files", "lines"] = "files"
+    context_lines: int = Field(default=0, ge=0, le=20, description="lines 模式下每个匹配前后的上下文行数")
+    max_file_bytes: int = Field(default=DEFAULT_MAX_FILE_BYTES, ge=1, description="超过该大小的文件跳过")
 
 
 GREP_FILES_SPEC = ToolSpec(
     name="grep_files",
-    description="在指定路径下搜索 pattern，返回“包含匹配的文件路径列表”（不返回逐行内容）。",
+    description=(
+        "在指定路径下搜索 pattern。默认返回“包含匹配的文件路径列表”；"
+        "mode=lines 时返回 `path:line:text` 形式的匹配行（可带上下文）。"
+    ),
     parameters={
         "type": "object",
         "properties": {
             "pattern": {"type": "string", "description": "正则/搜索模式（trim 后不能为空）"},
             "path": {"type": "string", "description": "搜索根路径（可选；默认 workspace_root）"},
             "include": {"type": "string", "description": "glob 过滤（可选，例如 \"*.md\"）"},
-            "limit": {"type": "integer", "minimum": 1, "description": "最多返回的匹配文件数（可选；默认 100）"},
+            "limit": {
+                "type": "integer",
+                "minimum": 1,
+                "description": "最多返回的匹配文件数（lines 模式为匹配行数；可选；默认 100）",
+            },
+            "mode": {
+                "type": "string",
+                "enum": ["files", "lines"],
+                "description": "files：只返回文件路径（默认）；lines：返回 path:line:text",
+            },
+            "context_lines": {
+                "type": "integer",
+                "minimum": 0,
+                "maximum": 20,
+                "description": "lines 模式下每个匹配前后附带的上下文行数（可选；默认 0）",
+            },
+            "max_file_bytes": {
+                "type": "integer",
+                "minimum": 1,
+                "description": f"跳过超过该字节数的文件（可选；默认 {DEFAULT_MAX_FILE_BYTES}）",
+            },
         },
         "required": ["pattern"],
         "additionalProperties": False,
@@ -55,19 +84,23 @@ GREP_FILES_SPEC = ToolSpec(
 )
 
 
-def _is_hidden_rel(rel: Path) -> bool:
-    """判断相对路径任一组件是否以 '.' 开头。"""
+def _format_line_hits(hits: List[FileHit], limit: int) -> tuple[list[dict], list[str]]:
+    """把行模式命中整理为 data.matches 与 stdout 行（最多 limit 条；上下文组之间用 `--` 分隔）。"""
 
-    for part in rel.parts:
-        if part.startswith("."):
-            return True
-    return False
-
-
-def _looks_binary_prefix(data: bytes) -> bool:
-    """用极轻量启发式判断二进制文件（含 NUL 字节）。"""
-
-    return b"\x00" in data
+    matches: list[dict] = []
+    out_lines: list[str] = []
+    for hit in hits:
+        for lm in hit.lines:
+            if len(matches) >= limit:
+                return matches, out_lines
+            if lm.before or lm.after:
+                if out_lines:
+                    out_lines.append("--")
+                out_lines.extend(f"{hit.path}-{n}-{t}" for n, t in lm.before)
+            out_lines.append(f"{hit.path}:{lm.line}:{lm.text}")
+            out_lines.extend(f"{hit.path}-{n}-{t}" for n, t in lm.after)
+            matches.append({"path": hit.path, "line": lm.line, "text": lm.text})
+    return matches, out_lines
 
 
 def grep_files(call: ToolCall, ctx: ToolExecutionContext) -> ToolResult:
@@ -75,11 +108,11 @@ def grep_files(call: ToolCall, ctx: ToolExecutionContext) -> ToolResult:
     执行 grep_files。
 
     参数：
-    - call：工具调用（args.pattern / args.path / args.include / args.limit）
+    - call：工具调用（args.pattern / path / include / limit / mode / context_lines / max_file_bytes）
     - ctx：执行上下文（workspace_root；用于路径边界校验）
 
     返回：
-    - ok=true：data.files 为绝对路径列表；stdout 为多行文本（可读）
+    - ok=true：data.files 为绝对路径列表（lines 模式另有 data.matches）；stdout 为多行文本（可读）
     - ok=false：error_kind 指示 permission/validation/unknown
     """
 
@@ -99,7 +132,7 @@ def grep_files(call: ToolCall, ctx: ToolExecutionContext) -> ToolResult:
         include = None
 
     try:
-        regex = re.compile(pattern)
+        compile_matcher(pattern)
     except re.error as e:
         return ToolResult.error_payload(error_kind="validation", stderr=f"invalid pattern regex: {e}")
 
@@ -110,90 +143,70 @@ def grep_files(call: ToolCall, ctx: ToolExecutionContext) -> ToolResult:
         except Exception as e:  # 防御性兜底：resolve_path 可能抛出 UserError（越界）或 OSError 等。
             return ToolResult.error_payload(error_kind="permission", stderr=str(e))
 
-    if root.exists() and root.is_file():
-        # 单文件模式：只检查该文件
-        roots = [(root.parent, [root.name])]
-    else:
-        roots = []
-        if not root.exists():
-            # 根不存在：视为无匹配（不当作错误，便于产品层决定提示口径）
-            duration_ms = int((time.monotonic() - start) * 1000)
-            payload = ToolResultPayload(
-                ok=True,
-                stdout="No matches found.\n",
-                stderr="",
-                exit_code=0,
-                duration_ms=duration_ms,
-                truncated=False,
-                data={"files": []},
-                error_kind=None,
-                retryable=False,
-                retry_after_ms=None,
-            )
-            return ToolResult.from_payload(payload)
-        if not root.is_dir():
-            return ToolResult.error_payload(error_kind="validation", stderr="path must be a directory or a file")
-        roots = [(root, None)]
-
-    matches: list[str] = []
-    truncated = False
-    limit = int(args.limit)
+    if not root.exists():
+        # 根不存在：视为无匹配（不当作错误，便于产品层决定提示口径）
+        duration_ms = int((time.monotonic() - start) * 1000)
+        payload = ToolResultPayload(
+            ok=True,
+            stdout="No matches found.\n",
+            stderr="",
+            exit_code=0,
+            duration_ms=duration_ms,
+            truncated=False,
+            data={"files": []},
+            error_kind=None,
+            retryable=False,
+            retry_after_ms=None,
+        )
+        return ToolResult.from_payload(payload)
+    if not root.is_dir() and not root.is_file():
+        return ToolResult.error_payload(error_kind="validation", stderr="path must be a directory or a file")
 
-    for walk_root, files_override in roots:
-        if files_override is not None:
-            # 固定文件列表（单文件模式）
-            to_iter = [(walk_root, [], files_override)]
-        else:
-            to_iter = os.walk(walk_root, topdown=True, followlinks=False)
-
-        for dirpath, dirnames, filenames in to_iter:
-            # 过滤隐藏目录（避免深入）
-            try:
-                rel_dir = Path(dirpath).relative_to(root)
-            except ValueError:
-                rel_dir = Path(".")
-            if _is_hidden_rel(rel_dir) and str(rel_dir) != ".":
-                if isinstance(dirnames, list):
-                    dirnames[:] = []
-                continue
-
-            for fname in filenames:
-                fpath = Path(dirpath) / fname
-                try:
-                    rel = fpath.relative_to(root)
-                except ValueError:
-                    continue
-                if _is_hidden_rel(rel):
-                    continue
-
-                rel_posix = rel.as_posix()
-                if include is not None and not fnmatch.fnmatch(rel_posix, include):
-                    continue
-
-                try:
-                    with fpath.open("rb") as f:
-                        head = f.read(1024)
-                        if _looks_binary_prefix(head):
-                            continue
-                        data = head + f.read()
-                    text = data.decode("utf-8", errors="replace")
-                except OSError:
-                    continue
-
-                if regex.search(text) is None:
-                    continue
-                matches.append(str(fpath.resolve()))
-                if len(matches) >= limit:
-                    truncated = True
-                    break
-
-            if truncated:
-                break
-        if truncated:
+    limit = int(args.limit)
+    options = GrepOptions(
+        pattern=pattern,
+        include=include,
+        limit=limit,
+        mode=args.mode,
+        context_lines=int(args.context_lines),
+        max_file_bytes=int(args.max_file_bytes),
+    )
+    candidates = None
+    index = TrigramIndex.load(ctx.workspace_root)
+    if index is not None:
+        candidates = index.candidate_files(pattern, root=root, include=include)
+
+    stats = GrepStats()
+    hits: list[FileHit] = []
+    found_lines = 0
+    truncated = False
+    # 生成器在 break 时关闭：不再派发新文件（limit 短路）。
+    for hit in grep(str(root.resolve()), options, stats=stats, cancel_checker=ctx.cancel_checker, candidates=candidates):
+        hits.append(hit)
+        found_lines += len(hit.lines)
+        if (len(hits) if args.mode == "files" else found_lines) >= limit:
+            truncated = True
             break
 
+    data: dict = {
+        "files": [h.path for h in hits],
+        "pattern": pattern,
+        "root": str(root),
+        "include": include,
+        "limit": limit,
+        "mode": args.mode,
+        "files_scanned": stats.files_scanned,
+        "skipped_large": stats.skipped_large,
+        "index_used": candidates is not None and not candidates.fell_back,
+    }
+    if args.mode == "lines":
+        matches, out_lines = _format_line_hits(hits, limit)
+        data["matches"] = matches
+        stdout = "No matches found.\n" if not matches else "\n".join(out_lines) + "\n"
+    else:
+        stdout = "No matches found.\n" if not hits else "\n".join(data["files"]) + "\n"
+
     duration_ms = int((time.monotonic() - start) * 1000)
-    stdout = "No matches found.\n" if not matches else "\n".join(matches) + "\n"
     payload = ToolResultPayload(
         ok=True,
         stdout=stdout,
@@ -201,7 +214,7 @@ def grep_files(call: ToolCall, ctx: ToolExecutionContext) -> ToolResult:
         exit_code=0,
         duration_ms=duration_ms,
         truncated=truncated,
-        data={"files": matches, "pattern": pattern, "root": str(root), "include": include, "limit": limit},
+        data=data,
         error_kind=None,
         retryable=False,
         retry_after_ms=None,
@@ -8,14 +8,20 @@
 说明：
 - 本实现以“可回归 + 安全边界”为优先：只允许列出 workspace_root 内的目录。
 - 默认不跟随 symlink 递归（避免隐式越界）。
+- 惰性分页：按 rel_path 全局有序地逐条产出（最小堆 + `os.scandir`），凑够 `offset+limit` 即停止；
+  结果被截断时返回不透明的 `next_cursor`，下一页从 cursor 之后继续，只展开 cursor 路径上的目录。
 """
 
 from __future__ import annotations
 
+import base64
+import heapq
+import json
+import os
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -32,6 +38,7 @@ class _ListDirArgs(BaseModel):
     depth: int = Field(default=2, ge=1, description="递归深度（>=1）")
     offset: int = Field(default=1, ge=1, description="1-indexed 起始条目序号（>=1）")
     limit: int = Field(default=25, ge=1, description="返回条目数上限（>=1）")
+    cursor: Optional[str] = Field(default=None, description="上一页返回的 next_cursor（offset 相对 cursor 计）")
 
 
 LIST_DIR_SPEC = ToolSpec(
@@ -44,6 +51,7 @@ LIST_DIR_SPEC = ToolSpec(
             "depth": {"type": "integer", "minimum": 1, "description": "递归深度（可选；默认 2）"},
             "offset": {"type": "integer", "minimum": 1, "description": "1-indexed 起始条目序号（可选；默认 1）"},
             "limit": {"type": "integer", "minimum": 1, "description": "返回条目数上限（可选；默认 25）"},
+            "cursor": {"type": "string", "description": "上一页返回的 data.next_cursor（可选；用于翻页）"},
         },
         "required": ["dir_path"],
         "additionalProperties": False,
@@ -67,63 +75,82 @@ class _Entry:
         return {"rel_path": self.rel_path, "abs_path": self.abs_path, "type": self.type}
 
 
-def _is_dot_entry(path: Path) -> bool:
-    """判断路径任一组件是否以 '.' 开头（用于忽略隐藏条目）。"""
+def _entry_type(entry: os.DirEntry) -> str:
+    """按 DirEntry 缓存的类型判断条目类型（大多数平台无需额外 stat）。"""
 
-    for part in path.parts:
-        if part.startswith("."):
-            return True
-    return False
-
-
-def _collect_entries(*, root: Path, depth: int) -> list[_Entry]:
+    try:
+        if entry.is_symlink():
+            return "symlink"
+        if entry.is_dir(follow_symlinks=False):
+            return "dir"
+        if entry.is_file(follow_symlinks=False):
+            return "file"
+    except OSError:
+        pass
+    return "other"
+
+
+def _iter_entries(*, root: Path, depth: int, after: Optional[str] = None) -> Iterator[_Entry]:
     """
-    BFS 收集目录条目（不跟随 symlink 递归）。
+    按 rel_path 升序惰性产出目录条目（不跟随 symlink 递归，忽略 '.' 开头的条目）。
 
     参数：
     - root：起始目录（绝对路径，且在 workspace_root 内）
     - depth：递归深度（>=1）
+    - after：只产出 rel_path 大于该值的条目（cursor 续读）
 
-    返回：
-    - _Entry 列表（未切片；稳定排序由调用方负责）
+    说明：
+    - 目录的所有子孙都以 `rel + "/"` 为前缀、必然排在其后，因此“弹出堆顶时才展开目录”可保证全局有序；
+    - `<= after` 的目录只有当 after 就是该目录或位于其子树内时才展开（且不产出），其余整棵子树直接跳过。
     """
 
-    out: list[_Entry] = []
-    queue: list[tuple[Path, int]] = [(root, 1)]
-    while queue:
-        current, current_depth = queue.pop(0)
+    root_abs = str(root)
+    # (rel_path, depth, type, emit)
+    heap: list[tuple[str, int, str, bool]] = [("", 0, "dir", False)]
+    while heap:
+        rel, cur_depth, typ, emit = heapq.heappop(heap)
+        abs_path = os.path.join(root_abs, rel) if rel else root_abs
+        if emit:
+            if typ == "symlink":
+                abs_path = str(Path(abs_path).resolve())
+            yield _Entry(rel_path=rel, abs_path=abs_path, type=typ)
+        if typ != "dir" or cur_depth >= depth:
+            continue
+        prefix = rel + "/" if rel else ""
         try:
-            children = list(current.iterdir())
+            with os.scandir(abs_path) as it:
+                for child in it:
+                    if child.name.startswith("."):
+                        continue
+                    child_rel = prefix + child.name
+                    child_typ = _entry_type(child)
+                    if after is None or child_rel > after:
+                        heapq.heappush(heap, (child_rel, cur_depth + 1, child_typ, True))
+                    elif child_typ == "dir" and (child_rel == after or after.startswith(child_rel + "/")):
+                        heapq.heappush(heap, (child_rel, cur_depth + 1, child_typ, False))
         except OSError:
             continue
 
-        for child in children:
-            try:
-                rel = child.relative_to(root)
-            except ValueError:
-                continue
-            if _is_dot_entry(rel):
-                continue
-
-            rel_str = rel.as_posix()
-            typ = "other"
-            try:
-                if child.is_symlink():
-                    typ = "symlink"
-                elif child.is_dir():
-                    typ = "dir"
-                elif child.is_file():
-                    typ = "file"
-            except OSError:
-                typ = "other"
-
-            out.append(_Entry(rel_path=rel_str, abs_path=str(child.resolve()), type=typ))
-
-            # 递归：仅对真实 dir，且不跟随 symlink dir
-            if typ == "dir" and current_depth < depth:
-                queue.append((child, current_depth + 1))
-    out.sort(key=lambda e: e.rel_path.replace("\\", "/"))
-    return out
+
+def _encode_cursor(*, root: Path, depth: int, after: str) -> str:
+    """生成不透明 cursor（绑定 dir_path/depth，防止跨查询误用）。"""
+
+    raw = json.dumps({"v": 1, "dir": str(root), "depth": depth, "after": after}, ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str, *, root: Path, depth: int) -> Optional[str]:
+    """解析 cursor 并返回续读位置；格式错误或与本次查询不匹配时返回 None。"""
+
+    try:
+        obj = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8"))
+    except (ValueError, UnicodeError):
+        return None
+    if not isinstance(obj, dict) or obj.get("v") != 1:
+        return None
+    if obj.get("dir") != str(root) or obj.get("depth") != depth or not isinstance(obj.get("after"), str):
+        return None
+    return str(obj["after"])
 
 
 def list_dir(call: ToolCall, ctx: ToolExecutionContext) -> ToolResult:
@@ -131,11 +158,12 @@ def list_dir(call: ToolCall, ctx: ToolExecutionContext) -> ToolResult:
     执行 list_dir。
 
     参数：
-    - call：工具调用（args.dir_path / args.depth / args.offset / args.limit）
+    - call：工具调用（args.dir_path / args.depth / args.offset / args.limit / args.cursor）
     - ctx：执行上下文（workspace_root；用于路径边界校验）
 
     返回：
-    - ok=true：data.entries 为结构化条目；stdout 为多行文本
+    - ok=true：data.entries 为结构化条目；stdout 为多行文本；截断时 data.next_cursor 用于取下一页
+      （data.total 仅在遍历完成时给出，否则为 null）
     - ok=false：error_kind 指示 permission/not_found/validation/unknown
     """
 
@@ -157,26 +185,38 @@ def list_dir(call: ToolCall, ctx: ToolExecutionContext) -> ToolResult:
     if not root.is_dir():
         return ToolResult.error_payload(error_kind="validation", stderr=f"dir_path 不是目录：{args.dir_path}", data={"dir_path": args.dir_path})
 
-    entries = _collect_entries(root=root, depth=int(args.depth))
-    total = len(entries)
+    depth = int(args.depth)
+    after: Optional[str] = None
+    if args.cursor is not None:
+        after = _decode_cursor(args.cursor, root=root, depth=depth)
+        if after is None:
+            return ToolResult.error_payload(
+                error_kind="validation",
+                stderr="cursor is invalid or does not match dir_path/depth",
+                data={"dir_path": str(root), "depth": depth},
+            )
 
     offset0 = int(args.offset) - 1
     limit = int(args.limit)
-    if offset0 >= total and total > 0:
-        return ToolResult.error_payload(
-            error_kind="validation",
-            stderr="offset exceeds directory entry count",
-            data={"dir_path": str(root), "offset": int(args.offset), "total": total},
-        )
-    if total == 0 and int(args.offset) != 1:
+    # 多取 1 条用于判断是否还有下一页；遍历在凑够后即停止。
+    window: list[_Entry] = []
+    for e in _iter_entries(root=root, depth=depth, after=after):
+        window.append(e)
+        if len(window) > offset0 + limit:
+            break
+    truncated = len(window) > offset0 + limit
+    # 只有遍历完成时才知道总数（cursor 续读时为 cursor 之后的条目数）。
+    total: Optional[int] = None if truncated else len(window)
+
+    if total is not None and ((offset0 >= total and total > 0) or (total == 0 and int(args.offset) != 1)):
         return ToolResult.error_payload(
             error_kind="validation",
             stderr="offset exceeds directory entry count",
             data={"dir_path": str(root), "offset": int(args.offset), "total": total},
         )
 
-    sliced = entries[offset0 : offset0 + limit]
-    truncated = (offset0 + limit) < total
+    sliced = window[offset0 : offset0 + limit]
+    next_cursor = _encode_cursor(root=root, depth=depth, after=sliced[-1].rel_path) if truncated else None
 
     lines: list[str] = [f"Absolute path: {root}"]
     for e in sliced:
@@ -201,11 +241,12 @@ def list_dir(call: ToolCall, ctx: ToolExecutionContext) -> ToolResult:
         truncated=truncated,
         data={
             "dir_path": str(root),
-            "depth": int(args.depth),
+            "depth": depth,
             "offset": int(args.offset),
             "limit": int(args.limit),
             "total": total,
             "entries": [e.to_dict() for e in sliced],
+            "next_cursor": next_cursor,
         },
         error_kind=None,
         retryable=False,
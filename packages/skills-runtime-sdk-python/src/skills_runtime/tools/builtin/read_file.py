@@ -4,16 +4,23 @@
 对齐规格：
 - `docs/specs/skills-runtime-sdk/docs/tools-standard-library.md`（read_file slice + indentation 契约）
 - Codex 参考：`../codex/docs/workdocjcl/spec/05_Integrations/TOOLS_DETAILED/read_file.md`
+
+读取方式：
+- 不整体加载文件：通过 `skills_runtime.tools.line_index.LineReader` 按行流式读取，
+  slice 模式读到窗口末尾（多看 1 行判断截断）即停止；indentation 模式从锚点向上/向下按需扫描；
+- 同一文件（按 path/size/mtime）后续读取借助稀疏行偏移索引直接 seek；
+- total_lines 仅在读到过 EOF 时可知，否则为 null。
 """
 
 from __future__ import annotations
 
 import time
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from skills_runtime.tools.line_index import LineReader
 from skills_runtime.tools.protocol import ToolCall, ToolResult, ToolResultPayload, ToolSpec
 from skills_runtime.tools.registry import ToolExecutionContext
 
@@ -126,12 +133,12 @@ def _is_blank(raw_line: str) -> bool:
     return not raw_line.strip()
 
 
-def _next_nonblank_index(lines: list[str], start_idx: int) -> Optional[int]:
+def _next_nonblank_index(lines: LineReader, start_idx: int) -> Optional[int]:
     """
     返回从 start_idx 开始向下的第一条非空行 index（含 start_idx）。
 
     参数：
-    - lines：全文件 lines（不含换行）
+    - lines：按需读取的行源（不含换行）
     - start_idx：起始 index（0-indexed）
 
     返回：
@@ -139,14 +146,14 @@ def _next_nonblank_index(lines: list[str], start_idx: int) -> Optional[int]:
     """
 
     i = start_idx
-    while i < len(lines):
-        if not _is_blank(lines[i]):
+    while (text := lines.line(i)) is not None:
+        if not _is_blank(text):
             return i
         i += 1
     return None
 
 
-def _find_header_above(lines: list[str], from_idx: int, current_indent: int) -> Optional[int]:
+def _find_header_above(lines: LineReader, from_idx: int, current_indent: int) -> Optional[int]:
     """
     向上寻找“候选 header 行”（indentation 模式）。
 
@@ -155,7 +162,7 @@ def _find_header_above(lines: list[str], from_idx: int, current_indent: int) ->
     - header 行后紧邻的下一条非空行缩进严格大于 header 缩进
 
     参数：
-    - lines：全文件 lines（不含换行）
+    - lines：按需读取的行源（不含换行）
     - from_idx：向上搜索的起点（包含该行，0-indexed）
     - current_indent：当前块缩进宽度（用于比较）
 
@@ -165,19 +172,20 @@ def _find_header_above(lines: list[str], from_idx: int, current_indent: int) ->
 
     i = from_idx
     while i >= 0:
-        if _is_blank(lines[i]):
+        text = lines.line(i) or ""
+        if _is_blank(text):
             i -= 1
             continue
-        h_indent = _indent_width(lines[i])
+        h_indent = _indent_width(text)
         if h_indent < current_indent:
             nxt = _next_nonblank_index(lines, i + 1)
-            if nxt is not None and _indent_width(lines[nxt]) > h_indent:
+            if nxt is not None and _indent_width(lines.line(nxt) or "") > h_indent:
                 return i
         i -= 1
     return None
 
 
-def _block_range_for_header(lines: list[str], header_idx: int) -> tuple[int, int]:
+def _block_range_for_header(lines: LineReader, header_idx: int) -> tuple[int, int]:
     """
     计算某个 header 的 body block 范围（不含 header 行）。
 
@@ -187,31 +195,23 @@ def _block_range_for_header(lines: list[str], header_idx: int) -> tuple[int, int
 
     返回：
     - (start_idx, end_idx)：均为 0-indexed 且 end_idx >= start_idx-1。
-      当文件在 header 之后无任何行时，返回 (len(lines), len(lines)-1)（空范围）。
+      当文件在 header 之后无任何行时，返回 (header_idx+1, header_idx)（空范围）。
     """
 
-    if header_idx + 1 >= len(lines):
-        return len(lines), len(lines) - 1
-
-    header_indent = _indent_width(lines[header_idx])
+    header_indent = _indent_width(lines.line(header_idx) or "")
     start_idx = header_idx + 1
-    end_idx = len(lines) - 1
 
     i = start_idx
-    while i < len(lines):
-        if _is_blank(lines[i]):
-            i += 1
-            continue
-        if _indent_width(lines[i]) <= header_indent:
-            end_idx = i - 1
+    while (text := lines.line(i)) is not None:
+        if not _is_blank(text) and _indent_width(text) <= header_indent:
             break
         i += 1
-    return start_idx, end_idx
+    return start_idx, i - 1
 
 
 def _indentation_select_range(
     *,
-    lines: list[str],
+    lines: LineReader,
     anchor_idx: int,
     max_levels: int,
     include_siblings: bool,
@@ -221,7 +221,7 @@ def _indentation_select_range(
     按 indentation 规则选择输出范围（0-indexed，含 header 可选）。
 
     参数：
-    - lines：全文件 lines（不含换行）
+    - lines：按需读取的行源（不含换行）
     - anchor_idx：锚点 index（0-indexed）
     - max_levels：向上扩展最大层级；0 表示不限制
     - include_siblings：是否包含同级块
@@ -231,7 +231,7 @@ def _indentation_select_range(
     - Optional[(start_idx, end_idx)]：找不到可用 header 时返回 None（调用方可回退到 slice）
     """
 
-    anchor_indent = _indent_width(lines[anchor_idx])
+    anchor_indent = _indent_width(lines.line(anchor_idx) or "")
     if anchor_indent <= 0:
         return None
 
@@ -248,7 +248,7 @@ def _indentation_select_range(
             break
         headers.append(h)
         current_from = h - 1
-        current_indent = _indent_width(lines[h])
+        current_indent = _indent_width(lines.line(h) or "")
 
     if not headers:
         return None
@@ -272,6 +272,106 @@ def _indentation_select_range(
     return body_start, body_end
 
 
+def _offset_error(path: Path, offset: int, total_lines: Optional[int]) -> ToolResult:
+    """offset 越界的 validation 错误。"""
+
+    return ToolResult.error_payload(
+        error_kind="validation",
+        stderr="offset exceeds file length",
+        data={"file_path": str(path), "offset": offset, "total_lines": total_lines},
+    )
+
+
+def _format_line(idx: int, text: str) -> str:
+    """格式化输出行（`L<n>: <text>`，n 为 1-indexed）。"""
+
+    return f"L{idx + 1}: {_clip_line(text)}"
+
+
+def _read_slice(reader: LineReader, *, path: Path, offset: int, limit: int) -> Union[ToolResult, tuple[list[str], bool]]:
+    """
+    slice 模式：从 offset 开始流式读取最多 limit 行。
+
+    返回：
+    - (out_lines, truncated)：多读 1 行用于判断 truncated，读够即停止；
+    - ToolResult：offset 越界（此时必然已读到 EOF，total_lines 已知）。
+    """
+
+    out_lines: list[str] = []
+    truncated = False
+    for i, text in enumerate(reader.iter_lines(offset - 1), start=offset - 1):
+        if len(out_lines) >= limit:
+            truncated = True
+            break
+        out_lines.append(_format_line(i, text))
+    # 空文件允许 offset=1（返回空输出）；其余情况读不到首行即越界。
+    if not out_lines and offset != 1:
+        return _offset_error(path, offset, reader.total_lines)
+    return out_lines, truncated
+
+
+def _read_indentation(
+    reader: LineReader,
+    *,
+    path: Path,
+    offset: int,
+    limit: int,
+    ind: _ReadFileIndentationArgs,
+) -> Union[ToolResult, tuple[list[str], bool]]:
+    """
+    indentation 模式：从锚点向上寻找 header、向下确定块范围，只读取涉及的行。
+
+    返回：
+    - (out_lines, truncated)：truncated 表示选中范围超过 max_lines；
+    - ToolResult：offset/anchor_line/max_lines 校验失败。
+    """
+
+    # 基础 offset 越界校验（与 slice 一致）
+    if reader.line(offset - 1) is None and offset != 1:
+        return _offset_error(path, offset, reader.total_lines)
+
+    anchor_line = int(ind.anchor_line or offset)
+    if reader.line(anchor_line - 1) is None:
+        return ToolResult.error_payload(
+            error_kind="validation",
+            stderr="anchor_line exceeds file length",
+            data={"file_path": str(path), "anchor_line": anchor_line, "total_lines": reader.total_lines},
+        )
+    max_output_lines = int(ind.max_lines or limit)
+    if max_output_lines <= 0:
+        return ToolResult.error_payload(
+            error_kind="validation",
+            stderr="max_lines must be greater than zero",
+            data={"file_path": str(path), "max_lines": max_output_lines},
+        )
+
+    selected = _indentation_select_range(
+        lines=reader,
+        anchor_idx=anchor_line - 1,
+        max_levels=int(ind.max_levels),
+        include_siblings=bool(ind.include_siblings),
+        include_header=bool(ind.include_header),
+    )
+    if selected is None:
+        # 无法识别可用 header（例如 anchor 在顶层、或文件形态不适合缩进块）：
+        # 按 spec 允许回退为 slice（从 anchor_line 开始，最多 max_output_lines 行）。
+        start_idx = anchor_line - 1
+        end_idx = start_idx + max_output_lines - 1
+    else:
+        start_idx, end_idx = selected
+
+    # 输出范围保护（max_output_lines）
+    out_lines: list[str] = []
+    i = max(0, start_idx)
+    while i <= end_idx and len(out_lines) < max_output_lines:
+        text = reader.line(i)
+        if text is None:
+            break
+        out_lines.append(_format_line(i, text))
+        i += 1
+    return out_lines, i <= end_idx and reader.line(i) is not None
+
+
 def read_file(call: ToolCall, ctx: ToolExecutionContext) -> ToolResult:
     """
     执行 read_file（slice/indentation）。
@@ -281,7 +381,7 @@ def read_file(call: ToolCall, ctx: ToolExecutionContext) -> ToolResult:
     - ctx：执行上下文（workspace_root；用于路径边界校验）
 
     返回：
-    - ok=true：stdout 为带行号文本；data 含 total_lines/offset/limit/file_path
+    - ok=true：stdout 为带行号文本；data 含 total_lines/offset/limit/file_path（total_lines 未读到 EOF 时为 null）
     - ok=false：error_kind 为 validation/not_found/permission/unknown
     """
 
@@ -319,8 +419,21 @@ def read_file(call: ToolCall, ctx: ToolExecutionContext) -> ToolResult:
             data={"file_path": str(args.file_path)},
         )
 
+    offset = int(args.offset)
+    limit = int(args.limit)
     try:
-        text = path.read_text(encoding="utf-8")
+        with LineReader(path) as reader:
+            if mode == "slice":
+                out = _read_slice(reader, path=path, offset=offset, limit=limit)
+            else:
+                out = _read_indentation(
+                    reader,
+                    path=path,
+                    offset=offset,
+                    limit=limit,
+                    ind=args.indentation or _ReadFileIndentationArgs(),
+                )
+            total_lines = reader.total_lines
     except UnicodeDecodeError:
         return ToolResult.error_payload(
             error_kind="validation",
@@ -329,95 +442,9 @@ def read_file(call: ToolCall, ctx: ToolExecutionContext) -> ToolResult:
         )
     except OSError as e:
         return ToolResult.error_payload(error_kind="unknown", stderr=str(e), data={"file_path": str(path)})
-
-    lines = text.splitlines()
-    total_lines = len(lines)
-    offset = int(args.offset)
-    limit = int(args.limit)
-
-    # 基础 offset 越界校验（对齐 slice 语义；indentation 也复用 offset 默认值）
-    if total_lines == 0 and offset != 1:
-        return ToolResult.error_payload(
-            error_kind="validation",
-            stderr="offset exceeds file length",
-            data={"file_path": str(path), "offset": offset, "total_lines": total_lines},
-        )
-    if offset > total_lines and total_lines > 0:
-        return ToolResult.error_payload(
-            error_kind="validation",
-            stderr="offset exceeds file length",
-            data={"file_path": str(path), "offset": offset, "total_lines": total_lines},
-        )
-
-    selected_start_idx: int
-    selected_end_idx: int
-    max_output_lines: int = limit
-
-    if mode == "slice":
-        selected_start_idx = offset - 1
-        selected_end_idx = min(total_lines, selected_start_idx + limit) - 1
-    else:
-        ind = args.indentation or _ReadFileIndentationArgs()
-        anchor_line = int(ind.anchor_line or offset)
-        if total_lines == 0:
-            return ToolResult.error_payload(
-                error_kind="validation",
-                stderr="anchor_line exceeds file length",
-                data={"file_path": str(path), "anchor_line": anchor_line, "total_lines": total_lines},
-            )
-        if anchor_line < 1 or anchor_line > total_lines:
-            return ToolResult.error_payload(
-                error_kind="validation",
-                stderr="anchor_line exceeds file length",
-                data={"file_path": str(path), "anchor_line": anchor_line, "total_lines": total_lines},
-            )
-        max_output_lines = int(ind.max_lines or limit)
-        if max_output_lines <= 0:
-            return ToolResult.error_payload(
-                error_kind="validation",
-                stderr="max_lines must be greater than zero",
-                data={"file_path": str(path), "max_lines": max_output_lines},
-            )
-
-        selected = _indentation_select_range(
-            lines=lines,
-            anchor_idx=anchor_line - 1,
-            max_levels=int(ind.max_levels),
-            include_siblings=bool(ind.include_siblings),
-            include_header=bool(ind.include_header),
-        )
-        if selected is None:
-            # 无法识别可用 header（例如 anchor 在顶层、或文件形态不适合缩进块）：
-            # 按 spec 允许回退为 slice（从 anchor_line 开始，最多 max_output_lines 行）。
-            selected_start_idx = anchor_line - 1
-            selected_end_idx = min(total_lines, selected_start_idx + max_output_lines) - 1
-        else:
-            selected_start_idx, selected_end_idx = selected
-
-    if total_lines == 0:
-        selected_start_idx = 0
-        selected_end_idx = -1
-
-    # 输出范围保护（max_output_lines）
-    out_start = max(0, selected_start_idx)
-    out_end = min(total_lines - 1, selected_end_idx)
-    range_truncated = False
-    if out_end < out_start:
-        out_lines = []
-    else:
-        full_len = out_end - out_start + 1
-        slice_len = min(full_len, max_output_lines)
-        range_truncated = slice_len < full_len
-        final_end = out_start + slice_len - 1
-        out_lines = []
-        for i in range(out_start, final_end + 1):
-            n = i + 1
-            out_lines.append(f"L{n}: {_clip_line(lines[i])}")
-
-    if mode == "slice":
-        truncated = (offset - 1 + limit) < total_lines
-    else:
-        truncated = range_truncated
+    if isinstance(out, ToolResult):
+        return out
+    out_lines, truncated = out
 
     stdout = "\n".join(out_lines) + ("\n" if out_lines else "")
     duration_ms = int((time.monotonic() - start) * 1000)
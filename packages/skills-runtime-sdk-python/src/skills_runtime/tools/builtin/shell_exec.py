@@ -11,6 +11,8 @@ from typing import Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from skills_runtime.core.executor import Executor
+from skills_runtime.tools.output_stream import ToolOutputStreamer
 from skills_runtime.tools.protocol import ToolCall, ToolResult, ToolResultPayload, ToolSpec
 from skills_runtime.tools.registry import ToolExecutionContext
 
@@ -70,6 +72,7 @@ SHELL_EXEC_SPEC = ToolSpec(
         "required": ["argv"],
         "additionalProperties": False,
     },
+    idempotency="unknown",
 )
 
 
@@ -145,13 +148,23 @@ def shell_exec(call: ToolCall, ctx: ToolExecutionContext) -> ToolResult:
                 data={"sandbox": sandbox_meta},
             )
 
+    # 运行期间以 tool_output_delta 推送增量输出（短命令不发；最终结果仍是尾部截断的完整 payload）。
+    # 仅内置 Executor（及其子类）支持 on_output；宿主注入的 duck-typed executor 保持原调用签名。
+    streamer: Optional[ToolOutputStreamer] = None
+    stream_kwargs: dict = {}
+    if isinstance(ctx.executor, Executor):
+        streamer = ToolOutputStreamer(ctx, call_id=call.call_id, tool=call.name)
+        stream_kwargs["on_output"] = streamer
     result = ctx.executor.run_command(
         argv,
         cwd=exec_cwd,
         env=merged_env,
         timeout_ms=timeout_ms,
         cancel_checker=ctx.cancel_checker,
+        **stream_kwargs,
     )
+    if streamer is not None:
+        streamer.finish()
 
     payload = ToolResultPayload(
         ok=result.ok,
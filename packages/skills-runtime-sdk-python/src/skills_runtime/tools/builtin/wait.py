@@ -11,7 +11,7 @@
 from __future__ import annotations
 
 import time
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -26,6 +26,7 @@ class _WaitArgs(BaseModel):
 
     ids: List[str] = Field(min_length=1, description="要等待的子 agent ids")
     timeout_ms: Optional[int] = Field(default=None, ge=1, description="总超时（毫秒）")
+    mode: Literal["all", "any"] = Field(default="all", description="all=全部完成才返回；any=任一完成即返回")
 
 
 WAIT_SPEC = ToolSpec(
@@ -36,6 +37,7 @@ WAIT_SPEC = ToolSpec(
         "properties": {
             "ids": {"type": "array", "items": {"type": "string"}, "minItems": 1},
             "timeout_ms": {"type": "integer", "minimum": 1},
+            "mode": {"type": "string", "enum": ["all", "any"]},
         },
         "required": ["ids"],
         "additionalProperties": False,
@@ -50,7 +52,8 @@ def wait_tool(call: ToolCall, ctx: ToolExecutionContext) -> ToolResult:
     执行 wait。
 
     约定：
-    - ctx.collab_manager 需要提供 `wait(ids, timeout_ms) -> handles[]`
+    - ctx.collab_manager 需要提供 `wait(ids, timeout_ms) -> handles[]`；
+      `mode="any"` 时额外传入 `mode` 关键字参数（默认 all 不传，兼容旧 manager）
     """
 
     start = time.monotonic()
@@ -66,7 +69,8 @@ def wait_tool(call: ToolCall, ctx: ToolExecutionContext) -> ToolResult:
 
     ids = [str(i) for i in args.ids]
     try:
-        handles = mgr.wait(ids=ids, timeout_ms=args.timeout_ms)  # type: ignore[attr-defined]
+        extra = {"mode": args.mode} if args.mode != "all" else {}
+        handles = mgr.wait(ids=ids, timeout_ms=args.timeout_ms, **extra)  # type: ignore[attr-defined]
     except KeyError as e:
         return ToolResult.error_payload(error_kind="validation", stderr=str(e), data={"ids": ids})
     except Exception as e:
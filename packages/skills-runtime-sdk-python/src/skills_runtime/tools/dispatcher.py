@@ -8,24 +8,109 @@ ToolDispatcher：工具派发封装（Agent Loop 使用）。
   - `tool_call_started/finished` 必须在实际 dispatch 前后
   - 工具执行期产生的其它事件（例如某些工具内部 emit 的 debug/metrics）需要延后统一 emit，
     避免插入到 approvals 事件之间造成审计序列歧义
+  - 例外：`tool_output_delta`（运行中输出）在工具执行期间经 event loop 实时推送，不等到 finished
 
 因此本模块提供一个薄封装，把“派发 + 事件 flush”收敛到单一入口，便于后续内核化重构。
+
+并发派发（`dispatch_batch`）：
+- 同步 handler 卸载到有界线程池，原生 async handler 直接 await；一批调用的墙钟耗时约等于最慢的一个；
+- 并发分组按 `ToolSpec.idempotency` 计算（见 `tool_wave_key`）：相邻 safe 调用并发，其余调用按原始顺序逐个执行；
+- WAL 顺序确定：波次内先按 call 顺序写 started，再按 call 顺序写各自的旁路事件与 finished。
 """
 
 from __future__ import annotations
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+import functools
 import json
 import hashlib
-from typing import Callable, List
+from typing import Callable, List, Optional, Sequence, Tuple, Union
 
 from skills_runtime.core.contracts import AgentEvent
-from skills_runtime.tools.protocol import ToolCall, ToolResult
+from skills_runtime.core.errors import UserError
+from skills_runtime.tools.protocol import ToolCall, ToolResult, ToolSpec
 from skills_runtime.tools.registry import ToolRegistry
 
 
 EventEmitter = Callable[[AgentEvent], None]
 
+# 工具执行期间实时推送（不延后到 finished 之前）的旁路事件类型。
+_LIVE_SIDE_EVENTS = frozenset({"tool_output_delta"})
+
+
+def tool_wave_key(spec: Optional[ToolSpec], *, unknown_per_tool: int) -> Optional[str]:
+    """
+    按 `ToolSpec.idempotency` 计算调用的并发分组 key：相邻且 key 相同的调用组成一个并发波次。
+
+    规则：
+    - safe（只读/可重复）：`"safe"`，相邻的 safe 调用并发执行；
+    - unknown：`unknown_per_tool>1` 时为 `"tool:<name>"`（仅与相邻的同名调用并发），否则独立执行；
+    - unsafe / 未声明：None（独立执行，前后调用都不与之重叠）；
+    - spec 缺失（未注册工具）：按 safe 处理（dispatch 会直接返回 not_found）。
+
+    说明：不同工具之间（例如 `exec_command` 与随后写入同一 session 的 `write_stdin`）可能存在隐式依赖，
+    因此只有 safe 调用跨工具并发；顺序敏感的组合始终按原始顺序逐个执行。
+    """
+
+    if spec is None or spec.idempotency == "safe":
+        return "safe"
+    if spec.idempotency == "unknown" and unknown_per_tool > 1:
+        return f"tool:{spec.name}"
+    return None
+
+
+def _aborted_result(task: "asyncio.Future[ToolResult]") -> ToolResult:
+    """波次中止后，为未写 finished 的调用生成结果：已完成的用其结果，被取消的记 cancelled，抛错的记 unknown。"""
+
+    if task.cancelled():
+        return ToolResult.error_payload(error_kind="cancelled", stderr="tool call cancelled")
+    exc = task.exception()
+    if exc is not None:
+        return ToolResult.error_payload(error_kind="unknown", stderr=f"tool call failed: {exc}")
+    return task.result()
+
+
+class _SideEvents:
+    """
+    单个调用的旁路事件缓冲（作为 `event_sink`，可能在工具线程中被调用）。
+
+    - `_LIVE_SIDE_EVENTS` 中的事件经 `loop.call_soon_threadsafe` 立即交给 `live` 推送，记为已推送；
+    - 其余事件只缓冲，由 `_finish` 在 finished 之前按顺序发出；
+    - `close()` 之后到达的实时事件不再推送（避免出现在 finished 之后）。
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, live: Optional[EventEmitter]) -> None:
+        """创建缓冲；`live` 为 None 时全部事件都缓冲。"""
+
+        self.events: List[Tuple[AgentEvent, bool]] = []
+        self._loop = loop
+        self._live = live
+        self._closed = False
+
+    def sink(self, ev: AgentEvent) -> None:
+        """ToolExecutionContext.event_sink：记录事件，实时事件同时调度推送。"""
+
+        streamed = self._live is not None and ev.type in _LIVE_SIDE_EVENTS
+        self.events.append((ev, streamed))
+        if streamed:
+            try:
+                self._loop.call_soon_threadsafe(self._forward, ev)
+            except RuntimeError:
+                pass  # event loop 已关闭：不再推送
+
+    def _forward(self, ev: AgentEvent) -> None:
+        """在 event loop 线程中推送实时事件。"""
+
+        if not self._closed and self._live is not None:
+            self._live(ev)
+
+    def close(self) -> None:
+        """停止推送实时事件（调用即将写 finished）。"""
+
+        self._closed = True
+
 
 @dataclass(frozen=True)
 class ToolDispatchInputs:
@@ -52,11 +137,26 @@ class ToolDispatcher:
     - `emit_stream`：仅用于把“工具执行期旁路事件”推送到调用方（这些事件通常已由 tool ctx 写入 WAL）
     """
 
-    def __init__(self, *, registry: ToolRegistry, now_rfc3339: Callable[[], str]) -> None:
-        """创建派发器。参数见类注释。"""
+    def __init__(
+        self,
+        *,
+        registry: ToolRegistry,
+        now_rfc3339: Callable[[], str],
+        max_parallel: int = 1,
+        unknown_per_tool: int = 1,
+    ) -> None:
+        """
+        创建派发器。
+
+        参数：
+        - max_parallel：`dispatch_batch` 同时执行的调用上限；1 表示逐个串行（等价于循环 `dispatch_one`）
+        - unknown_per_tool：相邻同名 idempotency=unknown 调用的并发上限；1 表示逐个执行
+        """
 
         self._registry = registry
         self._now_fn = now_rfc3339
+        self._max_parallel = max(1, int(max_parallel))
+        self._unknown_per_tool = max(1, int(unknown_per_tool))
 
     def dispatch_one(
         self,
@@ -79,9 +179,216 @@ class ToolDispatcher:
         - ToolResult：工具执行结果
         """
 
-        call = inputs.call
         pending_tool_events.clear()
+        rejected = self._begin(inputs, emit_event=emit_event)
+        if rejected is not None:
+            return rejected
+
+        result = self._registry.dispatch(
+            inputs.call,
+            turn_id=inputs.turn_id,
+            step_id=inputs.step_id,
+            event_sink=pending_tool_events.append,
+        )
+
+        # 注意：pending_tool_events 中的事件通常已经被 tool ctx 写入 WAL（ctx.emit_event），这里只负责 stream。
+        self._finish(
+            inputs,
+            result,
+            side_events=[(ev, False) for ev in pending_tool_events],
+            emit_side=emit_stream,
+            emit_event=emit_event,
+        )
+        return result
+
+    async def dispatch_batch(
+        self,
+        *,
+        batch: Sequence[ToolDispatchInputs],
+        emit_event: EventEmitter,
+        emit_stream: EventEmitter,
+        emit_wal: Optional[EventEmitter] = None,
+    ) -> List[ToolResult]:
+        """
+        并发执行一批已批准的 tool calls，返回与 `batch` 等长、同序的结果。
+
+        参数：
+        - batch：按原始顺序排列的调用输入
+        - emit_event：落盘事件出口（started/finished 与补写的旁路事件）
+        - emit_stream：旁路事件出口（串行路径的旁路事件已由 tool ctx 写入 WAL，只需推送；
+          `tool_output_delta` 在工具运行期间即经此出口实时推送）
+        - emit_wal：只写 WAL 的出口；提供时并发波次中的 `tool_output_delta` 也实时推送，
+          并在 finished 之前经此出口补写 WAL（不重复推送）；None 时波次内的 delta 与其它旁路事件一样延后
+
+        说明：
+        - `max_parallel<=1` 或仅一个调用时逐个执行（与 `dispatch_one` 行为一致，但不阻塞 event loop）；
+        - 否则把 batch 切成波次：相邻且 `tool_wave_key` 相同的调用并发执行，key 为 None 的调用单独执行；
+        - 并发波次中工具旁路事件先缓冲（`defer_wal`），在该调用 finished 之前按 call 顺序经 `emit_event` 落盘并推送。
+        """
+
+        results: List[ToolResult] = []
+        if self._max_parallel <= 1 or len(batch) <= 1:
+            for inputs in batch:
+                results.append(await self._dispatch_serial(inputs, emit_event=emit_event, emit_stream=emit_stream))
+            return results
+
+        idx = 0
+        while idx < len(batch):
+            key = self._wave_key(batch[idx].call.name)
+            end = idx + 1
+            while key is not None and end < len(batch) and self._wave_key(batch[end].call.name) == key:
+                end += 1
+            if end - idx == 1:
+                results.append(await self._dispatch_serial(batch[idx], emit_event=emit_event, emit_stream=emit_stream))
+            else:
+                limit = self._max_parallel if key == "safe" else min(self._unknown_per_tool, self._max_parallel)
+                results.extend(
+                    await self._run_wave(
+                        batch[idx:end],
+                        limit=limit,
+                        emit_event=emit_event,
+                        emit_stream=emit_stream,
+                        emit_wal=emit_wal,
+                    )
+                )
+            idx = end
+        return results
+
+    def _wave_key(self, name: str) -> Optional[str]:
+        """返回工具的并发分组 key（见 `tool_wave_key`）。"""
+
+        try:
+            spec: Optional[ToolSpec] = self._registry.get_spec(name)
+        except UserError:
+            spec = None
+        return tool_wave_key(spec, unknown_per_tool=self._unknown_per_tool)
+
+    async def _dispatch_serial(
+        self,
+        inputs: ToolDispatchInputs,
+        *,
+        emit_event: EventEmitter,
+        emit_stream: EventEmitter,
+    ) -> ToolResult:
+        """单个调用的异步派发：async handler 直接 await，同步 handler 卸载到线程执行。"""
+
+        rejected = self._begin(inputs, emit_event=emit_event)
+        if rejected is not None:
+            return rejected
+
+        # 旁路事件已由 tool ctx 写入 WAL：delta 实时推送，其余在 finished 之前推送。
+        side = _SideEvents(asyncio.get_running_loop(), emit_stream)
+        kwargs = {"turn_id": inputs.turn_id, "step_id": inputs.step_id, "event_sink": side.sink}
+        try:
+            if self._registry.is_async_handler(inputs.call.name):
+                result = await self._registry.dispatch_async(inputs.call, **kwargs)
+            else:
+                result = await asyncio.to_thread(functools.partial(self._registry.dispatch, inputs.call, **kwargs))
+        finally:
+            side.close()
+
+        self._finish(inputs, result, side_events=side.events, emit_side=emit_stream, emit_event=emit_event)
+        return result
+
+    async def _run_wave(
+        self,
+        wave: Sequence[ToolDispatchInputs],
+        *,
+        limit: int,
+        emit_event: EventEmitter,
+        emit_stream: EventEmitter,
+        emit_wal: Optional[EventEmitter],
+    ) -> List[ToolResult]:
+        """
+        并发执行一个波次（同时执行的调用数不超过 `limit`）。
+
+        顺序保证：
+        - 先按 call 顺序写出全部 started（或参数非法调用的 finished）；
+        - 再按 call 顺序等待结果，依次补写旁路事件并写 finished（前缀完成即可推送，不必等待整个波次）；
+        - 提供 `emit_wal` 时 `tool_output_delta` 在运行期间经 `emit_stream` 实时推送，finished 之前只补写 WAL；
+        - 等待被取消或某个调用抛错时，其余调用被取消并等待结束，未写 finished 的调用补写
+          finished（cancelled/unknown）后再向上传播。
+        """
+
+        loop = asyncio.get_running_loop()
+        gate = asyncio.Semaphore(limit)
+        n_sync = sum(1 for x in wave if not self._registry.is_async_handler(x.call.name))
+        pool = ThreadPoolExecutor(max_workers=max(1, min(limit, n_sync)), thread_name_prefix="tool-dispatch")
+
+        async def _run(inputs: ToolDispatchInputs, side: _SideEvents) -> ToolResult:
+            """在波次信号量下执行单个调用（旁路事件写入 side，不直接落盘）。"""
+
+            name = inputs.call.name
+            kwargs = {"turn_id": inputs.turn_id, "step_id": inputs.step_id, "event_sink": side.sink, "defer_wal": True}
+            try:
+                async with gate:
+                    if self._registry.is_async_handler(name):
+                        return await self._registry.dispatch_async(inputs.call, **kwargs)
+                    return await loop.run_in_executor(
+                        pool, functools.partial(self._registry.dispatch, inputs.call, **kwargs)
+                    )
+            finally:
+                side.close()
 
+        slots: List[Union[ToolResult, Tuple["asyncio.Task[ToolResult]", _SideEvents]]] = []
+        results: List[ToolResult] = []
+        try:
+            for inputs in wave:
+                rejected = self._begin(inputs, emit_event=emit_event)
+                if rejected is not None:
+                    slots.append(rejected)
+                    continue
+                side = _SideEvents(loop, emit_stream if emit_wal is not None else None)
+                slots.append((asyncio.ensure_future(_run(inputs, side)), side))
+
+            for inputs, slot in zip(wave, slots):
+                if isinstance(slot, ToolResult):
+                    results.append(slot)
+                    continue
+                task, side = slot
+                result = await task
+                self._finish(
+                    inputs,
+                    result,
+                    side_events=side.events,
+                    emit_side=emit_event,
+                    emit_streamed=emit_wal,
+                    emit_event=emit_event,
+                )
+                results.append(result)
+            return results
+        finally:
+            # 等待被取消或某个调用抛错时：取消其余仍在运行的调用并等待其结束（回收异常，不留后台任务），
+            # 再为已 started 但尚未 finished 的调用补写 finished，保证事件序列闭合。
+            tasks = [slot[0] for slot in slots if not isinstance(slot, ToolResult)]
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            pool.shutdown(wait=False)
+            for inputs, slot in list(zip(wave, slots))[len(results) :]:
+                if not isinstance(slot, ToolResult):
+                    slot[1].close()
+                    self._finish(
+                        inputs,
+                        _aborted_result(slot[0]),
+                        side_events=slot[1].events,
+                        emit_side=emit_event,
+                        emit_streamed=emit_wal,
+                        emit_event=emit_event,
+                    )
+
+    def _begin(self, inputs: ToolDispatchInputs, *, emit_event: EventEmitter) -> Optional[ToolResult]:
+        """
+        派发前置：校验 raw_arguments 并写 started。
+
+        返回：
+        - None：可以执行
+        - ToolResult：参数非法（已写 finished，不得执行工具）
+        """
+
+        call = inputs.call
         # 重要：streaming tool_calls arguments 可能是碎片化的 JSON 字符串拼接。
         # 若 raw_arguments 无法解析为 JSON object，必须 fail-closed（不得执行工具）。
         # 注意：这里不发出 tool_call_started，避免“started 但未实际执行”的审计歧义。
@@ -121,17 +428,32 @@ class ToolDispatcher:
             )
         )
 
-        result = self._registry.dispatch(
-            call,
-            turn_id=inputs.turn_id,
-            step_id=inputs.step_id,
-            event_sink=pending_tool_events.append,
-        )
+        return None
 
-        # 注意：pending_tool_events 中的事件通常已经被 tool ctx 写入 WAL（ctx.emit_event），这里只负责 stream。
-        for te in pending_tool_events:
-            emit_stream(te)
+    def _finish(
+        self,
+        inputs: ToolDispatchInputs,
+        result: ToolResult,
+        *,
+        side_events: Sequence[Tuple[AgentEvent, bool]],
+        emit_side: EventEmitter,
+        emit_event: EventEmitter,
+        emit_streamed: Optional[EventEmitter] = None,
+    ) -> None:
+        """
+        派发收尾：先发出工具旁路事件，再写 finished。
 
+        `side_events` 为 `(event, streamed)`：未推送的经 `emit_side` 发出；
+        已在运行期间实时推送的不再重复推送，只在提供 `emit_streamed` 时经其补写（例如 WAL）。
+        """
+
+        for te, streamed in side_events:
+            if not streamed:
+                emit_side(te)
+            elif emit_streamed is not None:
+                emit_streamed(te)
+
+        call = inputs.call
         emit_event(
             AgentEvent(
                 type="tool_call_finished",
@@ -142,5 +464,3 @@ class ToolDispatcher:
                 payload={"call_id": call.call_id, "tool": call.name, "result": result.details or {}},
             )
         )
-
-        return result
@@ -0,0 +1,411 @@
+"""
+grep 搜索引擎（grep_files 与 CLI 共用）。
+
+设计要点：
+- 候选文件枚举：`os.scandir` 递归（按名称排序、跳过 `.` 开头的条目），惰性产出；
+- 文件扫描：线程池并行（文件 I/O 释放 GIL），按枚举顺序有界滑动窗口消费结果，
+  因此结果顺序稳定，且达到 `limit` 后立即停止枚举与派发（流式短路）；
+- 单文件匹配：
+  - 纯字面量 pattern：直接在字节上 `find`（大文件走 mmap），无需解码；
+  - 只能匹配 ASCII 字节的正则：bytes 正则直接作用于原始字节/mmap，无需解码；
+  - 不可能跨行匹配的正则：按行对齐的分块扫描，纯 ASCII 分块用 bytes 正则（免解码），命中即停；
+  - 其它正则：整文件解码后匹配（与历史语义一致）；
+- 超过 `max_file_bytes` 的文件跳过（计入统计）；前 1KiB 含 NUL 的文件视为二进制跳过。
+
+行模式（`mode="lines"`）：报告“匹配起始所在行”（`^`/`$` 按行生效），可附带上下文行。
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+import fnmatch
+import mmap
+import os
+import re
+import threading
+from typing import Any, Callable, Deque, Iterable, Iterator, List, Literal, Optional, Pattern, Tuple
+
+GrepMode = Literal["files", "lines"]
+
+DEFAULT_MAX_FILE_BYTES = 16 * 1024 * 1024
+MAX_LINE_CHARS = 512
+
+_BINARY_PROBE_BYTES = 1024
+_CHUNK_BYTES = 1024 * 1024
+_MMAP_MIN_BYTES = 64 * 1024
+_REGEX_META = frozenset(".^$*+?{}[]\\|()")
+# 可能匹配换行符的正则构造（保守判断；出现任意一个即按整文件匹配）。
+_NEWLINE_CAPABLE = ("\\n", "\\s", "\\S", "\\W", "\\D", "\\x", "\\u", "\\U", "\\N", "\\0", "[^", "(?s", "(?x")
+# 对非 ASCII 文本语义不同于 str 正则的构造（出现任意一个则 bytes 正则只用于纯 ASCII 分块）。
+_UNICODE_SENSITIVE = ("\\w", "\\W", "\\d", "\\D", "\\s", "\\S", "\\b", "\\B", "[^", "(?i", "(?x")
+# 可表示非 ASCII 码点的转义（`\xe9`、`\u00e9`、`\N{...}`、八进制 `\351`）：bytes 正则会按单个原始字节匹配，
+# 与解码后的 str 正则（匹配 UTF-8 多字节序列）语义不同。
+_CODEPOINT_ESCAPE = re.compile(r"\\(?:[xuUN0]|[0-7]{3})")
+# 以整个字符串为边界的锚点：分块扫描时会在每个分块的首尾生效（`^`/`$` 未开 MULTILINE）。
+_STRING_ANCHORS = ("^", "$", "\\A", "\\Z")
+_ESCAPED_RANGE = re.compile(r"\\.-")
+_ANY_ESCAPE = re.compile(r"\\.", re.DOTALL)
+
+
+@dataclass(frozen=True)
+class GrepOptions:
+    """
+    一次搜索的参数。
+
+    字段：
+    - pattern：Python 正则（纯字面量会自动走字节快路径）
+    - include：glob 过滤（匹配相对根目录的 POSIX 路径；单文件模式匹配文件名）
+    - limit：files 模式为最多返回文件数，lines 模式为最多返回匹配行数
+    - mode：files（只返回文件）| lines（返回 `path:line:text`）
+    - context_lines：lines 模式下每个匹配前后附带的上下文行数
+    - max_file_bytes：超过该大小的文件跳过
+    - max_workers：扫描线程数（None 使用 ThreadPoolExecutor 默认值）
+    """
+
+    pattern: str
+    include: Optional[str] = None
+    limit: int = 100
+    mode: GrepMode = "files"
+    context_lines: int = 0
+    max_file_bytes: int = DEFAULT_MAX_FILE_BYTES
+    max_workers: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class LineMatch:
+    """行模式下的一条匹配（行号从 1 开始；before/after 为上下文行 `(line, text)`）。"""
+
+    line: int
+    text: str
+    before: Tuple[Tuple[int, str], ...] = ()
+    after: Tuple[Tuple[int, str], ...] = ()
+
+
+@dataclass(frozen=True)
+class FileHit:
+    """一个命中的文件（lines 模式下附带匹配行）。"""
+
+    path: str
+    rel: str
+    lines: Tuple[LineMatch, ...] = ()
+
+
+@dataclass
+class GrepStats:
+    """搜索统计（只在消费线程中更新）。"""
+
+    files_scanned: int = 0
+    skipped_large: int = 0
+    skipped_binary: int = 0
+
+
+@dataclass(frozen=True)
+class _Matcher:
+    """编译后的匹配器（不可变，可跨线程共享）。"""
+
+    regex: Pattern[str]
+    line_regex: Pattern[str]
+    literal: Optional[bytes]
+    ascii_regex: Optional[Pattern[bytes]]
+    byte_exact: bool
+    chunk_safe: bool
+    # 解码 + str 正则全程持有 GIL：多线程同时执行只会互相争抢，按搜索串行化（I/O 仍并行）。
+    cpu_lock: threading.Lock = field(default_factory=threading.Lock, compare=False)
+
+
+@dataclass
+class _ScanResult:
+    """单文件扫描结果（worker → 消费线程）。"""
+
+    hit: Optional[FileHit] = None
+    skipped_large: bool = False
+    skipped_binary: bool = False
+    scanned: bool = False
+
+
+def compile_matcher(pattern: str) -> _Matcher:
+    """编译 pattern；非法正则抛 `re.error`。"""
+
+    regex = re.compile(pattern)
+    line_regex = re.compile(pattern, re.MULTILINE)
+    literal: Optional[bytes] = None
+    if not (_REGEX_META & set(pattern)) and "�" not in pattern:
+        literal = pattern.encode("utf-8")
+    ascii_regex: Optional[Pattern[bytes]] = None
+    if pattern.isascii():
+        try:
+            ascii_regex = re.compile(pattern.encode("ascii"))
+        except re.error:
+            ascii_regex = None
+    # ASCII pattern 且不含 `.`/`\w` 等构造时，只能匹配 ASCII 字节：直接在原始 UTF-8 字节上匹配与解码后匹配等价。
+    byte_exact = (
+        ascii_regex is not None
+        and "." not in _ANY_ESCAPE.sub("", pattern)
+        and not any(tok in pattern for tok in _UNICODE_SENSITIVE)
+        and _CODEPOINT_ESCAPE.search(pattern) is None
+    )
+    chunk_safe = not (
+        any(ord(ch) < 32 for ch in pattern)
+        or any(tok in pattern for tok in _NEWLINE_CAPABLE)
+        or any(tok in pattern for tok in _STRING_ANCHORS)
+        or ("[" in pattern and _ESCAPED_RANGE.search(pattern) is not None)
+    )
+    return _Matcher(
+        regex=regex,
+        line_regex=line_regex,
+        literal=literal,
+        ascii_regex=ascii_regex,
+        byte_exact=byte_exact,
+        chunk_safe=chunk_safe,
+    )
+
+
+def iter_candidate_files(root: str, *, include: Optional[str]) -> Iterator[Tuple[str, str]]:
+    """
+    惰性枚举 root 下的候选文件，产出 `(abs_path, rel_posix)`。
+
+    说明：
+    - 目录内按名称排序（结果稳定）；跳过 `.` 开头的文件与目录；不跟随目录符号链接；
+    - root 为文件时只产出该文件（include 匹配文件名）。
+    """
+
+    include_re = re.compile(fnmatch.translate(include)) if include else None
+    if os.path.isfile(root):
+        name = os.path.basename(root)
+        if include_re is None or include_re.match(name):
+            yield root, name
+        return
+
+    stack: List[Tuple[str, str]] = [(root, "")]
+    while stack:
+        dir_abs, dir_rel = stack.pop()
+        try:
+            with os.scandir(dir_abs) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+        subdirs: List[Tuple[str, str]] = []
+        for entry in entries:
+            name = entry.name
+            if name.startswith("."):
+                continue
+            rel = f"{dir_rel}/{name}" if dir_rel else name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append((entry.path, rel))
+                    continue
+                if not entry.is_file():
+                    continue
+            except OSError:
+                continue
+            if include_re is not None and not include_re.match(rel):
+                continue
+            yield (os.path.realpath(entry.path) if entry.is_symlink() else entry.path), rel
+        stack.extend(reversed(subdirs))
+
+
+def grep(
+    root: str,
+    options: GrepOptions,
+    *,
+    stats: Optional[GrepStats] = None,
+    cancel_checker: Optional[Callable[[], bool]] = None,
+    candidates: Optional[Iterable[Tuple[str, str]]] = None,
+) -> Iterator[FileHit]:
+    """
+    流式搜索：按枚举顺序产出命中文件。
+
+    说明：
+    - 调用方停止迭代（或 `cancel_checker()` 为真）后不再派发新文件，已派发的扫描被取消或自然结束；
+    - 本函数不做 limit 截断（lines 模式的行数由调用方计数），但单文件最多收集 `limit` 条匹配行；
+    - candidates：预先筛选的 `(abs_path, rel_posix)`（例如由 trigram 索引缩小），为 None 时遍历 root。
+    """
+
+    matcher = compile_matcher(options.pattern)
+    st = stats if stats is not None else GrepStats()
+    source = iter(candidates) if candidates is not None else iter_candidate_files(root, include=options.include)
+    workers = options.max_workers or min(32, (os.cpu_count() or 1) + 4)
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="grep")
+    window = workers * 4
+    pending: Deque[Future[_ScanResult]] = deque()
+
+    def _fill() -> None:
+        """补满滑动窗口。"""
+
+        while len(pending) < window:
+            if cancel_checker is not None and cancel_checker():
+                return
+            nxt = next(source, None)
+            if nxt is None:
+                return
+            pending.append(pool.submit(_scan_file, nxt[0], nxt[1], matcher, options))
+
+    try:
+        _fill()
+        while pending:
+            res = pending.popleft().result()
+            _fill()
+            st.files_scanned += int(res.scanned)
+            st.skipped_large += int(res.skipped_large)
+            st.skipped_binary += int(res.skipped_binary)
+            if res.hit is not None:
+                yield res.hit
+    finally:
+        for fut in pending:
+            fut.cancel()
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _scan_file(path: str, rel: str, matcher: _Matcher, options: GrepOptions) -> _ScanResult:
+    """worker：扫描单个文件（任何 I/O 错误都视为不匹配）。"""
+
+    try:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size > options.max_file_bytes:
+                return _ScanResult(skipped_large=True)
+            head = f.read(_BINARY_PROBE_BYTES)
+            if b"\x00" in head:
+                return _ScanResult(skipped_binary=True)
+            if options.mode == "lines":
+                data = _read_all(f)
+                with matcher.cpu_lock:
+                    lines = _match_lines(data.decode("utf-8", errors="replace"), matcher, options)
+                hit = FileHit(path=path, rel=rel, lines=lines) if lines else None
+                return _ScanResult(hit=hit, scanned=True)
+            found = _file_contains(f, head, size, matcher)
+    except OSError:
+        return _ScanResult()
+    return _ScanResult(hit=FileHit(path=path, rel=rel) if found else None, scanned=True)
+
+
+def _file_contains(f, head: bytes, size: int, matcher: _Matcher) -> bool:  # type: ignore[no-untyped-def]
+    """files 模式：判断文件是否包含匹配（命中即停）。"""
+
+    if matcher.literal is not None:
+        if matcher.literal in head:
+            return True
+        return _search_raw(f, size, lambda buf: buf.find(matcher.literal) != -1)
+    if matcher.byte_exact:
+        rx = matcher.ascii_regex
+        assert rx is not None
+        return _search_raw(f, size, lambda buf: rx.search(buf) is not None)
+
+    if not matcher.chunk_safe:
+        return _chunk_matches(_read_all(f), matcher)
+
+    carry = head
+    while True:
+        block = f.read(_CHUNK_BYTES)
+        data = carry + block
+        if not block:
+            return _chunk_matches(data, matcher) if data else False
+        cut = data.rfind(b"\n")
+        if cut == -1:
+            carry = data
+            continue
+        if _chunk_matches(data[: cut + 1], matcher):
+            return True
+        carry = data[cut + 1 :]
+
+
+def _read_all(f) -> bytes:  # type: ignore[no-untyped-def]
+    """从头读取整个文件（避免 `head + rest` 拼接带来的整文件二次拷贝）。"""
+
+    f.seek(0)
+    return f.read()
+
+
+def _search_raw(f, size: int, probe: Callable[[Any], bool]) -> bool:  # type: ignore[no-untyped-def]
+    """在整个文件的原始字节上执行 probe：大文件走 mmap（零拷贝），小文件或 mmap 失败时读入内存。"""
+
+    if size > _MMAP_MIN_BYTES:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return probe(mm)
+        except (OSError, ValueError):
+            pass
+    return probe(_read_all(f))
+
+
+def _chunk_matches(data: bytes, matcher: _Matcher) -> bool:
+    """在一个分块上匹配：纯 ASCII 且 pattern 可编译为 bytes 时免解码。"""
+
+    if matcher.ascii_regex is not None and data.isascii():
+        return matcher.ascii_regex.search(data) is not None
+    with matcher.cpu_lock:
+        return matcher.regex.search(data.decode("utf-8", errors="replace")) is not None
+
+
+def _clip(line: str) -> str:
+    """截断过长的行（压缩/单行大文件）。"""
+
+    return line if len(line) <= MAX_LINE_CHARS else line[:MAX_LINE_CHARS] + "…"
+
+
+def _match_lines(text: str, matcher: _Matcher, options: GrepOptions) -> Tuple[LineMatch, ...]:
+    """lines 模式：报告匹配起始所在行（每行至多一次），最多 `options.limit` 条。"""
+
+    out: List[LineMatch] = []
+    ctx_n = max(0, int(options.context_lines))
+    n = len(text)
+    pos = 0
+    line_no = 1
+    counted_upto = 0
+    while pos <= n and len(out) < options.limit:
+        m = matcher.line_regex.search(text, pos)
+        if m is None or (m.start() == n and n and text.endswith("\n")):
+            break
+        start = text.rfind("\n", 0, m.start()) + 1
+        end = text.find("\n", m.start())
+        end = n if end == -1 else end
+        line_no += text.count("\n", counted_upto, start)
+        counted_upto = start
+        before: Tuple[Tuple[int, str], ...] = ()
+        after: Tuple[Tuple[int, str], ...] = ()
+        if ctx_n:
+            before = _lines_before(text, start, line_no, ctx_n)
+            after = _lines_after(text, end, line_no, ctx_n)
+        out.append(LineMatch(line=line_no, text=_clip(text[start:end].rstrip("\r")), before=before, after=after))
+        pos = end + 1
+    return tuple(out)
+
+
+def _lines_before(text: str, start: int, line_no: int, count: int) -> Tuple[Tuple[int, str], ...]:
+    """返回 `start` 所在行之前的至多 count 行（`(line, text)`，按行号升序）。"""
+
+    out: List[Tuple[int, str]] = []
+    end = start - 1
+    while len(out) < count and end >= 0:
+        begin = text.rfind("\n", 0, end) + 1
+        out.append((line_no - len(out) - 1, _clip(text[begin:end].rstrip("\r"))))
+        end = begin - 1
+    return tuple(reversed(out))
+
+
+def _lines_after(text: str, end: int, line_no: int, count: int) -> Tuple[Tuple[int, str], ...]:
+    """返回 `end`（行尾换行符位置）之后的至多 count 行（不含文件末尾换行后的空行）。"""
+
+    out: List[Tuple[int, str]] = []
+    n = len(text)
+    begin = end + 1
+    while len(out) < count and begin < n:
+        stop = text.find("\n", begin)
+        stop = n if stop == -1 else stop
+        out.append((line_no + len(out) + 1, _clip(text[begin:stop].rstrip("\r"))))
+        begin = stop + 1
+    return tuple(out)
+
+
+__all__ = [
+    "DEFAULT_MAX_FILE_BYTES",
+    "FileHit",
+    "GrepOptions",
+    "GrepStats",
+    "LineMatch",
+    "compile_matcher",
+    "grep",
+    "iter_candidate_files",
+]
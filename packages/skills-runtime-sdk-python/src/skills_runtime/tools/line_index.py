@@ -0,0 +1,185 @@
+"""
+按行流式读取文本文件，并维护稀疏行偏移索引（read_file 使用）。
+
+设计要点：
+- 以二进制按 `\\n` 切分“物理记录”，逐条 UTF-8 解码后再 `splitlines()`：
+  行号语义与 `read_text().splitlines()` 一致（`\\r\\n`/`\\r`/`\\u2028` 等同样视为换行），
+  但只读取并解码请求窗口之前（及之内）的数据；
+- 稀疏索引：每隔 `CHECKPOINT_STRIDE` 行在记录边界记录一次 `(行号, 字节偏移)`，
+  并记住已扫描到的最远边界与（到达 EOF 时的）总行数；
+- 索引按 `(path, size, mtime_ns)` 缓存在进程内（LRU），文件被修改后自然失效；
+  后续读取同一文件时直接 seek 到不晚于目标行的最近检查点。
+
+说明：
+- 解码错误只在实际读取到的范围内发现（抛出 `UnicodeDecodeError`，由调用方转换为 validation）。
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections import OrderedDict
+import os
+import threading
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+CHECKPOINT_STRIDE = 1024
+_CACHE_MAX_FILES = 64
+
+_IndexKey = Tuple[str, int, int]
+
+
+class LineOffsetIndex:
+    """
+    单个文件版本的稀疏行偏移索引。
+
+    字段：
+    - lines / offsets：升序的检查点（记录起始处的 0-indexed 行号与字节偏移）
+    - total_lines：到达 EOF 后得知的总行数；未知时为 None
+    """
+
+    def __init__(self) -> None:
+        """创建只含文件起点检查点的空索引。"""
+
+        self.lines: List[int] = [0]
+        self.offsets: List[int] = [0]
+        self.total_lines: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def seek_point(self, line_idx: int) -> Tuple[int, int]:
+        """返回不晚于 line_idx 的最近检查点 `(行号, 字节偏移)`。"""
+
+        with self._lock:
+            pos = bisect_right(self.lines, line_idx) - 1
+            return self.lines[pos], self.offsets[pos]
+
+    def record(self, line_idx: int, offset: int) -> None:
+        """在记录边界登记检查点（只接受超出已知范围至少一个步长的位置）。"""
+
+        with self._lock:
+            if line_idx >= self.lines[-1] + CHECKPOINT_STRIDE:
+                self.lines.append(line_idx)
+                self.offsets.append(offset)
+
+    def set_total(self, total_lines: int) -> None:
+        """登记总行数（到达 EOF 时调用）。"""
+
+        with self._lock:
+            self.total_lines = total_lines
+
+
+_cache: "OrderedDict[_IndexKey, LineOffsetIndex]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _index_for(path: str, st: os.stat_result) -> LineOffsetIndex:
+    """按 `(path, size, mtime_ns)` 取出（或创建）索引，并维护 LRU 顺序。"""
+
+    key = (path, int(st.st_size), int(st.st_mtime_ns))
+    with _cache_lock:
+        idx = _cache.get(key)
+        if idx is None:
+            idx = LineOffsetIndex()
+            _cache[key] = idx
+            while len(_cache) > _CACHE_MAX_FILES:
+                _cache.popitem(last=False)
+        else:
+            _cache.move_to_end(key)
+        return idx
+
+
+def clear_line_index_cache() -> None:
+    """清空进程内行偏移索引缓存（测试/长驻进程释放内存用）。"""
+
+    with _cache_lock:
+        _cache.clear()
+
+
+class LineReader:
+    """
+    单个文件的按行读取器（上下文管理器）。
+
+    用法：
+    - `iter_lines(start_idx)`：从 0-indexed 行号开始惰性产出行文本（不含换行符）；
+    - `total_lines`：已知的总行数（读到过 EOF 或索引已缓存总数时可用，否则为 None）；
+    - `line(idx)`：随机访问单行（按块缓存，供 indentation 模式双向扫描），超出 EOF 返回 None。
+    """
+
+    def __init__(self, path: Path) -> None:
+        """打开文件并关联该文件版本的稀疏索引。"""
+
+        self._f: BinaryIO = open(path, "rb")
+        try:
+            self._index = _index_for(str(path), os.fstat(self._f.fileno()))
+        except BaseException:
+            self._f.close()
+            raise
+        self._blocks: Dict[int, List[str]] = {}
+
+    def __enter__(self) -> "LineReader":
+        """进入上下文。"""
+
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        """关闭文件。"""
+
+        self.close()
+
+    def close(self) -> None:
+        """关闭底层文件句柄。"""
+
+        self._f.close()
+
+    @property
+    def total_lines(self) -> Optional[int]:
+        """已知的总行数（未知为 None）。"""
+
+        return self._index.total_lines
+
+    def iter_lines(self, start_idx: int) -> Iterator[str]:
+        """
+        从 start_idx 开始产出行文本；途经的记录边界会登记到稀疏索引，到达 EOF 时登记总行数。
+
+        说明：跳过阶段同样需要逐条解码（行号依赖 `splitlines()` 语义），但不会保留跳过的内容。
+        """
+
+        index = self._index
+        line_no, offset = index.seek_point(start_idx)
+        next_checkpoint = index.lines[-1] + CHECKPOINT_STRIDE
+        f = self._f
+        f.seek(offset)
+        while True:
+            record = f.readline()
+            if not record:
+                index.set_total(line_no)
+                return
+            parts = record.decode("utf-8").splitlines()
+            if line_no >= next_checkpoint:
+                index.record(line_no, offset)
+                next_checkpoint = index.lines[-1] + CHECKPOINT_STRIDE
+            offset += len(record)
+            for part in parts:
+                if line_no >= start_idx:
+                    yield part
+                line_no += 1
+
+    def line(self, idx: int) -> Optional[str]:
+        """随机访问第 idx 行（0-indexed）；超出 EOF 返回 None。"""
+
+        if idx < 0:
+            return None
+        block_no = idx // CHECKPOINT_STRIDE
+        block = self._blocks.get(block_no)
+        if block is None:
+            block = []
+            for text in self.iter_lines(block_no * CHECKPOINT_STRIDE):
+                block.append(text)
+                if len(block) >= CHECKPOINT_STRIDE:
+                    break
+            self._blocks[block_no] = block
+        pos = idx - block_no * CHECKPOINT_STRIDE
+        return block[pos] if pos < len(block) else None
+
+
+__all__ = ["CHECKPOINT_STRIDE", "LineOffsetIndex", "LineReader", "clear_line_index_cache"]
@@ -0,0 +1,196 @@
+"""
+命令运行期间的实时输出事件（`tool_output_delta`）。
+
+用途：
+- `Executor.run_command(on_output=...)` 在读到 stdout/stderr 时回调本模块的 `ToolOutputStreamer`；
+- streamer 做缓冲、限速与脱敏后，经 `ToolExecutionContext.emit_event` 发出 `tool_output_delta`，
+  让 SSE/hooks 在长命令运行期间就能看到进度；最终 tool 结果仍按 Executor 的尾部截断策略返回；
+- ToolDispatcher 在工具运行期间即把 delta 推送到 stream（见 `tools/dispatcher.py` 的 `_SideEvents`），不延后到 finished。
+
+约束：
+- 短命令（`start_delay_ms` 内结束）不发任何 delta，避免给每次 shell 调用增加事件；
+- 两次发送间隔至少 `min_interval_ms`；单条事件文本不超过 `max_chunk_chars`；
+  单次调用累计不超过 `max_total_chars`，超出部分只计数（结束时以 `dropped_chars` 报告）；
+- 优先在换行处切分；被迫在行内切分时保留最长 secret 长度的尾部，避免 secret 跨事件被拆开而漏脱敏。
+
+事件 payload：`{"call_id", "tool", "stream": "stdout"|"stderr", "text", "seq"}`；
+结束时若有丢弃，额外发出一条 `text=""` 且带 `dropped_chars` 的事件。
+"""
+
+from __future__ import annotations
+
+import codecs
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from skills_runtime.core.contracts import AgentEvent
+from skills_runtime.core.utils import now_rfc3339
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_START_DELAY_MS = 500
+DEFAULT_MIN_INTERVAL_MS = 250
+DEFAULT_MAX_CHUNK_CHARS = 8 * 1024
+DEFAULT_MAX_TOTAL_CHARS = 256 * 1024
+
+_STREAMS = ("stdout", "stderr")
+
+
+class ToolOutputStreamer:
+    """
+    把 Executor 的输出回调转换为限速、有界、脱敏的 `tool_output_delta` 事件。
+
+    用法：
+    - 作为 `on_output` 传给 `Executor.run_command`（空 chunk 视为心跳，只触发按时间刷新）；
+    - 命令结束后调用 `finish()` 刷出剩余缓冲（若此前从未发出 delta，则什么也不发）。
+    """
+
+    def __init__(
+        self,
+        ctx: Any,
+        *,
+        call_id: str,
+        tool: str,
+        start_delay_ms: int = DEFAULT_START_DELAY_MS,
+        min_interval_ms: int = DEFAULT_MIN_INTERVAL_MS,
+        max_chunk_chars: int = DEFAULT_MAX_CHUNK_CHARS,
+        max_total_chars: int = DEFAULT_MAX_TOTAL_CHARS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        参数：
+        - ctx：`ToolExecutionContext`（提供 emit_event / run_id / get_redactor）
+        - call_id/tool：写入事件 payload，用于关联 tool call
+        - 其余参数见模块说明
+        """
+
+        if max_chunk_chars < 1:
+            raise ValueError("max_chunk_chars must be >= 1")
+        self._ctx = ctx
+        self._call_id = call_id
+        self._tool = tool
+        self._start_delay_s = max(0, start_delay_ms) / 1000.0
+        self._min_interval_s = max(0, min_interval_ms) / 1000.0
+        self._max_chunk = max_chunk_chars
+        self._max_total = max(0, max_total_chars)
+        self._clock = clock
+        self._started = clock()
+        self._last_emit: Optional[float] = None
+        self._decoders = {name: codecs.getincrementaldecoder("utf-8")(errors="replace") for name in _STREAMS}
+        self._pending: Dict[str, str] = {name: "" for name in _STREAMS}
+        self._emitted_chars = 0
+        self._dropped_chars = 0
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    @property
+    def emitted_events(self) -> int:
+        """已发出的 delta 事件数。"""
+
+        return self._seq
+
+    def __call__(self, stream: str, chunk: bytes) -> None:
+        """Executor 输出回调：缓冲 chunk，并在限速允许时发出 delta。"""
+
+        with self._lock:
+            if chunk and stream in self._pending:
+                self._pending[stream] += self._decoders[stream].decode(chunk)
+                self._bound_pending(stream)
+            now = self._clock()
+            if now - self._started < self._start_delay_s:
+                return
+            if self._last_emit is not None and now - self._last_emit < self._min_interval_s:
+                return
+            if self._flush(final=False):
+                self._last_emit = now
+
+    def finish(self) -> None:
+        """命令结束：刷出剩余缓冲（仅当此前已发出过 delta）。"""
+
+        with self._lock:
+            for name in _STREAMS:
+                self._pending[name] += self._decoders[name].decode(b"", final=True)
+            if self._seq == 0:
+                return
+            self._flush(final=True)
+            if self._dropped_chars:
+                self._emit(stream="stdout", text="", dropped_chars=self._dropped_chars)
+
+    def _bound_pending(self, stream: str) -> None:
+        """限速/延迟期间缓冲最多保留 2 个 chunk 的尾部，其余计入 dropped。"""
+
+        pending = self._pending[stream]
+        cap = self._max_chunk * 2
+        if len(pending) > cap:
+            self._dropped_chars += len(pending) - cap
+            self._pending[stream] = pending[-cap:]
+
+    def _flush(self, *, final: bool) -> bool:
+        """每个 stream 发出一段可发送的文本（final 时发完全部）；返回是否发出过事件。"""
+
+        emitted = False
+        holdback = max(0, self._ctx.get_redactor().max_secret_len - 1)
+        for name in _STREAMS:
+            while True:
+                pending = self._pending[name]
+                if not pending:
+                    break
+                head = pending[: self._max_chunk]
+                if not final:
+                    cut = head.rfind("\n") + 1
+                    if cut == 0:
+                        if len(pending) < self._max_chunk:
+                            break
+                        cut = max(1, self._max_chunk - holdback)
+                    head = head[:cut]
+                self._pending[name] = pending[len(head) :]
+                emitted = self._emit_budgeted(stream=name, text=head) or emitted
+                if not final:
+                    break
+        return emitted
+
+    def _emit_budgeted(self, *, stream: str, text: str) -> bool:
+        """在累计预算内发出一段文本；超出预算的部分计入 dropped。"""
+
+        room = self._max_total - self._emitted_chars
+        if room <= 0:
+            self._dropped_chars += len(text)
+            return False
+        if len(text) > room:
+            self._dropped_chars += len(text) - room
+            text = text[:room]
+        self._emitted_chars += len(text)
+        self._emit(stream=stream, text=text)
+        return True
+
+    def _emit(self, *, stream: str, text: str, dropped_chars: int = 0) -> None:
+        """发出一条 `tool_output_delta`（文本经 ctx 脱敏）。"""
+
+        self._seq += 1
+        payload: Dict[str, Any] = {
+            "call_id": self._call_id,
+            "tool": self._tool,
+            "stream": stream,
+            "text": self._ctx.redact_text(text),
+            "seq": self._seq,
+        }
+        if dropped_chars:
+            payload["dropped_chars"] = dropped_chars
+        try:
+            self._ctx.emit_event(
+                AgentEvent(type="tool_output_delta", timestamp=now_rfc3339(), run_id=self._ctx.run_id, payload=payload)
+            )
+        except Exception:
+            # 防御性兜底：事件管道（WAL/hooks/sink）异常不应中断正在运行的命令。
+            logger.debug("failed to emit tool_output_delta", exc_info=True)
+
+
+__all__ = [
+    "DEFAULT_MAX_CHUNK_CHARS",
+    "DEFAULT_MAX_TOTAL_CHARS",
+    "DEFAULT_MIN_INTERVAL_MS",
+    "DEFAULT_START_DELAY_MS",
+    "ToolOutputStreamer",
+]
@@ -13,17 +13,20 @@ ToolRegistry：工具注册表与派发（dispatch）。
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
+import inspect
 import json
 import logging
 from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Any, Callable, Dict, Optional, Sequence, TYPE_CHECKING, Union
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence, TYPE_CHECKING, Union
 
 from skills_runtime.core.contracts import AgentEvent
 from skills_runtime.core.errors import UserError
 from skills_runtime.core.executor import Executor
 from skills_runtime.core.exec_sessions import ExecSessionManager
+from skills_runtime.core.secret_redactor import SecretRedactor, get_secret_redactor
 from skills_runtime.core.utils import now_rfc3339
 from skills_runtime.state.jsonl_wal import JsonlWal
 from skills_runtime.state.wal_emitter import WalEmitter
@@ -44,10 +47,16 @@ if TYPE_CHECKING:  # pragma: no cover
 logger = logging.getLogger(__name__)
 
 
-ToolHandler = Callable[[ToolCall, "ToolExecutionContext"], ToolResult]
+ToolHandler = Callable[[ToolCall, "ToolExecutionContext"], Union[ToolResult, Awaitable[ToolResult]]]
 EventSink = Callable[[AgentEvent], None]
 
 
+async def _as_coroutine(awaitable: Awaitable[ToolResult]) -> ToolResult:
+    """把任意 awaitable 包装为 coroutine（`asyncio.run` 只接受 coroutine）。"""
+
+    return await awaitable
+
+
 def _sanitize_tool_call_arguments_for_event(
     tool: str,
     *,
@@ -63,26 +72,13 @@ def _sanitize_tool_call_arguments_for_event(
     - 字符串字段 best-effort 替换已知 secret values
     """
 
-    def _redact_str(text: str) -> str:
-        """把文本中的“已知 secret 值”替换为 `<redacted>`（best-effort）。"""
-
-        if not text:
-            return text
-        out = text
-        for v in redaction_values:
-            if not isinstance(v, str):
-                continue
-            vv = v.strip()
-            if len(vv) < 4:
-                continue
-            out = out.replace(vv, "<redacted>")
-        return out
+    redactor = get_secret_redactor(redaction_values)
 
     def _sanitize_obj(obj: Any) -> Any:
         """递归清洗对象结构，避免在事件/WAL 中落盘敏感信息。"""
 
         if isinstance(obj, str):
-            return _redact_str(obj)
+            return redactor.redact(obj)
         if isinstance(obj, list):
             return [_sanitize_obj(x) for x in obj]
         if isinstance(obj, dict):
@@ -248,15 +244,12 @@ class ToolExecutionContext:
 
         if not text:
             return text
-        values = list(self.get_redaction_values() or [])
-        for v in values:
-            if not isinstance(v, str):
-                continue
-            vv = v.strip()
-            if len(vv) < 4:
-                continue
-            text = text.replace(vv, "<redacted>")
-        return text
+        return self.get_redactor().redact(text)
+
+    def get_redactor(self) -> SecretRedactor:
+        """返回当前 redaction_values 对应的（缓存）脱敏器；secret 集合不变时复用同一编译结果。"""
+
+        return get_secret_redactor(self.get_redaction_values())
 
 
 class ToolRegistry:
@@ -316,26 +309,36 @@ class ToolRegistry:
         except KeyError as e:
             raise UserError(f"未注册的 tool：{name}") from e
 
-    def dispatch(
-        self,
-        call: ToolCall,
-        *,
-        turn_id: Optional[str] = None,
-        step_id: Optional[str] = None,
-        event_sink: Optional[EventSink] = None,
-    ) -> ToolResult:
-        """
-        派发执行一个 ToolCall，并在 WAL 中记录 tool_call_* 事件。
+    def is_async_handler(self, name: str) -> bool:
+        """判断工具 handler 是否为原生 async（`async def`）；未注册返回 False。"""
 
-        参数：
-        - call：工具调用（已解析 arguments）
-        - turn_id/step_id：可选，用于与更高层 turn/step 关联
-        - event_sink：可选；覆盖本次 dispatch 的旁路事件 sink（用于并发隔离）
+        handler = self._handlers.get(name)
+        return handler is not None and inspect.iscoroutinefunction(handler)
 
-        返回：
-        - ToolResult
+    def _bind_ctx(self, *, event_sink: Optional[EventSink], defer_wal: bool) -> ToolExecutionContext:
         """
-        exec_ctx = self._ctx if event_sink is None else replace(self._ctx, event_sink=event_sink)
+        为单次 dispatch 绑定执行上下文。
+
+        说明：
+        - `defer_wal=True` 时工具旁路事件不直接落盘，只写入 `event_sink`，由调用方按 call 顺序补写 WAL
+          （并发派发时避免多个工具的旁路事件在 WAL 中交错）。
+        """
+
+        if defer_wal:
+            return replace(self._ctx, wal=None, event_emitter=None, event_sink=event_sink)
+        if event_sink is None:
+            return self._ctx
+        return replace(self._ctx, event_sink=event_sink)
+
+    def _begin_dispatch(
+        self,
+        call: ToolCall,
+        exec_ctx: ToolExecutionContext,
+        *,
+        turn_id: Optional[str],
+        step_id: Optional[str],
+    ) -> Union[ToolHandler, ToolResult]:
+        """写入 requested/started 事件并返回 handler；未注册时直接返回 not_found 结果（已写 finished）。"""
 
         if exec_ctx.emit_tool_events:
             self._append_event(
@@ -372,19 +375,106 @@ class ToolRegistry:
                 step_id=step_id,
                 payload={"call_id": call.call_id, "tool": call.name},
             )
+        return handler
+
+    def _end_dispatch(
+        self,
+        call: ToolCall,
+        exec_ctx: ToolExecutionContext,
+        result: ToolResult,
+        *,
+        turn_id: Optional[str],
+        step_id: Optional[str],
+    ) -> ToolResult:
+        """对结果脱敏并写入 finished 事件。"""
+
+        result = self._redact_tool_result(result, ctx=exec_ctx)
+        if exec_ctx.emit_tool_events:
+            self._append_tool_result(exec_ctx, call, result, turn_id=turn_id, step_id=step_id)
+        return result
+
+    def dispatch(
+        self,
+        call: ToolCall,
+        *,
+        turn_id: Optional[str] = None,
+        step_id: Optional[str] = None,
+        event_sink: Optional[EventSink] = None,
+        defer_wal: bool = False,
+    ) -> ToolResult:
+        """
+        派发执行一个 ToolCall，并在 WAL 中记录 tool_call_* 事件。
+
+        参数：
+        - call：工具调用（已解析 arguments）
+        - turn_id/step_id：可选，用于与更高层 turn/step 关联
+        - event_sink：可选；覆盖本次 dispatch 的旁路事件 sink（用于并发隔离）
+        - defer_wal：可选；为 True 时旁路事件只进入 event_sink，不直接写 WAL（见 `_bind_ctx`）
+
+        返回：
+        - ToolResult
+
+        说明：
+        - 可在工作线程中调用（并发派发）；async handler 在当前线程无运行中的 event loop 时用 `asyncio.run` 执行。
+        """
+        exec_ctx = self._bind_ctx(event_sink=event_sink, defer_wal=defer_wal)
+        handler = self._begin_dispatch(call, exec_ctx, turn_id=turn_id, step_id=step_id)
+        if isinstance(handler, ToolResult):
+            return handler
 
         try:
             result = handler(call, exec_ctx)
+            if inspect.isawaitable(result):
+                result = self._run_awaitable(result)
         except UserError as e:
             result = ToolResult.error_payload(error_kind="validation", stderr=str(e))
         except Exception as e:  # pragma: no cover（防御性兜底）
             result = ToolResult.error_payload(error_kind="unknown", stderr=str(e))
 
-        result = self._redact_tool_result(result, ctx=exec_ctx)
+        return self._end_dispatch(call, exec_ctx, result, turn_id=turn_id, step_id=step_id)
 
-        if exec_ctx.emit_tool_events:
-            self._append_tool_result(exec_ctx, call, result, turn_id=turn_id, step_id=step_id)
-        return result
+    async def dispatch_async(
+        self,
+        call: ToolCall,
+        *,
+        turn_id: Optional[str] = None,
+        step_id: Optional[str] = None,
+        event_sink: Optional[EventSink] = None,
+        defer_wal: bool = False,
+    ) -> ToolResult:
+        """
+        `dispatch` 的 async 版本：在当前 event loop 上 await 原生 async handler。
+
+        说明：
+        - 同步 handler 仍在当前线程内联执行（需要卸载到线程池时由调用方使用 `dispatch`）。
+        """
+        exec_ctx = self._bind_ctx(event_sink=event_sink, defer_wal=defer_wal)
+        handler = self._begin_dispatch(call, exec_ctx, turn_id=turn_id, step_id=step_id)
+        if isinstance(handler, ToolResult):
+            return handler
+
+        try:
+            result = handler(call, exec_ctx)
+            if inspect.isawaitable(result):
+                result = await result
+        except UserError as e:
+            result = ToolResult.error_payload(error_kind="validation", stderr=str(e))
+        except Exception as e:  # pragma: no cover（防御性兜底）
+            result = ToolResult.error_payload(error_kind="unknown", stderr=str(e))
+
+        return self._end_dispatch(call, exec_ctx, result, turn_id=turn_id, step_id=step_id)
+
+    @staticmethod
+    def _run_awaitable(awaitable: Any) -> ToolResult:
+        """在同步 dispatch 中执行 async handler 的返回值；当前线程已有运行中的 loop 时 fail-closed。"""
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(_as_coroutine(awaitable))
+        if inspect.iscoroutine(awaitable):
+            awaitable.close()
+        raise UserError("async tool handler 不能在运行中的 event loop 内同步派发；请使用 dispatch_async")
 
     def _redact_tool_result(self, result: ToolResult, *, ctx: Optional[ToolExecutionContext] = None) -> ToolResult:
         """
@@ -392,35 +482,18 @@ class ToolRegistry:
 
         说明：
         - 脱敏值来自 `ToolExecutionContext.redaction_values`；
+        - content 只在命中 secret 时才做 JSON 解析/序列化（见 `SecretRedactor.redact_json_text`）；
         - 仅用于降低“工具输出意外回显 secrets”的风险，不保证绝对安全。
         """
 
         exec_ctx = ctx or self._ctx
-        values = list(exec_ctx.get_redaction_values() or [])
-        if not values:
+        redactor = exec_ctx.get_redactor()
+        if not redactor.enabled:
             return result
 
-        def _redact_obj(obj: Any) -> Any:
-            """递归脱敏对象结构中的字符串字段（用于 details / json content）。"""
-
-            if isinstance(obj, str):
-                return exec_ctx.redact_text(obj)
-            if isinstance(obj, list):
-                return [_redact_obj(x) for x in obj]
-            if isinstance(obj, dict):
-                return {k: _redact_obj(v) for k, v in obj.items()}
-            return obj
-
-        details = _redact_obj(result.details) if result.details is not None else None
-        message = exec_ctx.redact_text(result.message or "") if result.message else None
-        content = result.content
-        try:
-            obj = json.loads(content)
-            if isinstance(obj, (dict, list)):
-                red = _redact_obj(obj)
-                content = json.dumps(red, ensure_ascii=False)
-        except json.JSONDecodeError:
-            content = exec_ctx.redact_text(content)
+        details = redactor.redact_obj(result.details) if result.details is not None else None
+        message = redactor.redact(result.message) if result.message else None
+        content = redactor.redact_json_text(result.content)
 
         return ToolResult(
             ok=result.ok,
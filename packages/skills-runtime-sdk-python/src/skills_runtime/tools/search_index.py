@@ -0,0 +1,512 @@
+"""
+workspace 搜索的 trigram 索引（可选，位于 `<workspace_root>/.skills_runtime_sdk/index/`）。
+
+用途：
+- grep 类查询先用 pattern 中必然出现的字面量（按 UTF-8 字节取 trigram）求候选文件交集，
+  再交给 `grep_engine` 做真正的正则校验；查询代价从“仓库总字节数”降到“候选文件数”。
+
+文件：
+- `files.json`：文件表 `{rel: [file_id, mtime_ns, size, indexed]}` + 代号 token；
+- `trigrams.bin`：倒排表（trigram → file_id 列表），头部带同一 token，防止读到新旧混搭的两份文件。
+
+一致性规则：
+- 索引按“行”提取 trigram（pattern 中的换行/控制字符会切断字面量，因此不会漏检）；
+- 二进制文件（前 1KiB 含 NUL）记为无 trigram（grep 本来就跳过）；超过 `INDEX_MAX_FILE_BYTES` 的文件
+  记为未索引，查询时总是作为候选；
+- mtime_ns/size 与磁盘不一致、或不在索引中的文件视为 stale，总是作为候选；
+  stale 比例超过阈值时查询放弃索引（其余文件不再过滤，等价于全量扫描）。
+
+增量更新（`refresh`）：只读取新增/变化的文件并分配新 file_id；旧 id 留在倒排表中成为“死 id”，
+查询时按文件表过滤；死 id 过多时整体重建。
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from functools import lru_cache
+import json
+import mmap
+import os
+import re
+import secrets
+import struct
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from skills_runtime.tools.grep_engine import iter_candidate_files
+
+INDEX_DIR = Path(".skills_runtime_sdk") / "index"
+INDEX_MAX_FILE_BYTES = 1024 * 1024
+STALE_FALLBACK_RATIO = 0.2
+# 遍历过程中至少看过这么多文件后才按 stale 比例提前放弃索引（避免开头几个 stale 文件就触发）。
+_STALE_CHECK_MIN_FILES = 64
+
+_FILES_NAME = "files.json"
+_POSTINGS_NAME = "trigrams.bin"
+_MAGIC = b"SRTRI1\n\x00"
+_HEADER = struct.Struct("<8s16sII")  # magic, token, ntri, nids
+_VERSION = 1
+_BINARY_PROBE_BYTES = 1024
+_FLAG_IX = re.compile(r"\(\?[aiLmsux-]*[ix]")
+_QUANT = re.compile(r"\{(\d*)(?:,(\d*))?\}")
+
+# rel -> (file_id, mtime_ns, size, indexed)
+_FileRow = Tuple[int, int, int, bool]
+
+
+@dataclass(frozen=True)
+class RefreshStats:
+    """一次增量更新的统计。"""
+
+    files: int
+    reindexed: int
+    removed: int
+    rebuilt: bool
+
+
+def literal_runs(pattern: str) -> Optional[List[str]]:
+    """
+    提取正则中“任何匹配都必然包含”的字面量片段（保守）。
+
+    返回：
+    - None：无法安全推断（顶层 `|`、大小写不敏感/verbose、复杂转义等）；
+    - list：顶层（不在分组内）的字面量片段，片段内不含换行/控制字符。
+    """
+
+    if _FLAG_IX.search(pattern) or "\ufffd" in pattern:
+        return None
+    runs: List[str] = []
+    cur: List[str] = []
+    depth = 0
+    i = 0
+    n = len(pattern)
+
+    def _flush() -> None:
+        """结束当前片段。"""
+
+        if cur:
+            runs.append("".join(cur))
+            cur.clear()
+
+    while i < n:
+        ch = pattern[i]
+        lit: Optional[str] = None
+        if ch == "\\":
+            nxt = pattern[i + 1 : i + 2]
+            if not nxt or nxt in "xuUN0123456789":
+                return None
+            if nxt.isalnum() or nxt == "_":
+                _flush()
+            else:
+                lit = nxt
+            i += 2
+        elif ch == "[":
+            j = i + 1
+            if pattern[j : j + 1] == "^":
+                j += 1
+            if pattern[j : j + 1] == "]":
+                j += 1
+            while j < n and pattern[j] != "]":
+                j += 2 if pattern[j] == "\\" else 1
+            _flush()
+            i = j + 1
+            continue
+        elif ch == "(":
+            if depth == 0:
+                _flush()
+            depth += 1
+            i += 1
+        elif ch == ")":
+            depth = max(0, depth - 1)
+            i += 1
+        elif ch == "|":
+            if depth == 0:
+                return None
+            i += 1
+        elif ch in "*?":
+            if depth == 0 and cur:
+                cur.pop()
+            _flush()
+            i += 1
+        elif ch == "+" or ch in ".^$":
+            _flush()
+            i += 1
+        elif ch == "{" and (m := _QUANT.match(pattern, i)) is not None:
+            if depth == 0 and cur and not (m.group(1) or "0").lstrip("0"):
+                cur.pop()
+            _flush()
+            i = m.end()
+        else:
+            lit = ch
+            i += 1
+        if lit is not None and depth == 0:
+            if ord(lit) < 32:
+                _flush()
+            else:
+                cur.append(lit)
+    _flush()
+    return runs
+
+
+def required_trigrams(pattern: str) -> Optional[Set[int]]:
+    """把必然出现的字面量转换为 trigram key 集合（UTF-8 字节）；无法缩小候选时返回 None。"""
+
+    runs = literal_runs(pattern)
+    if runs is None:
+        return None
+    keys: Set[int] = set()
+    for run in runs:
+        b = run.encode("utf-8")
+        keys.update((b[k] << 16) | (b[k + 1] << 8) | b[k + 2] for k in range(len(b) - 2))
+    return keys or None
+
+
+def _file_trigrams(data: bytes) -> Set[int]:
+    """按行（去重后）提取 trigram key 集合。"""
+
+    tris: Set[Tuple[int, int, int]] = set()
+    for line in set(data.split(b"\n")):
+        if len(line) >= 3:
+            tris.update(zip(line, line[1:], line[2:]))
+    return {(a << 16) | (b << 8) | c for a, b, c in tris}
+
+
+def _as_u32(data: bytes) -> array:
+    """把小端 uint32 字节解析为 array('I')。"""
+
+    arr = array("I")
+    arr.frombytes(data)
+    if sys.byteorder != "little":
+        arr.byteswap()
+    return arr
+
+
+def _u32_bytes(arr: array) -> bytes:
+    """array('I') → 小端字节。"""
+
+    if sys.byteorder != "little":
+        arr = array("I", arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+class CandidateFiles:
+    """
+    `TrigramIndex.candidate_files` 的惰性结果：按遍历顺序产出 `(abs_path, rel_posix)`。
+
+    说明：
+    - 文件在被消费时才 stat 与过滤，调用方（grep 的 limit）提前停止时不再遍历剩余目录；
+    - stale 比例超过 `STALE_FALLBACK_RATIO` 后不再 stat/过滤，剩余文件全部产出（等价于全量扫描），
+      并置 `fell_back=True`（遍历结束时比例超标同样置位）。
+    """
+
+    def __init__(
+        self,
+        index: "TrigramIndex",
+        hits: Set[int],
+        *,
+        root: str,
+        prefix: str,
+        single_file: bool,
+        include: Optional[str],
+    ) -> None:
+        """记录查询参数；遍历延迟到迭代时。"""
+
+        self.fell_back = False
+        self._index = index
+        self._hits = hits
+        self._root = root
+        self._prefix = prefix
+        self._single_file = single_file
+        self._include = include
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        """边遍历边按索引过滤。"""
+
+        files = self._index._files
+        total = 0
+        stale = 0
+        for abs_path, rel in iter_candidate_files(self._root, include=self._include):
+            if self.fell_back:
+                yield abs_path, rel
+                continue
+            total += 1
+            row = files.get(self._prefix.rstrip("/") if self._single_file else self._prefix + rel)
+            try:
+                st = os.stat(abs_path)
+            except OSError:
+                continue
+            if row is None or row[1] != st.st_mtime_ns or row[2] != st.st_size:
+                stale += 1
+                if total >= _STALE_CHECK_MIN_FILES and stale / total > STALE_FALLBACK_RATIO:
+                    self.fell_back = True
+                yield abs_path, rel
+            elif not row[3] or row[0] in self._hits:
+                yield abs_path, rel
+        if total and stale / total > STALE_FALLBACK_RATIO:
+            self.fell_back = True
+
+
+class TrigramIndex:
+    """
+    workspace 级 trigram 索引。
+
+    说明：
+    - `load` 读取已有索引（不存在/损坏返回 None）；`open_or_create` 用于 CLI 建立索引；
+    - 查询只读 `trigrams.bin` 的目录与命中 trigram 的 posting（mmap），不会整体加载倒排表。
+    """
+
+    def __init__(self, workspace_root: Path, *, files: Dict[str, _FileRow], next_id: int, token: str) -> None:
+        """内部构造；请使用 `load` / `open_or_create`。"""
+
+        self.workspace_root = Path(workspace_root).resolve()
+        self._files = files
+        self._next_id = next_id
+        self._token = token
+        self._live_ids: Optional[Set[int]] = None
+
+    @property
+    def index_dir(self) -> Path:
+        """索引目录。"""
+
+        return self.workspace_root / INDEX_DIR
+
+    @property
+    def file_count(self) -> int:
+        """文件表中的文件数。"""
+
+        return len(self._files)
+
+    @classmethod
+    def load(cls, workspace_root: Path) -> Optional["TrigramIndex"]:
+        """读取已有索引；不存在或格式不兼容时返回 None。"""
+
+        path = Path(workspace_root).resolve() / INDEX_DIR / _FILES_NAME
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return _load_cached(str(path), st.st_mtime_ns, st.st_size)
+
+    @classmethod
+    def open_or_create(cls, workspace_root: Path) -> "TrigramIndex":
+        """读取已有索引（返回可修改的副本，不影响缓存实例），或返回一个空索引（首次 `refresh` 时写盘）。"""
+
+        idx = cls.load(workspace_root)
+        if idx is None:
+            return cls(workspace_root, files={}, next_id=0, token="")
+        return cls(idx.workspace_root, files=dict(idx._files), next_id=idx._next_id, token=idx._token)
+
+    # ---- 查询 ----
+
+    def candidate_files(self, pattern: str, *, root: Path, include: Optional[str]) -> Optional[CandidateFiles]:
+        """
+        返回 root 下可能匹配 pattern 的文件 `(abs_path, rel_posix)`（rel 相对 root；惰性遍历，见 `CandidateFiles`）。
+
+        返回 None 表示索引帮不上忙（pattern 无法缩小候选、索引缺失/损坏），调用方应全量扫描；
+        stale 比例过高时在遍历中途放弃过滤（`CandidateFiles.fell_back`）。
+        """
+
+        keys = required_trigrams(pattern)
+        if keys is None:
+            return None
+        hits = self._lookup(keys)
+        if hits is None:
+            return None
+        root = Path(root).resolve()
+        try:
+            prefix = root.relative_to(self.workspace_root).as_posix()
+        except ValueError:
+            return None
+        single_file = not root.is_dir()
+        prefix = "" if prefix == "." else prefix + "/"
+        return CandidateFiles(self, hits, root=str(root), prefix=prefix, single_file=single_file, include=include)
+
+    def _lookup(self, keys: Set[int]) -> Optional[Set[int]]:
+        """求所有 key 的 posting 交集（只保留仍在文件表中的 id）；索引文件不可用时返回 None。"""
+
+        path = self.index_dir / _POSTINGS_NAME
+        try:
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                directory = self._read_directory(mm)
+                if directory is None:
+                    return None
+                tri_keys, offsets, base = directory
+                result: Optional[Set[int]] = None
+                # 先取最短的 posting，交集尽早变小。
+                spans = []
+                for key in keys:
+                    pos = bisect_left(tri_keys, key)
+                    if pos >= len(tri_keys) or tri_keys[pos] != key:
+                        return set()
+                    spans.append((offsets[pos + 1] - offsets[pos], offsets[pos]))
+                for count, start in sorted(spans):
+                    ids = _as_u32(mm[base + start * 4 : base + (start + count) * 4])
+                    result = set(ids) if result is None else result.intersection(ids)
+                    if not result:
+                        return set()
+        except (OSError, ValueError):
+            return None
+        return (result or set()) & self._live()
+
+    def _read_directory(self, mm: mmap.mmap) -> Optional[Tuple[array, array, int]]:
+        """解析 `trigrams.bin` 头部与目录；token 不一致（文件表与倒排表不是同一代）时返回 None。"""
+
+        if len(mm) < _HEADER.size:
+            return None
+        magic, token, ntri, _nids = _HEADER.unpack_from(mm, 0)
+        if magic != _MAGIC or token.hex() != self._token:
+            return None
+        pos = _HEADER.size
+        tri_keys = _as_u32(mm[pos : pos + ntri * 4])
+        pos += ntri * 4
+        offsets = _as_u32(mm[pos : pos + (ntri + 1) * 4])
+        pos += (ntri + 1) * 4
+        return tri_keys, offsets, pos
+
+    def _live(self) -> Set[int]:
+        """文件表中仍然有效的 file_id 集合（惰性计算）。"""
+
+        if self._live_ids is None:
+            self._live_ids = {row[0] for row in self._files.values()}
+        return self._live_ids
+
+    # ---- 更新 ----
+
+    def refresh(self, *, force_rebuild: bool = False) -> RefreshStats:
+        """
+        按 mtime/size 增量更新索引并原子写盘。
+
+        说明：
+        - 只读取新增或变化的文件；删除的文件从文件表移除（其 id 成为死 id）；
+        - 死 id 超过存活文件数（或 force_rebuild）时整体重建，回收倒排表空间。
+        """
+
+        postings: Dict[int, array] = {} if force_rebuild else self._load_postings()
+        old_files = {} if force_rebuild else self._files
+        dead = max(0, self._next_id - len(old_files)) if not force_rebuild else 0
+        rebuild = force_rebuild or (old_files and dead > len(old_files))
+        if rebuild:
+            postings, old_files = {}, {}
+        next_id = 0 if rebuild else self._next_id
+
+        files: Dict[str, _FileRow] = {}
+        reindexed = 0
+        for abs_path, rel in iter_candidate_files(str(self.workspace_root), include=None):
+            try:
+                st = os.stat(abs_path)
+            except OSError:
+                continue
+            row = old_files.get(rel)
+            if row is not None and row[1] == st.st_mtime_ns and row[2] == st.st_size:
+                files[rel] = row
+                continue
+            file_id = next_id
+            next_id += 1
+            reindexed += 1
+            indexed = st.st_size <= INDEX_MAX_FILE_BYTES
+            if indexed:
+                try:
+                    with open(abs_path, "rb") as f:
+                        data = f.read(INDEX_MAX_FILE_BYTES + 1)
+                except OSError:
+                    continue
+                if b"\x00" not in data[:_BINARY_PROBE_BYTES]:
+                    for key in _file_trigrams(data):
+                        lst = postings.get(key)
+                        if lst is None:
+                            postings[key] = lst = array("I")
+                        lst.append(file_id)
+            files[rel] = (file_id, st.st_mtime_ns, st.st_size, indexed)
+
+        removed = len(set(old_files) - set(files))
+        self._files = files
+        self._next_id = next_id
+        self._live_ids = None
+        self._write(postings)
+        return RefreshStats(files=len(files), reindexed=reindexed, removed=removed, rebuilt=bool(rebuild))
+
+    def _load_postings(self) -> Dict[int, array]:
+        """把现有倒排表整体读入内存（仅更新时使用）。"""
+
+        out: Dict[int, array] = {}
+        path = self.index_dir / _POSTINGS_NAME
+        try:
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                directory = self._read_directory(mm)
+                if directory is None:
+                    self._files = {}
+                    return out
+                tri_keys, offsets, base = directory
+                ids = _as_u32(mm[base : base + offsets[-1] * 4]) if len(offsets) else array("I")
+                for pos, key in enumerate(tri_keys):
+                    out[key] = ids[offsets[pos] : offsets[pos + 1]]
+        except (OSError, ValueError):
+            self._files = {}
+        return out
+
+    def _write(self, postings: Dict[int, array]) -> None:
+        """原子写出倒排表与文件表（先写倒排表，两者共享新 token）。"""
+
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        token = secrets.token_bytes(16)
+        tri_keys = array("I", sorted(postings))
+        offsets = array("I", [0])
+        ids = array("I")
+        for key in tri_keys:
+            ids.extend(postings[key])
+            offsets.append(len(ids))
+
+        bin_path = self.index_dir / _POSTINGS_NAME
+        tmp_bin = bin_path.with_suffix(".tmp")
+        with open(tmp_bin, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, token, len(tri_keys), len(ids)))
+            f.write(_u32_bytes(tri_keys))
+            f.write(_u32_bytes(offsets))
+            f.write(_u32_bytes(ids))
+        os.replace(tmp_bin, bin_path)
+
+        self._token = token.hex()
+        meta = {
+            "version": _VERSION,
+            "token": self._token,
+            "next_id": self._next_id,
+            "files": {rel: [row[0], row[1], row[2], int(row[3])] for rel, row in self._files.items()},
+        }
+        files_path = self.index_dir / _FILES_NAME
+        tmp_files = files_path.with_suffix(".tmp")
+        tmp_files.write_text(json.dumps(meta, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp_files, files_path)
+
+
+@lru_cache(maxsize=4)
+def _load_cached(files_path: str, mtime_ns: int, size: int) -> Optional[TrigramIndex]:
+    """按文件表的 (path, mtime_ns, size) 缓存解析结果（索引被重写后自动失效）。"""
+
+    try:
+        meta = json.loads(Path(files_path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(meta, dict) or meta.get("version") != _VERSION:
+        return None
+    try:
+        files = {str(rel): (int(r[0]), int(r[1]), int(r[2]), bool(r[3])) for rel, r in dict(meta["files"]).items()}
+        workspace_root = Path(files_path).parent.parent.parent
+        return TrigramIndex(workspace_root, files=files, next_id=int(meta["next_id"]), token=str(meta["token"]))
+    except (KeyError, TypeError, ValueError, IndexError):
+        return None
+
+
+__all__ = [
+    "CandidateFiles",
+    "INDEX_DIR",
+    "INDEX_MAX_FILE_BYTES",
+    "RefreshStats",
+    "STALE_FALLBACK_RATIO",
+    "TrigramIndex",
+    "literal_runs",
+    "required_trigrams",
+]
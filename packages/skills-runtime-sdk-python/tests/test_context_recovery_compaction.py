@@ -148,3 +148,132 @@ run:
     failed = [e for e in events if e.type == "run_failed"]
     assert len(failed) == 1
     assert failed[0].payload.get("error_kind") == "context_length_exceeded"
+
+
+class _RecordingBackend:
+    def __init__(self) -> None:
+        self.requests: List[ChatRequest] = []
+
+    async def stream_chat(self, request: ChatRequest) -> AsyncIterator[ChatStreamEvent]:
+        self.requests.append(request)
+        if request.tools is None:
+            yield ChatStreamEvent(type="text_delta", text="compacted summary")
+        else:
+            yield ChatStreamEvent(type="text_delta", text="ok")
+        yield ChatStreamEvent(type="completed", finish_reason="stop")
+
+
+def test_proactive_compaction_runs_before_request_when_window_threshold_is_crossed(tmp_path: Path) -> None:
+    overlay = _write_overlay(
+        tmp_path,
+        """
+run:
+  context_recovery:
+    context_window_tokens: 4000
+    compaction_keep_last_messages: 0
+prompt:
+  system_text: "SYS"
+  developer_text: ""
+  include_skills_list: false
+  tools:
+    exposure: none
+  history:
+    tokenizer: heuristic
+""".lstrip(),
+    )
+    history = [{"role": "user" if i % 2 == 0 else "assistant", "content": "x" * 2000} for i in range(10)]
+    backend = _RecordingBackend()
+    agent = Agent(workspace_root=tmp_path, backend=backend, config_paths=[overlay])
+    events = list(agent.run_stream("do something", run_id="run_test_proactive", initial_history=history))
+
+    started = [e for e in events if e.type == "compaction_started"]
+    assert len(started) == 1
+    assert started[0].payload["reason"] == "proactive"
+    assert started[0].payload["context_window_tokens"] == 4000
+    assert started[0].payload["prompt_tokens"] >= 3200
+    assert not any(e.type == "context_length_exceeded" for e in events)
+    # 先发 compaction 请求，再发已压缩的正式请求（没有先浪费一次注定失败的全量请求）。
+    assert [r.tools is None for r in backend.requests] == [True, False]
+    sent = backend.requests[1].messages
+    assert not any(m.get("content") == "x" * 2000 for m in sent)
+    assert any(e.type == "run_completed" and e.payload.get("final_output") == "ok" for e in events)
+
+
+def test_proactive_compaction_is_off_without_context_window(tmp_path: Path) -> None:
+    history = [{"role": "user", "content": "x" * 2000} for _ in range(10)]
+    backend = _RecordingBackend()
+    agent = Agent(workspace_root=tmp_path, backend=backend)
+    events = list(agent.run_stream("do something", run_id="run_test_no_proactive", initial_history=history))
+    assert not any(e.type == "compaction_started" for e in events)
+    assert [r.tools is None for r in backend.requests] == [False]
+
+
+class _CapturingCompactionBackend:
+    def __init__(self) -> None:
+        self.prompts: List[str] = []
+
+    async def stream_chat(self, request: ChatRequest) -> AsyncIterator[ChatStreamEvent]:
+        self.prompts.append(str(request.messages[-1]["content"]))
+        yield ChatStreamEvent(type="text_delta", text=f"summary #{len(self.prompts)}")
+        yield ChatStreamEvent(type="completed", finish_reason="stop")
+
+
+def _make_run_ctx(tmp_path: Path):  # type: ignore[no-untyped-def]
+    from skills_runtime.core.run_context import RunContext
+    from skills_runtime.state.wal_emitter import WalEmitter
+    from skills_runtime.state.wal_protocol import InMemoryWal
+
+    wal = InMemoryWal(locator_str="wal://rolling")
+    events: List[Any] = []
+    ctx = RunContext(
+        run_id="run_rolling",
+        run_dir=tmp_path,
+        wal=wal,
+        wal_locator=wal.locator(),
+        wal_emitter=WalEmitter(wal=wal, stream=events.append, hooks=[]),
+        history=[],
+        artifacts_dir=tmp_path / "artifacts",
+        compaction_keep_last_messages=1,
+    )
+    return ctx, events
+
+
+@pytest.mark.asyncio
+async def test_second_compaction_only_summarizes_messages_since_checkpoint(tmp_path: Path) -> None:
+    from skills_runtime.core.context_recovery import perform_compaction_turn_and_rebuild_history
+
+    ctx, events = _make_run_ctx(tmp_path)
+    backend = _CapturingCompactionBackend()
+    ctx.history.extend(
+        [
+            {"role": "user", "content": "first-user"},
+            {"role": "tool", "tool_call_id": "t1", "content": '{"ok": true, "stdout": "first-tool-output"}'},
+            {"role": "assistant", "content": "first-answer"},
+        ]
+    )
+    await perform_compaction_turn_and_rebuild_history(
+        backend=backend, executor_model="m", ctx=ctx, task="task", reason="r", turn_id="turn_1"
+    )
+    assert "first-tool-output" in backend.prompts[0]
+    assert [m["content"] for m in ctx.history[1:]] == ["first-answer"]
+
+    ctx.history.extend(
+        [
+            {"role": "tool", "tool_call_id": "t2", "content": '{"ok": true, "stdout": "second-tool-output"}'},
+            {"role": "assistant", "content": "second-answer"},
+        ]
+    )
+    await perform_compaction_turn_and_rebuild_history(
+        backend=backend, executor_model="m", ctx=ctx, task="task", reason="r", turn_id="turn_2"
+    )
+
+    second = backend.prompts[1]
+    assert "summary #1" in second
+    assert "second-tool-output" in second
+    assert "first-tool-output" not in second
+    assert "first-answer" not in second
+    assert "summary #2" in ctx.history[0]["content"]
+    assert [m["content"] for m in ctx.history[1:]] == ["second-answer"]
+    started = [e for e in events if e.type == "compaction_started"]
+    assert [e.payload["incremental"] for e in started] == [False, True]
+    assert [e.payload["messages"] for e in started] == [3, 2]
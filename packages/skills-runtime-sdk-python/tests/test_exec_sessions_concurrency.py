@@ -0,0 +1,96 @@
+"""验证 exec sessions 的会话级加锁：不同 session 的读写互不阻塞，close 可打断进行中的轮询。"""
+
+from __future__ import annotations
+
+import os
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from skills_runtime.core.exec_sessions import ExecSessionManager, PersistentExecSessionManager
+from skills_runtime.runtime.client import RuntimeClient
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="no Windows support in this SDK")
+
+_QUIET = [sys.executable, "-u", "-c", "import time; time.sleep(30)"]
+_ECHO = [sys.executable, "-u", "-c", "import sys\nfor line in sys.stdin:\n    print('echo:' + line.strip(), flush=True)"]
+
+
+def _poll_in_thread(mgr, session_id: int, yield_time_ms: int) -> tuple[threading.Thread, dict]:  # type: ignore[no-untyped-def]
+    box: dict = {}
+
+    def _run() -> None:
+        try:
+            box["result"] = mgr.write(session_id=session_id, yield_time_ms=yield_time_ms)
+        except Exception as e:  # noqa: BLE001
+            box["error"] = e
+
+    t = threading.Thread(target=_run, daemon=True)
+    t.start()
+    return t, box
+
+
+def test_write_on_one_session_does_not_block_other_sessions(tmp_path: Path) -> None:
+    mgr = ExecSessionManager()
+    quiet = mgr.spawn(argv=_QUIET, cwd=tmp_path, tty=False)
+    echo = mgr.spawn(argv=_ECHO, cwd=tmp_path, tty=False)
+    try:
+        t, box = _poll_in_thread(mgr, quiet.session_id, 2_000)
+        time.sleep(0.1)
+
+        started = time.monotonic()
+        out = mgr.write(session_id=echo.session_id, chars="hi\n", yield_time_ms=300)
+        elapsed = time.monotonic() - started
+
+        assert "echo:hi" in out.stdout
+        assert elapsed < 1.5, f"session 间不应互相阻塞，实际 {elapsed:.2f}s"
+        assert t.is_alive()
+        assert sorted(mgr.session_ids()) == sorted([quiet.session_id, echo.session_id])
+    finally:
+        mgr.close_all()
+    t.join(timeout=3.0)
+    assert not t.is_alive()
+
+
+def test_close_interrupts_in_flight_poll_and_releases_session(tmp_path: Path) -> None:
+    mgr = ExecSessionManager()
+    s = mgr.spawn(argv=_QUIET, cwd=tmp_path, tty=False)
+    t, box = _poll_in_thread(mgr, s.session_id, 10_000)
+    time.sleep(0.1)
+
+    started = time.monotonic()
+    mgr.close(s.session_id)
+    t.join(timeout=3.0)
+
+    assert time.monotonic() - started < 3.0
+    assert not t.is_alive()
+    assert "error" not in box
+    assert mgr.has(s.session_id) is False
+    with pytest.raises(KeyError):
+        mgr.write(session_id=s.session_id, yield_time_ms=0)
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="no AF_UNIX support")
+def test_runtime_server_serves_exec_writes_on_different_sessions_in_parallel(tmp_path: Path) -> None:
+    mgr = PersistentExecSessionManager(workspace_root=tmp_path)
+    quiet = mgr.spawn(argv=_QUIET, cwd=tmp_path, tty=False)
+    echo = mgr.spawn(argv=_ECHO, cwd=tmp_path, tty=False)
+    try:
+        t, _box = _poll_in_thread(mgr, quiet.session_id, 3_000)
+        time.sleep(0.2)
+
+        started = time.monotonic()
+        out = mgr.write(session_id=echo.session_id, chars="ping\n", yield_time_ms=300)
+        elapsed = time.monotonic() - started
+
+        assert "echo:ping" in out.stdout
+        assert elapsed < 2.0, f"runtime exec.write 不应被其它 session 的轮询阻塞，实际 {elapsed:.2f}s"
+    finally:
+        mgr.close(quiet.session_id)
+        mgr.close(echo.session_id)
+        t.join(timeout=5.0)
+        RuntimeClient(workspace_root=tmp_path).call(method="shutdown")
@@ -45,3 +45,27 @@ def test_executor_run_command_timeout(tmp_path: Path) -> None:
     assert result.error_kind == "timeout"
     assert result.exit_code is None
 
+
+
+def test_executor_drains_both_streams_without_reader_threads(tmp_path: Path, monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    import os
+    import threading
+
+    import pytest
+
+    if os.name == "nt":
+        pytest.skip("selector engine is POSIX-only")
+
+    def _no_threads(*_a, **_k):  # type: ignore[no-untyped-def]
+        raise AssertionError("run_command must not start reader threads on POSIX")
+
+    monkeypatch.setattr(threading.Thread, "start", _no_threads)
+    ex = Executor(max_stdout_bytes=1024, max_stderr_bytes=1024, max_combined_bytes=4096)
+    script = "import sys\nfor i in range(20000):\n    sys.stdout.write(f'o{i}\\n'); sys.stderr.write(f'e{i}\\n')\n"
+    result = ex.run_command([sys.executable, "-c", script], cwd=tmp_path, timeout_ms=10_000)
+
+    assert result.ok is True
+    assert result.truncated is True
+    assert result.stdout.endswith("o19999\n")
+    assert result.stderr.endswith("e19999\n")
+    assert len(result.stdout.encode("utf-8")) <= 1024 + len("...<truncated>\n")
@@ -0,0 +1,107 @@
+"""验证 JsonlWal group-commit 模式：批量写入、稳定 index、终态立即 fsync、计数器。"""
+
+from __future__ import annotations
+
+import time
+import unittest.mock as mock
+from pathlib import Path
+
+from skills_runtime.config.defaults import load_default_config_dict
+from skills_runtime.config.loader import load_config_dicts
+from skills_runtime.core.contracts import AgentEvent
+from skills_runtime.state.jsonl_wal import JsonlWal
+
+
+def _make_event(type_: str, i: int = 0) -> AgentEvent:
+    return AgentEvent(type=type_, timestamp=f"t{i}", run_id="r1", payload={"i": i})
+
+
+def _line_count(path: Path) -> int:
+    if not path.exists():
+        return 0
+    return sum(1 for line in path.read_text(encoding="utf-8").splitlines() if line.strip())
+
+
+def test_group_commit_returns_stable_indexes_and_batches_writes(tmp_path: Path) -> None:
+    path = tmp_path / "events.jsonl"
+    wal = JsonlWal(path, group_commit=True, group_commit_max_events=10, group_commit_max_delay_ms=60_000)
+
+    indexes = [wal.append(_make_event("llm_response_delta", i)) for i in range(25)]
+    assert indexes == list(range(25))
+    # 两个满批已落盘，剩余 5 条仍在缓冲
+    assert _line_count(path) == 20
+
+    stats = wal.group_commit_stats()
+    assert stats["enabled"] is True
+    assert stats["flushes"] == 2
+    assert stats["max_batch_size"] == 10
+    assert stats["pending_events"] == 5
+
+    events = list(wal.iter_events())
+    assert [ev.payload["i"] for ev in events] == list(range(25))
+    wal.close()
+
+
+def test_group_commit_terminal_event_flushes_and_fsyncs_immediately(tmp_path: Path) -> None:
+    path = tmp_path / "events.jsonl"
+    wal = JsonlWal(path, group_commit=True, group_commit_max_events=1000, group_commit_max_delay_ms=60_000)
+
+    with mock.patch("os.fsync") as mock_fsync:
+        for i in range(5):
+            wal.append(_make_event("llm_response_delta", i))
+        assert mock_fsync.call_count == 0
+        assert _line_count(path) == 0
+
+        idx = wal.append(_make_event("run_completed", 5))
+        assert idx == 5
+        assert mock_fsync.call_count == 1
+    assert _line_count(path) == 6
+    assert wal.group_commit_stats()["last_batch_size"] == 6
+    wal.close()
+
+
+def test_group_commit_flushes_on_byte_threshold(tmp_path: Path) -> None:
+    path = tmp_path / "events.jsonl"
+    wal = JsonlWal(path, group_commit=True, group_commit_max_bytes=1, group_commit_max_delay_ms=60_000)
+
+    wal.append(_make_event("llm_response_delta"))
+    assert _line_count(path) == 1
+    wal.close()
+
+
+def test_group_commit_flushes_on_delay_timer(tmp_path: Path) -> None:
+    path = tmp_path / "events.jsonl"
+    wal = JsonlWal(path, group_commit=True, group_commit_max_delay_ms=10)
+
+    wal.append(_make_event("llm_response_delta"))
+    deadline = time.monotonic() + 5.0
+    while _line_count(path) < 1 and time.monotonic() < deadline:
+        time.sleep(0.005)
+    assert _line_count(path) == 1
+    wal.close()
+
+
+def test_group_commit_close_flushes_and_index_continues_after_reopen(tmp_path: Path) -> None:
+    path = tmp_path / "events.jsonl"
+    wal = JsonlWal(path, group_commit=True, group_commit_max_delay_ms=60_000)
+    for i in range(3):
+        wal.append(_make_event("llm_response_delta", i))
+    wal.close()
+    assert _line_count(path) == 3
+
+    other = JsonlWal(path)
+    assert other.append(_make_event("llm_response_delta", 3)) == 3
+    other.close()
+
+    reopened = JsonlWal(path, group_commit=True, group_commit_max_delay_ms=60_000)
+    assert reopened.append(_make_event("llm_response_delta", 4)) == 4
+    reopened.close()
+    assert _line_count(path) == 5
+
+
+def test_run_wal_config_defaults_keep_group_commit_disabled() -> None:
+    cfg = load_config_dicts([load_default_config_dict()])
+    assert cfg.run.wal.group_commit is False
+
+    cfg2 = load_config_dicts([load_default_config_dict(), {"run": {"wal": {"group_commit": True}}}])
+    assert cfg2.run.wal.group_commit is True
@@ -0,0 +1,212 @@
+"""验证 events.jsonl 的 sidecar 行偏移索引：维护、O(1) 打开、增量补齐/重建、tail 与 fork。"""
+
+from __future__ import annotations
+
+import json
+import unittest.mock as mock
+from pathlib import Path
+
+import pytest
+
+from skills_runtime.core.contracts import AgentEvent
+from skills_runtime.core.resume_builder import prepare_resume
+from skills_runtime.state.fork import fork_run_events_jsonl
+from skills_runtime.state.jsonl_wal import JsonlWal
+from skills_runtime.state.wal_index import WalOffsetIndex
+
+
+def _ev(i: int, *, run_id: str = "r1", type_: str = "llm_response_delta") -> AgentEvent:
+    return AgentEvent(type=type_, timestamp=f"t{i}", run_id=run_id, payload={"i": i, "text": "中文" * (i % 3)})
+
+
+def _write_events(path: Path, n: int, **kwargs) -> None:
+    with JsonlWal(path, **kwargs) as wal:
+        for i in range(n):
+            wal.append(_ev(i))
+
+
+def test_index_is_maintained_on_append_and_matches_line_offsets(tmp_path: Path) -> None:
+    path = tmp_path / "events.jsonl"
+    _write_events(path, 10)
+
+    idx = WalOffsetIndex(path)
+    assert idx.path == tmp_path / "events.jsonl.idx"
+    assert idx.entry_count() == 10
+
+    raw = path.read_bytes()
+    for i, line in enumerate(raw.splitlines(keepends=True)):
+        start, end = idx.start_offset(i), idx.end_offset(i)
+        assert raw[start:end] == line
+    idx.close()
+
+
+def test_group_commit_batches_are_indexed(tmp_path: Path) -> None:
+    path = tmp_path / "events.jsonl"
+    _write_events(path, 23, group_commit=True, group_commit_max_events=5, group_commit_max_delay_ms=60_000)
+
+    idx = WalOffsetIndex(path)
+    assert idx.entry_count() == 23
+    assert idx.covered_end() == path.stat().st_size
+    idx.close()
+
+
+def test_open_uses_index_without_scanning_wal(tmp_path: Path) -> None:
+    path = tmp_path / "events.jsonl"
+    _write_events(path, 50)
+
+    with mock.patch.object(JsonlWal, "_scan_next_index", side_effect=AssertionError("full scan")):
+        with mock.patch.object(WalOffsetIndex, "_index_tail", side_effect=AssertionError("tail scan")):
+            wal = JsonlWal(path)
+            assert wal.event_count() == 50
+            assert wal.append(_ev(50)) == 50
+            wal.close()
+
+
+def test_stale_index_is_caught_up_incrementally(tmp_path: Path) -> None:
+    path = tmp_path / "events.jsonl"
+    _write_events(path, 5)
+    # 其它 writer（未维护索引）追加了 3 行
+    with path.open("a", encoding="utf-8") as f:
+        for i in range(5, 8):
+            f.write(json.dumps(_ev(i).model_dump(by_alias=True, exclude_none=True)) + "\n")
+
+    wal = JsonlWal(path)
+    assert wal.event_count() == 8
+    assert [ev.payload["i"] for ev in wal.iter_events(start_index=6)] == [6, 7]
+    wal.close()
+
+
+def test_index_is_rebuilt_when_wal_is_replaced_or_corrupted(tmp_path: Path) -> None:
+    path = tmp_path / "events.jsonl"
+    _write_events(path, 10)
+    # WAL 被截断重写为更短的内容
+    path.write_text(json.dumps(_ev(0).model_dump(by_alias=True, exclude_none=True)) + "\n", encoding="utf-8")
+    wal = JsonlWal(path)
+    assert wal.event_count() == 1
+    wal.close()
+
+    (tmp_path / "events.jsonl.idx").write_bytes(b"garbage")
+    wal2 = JsonlWal(path)
+    assert wal2.append(_ev(1)) == 1
+    wal2.close()
+    assert WalOffsetIndex(path).entry_count() == 2
+
+
+def test_iter_events_start_index_seeks_to_tail(tmp_path: Path) -> None:
+    path = tmp_path / "events.jsonl"
+    _write_events(path, 30)
+
+    with JsonlWal(path) as wal:
+        assert [ev.payload["i"] for ev in wal.iter_events(start_index=27)] == [27, 28, 29]
+        assert list(wal.iter_events(start_index=100)) == []
+
+    with JsonlWal(path, offset_index=False) as wal_no_index:
+        assert wal_no_index.byte_offset(3) is None
+        assert [ev.payload["i"] for ev in wal_no_index.iter_events(start_index=28)] == [28, 29]
+
+
+def test_fork_copies_prefix_via_index(tmp_path: Path) -> None:
+    src = tmp_path / "src" / "events.jsonl"
+    dst = tmp_path / "dst" / "events.jsonl"
+    _write_events(src, 20)
+    # 目标位置残留一个旧 WAL + 索引：fork 后必须不被误用
+    _write_events(dst, 40)
+
+    fork_run_events_jsonl(src_wal_path=src, dst_wal_path=dst, new_run_id="r2", up_to_index_inclusive=4)
+
+    with JsonlWal(dst) as wal:
+        events = list(wal.iter_events())
+        assert [ev.payload["i"] for ev in events] == [0, 1, 2, 3, 4]
+        assert {ev.run_id for ev in events} == {"r2"}
+        assert wal.append(_ev(5, run_id="r2")) == 5
+
+
+def test_fork_leaves_source_directory_untouched(tmp_path: Path) -> None:
+    src = tmp_path / "src" / "events.jsonl"
+    dst = tmp_path / "dst" / "events.jsonl"
+    src.parent.mkdir()
+    src.write_text("".join(json.dumps(_ev(i).model_dump(by_alias=True, exclude_none=True)) + "\n" for i in range(20)), encoding="utf-8")
+
+    def _snapshot() -> dict:
+        return {p.name: (p.stat().st_mtime_ns, p.read_bytes()) for p in src.parent.iterdir()}
+
+    before = _snapshot()
+    assert set(before) == {"events.jsonl"}
+    fork_run_events_jsonl(src_wal_path=src, dst_wal_path=dst, new_run_id="r2", up_to_index_inclusive=4)
+    assert _snapshot() == before
+    with JsonlWal(dst) as wal:
+        assert [ev.payload["i"] for ev in wal.iter_events()] == [0, 1, 2, 3, 4]
+
+    # 已有的索引只读借用：fork 不得更新源目录中的任何文件。
+    _write_events(src, 0)
+    before = _snapshot()
+    assert "events.jsonl.idx" in before
+    fork_run_events_jsonl(src_wal_path=src, dst_wal_path=dst, new_run_id="r3", up_to_index_inclusive=9)
+    assert _snapshot() == before
+    with JsonlWal(dst) as wal:
+        assert [ev.payload["i"] for ev in wal.iter_events()] == list(range(10))
+
+
+def test_fork_invalid_line_keeps_existing_destination(tmp_path: Path) -> None:
+    src = tmp_path / "src" / "events.jsonl"
+    dst = tmp_path / "dst" / "events.jsonl"
+    src.parent.mkdir()
+    lines = [json.dumps(_ev(i).model_dump(by_alias=True, exclude_none=True)) for i in range(5)]
+    lines[3] = "{not json"
+    src.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    _write_events(dst, 3)
+    old = dst.read_bytes()
+
+    with pytest.raises(json.JSONDecodeError):
+        fork_run_events_jsonl(src_wal_path=src, dst_wal_path=dst, new_run_id="r2", up_to_index_inclusive=4)
+    assert dst.read_bytes() == old
+    assert not (dst.parent / "events.jsonl.tmp").exists()
+
+
+def test_summary_resume_reads_only_tail(tmp_path: Path) -> None:
+    path = tmp_path / "events.jsonl"
+    _write_events(path, 250)
+
+    with JsonlWal(path) as wal:
+        assert wal.uniform_run_id() == "r1"
+        info = prepare_resume(wal=wal, run_id="r1", initial_history=None, resume_strategy="summary")
+    assert info.existing_events_count == 250
+    assert len(info.existing_events_tail) == 200
+    assert info.existing_events_tail[0].payload["i"] == 50
+    assert info.resume_summary is not None and "previous_events: 250" in info.resume_summary
+
+
+def test_summary_resume_counts_only_own_events_when_foreign_or_garbage_lines_precede_tail(tmp_path: Path) -> None:
+    path = tmp_path / "events.jsonl"
+    with JsonlWal(path) as wal:
+        wal.append(_ev(0, run_id="other"))
+        for i in range(1, 251):
+            wal.append(_ev(i))
+        assert wal.uniform_run_id() is None
+        info = prepare_resume(wal=wal, run_id="r1", initial_history=None, resume_strategy="summary")
+    assert info.existing_events_count == 250
+
+    garbage = tmp_path / "garbage" / "events.jsonl"
+    garbage.parent.mkdir()
+    garbage.write_text("not json\n", encoding="utf-8")
+    with JsonlWal(garbage) as wal:
+        for i in range(250):
+            wal.append(_ev(i))
+        assert wal.event_count() == 251
+        assert wal.uniform_run_id() is None
+        info = prepare_resume(wal=wal, run_id="r1", initial_history=None, resume_strategy="summary")
+    assert info.existing_events_count == 250
+
+
+def test_uniform_run_id_survives_reopen_and_rejects_legacy_index(tmp_path: Path) -> None:
+    path = tmp_path / "events.jsonl"
+    _write_events(path, 5, group_commit=True, group_commit_max_events=2, group_commit_max_delay_ms=60_000)
+    with JsonlWal(path) as wal:
+        assert wal.uniform_run_id() == "r1"
+
+    # 旧版本索引没有 run 归属标记：无法证明，回退全量扫描
+    (tmp_path / "events.jsonl.idx.run").unlink()
+    with JsonlWal(path) as wal:
+        assert wal.uniform_run_id() is None
+        info = prepare_resume(wal=wal, run_id="r1", initial_history=None, resume_strategy="summary")
+    assert info.existing_events_count == 5
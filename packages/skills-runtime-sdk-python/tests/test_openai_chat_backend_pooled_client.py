@@ -0,0 +1,150 @@
+"""OpenAIChatCompletionsBackend 连接池：本地 stand-in HTTP server 验证 keep-alive 复用与 aclose 生命周期。"""
+
+from __future__ import annotations
+
+import asyncio
+import gc
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator, List, Set, Tuple
+
+import httpx
+import pytest
+
+from skills_runtime.config.loader import AgentSdkLlmConfig
+from skills_runtime.core.agent import Agent
+from skills_runtime.llm.openai_chat import OpenAIChatCompletionsBackend
+from skills_runtime.llm.protocol import ChatRequest
+
+
+class _SseHandler(BaseHTTPRequestHandler):
+    """最小 chat.completions SSE stand-in：记录每个请求来自哪条 TCP 连接。"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:  # noqa: N802
+        length = int(self.headers.get("Content-Length") or 0)
+        _ = self.rfile.read(length)
+        self.server.peers.append(self.client_address)  # type: ignore[attr-defined]
+        chunk = json.dumps({"choices": [{"delta": {"content": "pong"}}]})
+        body = f"data: {chunk}\n\ndata: [DONE]\n\n".encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:  # type: ignore[no-untyped-def]
+        return None
+
+
+@pytest.fixture()
+def sse_server() -> Iterator[Tuple[str, List[Tuple[str, int]]]]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SseHandler)
+    server.peers = []  # type: ignore[attr-defined]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        host, port = server.server_address[:2]
+        yield f"http://{host}:{port}/v1", server.peers  # type: ignore[attr-defined]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _backend(base_url: str) -> OpenAIChatCompletionsBackend:
+    cfg = AgentSdkLlmConfig(base_url=base_url, api_key_env="OPENAI_API_KEY", timeout_sec=5)
+    return OpenAIChatCompletionsBackend(cfg, api_key="sk-test")
+
+
+async def _one_turn(backend: OpenAIChatCompletionsBackend) -> str:
+    text = ""
+    req = ChatRequest(model="gpt-test", messages=[{"role": "user", "content": "ping"}])
+    async for ev in backend.stream_chat(req):
+        if ev.type == "text_delta":
+            text += ev.text or ""
+    return text
+
+
+def test_sequential_turns_reuse_one_keepalive_connection(sse_server) -> None:  # type: ignore[no-untyped-def]
+    base_url, peers = sse_server
+    backend = _backend(base_url)
+
+    async def _go() -> List[str]:
+        async with backend:
+            return [await _one_turn(backend) for _ in range(5)]
+
+    assert asyncio.run(_go()) == ["pong"] * 5
+    assert len(peers) == 5
+    assert len(set(peers)) == 1, f"expected a single pooled connection, got {set(peers)}"
+
+
+def test_concurrent_turns_share_pool_and_aclose_allows_reuse(sse_server) -> None:  # type: ignore[no-untyped-def]
+    base_url, peers = sse_server
+    backend = _backend(base_url)
+
+    async def _go() -> Set[str]:
+        results = await asyncio.gather(*[_one_turn(backend) for _ in range(8)])
+        first_client = backend._client()  # noqa: SLF001
+        await backend.aclose()
+        assert first_client.is_closed
+        # 关闭后仍可继续使用：按需重建连接池
+        again = await _one_turn(backend)
+        assert backend._client() is not first_client  # noqa: SLF001
+        await backend.aclose()
+        return set(results) | {again}
+
+    assert asyncio.run(_go()) == {"pong"}
+    assert len(peers) == 9
+
+
+def test_separate_event_loops_get_separate_clients(sse_server) -> None:  # type: ignore[no-untyped-def]
+    base_url, _peers = sse_server
+    backend = _backend(base_url)
+
+    assert asyncio.run(_one_turn(backend)) == "pong"
+    # 前一个 loop 已结束：新 loop 必须拿到新的 client，而不是复用绑定旧 loop 的连接
+    assert asyncio.run(_one_turn(backend)) == "pong"
+    asyncio.run(backend.aclose())
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc/self/fd")
+def test_repeated_sync_runs_do_not_accumulate_clients_or_fds(sse_server, tmp_path: Path) -> None:  # type: ignore[no-untyped-def]
+    base_url, peers = sse_server
+    backend = _backend(base_url)
+    agent = Agent(backend=backend, workspace_root=tmp_path)
+
+    def _open_clients() -> int:
+        gc.collect()
+        return sum(1 for o in gc.get_objects() if isinstance(o, httpx.AsyncClient) and not o.is_closed)
+
+    # 每次 run_stream 都在新的 event loop 中执行：loop 结束时其 client 必须被关闭并解除登记。
+    assert list(agent.run_stream("ping"))[-1].type == "run_completed"
+    baseline_fds = len(os.listdir("/proc/self/fd"))
+    for _ in range(20):
+        assert list(agent.run_stream("ping"))[-1].type == "run_completed"
+
+    assert len(peers) == 21
+    assert len(backend._clients) == 0  # noqa: SLF001
+    assert _open_clients() == 0
+    assert len(os.listdir("/proc/self/fd")) <= baseline_fds + 2
+
+
+def test_http2_without_h2_is_a_config_error(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    import skills_runtime.llm.openai_chat as mod
+
+    def _raise(*args, **kwargs):  # type: ignore[no-untyped-def]
+        raise ImportError("h2 missing")
+
+    monkeypatch.setattr(mod.httpx, "AsyncClient", _raise)
+    cfg = AgentSdkLlmConfig(base_url="http://example.test/v1", api_key_env="OPENAI_API_KEY", http={"http2": True})
+    backend = OpenAIChatCompletionsBackend(cfg, api_key="sk-test")
+
+    async def _go() -> None:
+        with pytest.raises(ValueError, match="h2"):
+            await _one_turn(backend)
+
+    asyncio.run(_go())
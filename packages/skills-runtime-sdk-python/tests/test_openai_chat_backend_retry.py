@@ -69,38 +69,37 @@ class _FakeStreamResponse:
 
 class _Scenario:
     """
-    以“每次创建 AsyncClient 代表一次 attempt”的方式组织响应序列。
+    以“每次 `client.stream(...)` 代表一次 attempt”的方式组织响应序列。
 
     说明：
-    - backend 的 retry 循环每次都会创建一个新的 `httpx.AsyncClient`；
-    - 我们通过 `client_creations` 来验证是否发生了重试。
+    - backend 在同一 event loop 内复用一个共享 `httpx.AsyncClient`（连接池）；
+    - 我们通过 `attempts` 来验证是否发生了重试，通过 `client_creations` 验证 client 被复用。
     """
 
     def __init__(self, responses: List[_FakeStreamResponse]) -> None:
         self.responses = responses
         self.client_creations = 0
+        self.attempts = 0
         self.last_json_payloads: List[Any] = []
 
     def make_client(self, *args: Any, **kwargs: Any) -> "_FakeAsyncClient":
-        idx = self.client_creations
         self.client_creations += 1
-        return _FakeAsyncClient(self, idx)
+        return _FakeAsyncClient(self)
 
 
 class _FakeAsyncClient:
-    def __init__(self, scenario: _Scenario, idx: int) -> None:
+    def __init__(self, scenario: _Scenario) -> None:
         self._scenario = scenario
-        self._idx = idx
+        self.is_closed = False
 
     def stream(self, *args: Any, **kwargs: Any) -> _FakeStreamResponse:
         self._scenario.last_json_payloads.append(kwargs.get("json"))
-        return self._scenario.responses[self._idx]
+        idx = self._scenario.attempts
+        self._scenario.attempts += 1
+        return self._scenario.responses[idx]
 
-    async def __aenter__(self) -> "_FakeAsyncClient":
-        return self
-
-    async def __aexit__(self, exc_type, exc, tb) -> None:  # type: ignore[no-untyped-def]
-        return None
+    async def aclose(self) -> None:
+        self.is_closed = True
 
 
 def _run_stream(backend: OpenAIChatCompletionsBackend) -> List[str]:
@@ -165,7 +164,8 @@ def test_openai_chat_retries_on_429_with_retry_after(monkeypatch) -> None:  # ty
     backend = OpenAIChatCompletionsBackend(cfg, api_key="sk-test")
     types = _run_stream(backend)
 
-    assert scenario.client_creations == 2, "expected one retry (two attempts)"
+    assert scenario.attempts == 2, "expected one retry (two attempts)"
+    assert scenario.client_creations == 1, "retries must reuse the pooled client"
     assert sleeps and abs(sleeps[0] - 1.0) < 1e-6, "expected Retry-After=1s to be respected"
     assert "text_delta" in types
     assert "completed" in types
@@ -206,7 +206,7 @@ def test_openai_chat_retries_on_request_error_before_emitting(monkeypatch) -> No
     backend = OpenAIChatCompletionsBackend(cfg, api_key="sk-test")
     types = _run_stream(backend)
 
-    assert scenario.client_creations == 2, "expected retry after request error"
+    assert scenario.attempts == 2, "expected retry after request error"
     assert sleeps and abs(sleeps[0] - 0.5) < 1e-6, "attempt0 backoff should be 0.5s when no Retry-After"
     assert "text_delta" in types
 
@@ -242,7 +242,7 @@ def test_openai_chat_does_not_retry_after_emitting_any_event(monkeypatch) -> Non
     with pytest.raises(httpx.RequestError):
         asyncio.run(_go())
 
-    assert scenario.client_creations == 1, "should not retry after emitted_any=True"
+    assert scenario.attempts == 1, "should not retry after emitted_any=True"
 
 
 def test_openai_chat_retries_on_500_then_success(monkeypatch) -> None:  # type: ignore[no-untyped-def]
@@ -272,7 +272,7 @@ def test_openai_chat_retries_on_500_then_success(monkeypatch) -> None:  # type:
     backend = OpenAIChatCompletionsBackend(cfg, api_key="sk-test")
     types = _run_stream(backend)
 
-    assert scenario.client_creations == 2, "expected one retry (two attempts)"
+    assert scenario.attempts == 2, "expected one retry (two attempts)"
     assert "text_delta" in types
     assert "completed" in types
 
@@ -304,7 +304,7 @@ def test_openai_chat_does_not_fallback_on_generic_400_when_stream_options_are_us
     with pytest.raises(httpx.HTTPStatusError):
         asyncio.run(_go())
 
-    assert scenario.client_creations == 1, "should not fallback when stream_options are caller-controlled"
+    assert scenario.attempts == 1, "should not fallback when stream_options are caller-controlled"
 
 
 def test_openai_chat_enforces_retry_max_retries(monkeypatch) -> None:  # type: ignore[no-untyped-def]
@@ -344,7 +344,7 @@ def test_openai_chat_enforces_retry_max_retries(monkeypatch) -> None:  # type: i
     with pytest.raises(httpx.HTTPStatusError):
         asyncio.run(_go())
 
-    assert scenario.client_creations == 2, "expected attempts=1+max_retries"
+    assert scenario.attempts == 2, "expected attempts=1+max_retries"
     assert sleeps and abs(sleeps[0] - 0.5) < 1e-6
 
 
@@ -423,7 +423,7 @@ def test_openai_chat_falls_back_without_stream_options_when_usage_request_unsupp
     backend = OpenAIChatCompletionsBackend(cfg, api_key="sk-test")
     types = _run_stream(backend)
 
-    assert scenario.client_creations == 2
+    assert scenario.attempts == 2
     assert scenario.last_json_payloads[0]["stream_options"] == {"include_usage": True}
     assert "stream_options" not in scenario.last_json_payloads[1]
     assert "completed" in types
@@ -457,7 +457,7 @@ def test_openai_chat_falls_back_without_stream_options_on_generic_422_when_auto_
     backend = OpenAIChatCompletionsBackend(cfg, api_key="sk-test")
     types = _run_stream(backend)
 
-    assert scenario.client_creations == 2
+    assert scenario.attempts == 2
     assert scenario.last_json_payloads[0]["stream_options"] == {"include_usage": True}
     assert "stream_options" not in scenario.last_json_payloads[1]
     assert "completed" in types
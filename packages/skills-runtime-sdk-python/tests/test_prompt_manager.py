@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
-from skills_runtime.prompts.history import trim_history
+import pytest
+
+import skills_runtime.prompts.manager as manager_mod
+from skills_runtime.prompts.history import HistoryLedger, trim_history
 from skills_runtime.prompts.manager import PromptManager, PromptTemplates
+from skills_runtime.prompts.tokens import MESSAGE_OVERHEAD_TOKENS, get_token_estimator, heuristic_token_count
 from skills_runtime.skills.manager import SkillsManager
 from skills_runtime.skills.models import Skill
 from skills_runtime.tools.protocol import ToolSpec
@@ -49,6 +54,75 @@ def test_trim_history_by_max_messages_and_chars() -> None:
     assert dropped2 == 2
 
 
+def test_trim_history_counts_tool_call_arguments_and_tokens() -> None:
+    hist = [
+        {"role": "user", "content": "a" * 40},
+        {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [{"id": "c1", "type": "function", "function": {"name": "file_read", "arguments": "x" * 400}}],
+        },
+        {"role": "tool", "tool_call_id": "c1", "content": "b" * 40},
+    ]
+
+    kept, dropped = trim_history(hist, max_messages=10, max_chars=200)
+    assert kept == hist[2:]
+    assert dropped == 2
+
+    tool_msg_tokens = heuristic_token_count("b" * 40) + MESSAGE_OVERHEAD_TOKENS
+    kept2, dropped2 = trim_history(hist, max_messages=10, max_chars=10_000, max_tokens=tool_msg_tokens)
+    assert kept2 == hist[2:]
+    assert dropped2 == 2
+
+
+def test_heuristic_token_count_treats_non_ascii_as_one_token_each() -> None:
+    assert heuristic_token_count("") == 0
+    assert heuristic_token_count("abcd" * 5) == 5
+    assert heuristic_token_count("你好世界") == 4
+    assert get_token_estimator("heuristic") is heuristic_token_count
+
+
+def test_history_ledger_only_counts_appended_messages() -> None:
+    counted: list[str] = []
+
+    def _estimator(text: str) -> int:
+        counted.append(text)
+        return len(text)
+
+    ledger = HistoryLedger(_estimator)
+    hist = [{"role": "user", "content": "one"}, {"role": "assistant", "content": "two"}]
+    ledger.sync(hist)
+    assert counted == ["one", "two"]
+
+    hist.append({"role": "user", "content": "three"})
+    ledger.sync(hist)
+    assert counted == ["one", "two", "three"]
+    assert ledger.total_tokens == 11 + 3 * MESSAGE_OVERHEAD_TOKENS
+
+    # 压缩后 history 被整体替换：账本从首个不一致处重建。
+    hist[:] = [{"role": "assistant", "content": "sum"}, hist[-1]]
+    ledger.sync(hist)
+    assert counted[-2:] == ["sum", "three"]
+    assert ledger.window_start(max_messages=10, max_chars=100, max_tokens=5 + MESSAGE_OVERHEAD_TOKENS) == 1
+
+
+def test_prompt_manager_history_max_tokens_reports_kept_tokens(tmp_path: Path) -> None:
+    sm, _skills = _make_skills_manager_with_two_skills(tmp_path)
+    pm = PromptManager(
+        templates=PromptTemplates(system_text="SYS", developer_text=""),
+        include_skills_list=False,
+        history_max_tokens=20,
+        token_estimator=heuristic_token_count,
+    )
+    history = [{"role": "user", "content": "x" * 200}, {"role": "assistant", "content": "y" * 40}]
+    messages, debug = pm.build_messages(
+        task="t", cwd=str(tmp_path), tools=[], skills_manager=sm, injected_skills=[], history=history
+    )
+    assert messages[1:] == [history[1], {"role": "user", "content": "t"}]
+    assert debug["history_dropped"] == 1
+    assert debug["history_tokens"] == 10 + MESSAGE_OVERHEAD_TOKENS
+
+
 def test_prompt_manager_message_order_includes_skills_list_and_injections(tmp_path: Path) -> None:
     skills_root = tmp_path / "skills"
     _write_skill(skills_root / "s1", name="python_testing", description="pytest patterns")
@@ -229,6 +303,44 @@ def test_tools_exposure_explicit_only_filters_to_mentioned_tool(tmp_path: Path)
     assert debug["tools_count"] == 1
 
 
+def test_tools_exposure_explicit_only_matches_whole_names_across_many_tools() -> None:
+    def _spec(name: str) -> ToolSpec:
+        return ToolSpec(name=name, description="d", parameters={"type": "object", "properties": {}})
+
+    tools = [_spec(f"custom_tool_{i}") for i in range(300)] + [_spec("file"), _spec("mcp:docs/search"), _spec("a.b")]
+    pm = PromptManager(templates=PromptTemplates(system_text="SYS", developer_text=""), tools_exposure="explicit_only")
+
+    picked = pm.filter_tools_for_task(
+        tools, task="run custom_tool_7, then mcp:docs/search; skip file_read and a.b.c", user_input="custom_tool_12"
+    )
+    assert [t.name for t in picked] == ["custom_tool_7", "custom_tool_12", "mcp:docs/search"]
+    assert pm.filter_tools_for_task(tools, task="file and a.b") == [tools[300], tools[302]]
+
+
+def test_explicit_only_parses_mentions_once_per_request_text(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    sm, skills = _make_skills_manager_with_two_skills(tmp_path)
+    calls: list[str] = []
+    real = manager_mod.extract_skill_mentions
+
+    def _counting(text: str):  # type: ignore[no-untyped-def]
+        calls.append(text)
+        return real(text)
+
+    monkeypatch.setattr(manager_mod, "extract_skill_mentions", _counting)
+    pm = PromptManager(
+        templates=PromptTemplates(system_text="SYS", developer_text=""),
+        include_skills_list=False,
+        skill_injection_mode="explicit_only",
+        skill_render="summary",
+    )
+    task = "Use $[demo:writing].mentioned_skill"
+    for skill in skills:
+        pm.should_inject_skill(skill, f"$[demo:writing].{skill.skill_name}", task=task)
+    assert pm.should_inject_skill(skills[0], "$[demo:writing].mentioned_skill", task=task) is True
+    assert pm.should_inject_skill(skills[1], "$[demo:writing].unmentioned_skill", task=task) is False
+    assert calls == [task]
+
+
 def test_history_compacted_currently_uses_full_sliding_window_behavior(tmp_path: Path) -> None:
     sm, _skills = _make_skills_manager_with_two_skills(tmp_path)
     history = [
@@ -366,3 +478,89 @@ def test_skill_render_method_only_falls_back_to_summary_when_body_loader_fails(t
     assert "<skill_method>" not in joined
     assert "cannot read skill body" not in joined
     assert debug["injected_skills_count"] == 1
+
+
+def test_prompt_manager_reuses_stable_prefix_byte_identically_across_turns(tmp_path: Path) -> None:
+    sm, skills = _make_skills_manager_with_two_skills(tmp_path)
+    for skill in skills:
+        # 刚写入的文件处于 mtime racy 窗口内，正文版本不可判定（不缓存）；回拨 mtime 模拟稳定文件。
+        os.utime(skill.path, (1_700_000_000, 1_700_000_000))
+    pm = PromptManager(templates=PromptTemplates(system_text="SYS {{task}}\n{{skills}}", developer_text="DEV"))
+    tools = [ToolSpec(name="file_read", description="read", parameters={"type": "object", "properties": {}})]
+    injected = [(skills[0], "mention", "$[demo:writing].mentioned_skill")]
+
+    def _build(history):  # type: ignore[no-untyped-def]
+        return pm.build_messages(
+            task="t", cwd=str(tmp_path), tools=tools, skills_manager=sm, injected_skills=injected, history=history
+        )
+
+    m1, d1 = _build([])
+    m2, d2 = _build([{"role": "assistant", "content": "a"}])
+    prefix_len = 2 + d1["injected_skills_count"]
+    assert d1["prompt_cache"] == {"hit": False, "hits": 0, "misses": 1}
+    assert d2["prompt_cache"] == {"hit": True, "hits": 1, "misses": 1}
+    assert m1[:prefix_len] == m2[:prefix_len]
+    assert all(a["content"] is b["content"] for a, b in zip(m1[:prefix_len], m2[:prefix_len]))
+    assert m2[prefix_len] == {"role": "assistant", "content": "a"}
+
+    # 启用状态变化会推进 scan_generation，前缀重新渲染。
+    sm.set_enabled(skills[1].path, False)
+    m3, d3 = _build([])
+    assert d3["prompt_cache"]["hit"] is False
+    assert "unmentioned_skill" not in m3[0]["content"]
+
+
+def test_skills_manager_scan_generation_only_advances_on_content_change(tmp_path: Path) -> None:
+    sm, _skills = _make_skills_manager_with_two_skills(tmp_path)
+    gen = sm.scan_generation
+    sm.scan(force_refresh=True)
+    assert sm.scan_generation == gen
+
+    _write_skill(tmp_path / "skills" / "third", name="third_skill", description="third desc")
+    sm.scan(force_refresh=True)
+    assert sm.scan_generation == gen + 1
+
+
+def test_skills_list_top_k_lists_relevant_and_mentioned_skills(tmp_path: Path) -> None:
+    sm, _skills = _make_skills_manager_with_two_skills(tmp_path)
+    _write_skill(tmp_path / "skills" / "pdf", name="pdf_extract", description="extract text from pdf files")
+    sm.scan(force_refresh=True)
+    pm = PromptManager(templates=PromptTemplates(system_text="SYS", developer_text=""), skills_list_top_k=1)
+    mentioned = next(s for s in sm.list_skills() if s.skill_name == "mentioned_skill")
+
+    messages, debug = pm.build_messages(
+        task="please extract the pdf text",
+        cwd=str(tmp_path),
+        tools=[],
+        skills_manager=sm,
+        injected_skills=[(mentioned, "mention", "$[demo:writing].mentioned_skill")],
+        history=[],
+    )
+
+    skills_list = messages[1]["content"]
+    assert "showing 2 of 3" in skills_list
+    assert "$[demo:writing].mentioned_skill" in skills_list
+    assert "$[demo:writing].pdf_extract" in skills_list
+    assert "unmentioned_skill" not in skills_list
+    assert (debug["skills_count"], debug["skills_listed"]) == (3, 2)
+
+
+def test_skills_list_top_k_fills_from_scan_order_when_task_matches_nothing(tmp_path: Path) -> None:
+    sm, _skills = _make_skills_manager_with_two_skills(tmp_path)
+    _write_skill(tmp_path / "skills" / "pdf", name="pdf_extract", description="extract text from pdf files")
+    sm.scan(force_refresh=True)
+    pm = PromptManager(templates=PromptTemplates(system_text="SYS", developer_text=""), skills_list_top_k=2)
+
+    messages, debug = pm.build_messages(
+        task="请帮我整理这份文档",
+        cwd=str(tmp_path),
+        tools=[],
+        skills_manager=sm,
+        injected_skills=[],
+        history=[],
+    )
+
+    listed = [line for line in messages[1]["content"].splitlines() if line.startswith("- $[")]
+    assert listed == [f"- $[demo:writing].{s.skill_name}: {s.description}" for s in sm.list_skills(enabled_only=True)[:2]]
+    assert "showing 2 of 3" in messages[1]["content"]
+    assert debug["skills_listed"] == 2
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from skills_runtime.core.exec_sessions import PersistentExecSessionManager
+from skills_runtime.runtime.client import RuntimeClient
+from skills_runtime.runtime.protocol import FRAME_HEADER, FRAME_MAGIC, encode_frame
+
+pytestmark = pytest.mark.skipif(
+    os.name == "nt" or not hasattr(socket, "AF_UNIX"), reason="no AF_UNIX support"
+)
+
+
+def test_calls_share_one_connection_without_per_call_ping(monkeypatch, tmp_path: Path) -> None:  # type: ignore[no-untyped-def]
+    client = RuntimeClient(workspace_root=tmp_path)
+    ensure_calls = {"count": 0}
+    real_ensure = client.ensure_server
+
+    def _counting_ensure():  # type: ignore[no-untyped-def]
+        ensure_calls["count"] += 1
+        return real_ensure()
+
+    monkeypatch.setattr(client, "ensure_server", _counting_ensure)
+    try:
+        for _ in range(5):
+            assert client.call(method="runtime.status").get("ok") is True
+        conn = client._conn
+        assert conn is not None and conn.alive
+        assert client.call(method="ping") == {"pong": True}
+        assert client._conn is conn
+        assert ensure_calls["count"] == 1
+    finally:
+        client.call(method="shutdown")
+        client.close()
+
+
+def test_concurrent_calls_are_multiplexed_on_one_connection(tmp_path: Path) -> None:
+    client = RuntimeClient(workspace_root=tmp_path)
+    try:
+        child = client.call(method="collab.spawn", params={"message": "wait_input:1", "agent_type": "default"})
+        cid = str(child["id"])
+
+        waited: dict[str, object] = {}
+
+        def _wait() -> None:
+            waited.update(client.call(method="collab.wait", params={"ids": [cid], "timeout_ms": 5_000}))
+
+        t = threading.Thread(target=_wait)
+        t.start()
+        time.sleep(0.1)
+
+        started = time.monotonic()
+        out = client.call(method="collab.send_input", params={"id": cid, "message": "hello"})
+        assert out.get("id") == cid
+        assert time.monotonic() - started < 1.0
+
+        t.join(timeout=5.0)
+        results = waited.get("results") or []
+        assert isinstance(results, list) and results[0].get("final_output") == "got:hello"
+    finally:
+        client.call(method="shutdown")
+        client.close()
+
+
+def test_call_reconnects_after_server_crash(tmp_path: Path) -> None:
+    client = RuntimeClient(workspace_root=tmp_path)
+    info = client.call(method="runtime.status")
+    old_pid = int(info["pid"])
+
+    os.kill(old_pid, signal.SIGKILL)
+    deadline = time.monotonic() + 3.0
+    while client._conn is not None and client._conn.alive and time.monotonic() < deadline:
+        time.sleep(0.02)
+
+    st = client.call(method="runtime.status")
+    assert int(st["pid"]) != old_pid
+    client.call(method="shutdown")
+    client.close()
+
+
+def test_exec_has_probe_does_not_consume_output(tmp_path: Path) -> None:
+    mgr = PersistentExecSessionManager(workspace_root=tmp_path)
+    s = mgr.spawn(argv=[sys.executable, "-u", "-c", "print('ready'); import time; time.sleep(5)"], cwd=tmp_path, tty=False)
+    try:
+        time.sleep(0.3)
+        assert mgr.has(s.session_id) is True
+        assert mgr.has(s.session_id + 1000) is False
+        out = mgr.write(session_id=s.session_id, yield_time_ms=500)
+        assert "ready" in out.stdout
+    finally:
+        mgr.close(s.session_id)
+        RuntimeClient(workspace_root=tmp_path).call(method="shutdown")
+
+
+def test_legacy_one_shot_requests_still_served(tmp_path: Path) -> None:
+    client = RuntimeClient(workspace_root=tmp_path)
+    info = client.ensure_server()
+    st = client._call_with_info(info, method="runtime.status", params={}, timeout_sec=2.0)
+    assert int(st.get("pid") or 0) == info.pid
+    client.call(method="shutdown")
+    client.close()
+
+
+def test_framed_connection_rejects_oversized_frame_and_bad_secret(tmp_path: Path) -> None:
+    client = RuntimeClient(workspace_root=tmp_path)
+    info = client.ensure_server()
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.settimeout(2.0)
+        s.connect(info.socket_path)
+        s.sendall(FRAME_MAGIC)
+        assert s.recv(len(FRAME_MAGIC)) == FRAME_MAGIC
+
+        s.sendall(encode_frame({"id": 7, "method": "runtime.status", "params": {}, "secret": "wrong"}))
+        (size,) = FRAME_HEADER.unpack(s.recv(FRAME_HEADER.size))
+        body = b""
+        while len(body) < size:
+            body += s.recv(size - len(body))
+        assert b'"id": 7' in body and b'"error_kind": "permission"' in body
+
+        s.sendall(FRAME_HEADER.pack(64 * 1024 * 1024))
+        (size,) = FRAME_HEADER.unpack(s.recv(FRAME_HEADER.size))
+        body = b""
+        while len(body) < size:
+            body += s.recv(size - len(body))
+        assert b'"id": null' in body and b'"error_kind": "validation"' in body
+        assert s.recv(1) == b""
+
+    assert client.call(method="runtime.status").get("ok") is True
+    client.call(method="shutdown")
+    client.close()
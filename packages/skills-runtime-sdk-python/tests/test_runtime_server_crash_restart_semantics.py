@@ -232,3 +232,21 @@ def _pid_alive(pid: int) -> bool:
         return True
     except Exception:
         return False
+
+
+@pytest.mark.skipif(os.name == "nt", reason="no Windows support in this SDK")
+def test_collab_wait_any_mode_returns_on_first_completion(tmp_path: Path) -> None:
+    """collab.wait 支持 mode=any：任一 child 结束即返回，结果仍包含全部 ids 的当前状态。"""
+
+    client = RuntimeClient(workspace_root=tmp_path)
+    try:
+        fast = str(client.call(method="collab.spawn", params={"message": "hi"})["id"])
+        slow = str(client.call(method="collab.spawn", params={"message": "wait_input:1"})["id"])
+        out = client.call(method="collab.wait", params={"ids": [slow, fast], "timeout_ms": 3_000, "mode": "any"})
+        by_id = {it["id"]: it["status"] for it in out["results"]}
+        assert by_id == {fast: "completed", slow: "running"}
+        with pytest.raises(RuntimeError, match="validation"):
+            client.call(method="collab.wait", params={"ids": [slow], "mode": "first"})
+    finally:
+        client.call(method="shutdown")
+        client.close()
@@ -0,0 +1,135 @@
+"""验证 workspace trigram 索引：字面量提取、候选缩小、增量更新与 stale 回退。"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from skills_runtime.tools.builtin.grep_files import grep_files
+from skills_runtime.tools.protocol import ToolCall
+from skills_runtime.tools.registry import ToolExecutionContext
+from skills_runtime.tools.search_index import TrigramIndex, literal_runs, required_trigrams
+
+
+def _grep(ctx: ToolExecutionContext, **args):  # type: ignore[no-untyped-def]
+    result = grep_files(ToolCall(call_id="c1", name="grep_files", args=args), ctx)
+    assert result.ok is True
+    return (result.details or {})["data"]
+
+
+def _make_tree(root: Path, n: int = 40) -> None:
+    for i in range(n):
+        d = root / "pkg" / f"m{i % 4}"
+        d.mkdir(parents=True, exist_ok=True)
+        (d / f"mod_{i}.py").write_text(f"def handler_{i}():\n    return 'token_{i}'\n", encoding="utf-8")
+
+
+@pytest.mark.parametrize(
+    ("pattern", "expected"),
+    [
+        ("plain_text", ["plain_text"]),
+        (r"foo\.bar+baz", ["foo.bar", "baz"]),
+        ("ab*cdef", ["a", "cdef"]),
+        ("(x|y)needle{0,2}zz", ["needl", "zz"]),
+        (r"pre\d+post", ["pre", "post"]),
+        ("a|b", None),
+        ("(?i)Needle", None),
+    ],
+)
+def test_literal_runs_only_keeps_mandatory_literals(pattern: str, expected) -> None:  # type: ignore[no-untyped-def]
+    assert literal_runs(pattern) == expected
+
+
+def test_required_trigrams_none_when_pattern_has_no_long_literal() -> None:
+    assert required_trigrams(r"\w+") is None
+    assert required_trigrams("ab.cd") is None
+    assert required_trigrams("abc") == {(ord("a") << 16) | (ord("b") << 8) | ord("c")}
+
+
+def test_grep_files_uses_index_and_matches_full_scan(tmp_path: Path) -> None:
+    _make_tree(tmp_path)
+    ctx = ToolExecutionContext(workspace_root=tmp_path, run_id="r1", emit_tool_events=False)
+    full = _grep(ctx, pattern=r"token_1\d")
+    assert full["index_used"] is False
+
+    stats = TrigramIndex.open_or_create(tmp_path).refresh()
+    assert (stats.files, stats.reindexed) == (40, 40)
+    indexed = _grep(ctx, pattern=r"token_1\d")
+    assert indexed["index_used"] is True
+    assert indexed["files"] == full["files"]
+    assert indexed["files_scanned"] == 11  # token_1 + token_10..19 含同一组 trigram
+
+    sub = _grep(ctx, pattern=r"handler_5\(", path="pkg/m1")
+    assert sub["index_used"] is True
+    assert sub["files"] == [str((tmp_path / "pkg" / "m1" / "mod_5.py").resolve())]
+
+    # 无法从 pattern 推断字面量时回退到全量扫描
+    assert _grep(ctx, pattern="(?i)TOKEN_3")["index_used"] is False
+
+
+def test_changed_files_are_always_candidates_and_refresh_is_incremental(tmp_path: Path) -> None:
+    _make_tree(tmp_path)
+    ctx = ToolExecutionContext(workspace_root=tmp_path, run_id="r1", emit_tool_events=False)
+    TrigramIndex.open_or_create(tmp_path).refresh()
+
+    changed = tmp_path / "pkg" / "m0" / "mod_0.py"
+    changed.write_text("fresh_marker = 1\n", encoding="utf-8")
+    os.utime(changed, ns=(1, 1))
+    (tmp_path / "pkg" / "m1" / "mod_1.py").unlink()
+
+    data = _grep(ctx, pattern="fresh_marker")
+    assert data["index_used"] is True
+    assert data["files"] == [str(changed.resolve())]
+
+    stats = TrigramIndex.open_or_create(tmp_path).refresh()
+    assert (stats.files, stats.reindexed, stats.removed) == (39, 1, 1)
+    assert _grep(ctx, pattern="fresh_marker")["files_scanned"] == 1
+
+
+def test_stale_index_falls_back_to_full_scan(tmp_path: Path) -> None:
+    _make_tree(tmp_path, n=10)
+    TrigramIndex.open_or_create(tmp_path).refresh()
+    for i in range(10, 20):
+        (tmp_path / f"new_{i}.py").write_text(f"value = 'token_{i}'\n", encoding="utf-8")
+
+    ctx = ToolExecutionContext(workspace_root=tmp_path, run_id="r1", emit_tool_events=False)
+    data = _grep(ctx, pattern="token_1")
+    assert data["index_used"] is False
+    assert len(data["files"]) == 11
+
+
+def test_candidate_files_are_walked_lazily(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    import skills_runtime.tools.search_index as search_index
+
+    _make_tree(tmp_path, n=200)
+    TrigramIndex.open_or_create(tmp_path).refresh()
+    index = TrigramIndex.load(tmp_path)
+    assert index is not None
+
+    stat_calls = []
+    real_stat = search_index.os.stat
+
+    def _stat(path, *args, **kwargs):  # type: ignore[no-untyped-def]
+        if str(path).endswith(".py"):
+            stat_calls.append(path)
+        return real_stat(path, *args, **kwargs)
+
+    monkeypatch.setattr(search_index.os, "stat", _stat)
+    candidates = index.candidate_files("handler_", root=tmp_path, include=None)
+    assert candidates is not None
+    assert stat_calls == []
+
+    # 只消费前两个候选：不得为整棵树 stat。
+    it = iter(candidates)
+    first = [next(it), next(it)]
+    assert all(rel.endswith(".py") for _abs, rel in first)
+    assert len(stat_calls) == 2
+    assert candidates.fell_back is False
+
+    ctx = ToolExecutionContext(workspace_root=tmp_path, run_id="r1", emit_tool_events=False)
+    stat_calls.clear()
+    data = _grep(ctx, pattern="handler_", limit=1)
+    assert data["index_used"] is True and len(data["files"]) == 1
+    assert len(stat_calls) < 200
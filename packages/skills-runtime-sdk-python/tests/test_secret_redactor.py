@@ -0,0 +1,72 @@
+"""验证编译式 secret 脱敏器：单遍多模式替换、按 secret 集合缓存、JSON 文本快路径。"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from skills_runtime.core.event_redaction import _redact_event_data
+from skills_runtime.core.secret_redactor import get_secret_redactor, normalize_secrets
+from skills_runtime.tools.protocol import ToolCall, ToolResult, ToolSpec
+from skills_runtime.tools.registry import ToolExecutionContext, ToolRegistry
+
+
+def test_redactor_replaces_all_secrets_and_prefers_longest_match() -> None:
+    r = get_secret_redactor(["token-abc", "token-abc-extended", " padded-secret ", "abc", 42])
+
+    assert normalize_secrets(["abc", " padded-secret ", None]) == ("padded-secret",)
+    assert r.redact("x token-abc-extended y token-abc z padded-secret") == "x <redacted> y <redacted> z <redacted>"
+    assert r.redact("abc is too short to count") == "abc is too short to count"
+
+
+def test_redactor_is_cached_per_secret_set() -> None:
+    a = get_secret_redactor(["secret-one", "secret-two"])
+    b = get_secret_redactor(["secret-two", "secret-one", "x"])
+    c = get_secret_redactor(["secret-one"])
+
+    assert a is b
+    assert a is not c
+    assert get_secret_redactor([]).enabled is False
+
+
+def test_redactor_scales_to_many_secrets_on_large_output() -> None:
+    secrets = [f"sk-live-{i:04d}-{'q' * 12}" for i in range(64)]
+    r = get_secret_redactor(secrets)
+    text = ("ordinary build log line\n" * 20_000) + secrets[17] + "\n" + secrets[63]
+
+    out = r.redact(text)
+
+    assert out.endswith("<redacted>\n<redacted>")
+    assert not any(s in out for s in secrets)
+
+
+def test_redact_json_text_skips_roundtrip_without_hits_and_handles_escaped_secrets() -> None:
+    r = get_secret_redactor(['pa"ss\\word', "plain-secret"])
+
+    raw = '{"b": 1,   "a": "nothing here"}'
+    assert r.redact_json_text(raw) is raw  # 未命中：不做 loads/dumps，格式原样保留
+
+    escaped = json.dumps({"stdout": 'login pa"ss\\word ok', "n": [1, "plain-secret"]})
+    assert json.loads(r.redact_json_text(escaped)) == {"stdout": "login <redacted> ok", "n": [1, "<redacted>"]}
+    assert r.redact_json_text("not json plain-secret") == "not json <redacted>"
+
+
+def test_event_data_and_tool_result_share_redaction_semantics(tmp_path: Path) -> None:
+    secrets = ["ghp_examplevalue", "db-password-1"]
+    assert _redact_event_data({"cmd": "echo ghp_examplevalue", "env": {"TOKEN": "x"}}, redaction_values=secrets) == {
+        "cmd": "echo <redacted>",
+        "env_keys": ["TOKEN"],
+    }
+
+    ctx = ToolExecutionContext(workspace_root=tmp_path, run_id="r1", redaction_values=lambda: secrets, emit_tool_events=False)
+    registry = ToolRegistry(ctx=ctx)
+
+    def _echo(call: ToolCall, _ctx: ToolExecutionContext) -> ToolResult:
+        return ToolResult.ok_payload(stdout=f"value={call.args['v']}", data={"echo": call.args["v"]})
+
+    registry.register(ToolSpec(name="echo", description="echo", parameters={"type": "object", "properties": {}}), _echo)
+    result = registry.dispatch(ToolCall(call_id="c1", name="echo", args={"v": "db-password-1"}))
+
+    assert "db-password-1" not in result.content
+    assert "db-password-1" not in json.dumps(result.details)
+    assert ctx.get_redactor() is get_secret_redactor(secrets)
@@ -0,0 +1,167 @@
+"""验证注入正文缓存：按版本寻址、LRU 字节上限、命中统计与 SkillsManager 接线。"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import time
+from typing import Any, Dict, List, Optional
+
+from skills_runtime.skills.body_cache import SkillBodyCache, body_cache_key
+from skills_runtime.skills.manager import SkillsManager
+from skills_runtime.skills.models import Skill
+
+
+TS = "2026-02-07T00:00:00Z"
+
+
+def _skill(name: str, *, body: str, calls: List[str], etag: Optional[str] = "e1", path: Optional[Path] = None) -> Skill:
+    def _load() -> str:
+        calls.append(name)
+        return body
+
+    return Skill(
+        space_id="space-eng",
+        source_id="src-redis",
+        namespace="alice:engineering",
+        skill_name=name,
+        description="d",
+        locator=f"redis://skills:meta:alice:engineering:{name}",
+        path=path,
+        body_size=None,
+        body_loader=_load,
+        required_env_vars=[],
+        metadata={"etag": etag, "updated_at": None},
+    )
+
+
+def test_body_cache_hits_until_version_changes() -> None:
+    calls: List[str] = []
+    cache = SkillBodyCache(max_bytes=1024)
+
+    s1 = _skill("a", body="v1", calls=calls)
+    assert cache.get_or_load(s1, s1.body_loader) == "v1"
+    assert cache.get_or_load(s1, s1.body_loader) == "v1"
+    assert calls == ["a"]
+
+    s2 = _skill("a", body="v2", calls=calls, etag="e2")
+    assert cache.get_or_load(s2, s2.body_loader) == "v2"
+    assert calls == ["a", "a"]
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+
+
+def test_body_cache_evicts_lru_by_bytes() -> None:
+    calls: List[str] = []
+    cache = SkillBodyCache(max_bytes=10)
+    a, b, c = (_skill(n, body=n * 4, calls=calls) for n in "abc")
+
+    cache.get_or_load(a, a.body_loader)
+    cache.get_or_load(b, b.body_loader)
+    cache.get_or_load(a, a.body_loader)  # a 变为最近使用
+    cache.get_or_load(c, c.body_loader)  # 超出 10 字节：淘汰 b
+
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["bytes"] == 8
+    cache.get_or_load(a, a.body_loader)
+    cache.get_or_load(b, b.body_loader)
+    assert calls == ["a", "b", "c", "b"]
+
+
+def test_body_cache_skips_unversioned_and_oversized_bodies() -> None:
+    calls: List[str] = []
+    cache = SkillBodyCache(max_bytes=4)
+
+    unversioned = _skill("u", body="x", calls=calls, etag=None)
+    assert body_cache_key(unversioned) is None
+    cache.get_or_load(unversioned, unversioned.body_loader)
+    cache.get_or_load(unversioned, unversioned.body_loader)
+
+    big = _skill("big", body="0123456789", calls=calls)
+    cache.get_or_load(big, big.body_loader)
+    cache.get_or_load(big, big.body_loader)
+
+    assert calls == ["u", "u", "big", "big"]
+    assert cache.stats()["entries"] == 0
+
+
+def test_body_cache_filesystem_key_follows_file_stat(tmp_path: Path) -> None:
+    p = tmp_path / "SKILL.md"
+    p.write_text("body", encoding="utf-8")
+    skill = _skill("fs", body="body", calls=[], path=p)
+
+    assert body_cache_key(skill) is None  # 刚写入：racy 窗口内不缓存
+    old = time.time() - 60
+    os.utime(p, (old, old))
+    k1 = body_cache_key(skill)
+    assert k1 is not None
+    os.utime(p, (old + 1, old + 1))
+    assert body_cache_key(skill) != k1
+
+
+class _BodyCountingRedis:
+    """最小 redis fake：记录 body GET 次数。"""
+
+    def __init__(self) -> None:
+        self.meta_key = "skills:meta:alice:engineering:python_testing"
+        self.body_key = "skills:body:alice:engineering:python_testing"
+        self.get_calls: List[str] = []
+
+    def scan_iter(self, *, match: str):
+        yield self.meta_key
+
+    def hgetall(self, raw_key: Any) -> Dict[str, Any]:
+        return {
+            "skill_name": "python_testing",
+            "description": "d",
+            "created_at": TS,
+            "body_key": self.body_key,
+            "etag": "etag-1",
+        }
+
+    def get(self, raw_key: Any) -> Any:
+        self.get_calls.append(str(raw_key))
+        return b"# Body\n" * 512
+
+
+def test_render_injected_skill_reuses_cached_redis_body_across_turns(tmp_path: Path) -> None:
+    client = _BodyCountingRedis()
+    mgr = SkillsManager(
+        workspace_root=tmp_path,
+        skills_config={
+            "spaces": [{"id": "space-eng", "namespace": "alice:engineering", "sources": ["src-redis"]}],
+            "sources": [{"id": "src-redis", "type": "redis", "options": {"key_prefix": "skills:"}}],
+        },
+        source_clients={"src-redis": client},
+    )
+
+    rendered = []
+    for _ in range(3):
+        skill, mention = mgr.resolve_mentions("$[alice:engineering].python_testing")[0]
+        rendered.append(mgr.render_injected_skill(skill, source="mention", mention_text=mention.mention_text))
+
+    assert len(set(rendered)) == 1
+    assert client.get_calls == [client.body_key]
+    stats = mgr.body_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 1, 1)
+
+
+def test_body_cache_can_be_disabled(tmp_path: Path) -> None:
+    client = _BodyCountingRedis()
+    mgr = SkillsManager(
+        workspace_root=tmp_path,
+        skills_config={
+            "spaces": [{"id": "space-eng", "namespace": "alice:engineering", "sources": ["src-redis"]}],
+            "sources": [{"id": "src-redis", "type": "redis", "options": {"key_prefix": "skills:"}}],
+            "injection": {"body_cache_max_bytes": 0},
+        },
+        source_clients={"src-redis": client},
+    )
+
+    for _ in range(2):
+        skill, _mention = mgr.resolve_mentions("$[alice:engineering].python_testing")[0]
+        mgr.render_injected_skill(skill, source="mention")
+    assert len(client.get_calls) == 2
+    assert mgr.body_cache_stats()["enabled"] is False
@@ -0,0 +1,77 @@
+"""验证 skills 相关性索引：BM25 排序、增量同步与 SkillsManager.rank_skills 接线。"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from skills_runtime.skills.index import SkillsIndex, tokenize
+from skills_runtime.skills.manager import SkillsManager
+from skills_runtime.skills.models import Skill
+
+
+def _skill(name: str, description: str, *, metadata: Optional[Dict[str, Any]] = None) -> Skill:
+    return Skill(
+        space_id="space-eng",
+        source_id="src-mem",
+        namespace="alice:engineering",
+        skill_name=name,
+        description=description,
+        locator=f"memory://{name}",
+        path=None,
+        body_size=None,
+        body_loader=lambda: "body",
+        required_env_vars=[],
+        metadata=dict(metadata or {}),
+    )
+
+
+def _names(results) -> list[str]:  # type: ignore[no-untyped-def]
+    return [skill.skill_name for skill, _score in results]
+
+
+def test_tokenize_splits_identifiers_and_cjk() -> None:
+    assert tokenize("PDF_extract-Tool 提取") == ["pdf", "extract", "tool", "提", "取"]
+
+
+def test_index_ranks_by_relevance_and_syncs_incrementally() -> None:
+    pdf = _skill("pdf_extract", "Extract text and tables from PDF files")
+    sql = _skill("sql_review", "Review SQL migrations", metadata={"tags": ["database", "postgres"]})
+    mail = _skill("mail_draft", "Draft customer emails")
+    index = SkillsIndex()
+    index.sync([pdf, sql, mail])
+
+    assert _names(index.search("extract the tables in this pdf")) == ["pdf_extract"]
+    assert _names(index.search("check the postgres database migration")) == ["sql_review"]
+    assert index.search("unrelated words") == []
+
+    # 描述变化：只重建该 skill 的倒排项；删除的 skill 不再命中。
+    mail2 = _skill("mail_draft", "Draft customer emails about PDF invoices")
+    index.sync([pdf, mail2])
+    assert len(index) == 2
+    assert _names(index.search("pdf")) == ["pdf_extract", "mail_draft"]
+    assert index.search("postgres") == []
+
+
+def test_skills_manager_rank_skills_skips_disabled(tmp_path: Path) -> None:
+    skills_root = tmp_path / "skills"
+    for name, desc in (("pdf_extract", "extract pdf text"), ("pdf_merge", "merge pdf files"), ("mail_draft", "draft mail")):
+        (skills_root / name).mkdir(parents=True)
+        (skills_root / name / "SKILL.md").write_text(
+            f"---\nname: {name}\ndescription: \"{desc}\"\n---\nbody\n", encoding="utf-8"
+        )
+    sm = SkillsManager(
+        workspace_root=tmp_path,
+        skills_config={
+            "spaces": [{"id": "space-eng", "namespace": "alice:engineering", "sources": ["src-fs"]}],
+            "sources": [{"id": "src-fs", "type": "filesystem", "options": {"root": str(skills_root)}}],
+        },
+    )
+    sm.scan()
+
+    assert [s.skill_name for s in sm.rank_skills("merge two pdf files", limit=5)] == ["pdf_merge", "pdf_extract"]
+    assert [s.skill_name for s in sm.rank_skills("merge two pdf files", limit=1)] == ["pdf_merge"]
+
+    merge = next(s for s in sm.list_skills() if s.skill_name == "pdf_merge")
+    sm.set_enabled(merge.path, False)
+    assert [s.skill_name for s in sm.rank_skills("merge two pdf files", limit=5)] == ["pdf_extract"]
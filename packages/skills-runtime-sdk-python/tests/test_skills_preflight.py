@@ -234,6 +234,27 @@ def test_preflight_redis_invalid_dsn_env_name(tmp_path: Path) -> None:
     _assert_has_issue(issues, code="SKILL_CONFIG_INVALID_ENV_VAR_NAME", path="skills.sources[0].options.dsn_env")
 
 
+def test_preflight_redis_invalid_scan_batch_options(tmp_path: Path) -> None:
+    """redis scan_batch_size/scan_count 非正整数 → SKILL_CONFIG_INVALID_OPTION。"""
+
+    mgr = _mk_manager(
+        tmp_path,
+        skills={
+            "spaces": [{"id": "space-eng", "namespace": "alice:engineering", "sources": ["src-redis"]}],
+            "sources": [
+                {
+                    "id": "src-redis",
+                    "type": "redis",
+                    "options": {"dsn_env": "REDIS_URL", "key_prefix": "skills:", "scan_batch_size": 0, "scan_count": "1000"},
+                }
+            ],
+        },
+    )
+    issues = mgr.preflight()
+    _assert_has_issue(issues, code="SKILL_CONFIG_INVALID_OPTION", path="skills.sources[0].options.scan_batch_size")
+    _assert_has_issue(issues, code="SKILL_CONFIG_INVALID_OPTION", path="skills.sources[0].options.scan_count")
+
+
 def test_preflight_pgsql_missing_schema_and_table(tmp_path: Path) -> None:
     """pgsql 缺 schema/table → SKILL_CONFIG_MISSING_REQUIRED_OPTION。"""
 
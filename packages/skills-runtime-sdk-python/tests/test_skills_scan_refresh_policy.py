@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 import threading
 from dataclasses import dataclass
 from pathlib import Path
@@ -323,3 +324,192 @@ def test_resolve_mentions_manual_does_not_auto_refresh_until_refresh_called(tmp_
 
     mgr.refresh()
     mgr.resolve_mentions("$[alice:engineering].s2")
+
+
+def _age_tree(root: Path, *, seconds_ago: float = 60.0) -> None:
+    """把目录树的 mtime 调到过去（跳出增量扫描的 racy 窗口，使指纹可缓存）。"""
+
+    ts = time.time() - seconds_ago
+    for p in [root, *root.rglob("*")]:
+        os.utime(p, (ts, ts))
+
+
+def test_refresh_policy_incremental_filesystem_only_reloads_changed_skills(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """incremental：未变化的 SKILL.md 不重读 frontmatter；修改/新增/删除均被发现。"""
+
+    import skills_runtime.skills.sources.filesystem as fs_mod
+
+    root = tmp_path / "skills_root"
+    _write_fs_skill(root, name="s1")
+    _write_fs_skill(root, name="s2")
+    _age_tree(root)
+
+    loads: list[str] = []
+    real_load = fs_mod.load_skill_metadata_from_path
+
+    def counting_load(path: Path, **kwargs: Any):
+        loads.append(Path(path).parent.name)
+        return real_load(path, **kwargs)
+
+    monkeypatch.setattr(fs_mod, "load_skill_metadata_from_path", counting_load)
+    mgr = _mk_fs_manager(tmp_path, root, scan={"refresh_policy": "incremental"})
+
+    first = mgr.scan()
+    assert sorted(loads) == ["s1", "s2"]
+    assert first.stats["skills_reloaded"] == 2
+
+    loads.clear()
+    second = mgr.scan()
+    assert loads == []
+    assert second.stats["skills_reused"] == 2
+    assert [s.skill_name for s in second.skills] == ["s1", "s2"]
+
+    # 修改 s1、新增 s3、删除 s2
+    (root / "s1" / "SKILL.md").write_text("---\nname: s1\ndescription: \"changed\"\n---\n# body\n", encoding="utf-8")
+    _write_fs_skill(root, name="s3")
+    (root / "s2" / "SKILL.md").unlink()
+    (root / "s2").rmdir()
+    _age_tree(root, seconds_ago=30.0)
+
+    third = mgr.scan()
+    assert sorted(loads) == ["s1", "s3"]
+    assert {s.skill_name: s.description for s in third.skills} == {"s1": "changed", "s3": "d"}
+    mgr.resolve_mentions("$[alice:engineering].s3")
+    with pytest.raises(FrameworkError) as exc_info:
+        mgr.resolve_mentions("$[alice:engineering].s2")
+    assert exc_info.value.code == "SKILL_UNKNOWN"
+
+    loads.clear()
+    mgr.refresh()
+    assert sorted(loads) == ["s1", "s3"]
+
+
+def test_refresh_policy_incremental_filesystem_does_not_cache_racy_entries(tmp_path: Path) -> None:
+    """incremental：刚修改（mtime 处于 racy 窗口）的条目不缓存，保证同一时间片内的二次修改可见。"""
+
+    root = tmp_path / "skills_root"
+    _write_fs_skill(root, name="s1")
+    mgr = _mk_fs_manager(tmp_path, root, scan={"refresh_policy": "incremental"})
+
+    mgr.scan()
+    (root / "s1" / "SKILL.md").write_text("---\nname: s1\ndescription: \"v2\"\n---\n", encoding="utf-8")
+    report = mgr.scan()
+    assert report.skills[0].description == "v2"
+    assert report.stats["skills_reused"] == 0
+
+
+class FingerprintRedisClient(CountingRedisClient):
+    """支持 HMGET 的 redis fake（增量扫描读取 etag/updated_at 指纹）。"""
+
+    def hmget(self, raw_key: Any, fields: list[str]) -> list[Any]:
+        key = raw_key.decode("utf-8") if isinstance(raw_key, bytes) else str(raw_key)
+        meta = self.meta_by_key.get(key, {})
+        return [meta.get(f) for f in fields]
+
+
+def test_refresh_policy_incremental_redis_skips_hgetall_when_etag_unchanged(tmp_path: Path) -> None:
+    """incremental：etag 未变化的 key 不再 HGETALL；etag 变化后重新读取。"""
+
+    base = _redis_fixture_client()
+    client = FingerprintRedisClient(keys=base.keys, meta_by_key=base.meta_by_key, bodies=base.bodies)
+    meta_key = client.keys[0]
+    client.meta_by_key[meta_key] = {**client.meta_by_key[meta_key], "etag": "v1"}
+    mgr = _mk_manager(tmp_path, client, scan={"refresh_policy": "incremental"})
+
+    mgr.scan()
+    second = mgr.scan()
+    assert client.hgetall_calls == [meta_key]
+    assert len(client.scan_calls) == 2
+    assert second.skills[0].description == "pytest patterns"
+    assert second.stats["skills_reused"] == 1
+
+    client.meta_by_key[meta_key] = {**client.meta_by_key[meta_key], "etag": "v2", "description": "updated"}
+    third = mgr.scan()
+    assert client.hgetall_calls == [meta_key, meta_key]
+    assert third.skills[0].description == "updated"
+    assert client.get_calls == []
+
+
+def test_refresh_policy_incremental_redis_without_fingerprint_falls_back_to_full_read(tmp_path: Path) -> None:
+    """incremental：meta 缺少 etag/updated_at 时每次都完整读取（不得返回过期数据）。"""
+
+    base = _redis_fixture_client()
+    client = FingerprintRedisClient(keys=base.keys, meta_by_key=base.meta_by_key, bodies=base.bodies)
+    mgr = _mk_manager(tmp_path, client, scan={"refresh_policy": "incremental"})
+
+    mgr.scan()
+    mgr.scan()
+    assert len(client.hgetall_calls) == 2
+
+
+class _ProbePgCursor:
+    """按 SQL 分派结果的 pgsql cursor fake（区分指纹探针与元数据查询）。"""
+
+    def __init__(self, owner: "_ProbePgClient") -> None:
+        self._owner = owner
+        self._rows: list[dict[str, Any]] = []
+
+    def __enter__(self) -> "_ProbePgCursor":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+    def execute(self, sql: str, params: Any) -> None:
+        self._owner.executed.append(sql)
+        if "count(*)" in sql:
+            rows = self._owner.rows
+            self._rows = [{"row_count": len(rows), "max_updated_at": max((r["updated_at"] for r in rows), default=None)}]
+        else:
+            self._rows = [dict(r) for r in self._owner.rows]
+
+    def fetchall(self) -> list[dict[str, Any]]:
+        return list(self._rows)
+
+
+class _ProbePgClient:
+    """最小 pgsql client fake。"""
+
+    def __init__(self, rows: list[dict[str, Any]]) -> None:
+        self.rows = rows
+        self.executed: list[str] = []
+
+    def cursor(self) -> _ProbePgCursor:
+        return _ProbePgCursor(self)
+
+
+def test_refresh_policy_incremental_pgsql_reuses_rows_until_fingerprint_changes(tmp_path: Path) -> None:
+    """incremental：count/max(updated_at) 未变化时不执行元数据查询。"""
+
+    row = {
+        "id": 1,
+        "namespace": "alice:engineering",
+        "skill_name": "pg_skill",
+        "description": "d1",
+        "body_size": None,
+        "body_etag": None,
+        "created_at": TS,
+        "updated_at": TS,
+        "required_env_vars": [],
+        "metadata": {},
+        "scope": None,
+    }
+    client = _ProbePgClient([row])
+    cfg: dict[str, Any] = {
+        "spaces": [{"id": "space-eng", "namespace": "alice:engineering", "sources": ["src-pg"]}],
+        "sources": [{"id": "src-pg", "type": "pgsql", "options": {"schema": "public", "table": "skills"}}],
+        "scan": {"refresh_policy": "incremental"},
+    }
+    mgr = SkillsManager(workspace_root=tmp_path, skills_config=cfg, source_clients={"src-pg": client})
+
+    mgr.scan()
+    second = mgr.scan()
+    assert sum(1 for sql in client.executed if "count(*)" not in sql) == 1
+    assert second.skills[0].description == "d1"
+
+    client.rows = [{**row, "description": "d2", "updated_at": "2026-02-08T00:00:00Z"}]
+    third = mgr.scan()
+    assert sum(1 for sql in client.executed if "count(*)" not in sql) == 2
+    assert third.skills[0].description == "d2"
@@ -427,6 +427,131 @@ def test_redis_source_hgetall_failed_issue(tmp_path: Path) -> None:
     assert details.get("locator") == f"redis://{meta_key}"
 
 
+class _FakeRedisPipeline:
+    """最小 redis pipeline fake：排队命令，execute 时一次性返回（错误以异常对象返回）。"""
+
+    def __init__(self, owner: "FakePipelinedRedisClient") -> None:
+        """绑定所属 client。"""
+
+        self._owner = owner
+        self._queued: List[Any] = []
+
+    def hgetall(self, raw_key: Any) -> None:
+        """排队 hgetall。"""
+
+        self._queued.append(raw_key)
+
+    def execute(self, raise_on_error: bool = True) -> List[Any]:
+        """执行已排队命令（计为一次 round-trip）。"""
+
+        self._owner.pipeline_batches.append(len(self._queued))
+        out: List[Any] = []
+        for raw_key in self._queued:
+            key = self._owner._key(raw_key)
+            err = self._owner._hgetall_errors.get(key)
+            if err is not None and raise_on_error:
+                raise err
+            out.append(err if err is not None else self._owner._hashes.get(key, {}))
+        return out
+
+
+class FakePipelinedRedisClient(FakeRedisClient):
+    """支持 pipeline() 与 SCAN COUNT 的 redis fake。"""
+
+    def __init__(self, **kwargs: Any) -> None:
+        """初始化并记录 pipeline 批次大小。"""
+
+        super().__init__(**kwargs)
+        self.pipeline_batches: List[int] = []
+        self.scan_counts: List[Optional[int]] = []
+
+    def scan_iter(self, *, match: str, count: Optional[int] = None):
+        """模拟带 COUNT hint 的 scan_iter。"""
+
+        self.scan_counts.append(count)
+        return super().scan_iter(match=match)
+
+    def pipeline(self, transaction: bool = True) -> _FakeRedisPipeline:
+        """返回非事务 pipeline。"""
+
+        assert transaction is False
+        return _FakeRedisPipeline(self)
+
+
+def _redis_meta_hashes(n: int) -> Dict[str, Any]:
+    """构造 n 个最小 redis meta hash。"""
+
+    return {
+        f"skills:meta:alice:engineering:skill_{i:03d}": {
+            b"skill_name": f"skill_{i:03d}".encode("utf-8"),
+            b"description": b"d",
+            b"created_at": TS.encode("utf-8"),
+        }
+        for i in range(n)
+    }
+
+
+def test_redis_source_scan_batches_hgetall_through_pipeline(tmp_path: Path) -> None:
+    """Redis: meta 按 scan_batch_size 经 pipeline 批量读取，round-trip 数 = ceil(N / batch)。"""
+
+    hashes = _redis_meta_hashes(250)
+    redis_client = FakePipelinedRedisClient(scan_keys=list(hashes), hashes=hashes)
+    mgr = _mk_manager(
+        tmp_path,
+        skills=_redis_skills_config({"key_prefix": "skills:", "scan_batch_size": 100, "scan_count": 500}),
+        source_clients={"src-redis": redis_client},
+    )
+
+    report = mgr.scan()
+    assert report.errors == []
+    assert [s.skill_name for s in report.skills] == [f"skill_{i:03d}" for i in range(250)]
+    assert redis_client.pipeline_batches == [100, 100, 50]
+    assert redis_client.hgetall_calls == []
+    assert redis_client.scan_counts == [500]
+
+
+def test_redis_source_pipeline_per_key_error_does_not_drop_batch(tmp_path: Path) -> None:
+    """Redis: pipeline 内单个 key 失败只产生该 key 的 issue，其余 key 正常产出。"""
+
+    hashes = _redis_meta_hashes(3)
+    bad_key = "skills:meta:alice:engineering:skill_001"
+    redis_client = FakePipelinedRedisClient(
+        scan_keys=list(hashes),
+        hashes=hashes,
+        hgetall_errors={bad_key: RuntimeError("hgetall boom")},
+    )
+    mgr = _mk_manager(
+        tmp_path,
+        skills=_redis_skills_config({"key_prefix": "skills:"}),
+        source_clients={"src-redis": redis_client},
+    )
+
+    report = mgr.scan()
+    assert [s.skill_name for s in report.skills] == ["skill_000", "skill_002"]
+    details = _assert_has_error(report, "SKILL_SCAN_SOURCE_UNAVAILABLE")
+    assert details.get("locator") == f"redis://{bad_key}"
+    assert "hgetall boom" in str(details.get("reason"))
+    assert redis_client.pipeline_batches == [3]
+
+
+def test_redis_source_scan_batch_size_one_keeps_per_key_hgetall(tmp_path: Path) -> None:
+    """Redis: scan_batch_size=1 时退化为逐 key hgetall（不使用 pipeline）。"""
+
+    hashes = _redis_meta_hashes(2)
+    redis_client = FakePipelinedRedisClient(scan_keys=list(hashes), hashes=hashes)
+    mgr = _mk_manager(
+        tmp_path,
+        skills=_redis_skills_config({"key_prefix": "skills:", "scan_batch_size": 1}),
+        source_clients={"src-redis": redis_client},
+    )
+
+    report = mgr.scan()
+    assert len(report.skills) == 2
+    assert redis_client.pipeline_batches == []
+    assert len(redis_client.hgetall_calls) == 2
+    assert redis_client.scan_counts == [None]
+
+
 def test_redis_source_hgetall_non_mapping_issue(tmp_path: Path) -> None:
     """Redis: hgetall 返回非 mapping 时返回 metadata invalid。"""
 
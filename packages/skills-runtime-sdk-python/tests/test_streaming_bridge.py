@@ -54,6 +54,27 @@ class _SlowBackend:
         yield ChatStreamEvent(type="completed", finish_reason="stop")
 
 
+class _TokenBackend:
+    """逐 token 产出 text_delta，中途可停顿，末尾附带 tool_calls。"""
+
+    def __init__(self, tokens: list[str], *, pause_after: int | None = None, pause_sec: float = 0.0) -> None:
+        self._tokens = tokens
+        self._pause_after = pause_after
+        self._pause_sec = pause_sec
+
+    async def stream_chat(self, request: ChatRequest) -> AsyncIterator[ChatStreamEvent]:
+        _ = request
+        for i, token in enumerate(self._tokens):
+            if self._pause_after is not None and i == self._pause_after:
+                await asyncio.sleep(self._pause_sec)
+            yield ChatStreamEvent(type="text_delta", text=token)
+        yield ChatStreamEvent(
+            type="tool_calls",
+            tool_calls=[ToolCall(call_id="call_1", name="echo", args={}, raw_arguments="{}")],
+        )
+        yield ChatStreamEvent(type="completed", finish_reason="tool_calls")
+
+
 def _make_context(tmp_path: Path) -> tuple[RunContext, InMemoryWal, list[AgentEvent]]:
     wal = InMemoryWal(locator_str="wal://stream-bridge")
     stream_events: list[AgentEvent] = []
@@ -76,8 +97,12 @@ def _make_bridge(
     cancel_checker=None,
     max_wall_time_sec: float | None = None,
     env_store: dict[str, str] | None = None,
+    coalesce_ms: int = 0,
+    coalesce_max_chars: int = 256,
 ) -> tuple[StreamingBridge, InMemoryWal, list[AgentEvent]]:
     ctx, wal, stream_events = _make_context(tmp_path)
+    ctx.text_delta_coalesce_ms = coalesce_ms
+    ctx.text_delta_coalesce_max_chars = coalesce_max_chars
     loop = LoopController(
         max_steps=10,
         max_wall_time_sec=max_wall_time_sec,
@@ -180,3 +205,61 @@ async def test_streaming_bridge_returns_cancelled_without_emitting_terminal_even
     assert outcome.pending_tool_calls == []
     assert not any(ev.type in ("run_cancelled", "run_failed") for ev in stream_events)
     assert not any(ev.type in ("run_cancelled", "run_failed") for ev in wal.iter_events())
+
+
+def _text_deltas(events: list[AgentEvent]) -> list[str]:
+    return [
+        ev.payload["text"]
+        for ev in events
+        if ev.type == "llm_response_delta" and ev.payload.get("delta_type") == "text"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_streaming_bridge_without_coalescing_emits_one_event_per_token(tmp_path: Path) -> None:
+    tokens = [f"t{i} " for i in range(20)]
+    bridge, wal, stream_events = _make_bridge(tmp_path=tmp_path, coalesce_ms=0)
+
+    outcome = await bridge.run(
+        backend=_TokenBackend(tokens),
+        request=ChatRequest(model="fake-model", messages=[{"role": "user", "content": "hi"}], run_id="r1", turn_id="turn_1"),
+    )
+
+    assert outcome.assistant_text == "".join(tokens)
+    assert _text_deltas(stream_events) == tokens
+    assert _text_deltas(list(wal.iter_events())) == tokens
+
+
+@pytest.mark.asyncio
+async def test_streaming_bridge_coalesces_text_deltas_and_keeps_order(tmp_path: Path) -> None:
+    tokens = [f"t{i} " for i in range(20)]
+    bridge, wal, stream_events = _make_bridge(tmp_path=tmp_path, coalesce_ms=10_000, coalesce_max_chars=16)
+
+    outcome = await bridge.run(
+        backend=_TokenBackend(tokens),
+        request=ChatRequest(model="fake-model", messages=[{"role": "user", "content": "hi"}], run_id="r1", turn_id="turn_1"),
+    )
+
+    deltas = _text_deltas(stream_events)
+    assert outcome.assistant_text == "".join(tokens)
+    assert "".join(deltas) == "".join(tokens)
+    assert 1 < len(deltas) < len(tokens)
+    assert all(len(d) >= 16 for d in deltas[:-1])
+    # 合并缓冲必须在 tool_calls delta 之前发出
+    types = [ev.payload.get("delta_type") for ev in stream_events if ev.type == "llm_response_delta"]
+    assert types[-1] == "tool_calls"
+    assert _text_deltas(list(wal.iter_events())) == deltas
+
+
+@pytest.mark.asyncio
+async def test_streaming_bridge_coalescing_flushes_on_time_window_when_stream_stalls(tmp_path: Path) -> None:
+    bridge, _wal, stream_events = _make_bridge(tmp_path=tmp_path, coalesce_ms=20, coalesce_max_chars=10_000)
+
+    outcome = await bridge.run(
+        backend=_TokenBackend(["a", "b", "c", "d"], pause_after=2, pause_sec=0.3),
+        request=ChatRequest(model="fake-model", messages=[{"role": "user", "content": "hi"}], run_id="r1", turn_id="turn_1"),
+    )
+
+    assert outcome.assistant_text == "abcd"
+    # 停顿期间窗口到期：前两段先发出，而不是等到下一个 token 才发
+    assert _text_deltas(stream_events) == ["ab", "cd"]
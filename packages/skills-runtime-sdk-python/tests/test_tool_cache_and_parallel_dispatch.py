@@ -158,8 +158,9 @@ def test_two_tool_calls_both_in_history(tmp_path: Path) -> None:
     assert "a" in tool_results["order"]
     assert "b" in tool_results["order"]
 
-    # 验证执行顺序（Phase 2 asyncio.gather，同步 handler 顺序执行，a 先于 b）
-    assert tool_results["order"].index("a") < tool_results["order"].index("b")
+    # 执行可并发（顺序不定），但事件与 history 仍按请求顺序（call_a 在 call_b 之前）
+    finished = [(e.payload or {}).get("call_id") for e in events if e.type == "tool_call_finished"]
+    assert finished == ["call_a", "call_b"]
 
 
 def test_failed_tool_does_not_interrupt_concurrent_sibling(tmp_path: Path) -> None:
@@ -284,3 +285,171 @@ def test_parallel_dispatch_streams_tool_side_events_from_each_call(tmp_path: Pat
         ((e.payload or {}).get("call_id"), (e.payload or {}).get("tool"))
         for e in finished_events
     } >= {("call_a", "tool_a"), ("call_b", "tool_b")}
+
+
+# ─── 并发派发：线程池 + idempotency 分级 + 确定性 WAL 顺序 ─────────────────────
+
+
+class _ToolCallsBackend:
+    """第一次采样返回给定的 tool calls，第二次返回最终文本。"""
+
+    def __init__(self, calls: List[ToolCall]) -> None:
+        self._calls = calls
+        self._call_count = 0
+
+    async def stream_chat(self, request: ChatRequest) -> AsyncIterator[ChatStreamEvent]:
+        self._call_count += 1
+        if self._call_count == 1:
+            yield ChatStreamEvent(type="tool_calls", tool_calls=list(self._calls))
+            yield ChatStreamEvent(type="completed", finish_reason="tool_calls")
+        else:
+            yield ChatStreamEvent(type="text_delta", text="done")
+            yield ChatStreamEvent(type="completed", finish_reason="stop")
+
+
+def _ok(text: str) -> ToolResult:
+    return ToolResult.from_payload(
+        ToolResultPayload(ok=True, stdout=text, stderr="", exit_code=0, duration_ms=0, truncated=False,
+                          data={}, error_kind=None, retryable=False, retry_after_ms=None),
+    )
+
+
+def _spec(name: str, idempotency: Any = None) -> ToolSpec:
+    return ToolSpec(
+        name=name,
+        description=name,
+        parameters={"type": "object", "properties": {"x": {"type": "string"}}, "required": ["x"]},
+        idempotency=idempotency,
+    )
+
+
+def _calls(*names: str) -> List[ToolCall]:
+    return [
+        ToolCall(call_id=f"c{i}", name=n, args={"x": str(i)}, raw_arguments=f'{{"x":"{i}"}}')
+        for i, n in enumerate(names)
+    ]
+
+
+def _agent(tmp_path: Path, calls: List[ToolCall], *, run: Dict[str, Any] | None = None) -> Agent:
+    import yaml as _yaml
+
+    overlay = {"config_version": 1, "safety": {"mode": "allow"}}
+    if run:
+        overlay["run"] = run
+    overlay_file = tmp_path / "overlay.yaml"
+    overlay_file.write_text(_yaml.safe_dump(overlay), encoding="utf-8")
+    return Agent(backend=_ToolCallsBackend(calls), workspace_root=tmp_path, config_paths=[overlay_file])
+
+
+def test_parallel_dispatch_wall_time_is_slowest_call_not_sum(tmp_path: Path) -> None:
+    import time
+
+    agent = _agent(tmp_path, _calls("slow", "slow", "slow", "slow"))
+
+    def _slow(call: ToolCall, ctx: ToolExecutionContext) -> ToolResult:
+        time.sleep(0.4)
+        return _ok(call.args["x"])
+
+    agent.register_tool(_spec("slow", "safe"), _slow)
+
+    started = time.monotonic()
+    events = list(agent.run_stream("go"))
+    elapsed = time.monotonic() - started
+
+    assert any(e.type == "run_completed" for e in events)
+    assert elapsed < 1.2, f"4 x 0.4s 应并发执行，实际 {elapsed:.2f}s"
+
+
+def test_parallel_dispatch_keeps_wal_order_deterministic(tmp_path: Path) -> None:
+    import time
+
+    agent = _agent(tmp_path, _calls("t", "t", "t"))
+
+    def _handler(call: ToolCall, ctx: ToolExecutionContext) -> ToolResult:
+        # 越靠前的调用越晚完成：验证事件不按完成顺序交错。
+        time.sleep(0.1 * (3 - int(call.args["x"])))
+        ctx.emit_event(
+            AgentEvent(type="tool_progress", timestamp="2026-03-25T00:00:00Z", run_id=ctx.run_id,
+                       payload={"call_id": call.call_id})
+        )
+        return _ok(call.args["x"])
+
+    agent.register_tool(_spec("t", "safe"), _handler)
+    events = list(agent.run_stream("go"))
+
+    seq = [
+        (e.type, (e.payload or {}).get("call_id"))
+        for e in events
+        if e.type in ("tool_call_started", "tool_progress", "tool_call_finished")
+    ]
+    assert seq == [
+        ("tool_call_started", "c0"),
+        ("tool_call_started", "c1"),
+        ("tool_call_started", "c2"),
+        ("tool_progress", "c0"),
+        ("tool_call_finished", "c0"),
+        ("tool_progress", "c1"),
+        ("tool_call_finished", "c1"),
+        ("tool_progress", "c2"),
+        ("tool_call_finished", "c2"),
+    ]
+
+    wal_path = Path(next(e for e in events if e.type == "run_completed").payload["wal_locator"])
+    wal_seq = [
+        (ev["type"], (ev.get("payload") or {}).get("call_id"))
+        for ev in map(__import__("json").loads, wal_path.read_text(encoding="utf-8").splitlines())
+        if ev["type"] in ("tool_call_started", "tool_progress", "tool_call_finished")
+    ]
+    assert wal_seq == seq
+
+
+def test_non_safe_tools_run_in_order_unless_same_unknown_tool_opted_in(tmp_path: Path) -> None:
+    import threading
+    import time
+
+    agent = _agent(
+        tmp_path,
+        _calls("plain", "unknown_tool", "unknown_tool", "unsafe_tool", "unknown_tool", "unknown_tool"),
+        run={"tool_dispatch": {"unknown_per_tool": 2}},
+    )
+    lock = threading.Lock()
+    running: List[str] = []
+    overlaps: List[List[str]] = []
+
+    def _track(call: ToolCall, ctx: ToolExecutionContext) -> ToolResult:
+        with lock:
+            running.append(call.call_id)
+            if len(running) > 1:
+                overlaps.append(sorted(running))
+        time.sleep(0.15)
+        with lock:
+            running.remove(call.call_id)
+        return _ok(call.name)
+
+    agent.register_tool(_spec("plain"), _track)
+    agent.register_tool(_spec("unknown_tool", "unknown"), _track)
+    agent.register_tool(_spec("unsafe_tool", "unsafe"), _track)
+    events = list(agent.run_stream("go"))
+
+    assert any(e.type == "run_completed" for e in events)
+    # 只有相邻的同名 unknown 调用互相重叠；plain（未声明）与 unsafe 都单独执行
+    assert {tuple(o) for o in overlaps} == {("c1", "c2"), ("c4", "c5")}
+
+
+def test_async_handler_is_awaited_and_max_parallel_one_is_serial(tmp_path: Path) -> None:
+    import time
+
+    agent = _agent(tmp_path, _calls("aio", "aio"), run={"tool_dispatch": {"max_parallel": 1}})
+
+    async def _aio(call: ToolCall, ctx: ToolExecutionContext) -> ToolResult:
+        await asyncio.sleep(0.2)
+        return _ok(f"aio:{call.args['x']}")
+
+    agent.register_tool(_spec("aio", "safe"), _aio)
+    started = time.monotonic()
+    events = list(agent.run_stream("go"))
+    elapsed = time.monotonic() - started
+
+    finished = [e for e in events if e.type == "tool_call_finished"]
+    assert [(e.payload or {}).get("result", {}).get("stdout") for e in finished] == ["aio:0", "aio:1"]
+    assert elapsed >= 0.4
@@ -267,3 +267,71 @@ def test_apply_patch_rejects_unknown_file_section(tmp_path: Path) -> None:
     result = apply_patch(_call_apply_patch(patch), ctx)
     assert result.ok is False
     assert result.error_kind == "validation"
+
+
+def test_line_index_find_matches_first_occurrence_after_start() -> None:
+    """行索引定位必须与朴素的“首次出现”一致（含重复行与 start 约束）。"""
+
+    from skills_runtime.tools.builtin.apply_patch import _LineIndex
+
+    lines = ["x", "a", "b", "x", "a", "b", "c", "a", "b", "c"]
+    index = _LineIndex(lines)
+    assert index.find(["a", "b"]) == 1
+    assert index.find(["a", "b"], start=2) == 4
+    assert index.find(["a", "b", "c"]) == 4
+    assert index.find(["a", "b", "c"], start=5) == 7
+    assert index.find(["b", "c"], start=9) is None
+    assert index.find(["missing"]) is None
+    assert index.find([]) is None
+
+
+def test_apply_patch_many_hunks_single_pass_keeps_mode(tmp_path: Path) -> None:
+    """多个 hunk 单遍套用到大文件；原子替换后保留权限位。"""
+
+    from skills_runtime.tools.builtin.apply_patch import apply_patch
+
+    target = tmp_path / "gen.py"
+    target.write_text("".join(f"value_{i} = {i}\n" for i in range(5000)), encoding="utf-8")
+    target.chmod(0o640)
+    body = ["*** Begin Patch", "*** Update File: gen.py"]
+    for i in range(0, 5000, 100):
+        body += ["@@", f"-value_{i} = {i}", f"+value_{i} = -{i}"]
+    body += ["*** End Patch", ""]
+
+    ok = apply_patch(_call_apply_patch("\n".join(body)), _mk_ctx(workspace_root=tmp_path))
+    assert ok.ok is True
+    lines = target.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 5000
+    assert lines[100] == "value_100 = -100"
+    assert lines[101] == "value_101 = 101"
+    assert target.stat().st_mode & 0o777 == 0o640
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["gen.py"]
+
+
+def test_apply_patch_same_file_updated_by_two_sections(tmp_path: Path) -> None:
+    """同一文件被多个 section 依次修改（含 Move to）：后一个 section 看到前一个的结果。"""
+
+    from skills_runtime.tools.builtin.apply_patch import apply_patch
+
+    (tmp_path / "a.txt").write_text("a\nb\nc\n", encoding="utf-8")
+    patch = "\n".join(
+        [
+            "*** Begin Patch",
+            "*** Update File: a.txt",
+            "*** Move to: b.txt",
+            "@@",
+            "-b",
+            "+B",
+            "*** Update File: b.txt",
+            "@@",
+            " B",
+            "-c",
+            "+C",
+            "*** End Patch",
+            "",
+        ]
+    )
+    ok = apply_patch(_call_apply_patch(patch), _mk_ctx(workspace_root=tmp_path))
+    assert ok.ok is True
+    assert not (tmp_path / "a.txt").exists()
+    assert (tmp_path / "b.txt").read_text(encoding="utf-8") == "a\nB\nC\n"
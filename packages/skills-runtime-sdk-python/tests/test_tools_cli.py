@@ -64,6 +64,27 @@ def test_cli_tools_grep_files_invalid_regex_validation(tmp_path: Path, capsys) -
     assert payload["result"]["error_kind"] == "validation"
 
 
+def test_cli_tools_search_builds_index_and_narrows_candidates(tmp_path: Path, capsys) -> None:  # type: ignore[no-untyped-def]
+    for i in range(30):
+        (tmp_path / f"m{i}.py").write_text(f"def handler_{i}():\n    return {i}\n", encoding="utf-8")
+
+    code = main(["tools", "search", "--workspace-root", str(tmp_path), "--pattern", r"handler_17\(", "--lines"])
+    payload = _parse_last_json(capsys.readouterr().out)
+    assert code == 0
+    assert payload.get("tool") == "grep_files"
+    assert payload["stats"]["index"]["reindexed"] == 30
+    data = payload["result"]["data"]
+    assert data["index_used"] is True
+    assert data["files_scanned"] == 1
+    assert data["matches"] == [{"path": str((tmp_path / "m17.py").resolve()), "line": 1, "text": "def handler_17():"}]
+
+    code = main(["tools", "search", "--workspace-root", str(tmp_path), "--pattern", "handler_2"])
+    payload = _parse_last_json(capsys.readouterr().out)
+    assert code == 0
+    assert payload["stats"]["index"]["reindexed"] == 0
+    assert len(payload["result"]["data"]["files"]) == 11
+
+
 def test_cli_tools_apply_patch_requires_yes(tmp_path: Path, capsys) -> None:  # type: ignore[no-untyped-def]
     patch = "\n".join(["*** Begin Patch", "*** Add File: a.txt", "+x", "*** End Patch", ""])
     code = main(["tools", "apply-patch", "--workspace-root", str(tmp_path), "--input", patch])
@@ -261,6 +261,46 @@ def test_wait_status_is_string(tmp_path: Path) -> None:
     assert isinstance(it["status"], str)
 
 
+def test_wait_any_returns_on_first_completion(tmp_path: Path) -> None:
+    ctx = _mk_ctx(tmp_path)
+    fast = _payload(spawn_agent(ToolCall(call_id="c1", name="spawn_agent", args={"message": "sleep:20"}), ctx))["data"]["id"]
+    slow = _payload(spawn_agent(ToolCall(call_id="c2", name="spawn_agent", args={"message": "wait_input:1"}), ctx))["data"]["id"]
+    started = time.monotonic()
+    p = _payload(wait_tool(ToolCall(call_id="c3", name="wait", args={"ids": [fast, slow], "mode": "any"}), ctx))
+    assert time.monotonic() - started < 2.0
+    by_id = {it["id"]: it["status"] for it in p["data"]["results"]}
+    assert by_id == {fast: "completed", slow: "running"}
+    ctx.collab_manager.close(agent_id=slow)  # type: ignore[union-attr]
+
+
+def test_wait_mode_must_be_all_or_any(tmp_path: Path) -> None:
+    ctx = _mk_ctx(tmp_path)
+    p = _payload(wait_tool(ToolCall(call_id="c1", name="wait", args={"ids": ["x"], "mode": "first"}), ctx))
+    assert p["ok"] is False
+    assert p["error_kind"] == "validation"
+
+
+def test_wait_wakes_on_completion_not_poll_interval(tmp_path: Path) -> None:
+    mgr = CollabManager(runner=_runner)
+    handles = [mgr.spawn(message="wait_input:1") for _ in range(20)]
+    ids = [h.id for h in handles]
+
+    for h in handles:
+        mgr.send_input(agent_id=h.id, message="go")
+    started = time.monotonic()
+    out = mgr.wait(ids=ids, timeout_ms=5_000)
+    assert time.monotonic() - started < 1.0
+    assert {s.status for s in out} == {"completed"}
+
+    pending = mgr.spawn(message="wait_input:1")
+    started = time.monotonic()
+    out = mgr.wait(ids=[pending.id], timeout_ms=80)
+    elapsed = time.monotonic() - started
+    assert out[0].status == "running"
+    assert 0.07 <= elapsed < 0.5
+    mgr.close(agent_id=pending.id)
+
+
 # --- send_input (10+) ---
 
 
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import asyncio
 from typing import List
 
+import pytest
+
 from skills_runtime.core.contracts import AgentEvent
 from skills_runtime.tools.dispatcher import ToolDispatchInputs, ToolDispatcher
 from skills_runtime.tools.protocol import ToolCall, ToolResult
@@ -59,3 +62,46 @@ def test_tool_dispatcher_valid_raw_arguments_emits_started_and_dispatches() -> N
     assert result.ok is True
     assert len(registry.dispatch_calls) == 1
     assert [e.type for e in events] == ["tool_call_started", "tool_call_finished"]
+
+
+class _AsyncWaveRegistry:
+    def __init__(self) -> None:
+        self.cancelled: List[str] = []
+
+    def get_spec(self, name: str):  # type: ignore[no-untyped-def]
+        return None
+
+    def is_async_handler(self, name: str) -> bool:
+        return True
+
+    async def dispatch_async(self, call: ToolCall, **_kwargs) -> ToolResult:  # type: ignore[no-untyped-def]
+        if call.name == "boom":
+            raise RuntimeError("boom")
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            self.cancelled.append(call.call_id)
+            raise
+        return ToolResult.ok_payload(stdout="late")
+
+
+def test_tool_dispatcher_wave_failure_cancels_and_awaits_sibling_calls() -> None:
+    registry = _AsyncWaveRegistry()
+    dispatcher = ToolDispatcher(registry=registry, now_rfc3339=lambda: "2026-01-01T00:00:00Z", max_parallel=4)  # type: ignore[arg-type]
+    batch = [
+        ToolDispatchInputs(call=ToolCall(call_id=f"c{i}", name=name, args={}), run_id="r", turn_id="t", step_id="s")
+        for i, name in enumerate(["boom", "slow", "slow"])
+    ]
+
+    events: List[AgentEvent] = []
+
+    async def _main() -> None:
+        with pytest.raises(RuntimeError, match="boom"):
+            await dispatcher.dispatch_batch(batch=batch, emit_event=events.append, emit_stream=lambda _e: None)
+        assert sorted(registry.cancelled) == ["c1", "c2"]
+        assert [t for t in asyncio.all_tasks() if t is not asyncio.current_task()] == []
+
+    asyncio.run(_main())
+    finished = {e.payload["call_id"]: e.payload["result"]["error_kind"] for e in events if e.type == "tool_call_finished"}
+    assert [e.type for e in events].count("tool_call_started") == 3
+    assert finished == {"c0": "unknown", "c1": "cancelled", "c2": "cancelled"}
@@ -165,3 +165,94 @@ def test_grep_files_handles_binary_like_bytes(tmp_path: Path) -> None:
     files = _assert_files(ok)
     assert str((tmp_path / "bin.dat").resolve()) not in files
 
+
+
+def test_grep_files_results_are_ordered_across_parallel_workers(tmp_path: Path) -> None:
+    """并行扫描后结果仍按（排序后的）遍历顺序返回，且跨分块/mmap 的匹配都能命中。"""
+
+    from skills_runtime.tools.builtin.grep_files import grep_files
+
+    for i in range(40):
+        sub = tmp_path / f"d{i % 4}"
+        sub.mkdir(exist_ok=True)
+        body = ("filler line\n" * (20_000 if i % 10 == 0 else 3)) + ("needle_42\n" if i % 3 == 0 else "")
+        (sub / f"f{i:02d}.txt").write_text(body, encoding="utf-8")
+
+    ctx = _mk_ctx(workspace_root=tmp_path)
+    expected = sorted(
+        str((tmp_path / f"d{i % 4}" / f"f{i:02d}.txt").resolve()) for i in range(40) if i % 3 == 0
+    )
+    assert _assert_files(grep_files(_call_grep(pattern="needle_42"), ctx)) == expected
+    assert _assert_files(grep_files(_call_grep(pattern=r"needle_\d+"), ctx)) == expected
+
+
+def test_grep_files_skips_files_over_max_file_bytes(tmp_path: Path) -> None:
+    """超过 max_file_bytes 的文件跳过，并计入 data.skipped_large。"""
+
+    from skills_runtime.tools.builtin.grep_files import grep_files
+
+    (tmp_path / "small.txt").write_text("hello\n", encoding="utf-8")
+    (tmp_path / "big.txt").write_text("hello\n" + "x" * 4096, encoding="utf-8")
+
+    ctx = _mk_ctx(workspace_root=tmp_path)
+    call = ToolCall(call_id="c1", name="grep_files", args={"pattern": "hello", "max_file_bytes": 1024})
+    result = grep_files(call, ctx)
+    assert _assert_files(result) == [str((tmp_path / "small.txt").resolve())]
+    assert (result.details or {})["data"]["skipped_large"] == 1
+
+
+def test_grep_files_lines_mode_returns_path_line_text_with_context(tmp_path: Path) -> None:
+    """mode=lines 返回 path:line:text，并按 context_lines 附带上下文。"""
+
+    from skills_runtime.tools.builtin.grep_files import grep_files
+
+    (tmp_path / "a.py").write_text("import os\n\ndef foo():\n    return 1\n\ndef bar():\n    pass\n", encoding="utf-8")
+    path = str((tmp_path / "a.py").resolve())
+
+    ctx = _mk_ctx(workspace_root=tmp_path)
+    call = ToolCall(call_id="c1", name="grep_files", args={"pattern": "^def ", "mode": "lines", "context_lines": 1})
+    result = grep_files(call, ctx)
+    data = (result.details or {})["data"]
+    assert data["matches"] == [
+        {"path": path, "line": 3, "text": "def foo():"},
+        {"path": path, "line": 6, "text": "def bar():"},
+    ]
+    assert result.details["stdout"].splitlines() == [  # type: ignore[index]
+        f"{path}-2-",
+        f"{path}:3:def foo():",
+        f"{path}-4-    return 1",
+        "--",
+        f"{path}-5-",
+        f"{path}:6:def bar():",
+        f"{path}-7-    pass",
+    ]
+
+    limited = grep_files(ToolCall(call_id="c2", name="grep_files", args={"pattern": "def", "mode": "lines", "limit": 1}), ctx)
+    assert [m["line"] for m in (limited.details or {})["data"]["matches"]] == [3]
+    assert limited.details["truncated"] is True  # type: ignore[index]
+
+
+@pytest.mark.parametrize("pattern", [r"caf\xe9", r"café", r"caf\351", r"caf\N{LATIN SMALL LETTER E WITH ACUTE}", r"[\xe0-\xff]"])
+def test_grep_files_codepoint_escapes_match_decoded_text(tmp_path: Path, pattern: str) -> None:
+    """`\\xHH`/`\\u`/`\\N`/八进制转义按码点匹配解码后的文本，而不是单个原始字节。"""
+
+    from skills_runtime.tools.builtin.grep_files import grep_files
+
+    (tmp_path / "a.txt").write_text("café\n", encoding="utf-8")
+    ctx = _mk_ctx(workspace_root=tmp_path)
+    assert _assert_files(grep_files(_call_grep(pattern=pattern), ctx)) == [str((tmp_path / "a.txt").resolve())]
+
+
+@pytest.mark.parametrize("pattern,expected", [(r"x.$", False), (r"^text", False), (r"\Ahead", True), (r"end\Z", True)])
+def test_grep_files_string_anchors_apply_to_whole_large_file(tmp_path: Path, pattern: str, expected: bool) -> None:
+    """大于分块大小的文件：`^`/`$`/`\\A`/`\\Z` 只在整个文件首尾生效，不会在分块边界误命中。"""
+
+    from skills_runtime.tools import grep_engine
+    from skills_runtime.tools.builtin.grep_files import grep_files
+
+    line = "text xy\n"
+    body = "head\n" + line * (grep_engine._CHUNK_BYTES // len(line) * 2) + "end"
+    (tmp_path / "big.txt").write_text(body, encoding="utf-8")
+    ctx = _mk_ctx(workspace_root=tmp_path)
+    files = _assert_files(grep_files(_call_grep(pattern=pattern), ctx))
+    assert files == ([str((tmp_path / "big.txt").resolve())] if expected else [])
@@ -217,3 +217,88 @@ def test_list_dir_limit_truncates_and_sets_truncated(tmp_path: Path) -> None:
     assert isinstance(files, list)
     assert len(files) == 3
 
+
+
+def test_list_dir_cursor_pages_through_tree_in_order(tmp_path: Path) -> None:
+    """next_cursor 翻页必须无重复、无遗漏，且与一次性列出的顺序一致。"""
+
+    from skills_runtime.tools.builtin.list_dir import list_dir
+
+    d = tmp_path / "d"
+    (d / "a").mkdir(parents=True)
+    (d / "a-b").mkdir()
+    for i in range(5):
+        (d / "a" / f"x{i}.txt").write_text("x", encoding="utf-8")
+        (d / f"f{i}.txt").write_text("x", encoding="utf-8")
+    (d / "a-b" / "y.txt").write_text("y", encoding="utf-8")
+
+    ctx = _mk_ctx(workspace_root=tmp_path)
+    full = _assert_has_entries(list_dir(_call_list_dir(dir_path=str(d.resolve()), limit=100), ctx))
+    expected = [e["rel_path"] for e in full]
+    assert expected == sorted(expected)
+    assert expected[:3] == ["a", "a-b", "a-b/y.txt"]
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        args: dict = {"dir_path": str(d.resolve()), "limit": 4}
+        if cursor is not None:
+            args["cursor"] = cursor
+        result = list_dir(ToolCall(call_id="c1", name="list_dir", args=args), ctx)
+        seen.extend(e["rel_path"] for e in _assert_has_entries(result))
+        data = (result.details or {})["data"]
+        cursor = data["next_cursor"]
+        if cursor is None:
+            assert result.details.get("truncated") is False  # type: ignore[union-attr]
+            assert data["total"] is not None
+            break
+        assert data["total"] is None
+    assert seen == expected
+
+
+def test_list_dir_cursor_page_ending_on_directory_keeps_its_subtree(tmp_path: Path) -> None:
+    """页尾恰好是非空目录时，下一页必须继续列出该目录的子树。"""
+
+    from skills_runtime.tools.builtin.list_dir import list_dir
+
+    d = tmp_path / "d"
+    (d / "a").mkdir(parents=True)
+    (d / "a" / "x.txt").write_text("x", encoding="utf-8")
+    (d / "b.txt").write_text("b", encoding="utf-8")
+
+    ctx = _mk_ctx(workspace_root=tmp_path)
+    seen: list[str] = []
+    cursor = None
+    while True:
+        args: dict = {"dir_path": str(d.resolve()), "limit": 1}
+        if cursor is not None:
+            args["cursor"] = cursor
+        result = list_dir(ToolCall(call_id="c1", name="list_dir", args=args), ctx)
+        seen.extend(e["rel_path"] for e in _assert_has_entries(result))
+        cursor = ((result.details or {})["data"])["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == ["a", "a/x.txt", "b.txt"]
+
+
+def test_list_dir_cursor_mismatch_is_validation(tmp_path: Path) -> None:
+    """cursor 与 dir_path/depth 不匹配或格式错误时必须失败（validation）。"""
+
+    from skills_runtime.tools.builtin.list_dir import list_dir
+
+    d = tmp_path / "d"
+    d.mkdir()
+    for i in range(3):
+        (d / f"f{i}.txt").write_text("x", encoding="utf-8")
+    ctx = _mk_ctx(workspace_root=tmp_path)
+    first = list_dir(_call_list_dir(dir_path=str(d.resolve()), limit=1), ctx)
+    cursor = ((first.details or {})["data"])["next_cursor"]
+    assert isinstance(cursor, str)
+
+    for args in (
+        {"dir_path": str(d.resolve()), "depth": 1, "cursor": cursor},
+        {"dir_path": str(d.resolve()), "cursor": "not-a-cursor"},
+    ):
+        result = list_dir(ToolCall(call_id="c1", name="list_dir", args=args), ctx)
+        assert result.ok is False
+        assert result.error_kind == "validation"
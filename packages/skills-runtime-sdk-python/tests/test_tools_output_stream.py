@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import json
+import sys
+import time
+from pathlib import Path
+from typing import AsyncIterator, List
+
+import yaml
+
+from skills_runtime.core.agent import Agent
+from skills_runtime.core.contracts import AgentEvent
+from skills_runtime.core.executor import Executor
+from skills_runtime.llm.chat_sse import ChatStreamEvent
+from skills_runtime.llm.protocol import ChatRequest
+from skills_runtime.tools.builtin.shell_exec import shell_exec
+from skills_runtime.tools.output_stream import ToolOutputStreamer
+from skills_runtime.tools.protocol import ToolCall, ToolResult, ToolResultPayload, ToolSpec
+from skills_runtime.tools.registry import ToolExecutionContext
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _mk_ctx(tmp_path: Path, events: List[AgentEvent], *, secrets: list[str] | None = None) -> ToolExecutionContext:
+    return ToolExecutionContext(
+        workspace_root=tmp_path,
+        run_id="t_stream",
+        executor=Executor(),
+        emit_tool_events=False,
+        event_sink=events.append,
+        redaction_values=secrets,
+    )
+
+
+def _deltas(events: List[AgentEvent]) -> List[dict]:
+    return [e.payload for e in events if e.type == "tool_output_delta"]
+
+
+def test_streamer_emits_nothing_within_start_delay(tmp_path: Path) -> None:
+    events: List[AgentEvent] = []
+    clock = _Clock()
+    s = ToolOutputStreamer(_mk_ctx(tmp_path, events), call_id="c1", tool="shell_exec", clock=clock)
+    s("stdout", b"hello\n")
+    clock.now = 0.2
+    s("stdout", b"world\n")
+    s.finish()
+    assert _deltas(events) == []
+
+
+def test_streamer_rate_limits_and_flushes_on_finish(tmp_path: Path) -> None:
+    events: List[AgentEvent] = []
+    clock = _Clock()
+    s = ToolOutputStreamer(_mk_ctx(tmp_path, events), call_id="c1", tool="shell_exec", clock=clock)
+    s("stdout", b"a\n")
+    clock.now = 0.6
+    s("stdout", b"b\n")
+    clock.now = 0.7
+    s("stdout", b"c\n")
+    s("stderr", b"partial")
+    assert [d["text"] for d in _deltas(events)] == ["a\nb\n"]
+
+    clock.now = 0.9
+    s("", b"")
+    assert [d["text"] for d in _deltas(events)] == ["a\nb\n", "c\n"]
+
+    s.finish()
+    deltas = _deltas(events)
+    assert deltas[-1] == {"call_id": "c1", "tool": "shell_exec", "stream": "stderr", "text": "partial", "seq": 3}
+    assert [d["seq"] for d in deltas] == [1, 2, 3]
+
+
+def test_streamer_redacts_and_bounds_total(tmp_path: Path) -> None:
+    events: List[AgentEvent] = []
+    clock = _Clock()
+    ctx = _mk_ctx(tmp_path, events, secrets=["s3cr3t-token"])
+    s = ToolOutputStreamer(ctx, call_id="c1", tool="shell_exec", max_total_chars=20, clock=clock)
+    clock.now = 1.0
+    s("stdout", b"key=s3cr3t-token\n")
+    s("stdout", b"x" * 50 + b"\n")
+    s.finish()
+    deltas = _deltas(events)
+    assert "s3cr3t-token" not in "".join(d["text"] for d in deltas)
+    assert "<redacted>" in deltas[0]["text"]
+    assert deltas[-1]["text"] == ""
+    assert deltas[-1]["dropped_chars"] == 17 + 51 - 20
+
+
+def test_shell_exec_long_command_streams_deltas(tmp_path: Path) -> None:
+    events: List[AgentEvent] = []
+    ctx = _mk_ctx(tmp_path, events)
+    code = "import time\nfor i in range(4):\n    print('tick', i, flush=True)\n    time.sleep(0.3)\n"
+    r = shell_exec(ToolCall(call_id="c1", name="shell_exec", args={"argv": [sys.executable, "-c", code]}), ctx)
+    assert json.loads(r.content)["ok"] is True
+    deltas = _deltas(events)
+    assert deltas, "expected tool_output_delta events for a long-running command"
+    assert all(d["call_id"] == "c1" and d["stream"] == "stdout" for d in deltas)
+    assert "".join(d["text"] for d in deltas) == "".join(f"tick {i}\n" for i in range(4))
+
+
+def test_shell_exec_short_command_emits_no_deltas(tmp_path: Path) -> None:
+    events: List[AgentEvent] = []
+    ctx = _mk_ctx(tmp_path, events)
+    r = shell_exec(ToolCall(call_id="c1", name="shell_exec", args={"argv": [sys.executable, "-c", "print('hi')"]}), ctx)
+    assert json.loads(r.content)["ok"] is True
+    assert _deltas(events) == []
+
+
+class _ToolCallsBackend:
+    """第一次采样返回给定的 tool calls，第二次返回最终文本。"""
+
+    def __init__(self, calls: List[ToolCall]) -> None:
+        self._calls = calls
+        self._call_count = 0
+
+    async def stream_chat(self, request: ChatRequest) -> AsyncIterator[ChatStreamEvent]:
+        self._call_count += 1
+        if self._call_count == 1:
+            yield ChatStreamEvent(type="tool_calls", tool_calls=list(self._calls))
+            yield ChatStreamEvent(type="completed", finish_reason="tool_calls")
+        else:
+            yield ChatStreamEvent(type="text_delta", text="done")
+            yield ChatStreamEvent(type="completed", finish_reason="stop")
+
+
+def _agent(tmp_path: Path, calls: List[ToolCall]) -> Agent:
+    overlay_file = tmp_path / "overlay.yaml"
+    overlay_file.write_text(yaml.safe_dump({"config_version": 1, "safety": {"mode": "allow"}}), encoding="utf-8")
+    return Agent(backend=_ToolCallsBackend(calls), workspace_root=tmp_path, config_paths=[overlay_file])
+
+
+def _timed_stream(agent: Agent) -> List[tuple[float, AgentEvent]]:
+    started = time.monotonic()
+    return [(time.monotonic() - started, ev) for ev in agent.run_stream("go")]
+
+
+def _wal_events(timed: List[tuple[float, AgentEvent]]) -> List[dict]:
+    done = next(ev for _t, ev in timed if ev.type == "run_completed")
+    wal_path = Path(done.payload["wal_locator"])
+    return [json.loads(line) for line in wal_path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_run_stream_delivers_shell_exec_deltas_while_command_runs(tmp_path: Path) -> None:
+    code = "import time\nfor i in range(3):\n    print('tick', i, flush=True)\n    time.sleep(0.6)\n"
+    call = ToolCall(call_id="c1", name="shell_exec", args={"argv": [sys.executable, "-c", code]})
+    timed = _timed_stream(_agent(tmp_path, [call]))
+
+    deltas = [(t, ev) for t, ev in timed if ev.type == "tool_output_delta"]
+    finished_at = next(t for t, ev in timed if ev.type == "tool_call_finished")
+    assert deltas, "expected tool_output_delta events for a long-running command"
+    assert deltas[0][0] < finished_at - 0.6, f"首个 delta 应在命令运行期间到达：{deltas[0][0]:.2f}s vs {finished_at:.2f}s"
+    assert "".join(ev.payload["text"] for _t, ev in deltas) == "".join(f"tick {i}\n" for i in range(3))
+
+    # WAL 中每条 delta 只出现一次，且位于 finished 之前。
+    wal_types = [ev["type"] for ev in _wal_events(timed)]
+    assert wal_types.count("tool_output_delta") == len(deltas)
+    assert wal_types.index("tool_output_delta") < wal_types.index("tool_call_finished")
+
+
+def test_run_stream_delivers_deltas_live_from_parallel_wave(tmp_path: Path) -> None:
+    calls = [ToolCall(call_id=f"c{i}", name="ticker", args={"x": str(i)}) for i in range(2)]
+    agent = _agent(tmp_path, calls)
+
+    def _ticker(call: ToolCall, ctx: ToolExecutionContext) -> ToolResult:
+        for seq in (1, 2):
+            ctx.emit_event(
+                AgentEvent(
+                    type="tool_output_delta",
+                    timestamp="2026-10-16T00:00:00Z",
+                    run_id=ctx.run_id,
+                    payload={"call_id": call.call_id, "tool": call.name, "stream": "stdout", "text": f"{seq}\n", "seq": seq},
+                )
+            )
+            time.sleep(0.6)
+        return ToolResult.from_payload(
+            ToolResultPayload(ok=True, stdout="ok", stderr="", exit_code=0, duration_ms=0, truncated=False,
+                              data={}, error_kind=None, retryable=False, retry_after_ms=None),
+        )
+
+    spec = ToolSpec(
+        name="ticker",
+        description="ticker",
+        parameters={"type": "object", "properties": {"x": {"type": "string"}}, "required": ["x"]},
+        idempotency="safe",
+    )
+    agent.register_tool(spec, _ticker)
+    timed = _timed_stream(agent)
+
+    first_finished = next(t for t, ev in timed if ev.type == "tool_call_finished")
+    deltas = [(t, ev) for t, ev in timed if ev.type == "tool_output_delta"]
+    assert sorted((ev.payload["call_id"], ev.payload["seq"]) for _t, ev in deltas) == [
+        ("c0", 1), ("c0", 2), ("c1", 1), ("c1", 2)
+    ]
+    assert all(t < first_finished - 0.3 for t, ev in deltas if ev.payload["seq"] == 1)
+
+    # 并发波次：delta 实时推送但不重复推送；WAL 仍按 call 顺序补写在各自 finished 之前。
+    wal_seq = [
+        (ev["type"], (ev.get("payload") or {}).get("call_id"))
+        for ev in _wal_events(timed)
+        if ev["type"] in ("tool_call_started", "tool_output_delta", "tool_call_finished")
+    ]
+    assert wal_seq == [
+        ("tool_call_started", "c0"),
+        ("tool_call_started", "c1"),
+        ("tool_output_delta", "c0"),
+        ("tool_output_delta", "c0"),
+        ("tool_call_finished", "c0"),
+        ("tool_output_delta", "c1"),
+        ("tool_output_delta", "c1"),
+        ("tool_call_finished", "c1"),
+    ]
@@ -291,3 +291,54 @@ def test_read_file_indentation_defaults_climb_and_omit_header(tmp_path: Path) ->
     # 默认 include_header=false，因此不包含 def header 行
     assert "L1:" not in payload["stdout"]
     assert "L2:     x = 1" in payload["stdout"]
+
+
+def test_read_file_slice_streams_window_and_reports_total_only_at_eof(tmp_path: Path) -> None:
+    p = tmp_path / "big.log"
+    p.write_text("".join(f"line {i}\n" for i in range(1, 5001)), encoding="utf-8")
+    ctx = _mk_ctx(tmp_path)
+
+    r = read_file(ToolCall(call_id="c1", name="read_file", args={"file_path": "big.log", "offset": 10, "limit": 3}), ctx)
+    payload = _result_payload(r)
+    assert payload["stdout"] == "L10: line 10\nL11: line 11\nL12: line 12\n"
+    assert payload["truncated"] is True
+    assert payload["data"]["total_lines"] is None
+
+    r = read_file(ToolCall(call_id="c2", name="read_file", args={"file_path": "big.log", "offset": 4999}), ctx)
+    payload = _result_payload(r)
+    assert payload["stdout"] == "L4999: line 4999\nL5000: line 5000\n"
+    assert payload["truncated"] is False
+    assert payload["data"]["total_lines"] == 5000
+
+
+def test_read_file_line_numbers_match_splitlines_semantics(tmp_path: Path) -> None:
+    p = tmp_path / "mixed.txt"
+    p.write_bytes("a\r\nb\rc d\ne".encode("utf-8"))
+    ctx = _mk_ctx(tmp_path)
+    r = read_file(ToolCall(call_id="c1", name="read_file", args={"file_path": "mixed.txt", "offset": 3}), ctx)
+    payload = _result_payload(r)
+    assert payload["stdout"] == "L3: c\nL4: d\nL5: e\n"
+    assert payload["data"]["total_lines"] == 5
+
+
+def test_line_reader_seeks_from_cached_checkpoints(tmp_path: Path) -> None:
+    from skills_runtime.tools.line_index import CHECKPOINT_STRIDE, LineReader
+
+    p = tmp_path / "big.log"
+    p.write_text("".join(f"{i}\n" for i in range(CHECKPOINT_STRIDE * 3)), encoding="utf-8")
+    with LineReader(p) as reader:
+        assert next(reader.iter_lines(CHECKPOINT_STRIDE * 2 + 5)) == str(CHECKPOINT_STRIDE * 2 + 5)
+
+    with LineReader(p) as reader:
+        line_no, offset = reader._index.seek_point(CHECKPOINT_STRIDE * 2 + 7)
+        assert line_no == CHECKPOINT_STRIDE * 2
+        assert p.read_bytes()[offset:].startswith(f"{CHECKPOINT_STRIDE * 2}\n".encode("utf-8"))
+        assert reader.line(CHECKPOINT_STRIDE * 2 + 7) == str(CHECKPOINT_STRIDE * 2 + 7)
+        assert reader.line(CHECKPOINT_STRIDE * 3) is None
+        assert reader.total_lines == CHECKPOINT_STRIDE * 3
+
+    # 文件变化（size/mtime 不同）后不复用旧索引
+    p.write_text("x\n", encoding="utf-8")
+    with LineReader(p) as reader:
+        assert reader.total_lines is None
+        assert list(reader.iter_lines(0)) == ["x"]
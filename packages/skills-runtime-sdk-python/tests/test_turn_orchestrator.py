@@ -165,7 +165,7 @@ async def test_turn_orchestrator_returns_continue_with_tools_when_bridge_has_pen
     assert result.kind == "continue_with_tools"
     assert result.assistant_text == "draft"
     assert [c.call_id for c in result.pending_tool_calls] == ["c1"]
-    assert [ev.type for ev in stream_events] == ["llm_request_started"]
+    assert [ev.type for ev in stream_events] == ["prompt_compiled", "llm_request_started"]
     assert [tool.name for tool in prompt_manager.last_tools] == ["echo"]
     assert bridge.last_request is not None
     assert [tool.name for tool in bridge.last_request.tools] == ["echo"]
@@ -210,7 +210,7 @@ async def test_turn_orchestrator_returns_completed_without_terminal_event(tmp_pa
     assert result.kind == "completed"
     assert result.assistant_text == "done"
     assert result.pending_tool_calls == []
-    assert [ev.type for ev in stream_events] == ["llm_request_started"]
+    assert [ev.type for ev in stream_events] == ["prompt_compiled", "llm_request_started"]
 
 
 @pytest.mark.asyncio
@@ -262,3 +262,78 @@ async def test_turn_orchestrator_does_not_emit_skill_injected_when_profile_skips
     assert result.kind == "completed"
     assert ensure_calls == 0
     assert "skill_injected" not in [ev.type for ev in stream_events]
+
+
+class _TokenPromptManagerStub(_PromptManagerStub):
+    def __init__(self, prompt_tokens: list[int]) -> None:
+        super().__init__()
+        self._prompt_tokens = list(prompt_tokens)
+        self.histories: list[list] = []
+
+    def build_messages(self, *, task: str, cwd: str, tools, skills_manager, injected_skills, history, user_input=None):
+        _ = (cwd, skills_manager, injected_skills, user_input)
+        self.histories.append(list(history))
+        tokens = self._prompt_tokens.pop(0) if self._prompt_tokens else 10
+        return ([{"role": "user", "content": task}], {"prompt_tokens": tokens})
+
+
+class _SummaryBackend:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def stream_chat(self, request):
+        _ = request
+        self.calls += 1
+        yield type("Ev", (), {"type": "text_delta", "text": "bg summary"})()
+        yield type("Ev", (), {"type": "completed"})()
+
+
+@pytest.mark.asyncio
+async def test_turn_orchestrator_background_compaction_overlaps_tools_and_keeps_new_messages(tmp_path: Path) -> None:
+    ctx, stream_events = _make_ctx(tmp_path)
+    ctx.context_window_tokens = 1000
+    ctx.compaction_keep_last_messages = 0
+    ctx.history.extend([{"role": "user", "content": "old-1"}, {"role": "assistant", "content": "old-2"}])
+    bridge = _BridgeStub(_OutcomeStub(assistant_text="", pending_tool_calls=[], terminal_state="completed"))
+    prompt_manager = _TokenPromptManagerStub([500, 700, 300])
+    backend = _SummaryBackend()
+    orchestrator = TurnOrchestrator(
+        workspace_root=tmp_path,
+        run_id="run_turn",
+        task="do it",
+        executor_model="fake-model",
+        human_io=None,
+        human_timeout_ms=1000,
+        skills_manager=_SkillsManagerStub(),
+        prompt_manager=prompt_manager,
+        registry=_RegistryStub(),
+        ensure_skill_env_vars=lambda **kwargs: True,
+        bridge_factory=lambda **kwargs: bridge,
+        handle_context_length_exceeded_fn=None,
+    )
+    loop = LoopController(max_steps=10, max_wall_time_sec=None, started_monotonic=0.0)
+
+    async def _turn(turn_id: str) -> None:
+        await orchestrator.run_turn(
+            ctx=ctx, loop=loop, backend=backend, turn_id=turn_id, run_env_store={}, safety_gate=object()
+        )
+
+    await _turn("turn_1")
+    assert orchestrator.start_background_compaction(ctx=ctx, backend=backend, turn_id="turn_1") is False
+    await _turn("turn_2")
+    # 500 -> 700：外推下一轮 900 >= 阈值 800，后台摘要与 tool 执行重叠。
+    assert orchestrator.start_background_compaction(ctx=ctx, backend=backend, turn_id="turn_2") is True
+    tool_msgs = [
+        {"role": "assistant", "content": None, "tool_calls": [{"id": "c1", "type": "function", "function": {"name": "echo", "arguments": "{}"}}]},
+        {"role": "tool", "tool_call_id": "c1", "content": "result"},
+    ]
+    ctx.history.extend(tool_msgs)
+    await _turn("turn_3")
+
+    assert backend.calls == 1
+    assert ctx.history[0]["role"] == "assistant" and "bg summary" in ctx.history[0]["content"]
+    assert ctx.history[1:] == tool_msgs
+    assert prompt_manager.histories[-1] == ctx.history
+    started = next(ev for ev in stream_events if ev.type == "compaction_started")
+    assert started.payload["reason"] == "proactive_background"
+    assert ctx.compactions_performed == 1
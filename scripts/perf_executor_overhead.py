@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Perf harness: per-command overhead of `Executor.run_command`.
+
+Goals:
+- Run a trivial command (default `true`) N times through `Executor.run_command`.
+- Run the same command N times through bare `subprocess.run` as the spawn baseline.
+- Report P50/P95 latency for both and the executor overhead on top of the spawn cost.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List
+
+
+def _prefer_repo_skills_runtime() -> None:
+    """
+    Prefer the in-repo Python SDK implementation when this script is run inside the repo.
+
+    Why:
+    - The harness should measure the *current workspace code*, not an older installed wheel.
+    """
+
+    repo_root = Path(__file__).resolve().parents[1]
+    local_src = repo_root / "packages" / "skills-runtime-sdk-python" / "src"
+    if local_src.exists() and local_src.is_dir():
+        sys.path.insert(0, str(local_src))
+
+
+_prefer_repo_skills_runtime()
+
+from skills_runtime.core.executor import Executor  # noqa: E402
+
+
+def _percentile(values: List[float], p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, max(0, int(round(p * (len(ordered) - 1)))))
+    return ordered[k]
+
+
+def _measure(fn: Callable[[], None], *, iterations: int, warmup: int) -> Dict[str, float]:
+    for _ in range(warmup):
+        fn()
+    samples: List[float] = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return {
+        "p50_ms": round(_percentile(samples, 0.50), 3),
+        "p95_ms": round(_percentile(samples, 0.95), 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure Executor.run_command per-command overhead.")
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--cmd", nargs="+", default=["true"], help="argv to run (default: true)")
+    args = parser.parse_args()
+
+    cwd = Path.cwd()
+    argv = list(args.cmd)
+    executor = Executor()
+
+    def _run_executor() -> None:
+        result = executor.run_command(argv, cwd=cwd, timeout_ms=10_000)
+        if result.error_kind not in (None, "exit_code"):
+            raise RuntimeError(f"command failed: {result.error_kind}: {result.stderr}")
+
+    def _run_baseline() -> None:
+        subprocess.run(argv, cwd=str(cwd), stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False)  # noqa: S603
+
+    baseline = _measure(_run_baseline, iterations=args.iterations, warmup=args.warmup)
+    executor_stats = _measure(_run_executor, iterations=args.iterations, warmup=args.warmup)
+    report = {
+        "argv": argv,
+        "iterations": args.iterations,
+        "subprocess_run": baseline,
+        "executor_run_command": executor_stats,
+        "overhead_p50_ms": round(executor_stats["p50_ms"] - baseline["p50_ms"], 3),
+    }
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -91,13 +91,22 @@ class CountingRedisClient:
     A thin wrapper around a redis-py client that counts high-level calls and bytes read.
 
     Note:
-    - This is an approximation of round-trips (scan_iter may issue multiple SCAN commands internally).
-    - It still provides useful evidence for relative comparisons and budgets.
+    - `scan_iter` is re-implemented on top of `SCAN` so each cursor page is counted (`scan` calls).
+    - Pipelines are counted per `execute()` (`pipeline_execute`) plus queued commands (`pipeline_commands`).
+    - `round_trips()` = SCAN pages + direct commands + pipeline executes.
     """
 
     def __init__(self, inner: Any) -> None:
         self._inner = inner
-        self.calls: Dict[str, int] = {"scan_iter": 0, "hgetall": 0, "get": 0}
+        self.calls: Dict[str, int] = {
+            "scan_iter": 0,
+            "scan": 0,
+            "hgetall": 0,
+            "hmget": 0,
+            "get": 0,
+            "pipeline_execute": 0,
+            "pipeline_commands": 0,
+        }
         self.bytes_read: int = 0
 
     def snapshot(self) -> RedisEvidence:
@@ -122,16 +131,39 @@ class CountingRedisClient:
         except Exception:
             return 0
 
-    def scan_iter(self, *, match: str):
+    @staticmethod
+    def round_trips(ev: RedisEvidence) -> int:
+        c = ev.calls
+        return int(c.get("scan", 0)) + int(c.get("hgetall", 0)) + int(c.get("hmget", 0)) + int(c.get("get", 0)) + int(
+            c.get("pipeline_execute", 0)
+        )
+
+    def _count_hash_bytes(self, out: Any) -> None:
+        if isinstance(out, dict):
+            for k, v in out.items():
+                self.bytes_read += self._len_bytes(k) + self._len_bytes(v)
+
+    def scan_iter(self, *, match: str, count: Optional[int] = None):
         self.calls["scan_iter"] += 1
-        return self._inner.scan_iter(match=match)
+        cursor: Any = 0
+        while True:
+            self.calls["scan"] += 1
+            cursor, keys = self._inner.scan(cursor=cursor, match=match, count=count)
+            yield from keys
+            if int(cursor) == 0:
+                break
+
+    def hmget(self, key: Any, fields: List[str]) -> Any:
+        self.calls["hmget"] += 1
+        return self._inner.hmget(key, fields)
+
+    def pipeline(self, transaction: bool = True) -> "CountingPipeline":
+        return CountingPipeline(self, self._inner.pipeline(transaction=transaction))
 
     def hgetall(self, key: Any) -> Any:
         self.calls["hgetall"] += 1
         out = self._inner.hgetall(key)
-        if isinstance(out, dict):
-            for k, v in out.items():
-                self.bytes_read += self._len_bytes(k) + self._len_bytes(v)
+        self._count_hash_bytes(out)
         return out
 
     def get(self, key: Any) -> Any:
@@ -144,6 +176,29 @@ class CountingRedisClient:
         return getattr(self._inner, name)
 
 
+class CountingPipeline:
+    """Pipeline wrapper: counts queued commands and one round-trip per `execute()`."""
+
+    def __init__(self, owner: CountingRedisClient, inner: Any) -> None:
+        self._owner = owner
+        self._inner = inner
+
+    def hgetall(self, key: Any) -> Any:
+        self._owner.calls["pipeline_commands"] += 1
+        return self._inner.hgetall(key)
+
+    def hmget(self, key: Any, fields: List[str]) -> Any:
+        self._owner.calls["pipeline_commands"] += 1
+        return self._inner.hmget(key, fields)
+
+    def execute(self, raise_on_error: bool = True) -> List[Any]:
+        self._owner.calls["pipeline_execute"] += 1
+        out = self._inner.execute(raise_on_error=raise_on_error)
+        for item in out:
+            self._owner._count_hash_bytes(item)
+        return out
+
+
 async def _sleep_ms(ms: int) -> None:
     await asyncio.sleep(max(0.0, float(ms) / 1000.0))
 
@@ -221,14 +276,22 @@ def _mk_skills_manager(
     ttl_sec: int,
     bundle_max_bytes: int,
     bundle_cache_dir: str,
+    scan_batch_size: Optional[int] = None,
+    scan_count: Optional[int] = None,
 ) -> Any:
     from skills_runtime.skills.manager import SkillsManager
 
+    source_options: Dict[str, Any] = {"dsn_env": dsn_env, "key_prefix": key_prefix}
+    if scan_batch_size is not None:
+        source_options["scan_batch_size"] = int(scan_batch_size)
+    if scan_count is not None:
+        source_options["scan_count"] = int(scan_count)
+
     return SkillsManager(
         workspace_root=workspace_root,
         skills_config={
             "spaces": [{"id": "space-perf", "namespace": namespace, "sources": [source_id]}],
-            "sources": [{"id": source_id, "type": "redis", "options": {"dsn_env": dsn_env, "key_prefix": key_prefix}}],
+            "sources": [{"id": source_id, "type": "redis", "options": source_options}],
             "scan": {"refresh_policy": refresh_policy, "ttl_sec": int(ttl_sec)},
             "injection": {"max_bytes": 64 * 1024},
             "actions": {"enabled": True},
@@ -290,6 +353,63 @@ def _run_scan_resolve_inject_bench(
     }
 
 
+def _run_scan_batching_bench(
+    *,
+    workspace_root: Path,
+    namespace: str,
+    key_prefix: str,
+    dsn_env: str,
+    redis_counter: CountingRedisClient,
+    bundle_max_bytes: int,
+    bundle_cache_dir: str,
+    scan_batch_size: int,
+    scan_count: Optional[int],
+    repeats: int,
+) -> Dict[str, Any]:
+    """
+    Compare forced scans before/after metadata pipelining.
+
+    - before: `scan_batch_size=1` (one HGETALL round-trip per meta key; legacy behavior)
+    - after: `scan_batch_size=<N>` + optional `scan_count` (pipelined HGETALL batches)
+    """
+
+    cases: Dict[str, Any] = {}
+    for label, batch, count in [("before", 1, None), ("after", int(scan_batch_size), scan_count)]:
+        mgr = _mk_skills_manager(
+            workspace_root=workspace_root,
+            namespace=namespace,
+            source_id="src-redis",
+            key_prefix=key_prefix,
+            dsn_env=dsn_env,
+            injected_redis_client=redis_counter,
+            refresh_policy="always",
+            ttl_sec=1,
+            bundle_max_bytes=bundle_max_bytes,
+            bundle_cache_dir=bundle_cache_dir,
+            scan_batch_size=batch,
+            scan_count=count,
+        )
+        durs: List[float] = []
+        round_trips: List[int] = []
+        skills_total = 0
+        for _ in range(int(repeats)):
+            before = redis_counter.snapshot()
+            t0 = time.perf_counter()
+            report = mgr.scan(force_refresh=True)
+            durs.append(time.perf_counter() - t0)
+            round_trips.append(CountingRedisClient.round_trips(redis_counter.delta(before)))
+            skills_total = len(report.skills)
+        cases[label] = {
+            "scan_batch_size": batch,
+            "scan_count": count,
+            "skills_total": skills_total,
+            "round_trips_per_scan": max(round_trips) if round_trips else 0,
+            "p50_ms": _percentile([x * 1000.0 for x in durs], 50),
+            "p95_ms": _percentile([x * 1000.0 for x in durs], 95),
+        }
+    return cases
+
+
 def _run_agent_tool_bench(
     *,
     workspace_root: Path,
@@ -463,11 +583,14 @@ def main() -> int:
     ap.add_argument("--num-skills", type=int, default=1000)
     ap.add_argument("--seed", type=int, default=42)
 
-    ap.add_argument("--refresh-policy", choices=["always", "ttl", "manual"], default="ttl")
+    ap.add_argument("--refresh-policy", choices=["always", "ttl", "manual", "incremental"], default="ttl")
     ap.add_argument("--ttl-sec", type=int, default=600)
     ap.add_argument("--bundle-max-bytes", type=int, default=1 * 1024 * 1024)
     ap.add_argument("--bundle-cache-dir", default=".skills_runtime_sdk/bundles")
 
+    ap.add_argument("--scan-batch-size", type=int, default=100, help="redis source scan_batch_size for the pipelined scan case")
+    ap.add_argument("--scan-count", type=int, default=1000, help="redis source scan_count (SCAN COUNT hint); 0 disables")
+    ap.add_argument("--scan-repeats", type=int, default=20, help="forced scans per case in the scan batching bench")
     ap.add_argument("--ops", type=int, default=200, help="number of resolve/inject ops per run (default 200)")
     ap.add_argument("--tool-ops", type=int, default=50, help="number of tool ops per scenario (default 50)")
     ap.add_argument("--approvals-delay-ms", type=int, default=250, help="interactive approvals artificial delay")
@@ -516,6 +639,19 @@ def main() -> int:
 
     rng = random.Random(int(args.seed))
 
+    scan_batching = _run_scan_batching_bench(
+        workspace_root=workspace_root,
+        namespace=str(args.namespace),
+        key_prefix=str(args.key_prefix),
+        dsn_env=dsn_env,
+        redis_counter=counter,
+        bundle_max_bytes=int(args.bundle_max_bytes),
+        bundle_cache_dir=str(args.bundle_cache_dir),
+        scan_batch_size=int(args.scan_batch_size),
+        scan_count=int(args.scan_count) if int(args.scan_count) > 0 else None,
+        repeats=int(args.scan_repeats),
+    )
+
     scan_res_inj = _run_scan_resolve_inject_bench(
         mgr=mgr,
         namespace=str(args.namespace),
@@ -581,6 +717,9 @@ def main() -> int:
             "ttl_sec": int(args.ttl_sec),
             "bundle_max_bytes": int(args.bundle_max_bytes),
             "bundle_cache_dir": str(args.bundle_cache_dir),
+            "scan_batch_size": int(args.scan_batch_size),
+            "scan_count": int(args.scan_count),
+            "scan_repeats": int(args.scan_repeats),
             "ops": int(args.ops),
             "tool_ops": int(args.tool_ops),
             "approvals_delay_ms": int(args.approvals_delay_ms),
@@ -592,6 +731,7 @@ def main() -> int:
             "inject": _summarize("render_injected_skill", scan_res_inj["inject"]["durations_sec"]),
             "redis_scan_evidence": scan_res_inj["scan"]["redis"],
         },
+        "scan_batching": scan_batching,
         "tools": [],
     }
 
@@ -637,6 +777,14 @@ def main() -> int:
     summary_lines.append(f"- resolve_mentions p50/p95 (ms): {sri['resolve_mentions']['p50_ms']:.2f} / {sri['resolve_mentions']['p95_ms']:.2f}")
     summary_lines.append(f"- inject p50/p95 (ms): {sri['inject']['p50_ms']:.2f} / {sri['inject']['p95_ms']:.2f}")
     summary_lines.append("")
+    summary_lines.append("## Scan batching (before: per-key HGETALL, after: pipelined)\n")
+    for label in ["before", "after"]:
+        c = report["scan_batching"][label]
+        summary_lines.append(
+            f"- {label}: scan_batch_size={c['scan_batch_size']} scan_count={c['scan_count']} "
+            f"round_trips/scan={c['round_trips_per_scan']} p50/p95(ms)={c['p50_ms']:.2f}/{c['p95_ms']:.2f}"
+        )
+    summary_lines.append("")
     summary_lines.append("## Tools\n")
     for t in report["tools"]:
         summary_lines.append(